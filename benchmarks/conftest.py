@@ -0,0 +1,42 @@
+"""Shared helpers for the benchmark suite.
+
+Benchmarks record what they measured in ``benchmark.extra_info`` so that
+saved runs can be compared by throughput rather than raw seconds::
+
+    from conftest import record, record_ns_per, record_rate
+
+    record(benchmark, elements=n)
+    record_ns_per(benchmark, "task", n)  # extra_info["ns_per_task"]
+    record_rate(benchmark, "GB/s", nbytes / 1e9)
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from hpyx import debug
+
+
+def _mean_seconds(benchmark: Any) -> float | None:
+    # ``benchmark.stats`` is None under --benchmark-disable.
+    return None if benchmark.stats is None else benchmark.stats.stats.mean
+
+
+def record(benchmark: Any, **info: Any) -> None:
+    """Store `info` and the HPX worker count in ``extra_info``."""
+    benchmark.extra_info["workers"] = debug.get_num_worker_threads()
+    benchmark.extra_info.update(info)
+
+
+def record_ns_per(benchmark: Any, unit: str, count: int) -> None:
+    """Store the mean time per `unit` as ``extra_info["ns_per_<unit>"]``."""
+    mean = _mean_seconds(benchmark)
+    if mean is not None:
+        benchmark.extra_info[f"ns_per_{unit}"] = mean * 1e9 / count
+
+
+def record_rate(benchmark: Any, key: str, amount: float) -> None:
+    """Store `amount` per second of the mean time as ``extra_info[key]``."""
+    mean = _mean_seconds(benchmark)
+    if mean is not None:
+        benchmark.extra_info[key] = amount / mean
@@ -0,0 +1,275 @@
+"""Strong and weak scaling harness over an os_threads x problem-size matrix.
+
+HPX cannot restart in-process with a different thread count, so every
+configuration runs in a fresh interpreter (``scaling.py --worker ...``).
+Each run records wall time, throughput and parallel efficiency to JSON,
+and can be compared against a stored baseline::
+
+    python benchmarks/scaling.py dot1d --threads 1 2 4 8 \\
+        --sizes 10000000 50000000 --output dot1d.json
+    python benchmarks/scaling.py dot1d --threads 1 2 4 8 \\
+        --sizes 10000000 50000000 --baseline dot1d.json --threshold 0.1
+
+Strong scaling (the default) keeps the problem size fixed while threads
+grow; efficiency is ``T(p0) * p0 / (T(p) * p)`` relative to the smallest
+thread count ``p0``. With ``--weak`` each size is per thread (the total
+is ``size * p``) and efficiency is ``T(p0) / T(p)``.
+
+Comparison exits with status 1 if any configuration present in both runs
+is slower than the baseline by more than ``--threshold`` (a fraction).
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import sysconfig
+import time
+from pathlib import Path
+from typing import Any
+
+WORKLOADS = ("dot1d", "for_loop", "submit")
+
+_WORKER_TIMEOUT = 1800
+
+
+def _python_body(x):
+    s = 0
+    for _ in range(100):
+        s += x
+    return s
+
+
+def _noop():
+    return None
+
+
+def _time_workload(workload: str, size: int, repeats: int) -> float:
+    """Run `workload` at `size` in this process; best of `repeats`, seconds."""
+    import hpyx
+
+    if workload == "dot1d":
+        import numpy as np
+
+        rng = np.random.default_rng(0)
+        a, b = rng.random(size), rng.random(size)
+
+        def run() -> None:
+            hpyx._core.dot1d(a, b)
+
+    elif workload == "for_loop":
+        data = list(range(size))
+
+        def run() -> None:
+            hpyx.multiprocessing.for_loop(_python_body, data, "par")
+
+    else:
+        from hpyx.futures import submit
+
+        def run() -> None:
+            futures = [submit(_noop, stacksize="nostack") for _ in range(size)]
+            for f in futures:
+                f.get()
+
+    run()  # warm up
+    best = float("inf")
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def _worker_main(workload: str, os_threads: int, size: int, repeats: int) -> None:
+    import hpyx
+
+    hpyx.init(os_threads=os_threads)
+    print(json.dumps({"seconds": _time_workload(workload, size, repeats)}))
+
+
+def run_config(workload: str, os_threads: int, size: int, repeats: int) -> float:
+    """Time one configuration in a fresh interpreter and return seconds."""
+    result = subprocess.run(
+        [
+            sys.executable,
+            __file__,
+            "--worker",
+            workload,
+            str(os_threads),
+            str(size),
+            str(repeats),
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+        timeout=_WORKER_TIMEOUT,
+    )
+    return float(json.loads(result.stdout.strip().splitlines()[-1])["seconds"])
+
+
+def add_efficiency(results: list[dict[str, Any]], *, weak: bool) -> None:
+    """Fill ``speedup`` and ``efficiency`` in place, per problem size.
+
+    Each size is normalized to its entry with the fewest threads.
+    """
+    by_size: dict[int, list[dict[str, Any]]] = {}
+    for entry in results:
+        by_size.setdefault(entry["size"], []).append(entry)
+    for entries in by_size.values():
+        base = min(entries, key=lambda e: e["os_threads"])
+        for entry in entries:
+            speedup = base["seconds"] / entry["seconds"]
+            if weak:
+                # The work grows with the thread count, so ideal time is flat.
+                entry["speedup"] = speedup * entry["os_threads"] / base["os_threads"]
+                entry["efficiency"] = speedup
+            else:
+                entry["speedup"] = speedup
+                entry["efficiency"] = speedup * base["os_threads"] / entry["os_threads"]
+
+
+def run_matrix(
+    workload: str,
+    threads: list[int],
+    sizes: list[int],
+    *,
+    weak: bool = False,
+    repeats: int = 3,
+) -> dict[str, Any]:
+    """Run every (os_threads, size) configuration and return the JSON report."""
+    results = []
+    for size in sizes:
+        for os_threads in threads:
+            total = size * os_threads if weak else size
+            seconds = run_config(workload, os_threads, total, repeats)
+            results.append(
+                {
+                    "os_threads": os_threads,
+                    "size": size,
+                    "total_size": total,
+                    "seconds": seconds,
+                    "throughput": total / seconds,
+                }
+            )
+            print(
+                f"{workload} os_threads={os_threads} size={total}: {seconds:.4f}s",
+                file=sys.stderr,
+            )
+    add_efficiency(results, weak=weak)
+    return {
+        "workload": workload,
+        "mode": "weak" if weak else "strong",
+        "machine": {
+            "python": platform.python_version(),
+            "free_threaded": bool(sysconfig.get_config_var("Py_GIL_DISABLED")),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+        },
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "results": results,
+    }
+
+
+def compare(
+    current: dict[str, Any], baseline: dict[str, Any], threshold: float
+) -> list[dict[str, Any]]:
+    """Return the configurations slower than `baseline` by more than `threshold`.
+
+    Configurations are matched on ``(os_threads, size)``; ones missing from
+    either report are ignored.
+    """
+    if (current["workload"], current["mode"]) != (baseline["workload"], baseline["mode"]):
+        msg = (
+            f"cannot compare a {current['mode']} {current['workload']} run against a "
+            f"{baseline['mode']} {baseline['workload']} baseline"
+        )
+        raise ValueError(msg)
+    base = {(e["os_threads"], e["size"]): e for e in baseline["results"]}
+    regressions = []
+    for entry in current["results"]:
+        old = base.get((entry["os_threads"], entry["size"]))
+        if old is None:
+            continue
+        change = entry["seconds"] / old["seconds"] - 1.0
+        if change > threshold:
+            regressions.append(
+                {
+                    "os_threads": entry["os_threads"],
+                    "size": entry["size"],
+                    "baseline_seconds": old["seconds"],
+                    "seconds": entry["seconds"],
+                    "change": change,
+                }
+            )
+    return regressions
+
+
+def format_table(report: dict[str, Any]) -> str:
+    """Render a report's results as a fixed-width text table."""
+    lines = [
+        f"{report['workload']} ({report['mode']} scaling)",
+        (
+            f"{'threads':>8} {'size':>12} {'seconds':>10} {'throughput':>14} "
+            f"{'speedup':>8} {'eff.':>6}"
+        ),
+    ]
+    for e in report["results"]:
+        lines.append(
+            f"{e['os_threads']:>8} {e['total_size']:>12} {e['seconds']:>10.4f} "
+            f"{e['throughput']:>14.4g} {e['speedup']:>8.2f} {e['efficiency']:>6.2f}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    if argv[:1] == ["--worker"]:
+        workload, os_threads, size, repeats = argv[1:5]
+        _worker_main(workload, int(os_threads), int(size), int(repeats))
+        return 0
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("workload", choices=WORKLOADS)
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--sizes", type=int, nargs="+", required=True)
+    parser.add_argument("--weak", action="store_true", help="sizes are per thread")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--output", type=Path, help="write the JSON report here")
+    parser.add_argument("--baseline", type=Path, help="JSON report to compare against")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="allowed slowdown vs. the baseline, as a fraction (default 0.1)",
+    )
+    args = parser.parse_args(argv)
+
+    cpus = os.cpu_count() or 1
+    threads = sorted(t for t in set(args.threads) if t <= cpus)
+    if not threads:
+        parser.error(f"every --threads value exceeds this host's {cpus} CPUs")
+    report = run_matrix(args.workload, threads, args.sizes, weak=args.weak, repeats=args.repeats)
+    print(format_table(report))
+    if args.output is not None:
+        args.output.write_text(json.dumps(report, indent=2) + "\n")
+
+    if args.baseline is None:
+        return 0
+    regressions = compare(report, json.loads(args.baseline.read_text()), args.threshold)
+    for r in regressions:
+        print(
+            f"REGRESSION os_threads={r['os_threads']} size={r['size']}: "
+            f"{r['baseline_seconds']:.4f}s -> {r['seconds']:.4f}s ({r['change']:+.1%})"
+        )
+    if regressions:
+        return 1
+    print(f"no regressions beyond {args.threshold:.0%} of {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
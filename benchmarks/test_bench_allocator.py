@@ -0,0 +1,103 @@
+"""Task-spawn throughput under each memory allocator.
+
+HPX's own allocator is fixed when HPX is built (``scripts/build.sh
+--malloc``), so every other allocator is swapped in with ``LD_PRELOAD``
+in a fresh interpreter. ``build`` runs with whatever the process would
+normally use. Allocators whose shared library cannot be found are skipped.
+Each run records ``tasks_per_second``, the allocator that
+``debug.allocator_info()`` reports as active (so a preload that did not
+take effect is visible) and its ``allocated_bytes`` after the batch.
+"""
+
+from __future__ import annotations
+
+import ctypes.util
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+pytestmark = [
+    pytest.mark.benchmark(group="allocator"),
+    pytest.mark.skipif(not sys.platform.startswith("linux"), reason="uses LD_PRELOAD"),
+]
+
+_N_TASKS = 200_000
+
+_LIBRARIES = {
+    "tcmalloc": ["tcmalloc_minimal", "tcmalloc"],
+    "jemalloc": ["jemalloc"],
+    "mimalloc": ["mimalloc"],
+}
+
+_SCRIPT = """
+import json, sys, time
+import hpyx
+from hpyx import debug
+from hpyx.futures import submit
+
+hpyx.init(os_threads=4)
+n = int(sys.argv[1])
+
+def noop():
+    return None
+
+submit(noop, stacksize="nostack").get()  # warm up
+t0 = time.perf_counter()
+futures = [submit(noop, stacksize="nostack") for _ in range(n)]
+for f in futures:
+    f.get()
+elapsed = time.perf_counter() - t0
+info = debug.allocator_info()
+print(json.dumps({
+    "seconds": elapsed,
+    "active": info["active"],
+    "allocated_bytes": info["stats"].get("allocated_bytes"),
+}))
+"""
+
+
+def _find_library(allocator: str) -> str | None:
+    prefix = os.environ.get("CONDA_PREFIX")
+    for name in _LIBRARIES[allocator]:
+        if prefix:
+            candidate = Path(prefix) / "lib" / f"lib{name}.so"
+            if candidate.exists():
+                return str(candidate)
+        found = ctypes.util.find_library(name)
+        if found:
+            return found
+    return None
+
+
+def _run(preload: str | None) -> dict:
+    env = dict(os.environ)
+    if preload is not None:
+        env["LD_PRELOAD"] = preload
+    result = subprocess.run(
+        [sys.executable, "-c", _SCRIPT, str(_N_TASKS)],
+        capture_output=True,
+        text=True,
+        check=True,
+        timeout=600,
+        env=env,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+@pytest.mark.parametrize("allocator", ["build", "tcmalloc", "jemalloc", "mimalloc"])
+def test_bench_task_throughput_by_allocator(benchmark, allocator):
+    preload = None
+    if allocator != "build":
+        preload = _find_library(allocator)
+        if preload is None:
+            pytest.skip(f"{allocator} shared library not found")
+    runs: list[dict] = []
+    benchmark.pedantic(lambda: runs.append(_run(preload)), rounds=3, iterations=1)
+    best = min(runs, key=lambda run: run["seconds"])
+    benchmark.extra_info["tasks_per_second"] = _N_TASKS / best["seconds"]
+    benchmark.extra_info["active_allocator"] = best["active"]
+    benchmark.extra_info["allocated_bytes"] = best["allocated_bytes"]
@@ -0,0 +1,76 @@
+"""hpyx.Array fused expressions versus the same expressions in NumPy.
+
+NumPy evaluates ``sqrt(x * x + y * y) * 0.5 + 1`` one ufunc at a time on a
+single thread and writes every intermediate to memory; hpyx.Array fuses
+it into one pass per chunk across the HPX workers. ``elementwise`` times
+the full expression, ``reduction`` its sum and ``row_reduction`` a
+per-row sum over a 2-D array.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+from conftest import record
+
+from hpyx import array as ha
+
+_N = 20_000_000
+_ROWS = 20_000
+
+
+@pytest.fixture(scope="module")
+def operands():
+    rng = np.random.default_rng(0)
+    return rng.random(_N), rng.random(_N)
+
+
+def _expr(x, y, sqrt):
+    return sqrt(x * x + y * y) * 0.5 + 1.0
+
+
+def _record(benchmark) -> None:
+    record(benchmark, elements=_N)
+
+
+@pytest.mark.benchmark(group="elementwise")
+def test_bench_elementwise_hpyx(benchmark, operands):
+    x, y = (ha.from_array(a) for a in operands)
+    benchmark(_expr(x, y, ha.sqrt).compute)
+    _record(benchmark)
+
+
+@pytest.mark.benchmark(group="elementwise")
+def test_bench_elementwise_numpy(benchmark, operands):
+    benchmark(_expr, *operands, np.sqrt)
+    _record(benchmark)
+
+
+@pytest.mark.benchmark(group="reduction")
+def test_bench_reduction_hpyx(benchmark, operands):
+    x, y = (ha.from_array(a) for a in operands)
+    lazy = _expr(x, y, ha.sqrt).sum()
+    result = benchmark(lazy.compute)
+    np.testing.assert_allclose(result, _expr(*operands, np.sqrt).sum())
+    _record(benchmark)
+
+
+@pytest.mark.benchmark(group="reduction")
+def test_bench_reduction_numpy(benchmark, operands):
+    benchmark(lambda: _expr(*operands, np.sqrt).sum())
+    _record(benchmark)
+
+
+@pytest.mark.benchmark(group="row_reduction")
+def test_bench_row_reduction_hpyx(benchmark, operands):
+    data = operands[0].reshape(_ROWS, -1)
+    lazy = (ha.from_array(data) ** 2).sum(axis=1)
+    benchmark(lazy.compute)
+    _record(benchmark)
+
+
+@pytest.mark.benchmark(group="row_reduction")
+def test_bench_row_reduction_numpy(benchmark, operands):
+    data = operands[0].reshape(_ROWS, -1)
+    benchmark(lambda: (data**2).sum(axis=1))
+    _record(benchmark)
@@ -0,0 +1,69 @@
+"""Native kernels on foreign buffers: read in place vs. converted first.
+
+A mid-size float64 vector arrives as ``bytes`` and as a DLPack-only
+tensor. ``dot1d`` reads either in place, which is compared with
+converting it to a new NumPy array first, the copy callers had to make
+before the kernels accepted buffers. A plain NumPy input is the baseline.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+import hpyx
+from hpyx.runtime import HPXRuntime
+
+_SIZES = [100_000, 1_000_000, 10_000_000]
+
+
+class _DLPackOnly:
+    def __init__(self, array):
+        self._array = array
+
+    def __dlpack__(self, **kwargs):
+        return self._array.__dlpack__(**kwargs)
+
+    def __dlpack_device__(self):
+        return self._array.__dlpack_device__()
+
+
+def _vector(size: int) -> np.ndarray:
+    return np.random.default_rng(0).random(size)
+
+
+@pytest.mark.benchmark(group="buffers")
+@pytest.mark.parametrize("size", _SIZES)
+def test_bench_dot1d_numpy(benchmark, size):
+    a = _vector(size)
+    with HPXRuntime():
+        benchmark(hpyx._core.dot1d, a, a)
+
+
+@pytest.mark.benchmark(group="buffers")
+@pytest.mark.parametrize("size", _SIZES)
+def test_bench_dot1d_bytes_in_place(benchmark, size):
+    data = _vector(size).tobytes()
+    with HPXRuntime():
+        benchmark(hpyx._core.dot1d, data, data)
+
+
+@pytest.mark.benchmark(group="buffers")
+@pytest.mark.parametrize("size", _SIZES)
+def test_bench_dot1d_bytes_copied(benchmark, size):
+    data = _vector(size).tobytes()
+
+    def run():
+        a = np.array(memoryview(data).cast("d"))
+        return hpyx._core.dot1d(a, a)
+
+    with HPXRuntime():
+        benchmark(run)
+
+
+@pytest.mark.benchmark(group="buffers")
+@pytest.mark.parametrize("size", _SIZES)
+def test_bench_dot1d_dlpack_in_place(benchmark, size):
+    tensor = _DLPackOnly(_vector(size))
+    with HPXRuntime():
+        benchmark(hpyx._core.dot1d, tensor, tensor)
@@ -0,0 +1,75 @@
+"""Cached vs. uncached submission of a repeated pure task.
+
+A notebook-style loop submits the same ``_N_REPEATS`` tasks over and over:
+a mid-size NumPy computation on one of a few input arrays. ``uncached``
+runs every task. ``cached`` keys each task by a content hash of its input
+and runs only the first of each. ``key`` times the hash alone for one
+input array, which is the floor a cache hit costs. Every test records
+``ns_per_task`` and the hash in use in ``extra_info``.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+from conftest import record, record_ns_per
+
+from hpyx import cache
+from hpyx.futures import submit
+
+_SIZES = [100_000, 1_000_000]
+_N_INPUTS = 4
+_N_REPEATS = 32
+
+
+def _spectrum(a):
+    return np.abs(np.fft.rfft(a)).max()
+
+
+def _inputs(size: int) -> list[np.ndarray]:
+    rng = np.random.default_rng(0)
+    return [rng.random(size) for _ in range(_N_INPUTS)]
+
+
+def _record(benchmark, size: int, tasks: int) -> None:
+    record(
+        benchmark,
+        elements=size,
+        hash="xxh3_128" if cache.xxhash is not None else "blake2b",
+    )
+    record_ns_per(benchmark, "task", tasks)
+
+
+def _run(inputs: list[np.ndarray], **kwargs) -> list[float]:
+    futures = [
+        submit(_spectrum, inputs[i % _N_INPUTS], stacksize="small", **kwargs)
+        for i in range(_N_REPEATS)
+    ]
+    return [f.get() for f in futures]
+
+
+@pytest.mark.benchmark(group="cache")
+@pytest.mark.parametrize("size", _SIZES)
+def test_bench_repeated_tasks_uncached(benchmark, size):
+    inputs = _inputs(size)
+    benchmark(_run, inputs)
+    _record(benchmark, size, _N_REPEATS)
+
+
+@pytest.mark.benchmark(group="cache")
+@pytest.mark.parametrize("size", _SIZES)
+def test_bench_repeated_tasks_cached(benchmark, size):
+    inputs = _inputs(size)
+    results = cache.ResultCache()
+    expected = _run(inputs)
+    assert benchmark(_run, inputs, cache=results) == expected
+    _record(benchmark, size, _N_REPEATS)
+
+
+@pytest.mark.benchmark(group="cache_key")
+@pytest.mark.parametrize("size", _SIZES)
+def test_bench_cache_key(benchmark, size):
+    (a, *_rest) = _inputs(size)
+    results = cache.ResultCache()
+    benchmark(results.key, _spectrum, (a,))
+    _record(benchmark, size, 1)
@@ -0,0 +1,54 @@
+"""The same Dask array workloads under hpyx.dask.get and Dask's own schedulers.
+
+``reduction`` sums an elementwise expression over a chunked array (one
+task per chunk plus a tree of combine tasks); ``dot`` computes the dot
+product of two chunked vectors, whose chunk tasks ``hpyx.dask.get`` runs
+as ``_core.dot1d``. Both run under ``hpyx.dask.get`` with and without
+native kernel substitution, Dask's threaded scheduler and the
+synchronous scheduler.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+import hpyx
+
+da = pytest.importorskip("dask.array")
+dask = pytest.importorskip("dask")
+
+_SIZE = 8_000_000
+_CHUNK = 500_000
+
+_SCHEDULERS = {
+    "hpyx": hpyx.dask.get,
+    "hpyx-no-native": lambda dsk, keys, **kw: hpyx.dask.get(dsk, keys, native_kernels=False, **kw),
+    "threads": "threads",
+    "sync": "sync",
+}
+
+
+@pytest.fixture(scope="module")
+def vectors():
+    rng = np.random.default_rng(0)
+    return rng.random(_SIZE), rng.random(_SIZE)
+
+
+@pytest.mark.benchmark(group="dask_reduction")
+@pytest.mark.parametrize("scheduler", list(_SCHEDULERS))
+def test_bench_dask_reduction(benchmark, vectors, scheduler):
+    x = da.from_array(vectors[0], chunks=_CHUNK)
+    expr = da.sqrt(x * x + 1.0).sum()
+    result = benchmark(lambda: expr.compute(scheduler=_SCHEDULERS[scheduler]))
+    np.testing.assert_allclose(result, np.sqrt(vectors[0] ** 2 + 1.0).sum())
+
+
+@pytest.mark.benchmark(group="dask_dot")
+@pytest.mark.parametrize("scheduler", list(_SCHEDULERS))
+def test_bench_dask_dot(benchmark, vectors, scheduler):
+    a = da.from_array(vectors[0], chunks=_CHUNK)
+    b = da.from_array(vectors[1], chunks=_CHUNK)
+    expr = da.dot(a, b)
+    result = benchmark(lambda: expr.compute(scheduler=_SCHEDULERS[scheduler]))
+    np.testing.assert_allclose(result, np.dot(*vectors))
@@ -0,0 +1,84 @@
+"""Per-step overhead of hpyx.delayed chains, with and without fusion.
+
+A chain of ``_CHAIN_LENGTH`` cheap steps is computed with the graph
+optimizations on (the chain fuses into one HPX task) and off (one HPX
+task per step), next to the same chain as ``futures.submit(...).then``
+continuations and as a plain loop. ``fan_out`` times ``_WIDTH``
+independent chains of ``_DEPTH`` steps, which fuse into ``_WIDTH``
+parallel tasks. Every test records ``ns_per_step`` in ``extra_info``.
+"""
+
+from __future__ import annotations
+
+import pytest
+from conftest import record, record_ns_per
+
+import hpyx
+from hpyx.futures import submit
+
+_CHAIN_LENGTH = 1_000
+_WIDTH = 64
+_DEPTH = 100
+
+
+def _inc(x):
+    return x + 1
+
+
+_delayed_inc = hpyx.delayed(_inc)
+
+
+def _chain(length: int, start: int = 0):
+    value = _delayed_inc(start)
+    for _ in range(length - 1):
+        value = _delayed_inc(value)
+    return value
+
+
+def _record(benchmark, steps: int) -> None:
+    record(benchmark, steps=steps)
+    record_ns_per(benchmark, "step", steps)
+
+
+@pytest.mark.benchmark(group="delayed_chain")
+@pytest.mark.parametrize("optimize", [True, False], ids=["fused", "unfused"])
+def test_bench_delayed_chain(benchmark, optimize):
+    result = benchmark(lambda: hpyx.compute(_chain(_CHAIN_LENGTH), optimize_graph=optimize))
+    assert result == (_CHAIN_LENGTH,)
+    _record(benchmark, _CHAIN_LENGTH)
+
+
+@pytest.mark.benchmark(group="delayed_chain")
+def test_bench_then_chain(benchmark):
+    def run():
+        future = submit(_inc, 0)
+        for _ in range(_CHAIN_LENGTH - 1):
+            future = future.then(_inc)
+        return future.get()
+
+    assert benchmark(run) == _CHAIN_LENGTH
+    _record(benchmark, _CHAIN_LENGTH)
+
+
+@pytest.mark.benchmark(group="delayed_chain")
+def test_bench_plain_chain(benchmark):
+    def run():
+        value = 0
+        for _ in range(_CHAIN_LENGTH):
+            value = _inc(value)
+        return value
+
+    assert benchmark(run) == _CHAIN_LENGTH
+    _record(benchmark, _CHAIN_LENGTH)
+
+
+@pytest.mark.benchmark(group="delayed_fan_out")
+@pytest.mark.parametrize("optimize", [True, False], ids=["fused", "unfused"])
+def test_bench_delayed_fan_out(benchmark, optimize):
+    def run():
+        chains = [_chain(_DEPTH, i) for i in range(_WIDTH)]
+        return hpyx.compute(*chains, optimize_graph=optimize)
+
+    result = benchmark(run)
+    assert result[-1] == _WIDTH - 1 + _DEPTH
+    _record(benchmark, _WIDTH * _DEPTH)
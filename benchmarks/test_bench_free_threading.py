@@ -0,0 +1,65 @@
+"""Free-threading scaling of pure-Python for_loop bodies across os_threads.
+
+HPX cannot restart in-process, so every os_threads setting runs in a fresh
+interpreter. The loop itself is timed inside the subprocess and recorded
+in ``extra_info``; compare ``loop_seconds`` across os_threads. On a
+free-threaded (3.13t) interpreter the 'par' time should fall as
+os_threads grows; on a GIL build it stays flat.
+"""
+
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+import sysconfig
+
+import pytest
+
+pytestmark = pytest.mark.benchmark(group="free_threading")
+
+_N_ITEMS = 20_000
+
+_SCRIPT = """
+import sys, time
+import hpyx
+
+hpyx.init(os_threads=int(sys.argv[1]))
+
+def body(x):
+    s = 0
+    for _ in range(500):
+        s += x
+    return s
+
+data = list(range(int(sys.argv[2])))
+t0 = time.perf_counter()
+hpyx.multiprocessing.for_loop(body, data, sys.argv[3])
+print(time.perf_counter() - t0)
+"""
+
+
+def _run_loop(os_threads: int, policy: str) -> float:
+    result = subprocess.run(
+        [sys.executable, "-c", _SCRIPT, str(os_threads), str(_N_ITEMS), policy],
+        capture_output=True,
+        text=True,
+        check=True,
+        timeout=300,
+    )
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+@pytest.mark.parametrize("os_threads", [1, 2, 4, 8])
+@pytest.mark.parametrize("policy", ["seq", "par"])
+def test_bench_for_loop_python_body(benchmark, os_threads, policy):
+    if os_threads > (os.cpu_count() or 1):
+        pytest.skip(f"host has fewer than {os_threads} CPUs")
+    benchmark.extra_info["free_threaded"] = bool(sysconfig.get_config_var("Py_GIL_DISABLED"))
+    loop_seconds: list[float] = []
+    benchmark.pedantic(
+        lambda: loop_seconds.append(_run_loop(os_threads, policy)),
+        rounds=3,
+        iterations=1,
+    )
+    benchmark.extra_info["loop_seconds"] = min(loop_seconds)
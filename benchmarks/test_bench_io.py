@@ -0,0 +1,85 @@
+"""Parallel loading with hpyx.io vs. NumPy's single-threaded readers.
+
+A float64 array of ``HPYX_BENCH_IO_BYTES`` bytes (default 512 MiB) is
+written once as raw binary and once as ``.npy``. It is read back with
+``np.fromfile``/``np.load`` and with ``hpyx.io.fromfile``/``load_npy`` on
+the HPX workers and on HPX's I/O threads, for several block sizes. The
+files go to ``HPYX_BENCH_IO_DIR`` (default: pytest's temporary directory);
+point it at the file system the jobs really read from. Files stay in the
+page cache between rounds unless the machine is short of memory, so the
+numbers show read parallelism rather than cold-disk bandwidth. Every test
+records the throughput in ``extra_info["GB/s"]``.
+"""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import numpy as np
+import pytest
+from conftest import record, record_rate
+
+import hpyx
+
+_BYTES = int(os.environ.get("HPYX_BENCH_IO_BYTES", "536870912"))
+_BLOCK_SIZES = [1 << 20, 8 << 20, 64 << 20]
+
+
+@pytest.fixture(scope="module")
+def files(tmp_path_factory):
+    root = os.environ.get("HPYX_BENCH_IO_DIR")
+    directory = Path(root) if root else tmp_path_factory.mktemp("io")
+    data = np.random.default_rng(0).random(_BYTES // 8)
+    raw = directory / "hpyx-bench-io.f64"
+    npy = directory / "hpyx-bench-io.npy"
+    data.tofile(raw)
+    np.save(npy, data)
+    del data
+    yield raw, npy
+    raw.unlink(missing_ok=True)
+    npy.unlink(missing_ok=True)
+
+
+def _record(benchmark, **info) -> None:
+    record(benchmark, bytes=_BYTES, **info)
+    record_rate(benchmark, "GB/s", _BYTES / 1e9)
+
+
+@pytest.mark.benchmark(group="io_fromfile")
+def test_bench_np_fromfile(benchmark, files):
+    raw, _npy = files
+    benchmark.pedantic(np.fromfile, args=(raw, np.float64), rounds=3)
+    _record(benchmark)
+
+
+@pytest.mark.benchmark(group="io_fromfile")
+@pytest.mark.parametrize("pool", ["default", "io"])
+@pytest.mark.parametrize("block_size", _BLOCK_SIZES)
+def test_bench_hpyx_fromfile(benchmark, files, pool, block_size):
+    raw, _npy = files
+
+    def load():
+        return hpyx.io.fromfile(raw, np.float64, block_size=block_size, pool=pool).get()
+
+    benchmark.pedantic(load, rounds=3)
+    _record(benchmark, pool=pool, block_size=block_size)
+
+
+@pytest.mark.benchmark(group="io_npy")
+def test_bench_np_load(benchmark, files):
+    _raw, npy = files
+    benchmark.pedantic(np.load, args=(npy,), rounds=3)
+    _record(benchmark)
+
+
+@pytest.mark.benchmark(group="io_npy")
+@pytest.mark.parametrize("block_size", _BLOCK_SIZES)
+def test_bench_hpyx_load_npy(benchmark, files, block_size):
+    _raw, npy = files
+
+    def load():
+        return hpyx.io.load_npy(npy, block_size=block_size).get()
+
+    benchmark.pedantic(load, rounds=3)
+    _record(benchmark, block_size=block_size)
@@ -0,0 +1,81 @@
+"""Out-of-core dot products and sums over np.memmap files vs. NumPy.
+
+Two float64 vectors are written to files and reduced through read-only
+memmaps with ``hpyx.kernels.memmap_dot``/``memmap_sum`` and with
+``np.dot``/``np.sum`` on the same memmaps. Each vector is
+``HPYX_BENCH_MEMMAP_BYTES`` bytes (default 1 GiB). Set it above half the
+machine's RAM to measure the larger-than-memory case, where NumPy thrashes
+the page cache and the blocked kernels keep resident memory bounded. The
+files go to ``HPYX_BENCH_MEMMAP_DIR`` (default: pytest's temporary
+directory). Every test records the throughput in ``extra_info["GB/s"]``.
+"""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import numpy as np
+import pytest
+from conftest import record, record_rate
+
+import hpyx
+
+_BYTES = int(os.environ.get("HPYX_BENCH_MEMMAP_BYTES", "1073741824"))  # 1 GiB
+_WRITE_BLOCK = 1 << 23  # elements per write when creating the files
+
+
+def _write(path: Path, size: int, seed: int) -> np.memmap:
+    rng = np.random.default_rng(seed)
+    out = np.memmap(path, dtype=np.float64, mode="w+", shape=(size,))
+    for start in range(0, size, _WRITE_BLOCK):
+        stop = min(size, start + _WRITE_BLOCK)
+        out[start:stop] = rng.random(stop - start)
+    out.flush()
+    del out
+    return np.memmap(path, dtype=np.float64, mode="r")
+
+
+@pytest.fixture(scope="module")
+def vectors(tmp_path_factory):
+    root = os.environ.get("HPYX_BENCH_MEMMAP_DIR")
+    directory = Path(root) if root else tmp_path_factory.mktemp("memmap")
+    size = _BYTES // 8
+    paths = [directory / f"hpyx-bench-{i}.f64" for i in range(2)]
+    yield tuple(_write(path, size, seed) for seed, path in enumerate(paths))
+    for path in paths:
+        path.unlink(missing_ok=True)
+
+
+def _record(benchmark, nbytes: int) -> None:
+    record(benchmark, bytes=nbytes)
+    record_rate(benchmark, "GB/s", nbytes / 1e9)
+
+
+@pytest.mark.benchmark(group="memmap_dot")
+@pytest.mark.parametrize("prefetch", [0, 1, 2])
+def test_bench_memmap_dot(benchmark, vectors, prefetch):
+    a, b = vectors
+    benchmark.pedantic(
+        hpyx.kernels.memmap_dot, args=(a, b), kwargs={"prefetch": prefetch}, rounds=3
+    )
+    _record(benchmark, a.nbytes + b.nbytes)
+
+
+@pytest.mark.benchmark(group="memmap_dot")
+def test_bench_np_dot_memmap(benchmark, vectors):
+    a, b = vectors
+    benchmark.pedantic(np.dot, args=(a, b), rounds=3)
+    _record(benchmark, a.nbytes + b.nbytes)
+
+
+@pytest.mark.benchmark(group="memmap_sum")
+def test_bench_memmap_sum(benchmark, vectors):
+    benchmark.pedantic(hpyx.kernels.memmap_sum, args=(vectors[0],), rounds=3)
+    _record(benchmark, vectors[0].nbytes)
+
+
+@pytest.mark.benchmark(group="memmap_sum")
+def test_bench_np_sum_memmap(benchmark, vectors):
+    benchmark.pedantic(np.sum, args=(vectors[0],), rounds=3)
+    _record(benchmark, vectors[0].nbytes)
@@ -0,0 +1,119 @@
+"""Per-node overhead of hpyx.run_graph vs. a Python scheduler loop.
+
+The same ``{key: (fn, *args)}`` graphs of cheap tasks are run with
+``hpyx.run_graph``, which wires every node with ``hpx::dataflow`` in C++,
+and with the loop a Python scheduler would otherwise use: walk the keys in
+topological order and ``submit`` each task once its inputs are known. The
+shapes are a wide map followed by a reduction tree (``tree``), a single
+chain (``chain``) and a layered random DAG (``random``), each with about
+``_NODES`` nodes. Every test records ``ns_per_node`` in ``extra_info``.
+"""
+
+from __future__ import annotations
+
+import operator
+import random
+from graphlib import TopologicalSorter
+
+import pytest
+from conftest import record, record_ns_per
+
+import hpyx
+from hpyx.futures import submit
+
+_NODES = 10_000
+
+
+def _inc(x):
+    return x + 1
+
+
+def _add_all(*xs):
+    return sum(xs) % 1_000_003  # keeps the random DAG's values small
+
+
+def _tree(n: int) -> tuple[dict, tuple]:
+    graph: dict = {("leaf", i): (_inc, i) for i in range(n // 2)}
+    level = [("leaf", i) for i in range(n // 2)]
+    depth = 0
+    while len(level) > 1:
+        depth += 1
+        pairs = [level[i : i + 2] for i in range(0, len(level), 2)]
+        level = []
+        for j, pair in enumerate(pairs):
+            key = ("sum", depth, j)
+            graph[key] = (operator.add, *pair) if len(pair) == 2 else (_inc, *pair)
+            level.append(key)
+    return graph, level[0]
+
+
+def _chain(n: int) -> tuple[dict, tuple]:
+    graph: dict = {("step", 0): (_inc, 0)}
+    for i in range(1, n):
+        graph[("step", i)] = (_inc, ("step", i - 1))
+    return graph, ("step", n - 1)
+
+
+def _random(n: int, width: int = 100, fan_in: int = 3) -> tuple[dict, tuple]:
+    rng = random.Random(0)
+    graph: dict = {("node", 0, j): (_inc, j) for j in range(width)}
+    layers = n // width
+    for layer in range(1, layers):
+        for j in range(width):
+            deps = rng.sample(range(width), fan_in)
+            graph[("node", layer, j)] = (_add_all, *[("node", layer - 1, d) for d in deps])
+    graph[("out",)] = (_add_all, *[("node", layers - 1, j) for j in range(width)])
+    return graph, ("out",)
+
+
+_SHAPES = {"tree": _tree, "chain": _chain, "random": _random}
+
+
+def _python_loop(graph: dict, output) -> object:
+    """Submit tasks in topological order, waiting for inputs as needed.
+
+    Every key in these graphs is a tuple, so only tuple arguments are looked
+    up as dependencies.
+    """
+    order = TopologicalSorter(
+        {
+            key: [a for a in task[1:] if isinstance(a, tuple) and a in graph]
+            for key, task in graph.items()
+        }
+    ).static_order()
+    futures = {}
+    results = {}
+
+    def value(arg):
+        if isinstance(arg, tuple) and arg in graph:
+            if arg not in results:
+                results[arg] = futures.pop(arg).get()
+            return results[arg]
+        return arg
+
+    for key in order:
+        fn, *args = graph[key]
+        futures[key] = submit(fn, *[value(a) for a in args], stacksize="small")
+    return value(output)
+
+
+def _record(benchmark, nodes: int) -> None:
+    record(benchmark, nodes=nodes)
+    record_ns_per(benchmark, "node", nodes)
+
+
+@pytest.mark.benchmark(group="run_graph")
+@pytest.mark.parametrize("shape", list(_SHAPES))
+def test_bench_run_graph(benchmark, shape):
+    graph, output = _SHAPES[shape](_NODES)
+    expected = _python_loop(graph, output)
+    assert benchmark(hpyx.run_graph, graph, output) == expected
+    _record(benchmark, len(graph))
+
+
+@pytest.mark.benchmark(group="run_graph")
+@pytest.mark.parametrize("shape", list(_SHAPES))
+def test_bench_python_toposort_submit(benchmark, shape):
+    graph, output = _SHAPES[shape](_NODES)
+    benchmark(_python_loop, graph, output)
+    _record(benchmark, len(graph))
@@ -0,0 +1,69 @@
+"""Spawn rate and memory cost of tiny tasks for each HPX stack size.
+
+Every setting runs in a fresh interpreter (HPX cannot restart in-process).
+The subprocess submits ``_N_TASKS`` no-op tasks with
+``submit(..., stacksize=...)`` before waiting on any of them, so they are
+all in flight at once, and reports:
+
+- ``tasks_per_second``: tasks spawned and completed per second;
+- ``rss_mb_per_1m_tasks``: growth of peak RSS while the tasks are in
+  flight, scaled to one million tasks.
+"""
+
+from __future__ import annotations
+
+import json
+import subprocess
+import sys
+
+import pytest
+
+pytestmark = pytest.mark.benchmark(group="stacksize")
+
+_N_TASKS = 200_000
+
+_SCRIPT = """
+import json, resource, sys, time
+import hpyx
+from hpyx.futures import submit
+
+hpyx.init(os_threads=4)
+stacksize, n = sys.argv[1], int(sys.argv[2])
+
+def noop():
+    return None
+
+submit(noop, stacksize=stacksize).get()  # warm up
+rss0 = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+t0 = time.perf_counter()
+futures = [submit(noop, stacksize=stacksize) for _ in range(n)]
+for f in futures:
+    f.get()
+elapsed = time.perf_counter() - t0
+rss1 = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({"seconds": elapsed, "rss_kb": rss1 - rss0}))
+"""
+
+
+def _run(stacksize: str) -> dict:
+    result = subprocess.run(
+        [sys.executable, "-c", _SCRIPT, stacksize, str(_N_TASKS)],
+        capture_output=True,
+        text=True,
+        check=True,
+        timeout=600,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="uses the resource module")
+@pytest.mark.parametrize("stacksize", ["nostack", "small", "medium", "large"])
+def test_bench_tiny_tasks(benchmark, stacksize):
+    runs: list[dict] = []
+    benchmark.pedantic(lambda: runs.append(_run(stacksize)), rounds=3, iterations=1)
+    best = min(runs, key=lambda run: run["seconds"])
+    benchmark.extra_info["tasks_per_second"] = _N_TASKS / best["seconds"]
+    # ru_maxrss is in KiB on Linux.
+    benchmark.extra_info["rss_mb_per_1m_tasks"] = (
+        max(run["rss_kb"] for run in runs) / 1024 * 1_000_000 / _N_TASKS
+    )
@@ -0,0 +1,74 @@
+"""Iterated stencils: hpyx.kernels.stencil vs. NumPy slicing loops.
+
+A 1-D three-point heat-equation sweep and a 2-D five-point Jacobi sweep
+run ``_STEPS`` steps with ``hpyx.kernels.stencil`` and with the usual
+NumPy loop, which builds new arrays from shifted slices on every step.
+Every test records ``cell_updates_per_second`` in ``extra_info``.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+from conftest import record, record_rate
+
+import hpyx
+
+_STEPS = 50
+_SIZES_1D = [100_000, 10_000_000]
+_SIZES_2D = [512, 4096]
+_HEAT = np.array([0.25, 0.5, 0.25])
+_JACOBI = np.array([[0.0, 0.25, 0.0], [0.25, 0.0, 0.25], [0.0, 0.25, 0.0]])
+
+
+def _numpy_heat(u: np.ndarray, steps: int) -> np.ndarray:
+    for _ in range(steps):
+        padded = np.pad(u, 1, mode="edge")
+        u = 0.25 * padded[:-2] + 0.5 * padded[1:-1] + 0.25 * padded[2:]
+    return u
+
+
+def _numpy_jacobi(u: np.ndarray, steps: int) -> np.ndarray:
+    for _ in range(steps):
+        padded = np.pad(u, 1, mode="edge")
+        u = 0.25 * (padded[:-2, 1:-1] + padded[2:, 1:-1] + padded[1:-1, :-2] + padded[1:-1, 2:])
+    return u
+
+
+def _record(benchmark, cells: int) -> None:
+    record(benchmark, cells=cells, steps=_STEPS)
+    record_rate(benchmark, "cell_updates_per_second", cells * _STEPS)
+
+
+@pytest.mark.benchmark(group="stencil_1d")
+@pytest.mark.parametrize("size", _SIZES_1D)
+def test_bench_stencil_1d_hpyx(benchmark, size):
+    u = np.random.default_rng(0).random(size)
+    out = np.empty_like(u)
+    benchmark(hpyx.kernels.stencil, u, _HEAT, steps=_STEPS, boundary="nearest", out=out)
+    _record(benchmark, size)
+
+
+@pytest.mark.benchmark(group="stencil_1d")
+@pytest.mark.parametrize("size", _SIZES_1D)
+def test_bench_stencil_1d_numpy(benchmark, size):
+    u = np.random.default_rng(0).random(size)
+    benchmark(_numpy_heat, u, _STEPS)
+    _record(benchmark, size)
+
+
+@pytest.mark.benchmark(group="stencil_2d")
+@pytest.mark.parametrize("n", _SIZES_2D)
+def test_bench_stencil_2d_hpyx(benchmark, n):
+    u = np.random.default_rng(0).random((n, n))
+    out = np.empty_like(u)
+    benchmark(hpyx.kernels.stencil, u, _JACOBI, steps=_STEPS, boundary="nearest", out=out)
+    _record(benchmark, n * n)
+
+
+@pytest.mark.benchmark(group="stencil_2d")
+@pytest.mark.parametrize("n", _SIZES_2D)
+def test_bench_stencil_2d_numpy(benchmark, n):
+    u = np.random.default_rng(0).random((n, n))
+    benchmark(_numpy_jacobi, u, _STEPS)
+    _record(benchmark, n * n)
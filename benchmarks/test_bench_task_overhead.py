@@ -0,0 +1,227 @@
+"""Per-task overhead of futures, HPXExecutor and for_loop.
+
+Each group times the same tiny workload on HPyX, on
+``concurrent.futures.ThreadPoolExecutor`` and on a plain Python loop, so
+the numbers show what HPyX costs over the alternatives for fine-grained
+work. The thread pool gets as many workers as HPX has worker threads.
+Every test records ``ns_per_op`` in ``extra_info``:
+
+- ``submit_latency``: submit one empty task and wait for it;
+- ``then_chain``: a chain of ``_CHAIN_DEPTH`` continuations, per link;
+- ``spawn_throughput``: ``_N_TASKS`` empty tasks in flight, then waited on;
+- ``for_loop_overhead``: ``for_loop`` seq/par over ``_N_ITEMS`` elements
+  with a near-empty body, per element;
+- ``executor_map``: ``Executor.map`` over ``_N_TASKS`` elements.
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from conftest import record, record_ns_per
+
+from hpyx import HPXExecutor, debug
+from hpyx.futures import submit
+from hpyx.multiprocessing import for_loop
+
+_N_TASKS = 10_000
+_N_ITEMS = 100_000
+_CHAIN_DEPTH = 100
+
+
+def _noop():
+    return None
+
+
+def _identity(x):
+    return x
+
+
+def _inc(x):
+    return x + 1
+
+
+@pytest.fixture(scope="module")
+def thread_pool():
+    with ThreadPoolExecutor(max_workers=debug.get_num_worker_threads()) as pool:
+        yield pool
+
+
+def _record(benchmark, ops: int) -> None:
+    record(benchmark, ops=ops)
+    record_ns_per(benchmark, "op", ops)
+
+
+# -- submit + get latency -----------------------------------------------------
+
+
+@pytest.mark.benchmark(group="submit_latency")
+def test_bench_submit_latency_hpyx(benchmark):
+    benchmark(lambda: submit(_noop).get())
+    _record(benchmark, 1)
+
+
+@pytest.mark.benchmark(group="submit_latency")
+def test_bench_submit_latency_hpyx_executor(benchmark):
+    executor = HPXExecutor(os_threads=debug.get_num_worker_threads())
+    benchmark(lambda: executor.submit(_noop).result())
+    _record(benchmark, 1)
+
+
+@pytest.mark.benchmark(group="submit_latency")
+def test_bench_submit_latency_thread_pool(benchmark, thread_pool):
+    benchmark(lambda: thread_pool.submit(_noop).result())
+    _record(benchmark, 1)
+
+
+@pytest.mark.benchmark(group="submit_latency")
+def test_bench_submit_latency_plain_call(benchmark):
+    benchmark(_noop)
+    _record(benchmark, 1)
+
+
+# -- .then chain depth --------------------------------------------------------
+
+
+def _hpyx_chain():
+    future = submit(_identity, 0)
+    for _ in range(_CHAIN_DEPTH):
+        future = future.then(_inc)
+    return future.get()
+
+
+def _thread_pool_chain(pool):
+    # concurrent.futures has no continuations; each link is a dependent
+    # submit, which is what user code does instead.
+    value = pool.submit(_identity, 0).result()
+    for _ in range(_CHAIN_DEPTH):
+        value = pool.submit(_inc, value).result()
+    return value
+
+
+def _plain_chain():
+    value = _identity(0)
+    for _ in range(_CHAIN_DEPTH):
+        value = _inc(value)
+    return value
+
+
+@pytest.mark.benchmark(group="then_chain")
+def test_bench_then_chain_hpyx(benchmark):
+    assert benchmark(_hpyx_chain) == _CHAIN_DEPTH
+    _record(benchmark, _CHAIN_DEPTH)
+
+
+@pytest.mark.benchmark(group="then_chain")
+def test_bench_then_chain_thread_pool(benchmark, thread_pool):
+    assert benchmark(_thread_pool_chain, thread_pool) == _CHAIN_DEPTH
+    _record(benchmark, _CHAIN_DEPTH)
+
+
+@pytest.mark.benchmark(group="then_chain")
+def test_bench_then_chain_plain_loop(benchmark):
+    assert benchmark(_plain_chain) == _CHAIN_DEPTH
+    _record(benchmark, _CHAIN_DEPTH)
+
+
+# -- spawn throughput ---------------------------------------------------------
+
+
+def _spawn_hpyx(stacksize):
+    futures = [submit(_noop, stacksize=stacksize) for _ in range(_N_TASKS)]
+    for f in futures:
+        f.get()
+
+
+def _spawn_thread_pool(pool):
+    futures = [pool.submit(_noop) for _ in range(_N_TASKS)]
+    for f in futures:
+        f.result()
+
+
+def _spawn_plain():
+    for _ in range(_N_TASKS):
+        _noop()
+
+
+@pytest.mark.benchmark(group="spawn_throughput")
+@pytest.mark.parametrize("stacksize", [None, "nostack"])
+def test_bench_spawn_hpyx(benchmark, stacksize):
+    benchmark.pedantic(_spawn_hpyx, args=(stacksize,), rounds=5, iterations=1)
+    _record(benchmark, _N_TASKS)
+
+
+@pytest.mark.benchmark(group="spawn_throughput")
+def test_bench_spawn_thread_pool(benchmark, thread_pool):
+    benchmark.pedantic(_spawn_thread_pool, args=(thread_pool,), rounds=5, iterations=1)
+    _record(benchmark, _N_TASKS)
+
+
+@pytest.mark.benchmark(group="spawn_throughput")
+def test_bench_spawn_plain_loop(benchmark):
+    benchmark.pedantic(_spawn_plain, rounds=5, iterations=1)
+    _record(benchmark, _N_TASKS)
+
+
+# -- for_loop per-element overhead --------------------------------------------
+
+
+@pytest.mark.benchmark(group="for_loop_overhead")
+@pytest.mark.parametrize("policy", ["seq", "par"])
+def test_bench_for_loop_hpyx(benchmark, policy):
+    data = list(range(_N_ITEMS))
+    benchmark.pedantic(for_loop, args=(_identity, data, policy), rounds=5, iterations=1)
+    _record(benchmark, _N_ITEMS)
+
+
+@pytest.mark.benchmark(group="for_loop_overhead")
+def test_bench_for_loop_thread_pool(benchmark, thread_pool):
+    data = list(range(_N_ITEMS))
+    chunksize = max(1, _N_ITEMS // (4 * debug.get_num_worker_threads()))
+    benchmark.pedantic(
+        lambda: list(thread_pool.map(_identity, data, chunksize=chunksize)),
+        rounds=5,
+        iterations=1,
+    )
+    _record(benchmark, _N_ITEMS)
+
+
+@pytest.mark.benchmark(group="for_loop_overhead")
+def test_bench_for_loop_plain_loop(benchmark):
+    data = list(range(_N_ITEMS))
+
+    def run():
+        for item in data:
+            _identity(item)
+
+    benchmark.pedantic(run, rounds=5, iterations=1)
+    _record(benchmark, _N_ITEMS)
+
+
+# -- Executor.map throughput --------------------------------------------------
+
+
+@pytest.mark.benchmark(group="executor_map")
+def test_bench_executor_map_hpyx(benchmark):
+    executor = HPXExecutor(os_threads=debug.get_num_worker_threads())
+    data = range(_N_TASKS)
+    result = benchmark.pedantic(lambda: list(executor.map(_inc, data)), rounds=5, iterations=1)
+    assert result[-1] == _N_TASKS
+    _record(benchmark, _N_TASKS)
+
+
+@pytest.mark.benchmark(group="executor_map")
+def test_bench_executor_map_thread_pool(benchmark, thread_pool):
+    data = range(_N_TASKS)
+    result = benchmark.pedantic(lambda: list(thread_pool.map(_inc, data)), rounds=5, iterations=1)
+    assert result[-1] == _N_TASKS
+    _record(benchmark, _N_TASKS)
+
+
+@pytest.mark.benchmark(group="executor_map")
+def test_bench_executor_map_builtin(benchmark):
+    data = range(_N_TASKS)
+    result = benchmark.pedantic(lambda: list(map(_inc, data)), rounds=5, iterations=1)
+    assert result[-1] == _N_TASKS
+    _record(benchmark, _N_TASKS)
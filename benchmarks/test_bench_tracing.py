@@ -0,0 +1,39 @@
+"""Overhead of per-task tracing on a 100k-task workload.
+
+Runs the same batch of tiny tasks with tracing off and on. Compare the
+two ``tracing`` groups' means; the difference is the tracing overhead
+(target: a few percent).
+"""
+
+from __future__ import annotations
+
+import pytest
+
+from hpyx import debug
+from hpyx.futures import submit
+
+pytestmark = pytest.mark.benchmark(group="tracing")
+
+_N_TASKS = 100_000
+
+
+def _work(x):
+    return x + 1
+
+
+def _run_batch():
+    futures = [submit(_work, i, stacksize="small") for i in range(_N_TASKS)]
+    for f in futures:
+        f.get()
+
+
+@pytest.mark.parametrize("traced", [False, True], ids=["off", "on"])
+def test_bench_tracing_overhead(benchmark, tmp_path, traced):
+    if traced:
+        debug.enable_tracing(tmp_path / "trace.jsonl")
+    try:
+        benchmark.pedantic(_run_batch, rounds=5, iterations=1)
+    finally:
+        if traced:
+            debug.disable_tracing()
+    benchmark.extra_info["tasks"] = _N_TASKS
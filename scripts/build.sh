@@ -7,6 +7,7 @@ set -e
 MALLOC="system"
 BUILD_DIR="build"
 HPX_VERSION=""
+NETWORKING="FALSE"
 
 # Parse command line arguments
 while [[ $# -gt 0 ]]; do
@@ -23,11 +24,17 @@ while [[ $# -gt 0 ]]; do
       HPX_VERSION="$2"
       shift 2
       ;;
+    --networking)
+      NETWORKING="TRUE"
+      shift
+      ;;
     -h|--help)
       echo "Usage: $0 [--malloc TYPE] [--build-dir DIR] --hpx-version VERSION"
-      echo "  --malloc TYPE        Set malloc implementation (default: system)"
+      echo "  --malloc TYPE        Allocator HPX uses: system, tcmalloc, jemalloc or"
+      echo "                       mimalloc (default: system)"
       echo "  --build-dir DIR      Set build directory (default: build)"
       echo "  --hpx-version VERSION Set HPX version to build from source (required)"
+      echo "  --networking         Build the TCP parcelport (multi-locality support)"
       echo "  -h, --help           Show this help message"
       exit 0
       ;;
@@ -40,6 +47,14 @@ while [[ $# -gt 0 ]]; do
   esac
 done
 
+case "$MALLOC" in
+  system|tcmalloc|jemalloc|mimalloc) ;;
+  *)
+    echo "Error: --malloc must be one of system, tcmalloc, jemalloc, mimalloc (got '$MALLOC')"
+    exit 1
+    ;;
+esac
+
 # Check if HPX_VERSION is required and provided
 if [ -z "$HPX_VERSION" ]; then
   echo "Error: HPX version must be specified with --hpx-version"
@@ -52,6 +67,7 @@ if [ -n "$HPX_VERSION" ]; then
 fi
 echo "Building with memory allocator: $MALLOC"
 echo "Using build directory: $BUILD_DIR"
+echo "Networking (TCP parcelport): $NETWORKING"
 
 git checkout "$HPX_VERSION" || {
   echo "Error: HPX version $HPX_VERSION not found in the repository."
@@ -83,7 +99,8 @@ cmake \
     -D PYTHON_EXECUTABLE="$PYTHON" \
     -D HPX_WITH_EXAMPLES=FALSE \
     -D HPX_WITH_MALLOC="$MALLOC" \
-    -D HPX_WITH_NETWORKING=FALSE \
+    -D HPX_WITH_NETWORKING="$NETWORKING" \
+    -D HPX_WITH_PARCELPORT_TCP="$NETWORKING" \
     -D HPX_WITH_TESTS=FALSE \
     ..
 cmake --build . --config Release --parallel ${CPU_COUNT}
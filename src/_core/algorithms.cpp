@@ -5,32 +5,57 @@
 #include <hpx/numeric.hpp>
 #include <hpx/algorithm.hpp>
 
+#include <algorithm>
+#include <exception>
+#include <mutex>
+#include <numeric>
+#include <string>
+#include <vector>
+
+#include "buffers.hpp"
+#include "futures.hpp"
+#include "gil.hpp"
+#include "tracing.hpp"
+
 namespace nb = nanobind;
 
 namespace algorithms {
 
-double dot1d(
-    nb::ndarray<nb::numpy, const double, nb::c_contig> a,
-    nb::ndarray<nb::numpy, const double, nb::c_contig> b)
+double dot1d(nb::handle a, nb::handle b)
 {
-    if (a.size() != b.size()) {
+    futures::require_stack("dot1d");
+    hpyx::buffers::f64_view const x(a, "a");
+    hpyx::buffers::f64_view const y(b, "b");
+    if (x.size() != y.size()) {
         throw std::invalid_argument("Arrays must have the same size");
     }
 
-    const double* a_data = a.data();
-    const double* b_data = b.data();
-    std::size_t size = a.size();
-
-    return hpx::transform_reduce(
-        hpx::execution::par,          // parallel execution policy
-        a_data, a_data + size,        // range of first array
-        b_data,                       // beginning of second array
-        0.0,                          // initial sum
-        std::plus<>(),                // reduction operation
-        [](double x, double y) {      // transform operation
-            return x * y;
-        }
-    );
+    const double* a_data = x.data();
+    const double* b_data = y.data();
+    std::size_t const size = x.size();
+    if (size == 0) return 0.0;
+
+    // Explicit chunks (a few per worker) so each one shows up as a
+    // kernel phase in traces.
+    static std::uint32_t const phase = hpyx::tracing::intern_name(std::string("dot1d.chunk"));
+    std::size_t const num_chunks = (std::min)(
+        size, 4 * static_cast<std::size_t>(hpx::get_num_worker_threads()));
+    std::vector<double> partial(num_chunks, 0.0);
+    {
+        // The chunks only read the views, so other Python threads can run.
+        nb::gil_scoped_release release;
+        hpx::experimental::for_loop(
+            hpx::execution::par, std::size_t(0), num_chunks,
+            [&](std::size_t chunk) {
+                hpyx::tracing::task_scope scope(hpyx::tracing::pending_task::kernel(phase));
+                std::size_t const begin = chunk * size / num_chunks;
+                std::size_t const end = (chunk + 1) * size / num_chunks;
+                partial[chunk] = std::inner_product(
+                    a_data + begin, a_data + end, b_data + begin, 0.0);
+            }
+        );
+    }
+    return std::accumulate(partial.begin(), partial.end(), 0.0);
 }
 
 // nb::ndarray<nb::numpy, double, nb::c_contig>
@@ -89,22 +114,50 @@ void hpx_for_loop(
     nb::iterable iterable,
     std::string policy = "seq"
 ) {
-    // Get start and end indices
-    int start = 0;
-    int end = nb::len(iterable);
+    std::size_t const size = nb::len(iterable);
 
-    // Use hpx for_loop to apply the function to each element in the iterable
     if (policy == "par") {
-        hpx::experimental::for_loop(
-            hpx::execution::par, start, end,
-            [&](std::size_t i) {
-                auto data = iterable[i];
-                iterable[i] = function(data);
-            }
-        );
+        futures::require_stack("for_loop");
+        if (size == 0) return;
+        // Split the range into a few chunks per worker so each HPX task
+        // acquires the GIL (attaches a thread state on free-threaded
+        // builds) once per chunk rather than once per element.
+        std::size_t const num_chunks = (std::min)(
+            size, 4 * static_cast<std::size_t>(hpx::get_num_worker_threads()));
+        static std::uint32_t const phase =
+            hpyx::tracing::intern_name(std::string("for_loop.chunk"));
+        std::mutex error_mtx;
+        std::exception_ptr first_error;
+        {
+            // Workers must be able to take the GIL while this thread waits.
+            nb::gil_scoped_release release;
+            hpx::experimental::for_loop(
+                hpx::execution::par, std::size_t(0), num_chunks,
+                [&](std::size_t chunk) {
+                    std::size_t const begin = chunk * size / num_chunks;
+                    std::size_t const end = (chunk + 1) * size / num_chunks;
+                    hpyx::tracing::task_scope scope(
+                        hpyx::tracing::pending_task::kernel(phase));
+                    hpyx::gil::acquire acquire(hpyx::gil::site::for_loop);
+                    scope.gil_acquired();
+                    try {
+                        for (std::size_t i = begin; i < end; ++i) {
+                            auto data = iterable[i];
+                            iterable[i] = function(data);
+                        }
+                    } catch (...) {
+                        std::lock_guard<std::mutex> lk(error_mtx);
+                        if (!first_error) first_error = std::current_exception();
+                    }
+                }
+            );
+        }
+        // Rethrow with the GIL held so the original Python exception is restored.
+        if (first_error) std::rethrow_exception(first_error);
     } else if (policy == "seq") {
+        // Runs on the calling thread, which already holds the GIL.
         hpx::experimental::for_loop(
-            hpx::execution::seq, start, end,
+            hpx::execution::seq, std::size_t(0), size,
             [&](std::size_t i) {
                 auto data = iterable[i];
                 iterable[i] = function(data);
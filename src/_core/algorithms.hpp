@@ -7,9 +7,9 @@ namespace algorithms {
 
 namespace nb = nanobind;
 
-double dot1d(
-    nb::ndarray<nb::numpy, const double, nb::c_contig> a,
-    nb::ndarray<nb::numpy, const double, nb::c_contig> b);
+// Dot product of two float64 buffers of equal size: anything
+// hpyx::buffers::f64_view accepts, read in place.
+double dot1d(nb::handle a, nb::handle b);
 
 // nb::ndarray<nb::numpy, double, nb::c_contig>
 // matmul2d(
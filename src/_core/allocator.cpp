@@ -0,0 +1,150 @@
+#include "allocator.hpp"
+
+#include <hpx/config.hpp>
+#include <nanobind/stl/string.h>
+
+#if defined(__unix__) || defined(__APPLE__)
+#include <dlfcn.h>
+#define HPYX_HAVE_DLSYM 1
+#endif
+
+#include <cstddef>
+#include <cstdint>
+#include <string>
+
+namespace nb = nanobind;
+
+namespace hpyx::allocator {
+
+namespace {
+
+// Allocator HPX was configured with. HPX records it in its config
+// header; the CMake fallback covers installs that do not.
+char const* hpx_malloc() {
+#if defined(HPX_HAVE_MALLOC)
+    return HPX_HAVE_MALLOC;
+#elif defined(HPYX_HPX_MALLOC)
+    return HPYX_HPX_MALLOC;
+#else
+    return "unknown";
+#endif
+}
+
+// All allocator entry points are looked up at run time so HPyX links
+// against none of them.
+void* lookup(char const* name) {
+#if defined(HPYX_HAVE_DLSYM)
+    return dlsym(RTLD_DEFAULT, name);
+#else
+    (void) name;
+    return nullptr;
+#endif
+}
+
+// glibc's struct mallinfo2 (2.33+); declared here so older headers build.
+struct mallinfo2_t {
+    std::size_t arena, ordblks, smblks, hblks, hblkhd, usmblks, fsmblks, uordblks,
+        fordblks, keepcost;
+};
+
+void tcmalloc_stats(nb::dict& stats) {
+    using get_t = int (*)(char const*, std::size_t*);
+    auto get = reinterpret_cast<get_t>(lookup("MallocExtension_GetNumericProperty"));
+    if (get == nullptr) return;
+    char const* const props[][2] = {
+        {"generic.current_allocated_bytes", "allocated_bytes"},
+        {"generic.heap_size", "heap_bytes"},
+        {"tcmalloc.pageheap_free_bytes", "pageheap_free_bytes"},
+        {"tcmalloc.pageheap_unmapped_bytes", "pageheap_unmapped_bytes"},
+        {"tcmalloc.current_total_thread_cache_bytes", "thread_cache_bytes"},
+    };
+    for (auto const& prop : props) {
+        std::size_t value = 0;
+        if (get(prop[0], &value)) stats[prop[1]] = value;
+    }
+}
+
+void jemalloc_stats(nb::dict& stats) {
+    using mallctl_t = int (*)(char const*, void*, std::size_t*, void*, std::size_t);
+    auto mallctl = reinterpret_cast<mallctl_t>(lookup("mallctl"));
+    if (mallctl == nullptr) mallctl = reinterpret_cast<mallctl_t>(lookup("je_mallctl"));
+    if (mallctl == nullptr) return;
+    // Statistics are cached; bumping the epoch refreshes them.
+    std::uint64_t epoch = 1;
+    std::size_t len = sizeof(epoch);
+    mallctl("epoch", &epoch, &len, &epoch, len);
+    char const* const props[][2] = {
+        {"stats.allocated", "allocated_bytes"},
+        {"stats.active", "active_bytes"},
+        {"stats.resident", "resident_bytes"},
+        {"stats.mapped", "mapped_bytes"},
+    };
+    for (auto const& prop : props) {
+        std::size_t value = 0;
+        len = sizeof(value);
+        if (mallctl(prop[0], &value, &len, nullptr, 0) == 0) stats[prop[1]] = value;
+    }
+}
+
+void mimalloc_stats(nb::dict& stats) {
+    using info_t = void (*)(std::size_t*, std::size_t*, std::size_t*, std::size_t*,
+        std::size_t*, std::size_t*, std::size_t*, std::size_t*);
+    auto process_info = reinterpret_cast<info_t>(lookup("mi_process_info"));
+    if (process_info == nullptr) return;
+    std::size_t elapsed = 0, user = 0, system = 0, rss = 0, peak_rss = 0, commit = 0,
+                peak_commit = 0, faults = 0;
+    process_info(&elapsed, &user, &system, &rss, &peak_rss, &commit, &peak_commit, &faults);
+    stats["committed_bytes"] = commit;
+    stats["peak_committed_bytes"] = peak_commit;
+    stats["rss_bytes"] = rss;
+    stats["peak_rss_bytes"] = peak_rss;
+    stats["page_faults"] = faults;
+}
+
+void system_stats(nb::dict& stats) {
+    using mallinfo2_fn = mallinfo2_t (*)();
+    auto mallinfo2 = reinterpret_cast<mallinfo2_fn>(lookup("mallinfo2"));
+    if (mallinfo2 == nullptr) return;  // not glibc, or glibc < 2.33
+    mallinfo2_t const mi = mallinfo2();
+    stats["allocated_bytes"] = mi.uordblks + mi.hblkhd;
+    stats["free_bytes"] = mi.fordblks;
+    stats["arena_bytes"] = mi.arena;
+    stats["mmapped_bytes"] = mi.hblkhd;
+    stats["releasable_bytes"] = mi.keepcost;
+}
+
+}  // namespace
+
+nb::dict info() {
+    std::string active = "system";
+    if (lookup("tc_malloc") != nullptr) {
+        active = "tcmalloc";
+    } else if (lookup("mallctl") != nullptr || lookup("je_mallctl") != nullptr) {
+        active = "jemalloc";
+    } else if (lookup("mi_malloc") != nullptr) {
+        active = "mimalloc";
+    }
+
+    nb::dict stats;
+    if (active == "tcmalloc") {
+        tcmalloc_stats(stats);
+    } else if (active == "jemalloc") {
+        jemalloc_stats(stats);
+    } else if (active == "mimalloc") {
+        mimalloc_stats(stats);
+    } else {
+        system_stats(stats);
+    }
+
+    nb::dict out;
+    out["hpx_malloc"] = std::string(hpx_malloc());
+    out["active"] = active;
+    out["stats"] = stats;
+    return out;
+}
+
+void register_bindings(nb::module_& m) {
+    m.def("info", &info, "Configured and active allocator with its statistics.");
+}
+
+}  // namespace hpyx::allocator
@@ -0,0 +1,14 @@
+#pragma once
+
+#include <nanobind/nanobind.h>
+
+namespace hpyx::allocator {
+
+// Allocator HPX was built with (HPX_WITH_MALLOC), the allocator actually
+// serving malloc in this process (found by symbol lookup, so LD_PRELOAD
+// is taken into account) and that allocator's own statistics.
+nanobind::dict info();
+
+void register_bindings(nanobind::module_& m);
+
+}  // namespace hpyx::allocator
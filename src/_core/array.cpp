@@ -0,0 +1,395 @@
+#include "array.hpp"
+
+#include <hpx/future.hpp>
+#include <hpx/runtime.hpp>
+#include <nanobind/ndarray.h>
+#include <nanobind/stl/string.h>
+
+#include <algorithm>
+#include <cmath>
+#include <cstddef>
+#include <cstdint>
+#include <exception>
+#include <limits>
+#include <memory>
+#include <stdexcept>
+#include <string>
+#include <tuple>
+#include <utility>
+#include <vector>
+
+#include "futures.hpp"
+#include "tracing.hpp"
+
+namespace nb = nanobind;
+using namespace nb::literals;
+
+namespace hpyx::array {
+
+namespace {
+
+using input_array = nb::ndarray<const double, nb::ndim<1>, nb::c_contig>;
+using output_array = nb::ndarray<double, nb::ndim<1>, nb::c_contig>;
+
+enum class opcode : std::uint8_t {
+    load, constant,
+    neg, abs, sqrt, exp, log, sin, cos, tanh,
+    add, sub, mul, div, pow, maximum, minimum,
+};
+
+enum class reduce_op : std::uint8_t { none, sum, prod, min, max };
+
+struct step {
+    opcode op;
+    std::size_t index;
+    double value;
+};
+
+struct operand_ref {
+    std::size_t instr;
+    std::size_t offset;
+    std::size_t period;
+};
+
+struct instruction {
+    enum class kind_t : std::uint8_t { input, fused, concat } kind;
+    double const* data = nullptr;  // input
+    std::size_t size = 0;          // input
+    std::vector<operand_ref> operands;
+    std::vector<step> steps;
+    std::size_t depth = 0;  // stack slots the steps need
+    std::size_t length = 0;
+    reduce_op reduce = reduce_op::none;
+    std::size_t outer = 1, n = 1, inner = 1;
+    double* out = nullptr;
+    std::size_t out_size = 0;
+};
+
+// A finished instruction's values: either borrowed (inputs, sinks) or
+// owned by the shared vector.
+struct buffer {
+    double const* data = nullptr;
+    std::size_t size = 0;
+    std::shared_ptr<std::vector<double>> owned;
+};
+
+constexpr std::size_t tile = 256;
+
+opcode parse_opcode(std::string const& name) {
+    static std::pair<char const*, opcode> const table[] = {
+        {"load", opcode::load}, {"const", opcode::constant},
+        {"neg", opcode::neg}, {"abs", opcode::abs}, {"sqrt", opcode::sqrt},
+        {"exp", opcode::exp}, {"log", opcode::log}, {"sin", opcode::sin},
+        {"cos", opcode::cos}, {"tanh", opcode::tanh},
+        {"add", opcode::add}, {"sub", opcode::sub}, {"mul", opcode::mul},
+        {"div", opcode::div}, {"pow", opcode::pow},
+        {"maximum", opcode::maximum}, {"minimum", opcode::minimum},
+    };
+    for (auto const& [key, op] : table) {
+        if (name == key) return op;
+    }
+    throw std::invalid_argument("Unknown hpyx.Array op: " + name);
+}
+
+reduce_op parse_reduce(std::string const& name) {
+    if (name.empty()) return reduce_op::none;
+    if (name == "sum") return reduce_op::sum;
+    if (name == "prod") return reduce_op::prod;
+    if (name == "min") return reduce_op::min;
+    if (name == "max") return reduce_op::max;
+    throw std::invalid_argument("Unknown hpyx.Array reduction: " + name);
+}
+
+bool is_unary(opcode op) { return op >= opcode::neg && op <= opcode::tanh; }
+
+double identity(reduce_op op) {
+    switch (op) {
+        case reduce_op::prod: return 1.0;
+        case reduce_op::min: return std::numeric_limits<double>::infinity();
+        case reduce_op::max: return -std::numeric_limits<double>::infinity();
+        default: return 0.0;
+    }
+}
+
+// NumPy semantics: min/max propagate NaN.
+inline double fold(reduce_op op, double acc, double v) {
+    switch (op) {
+        case reduce_op::sum: return acc + v;
+        case reduce_op::prod: return acc * v;
+        case reduce_op::min: return (v < acc || std::isnan(v)) && !std::isnan(acc) ? v : acc;
+        case reduce_op::max: return (v > acc || std::isnan(v)) && !std::isnan(acc) ? v : acc;
+        default: return v;
+    }
+}
+
+inline double maximum(double a, double b) {
+    return std::isnan(a) || std::isnan(b) ? std::numeric_limits<double>::quiet_NaN()
+                                          : (a < b ? b : a);
+}
+
+inline double minimum(double a, double b) {
+    return std::isnan(a) || std::isnan(b) ? std::numeric_limits<double>::quiet_NaN()
+                                          : (b < a ? b : a);
+}
+
+template <typename F>
+void apply_unary(double* a, std::size_t m, F f) {
+    for (std::size_t t = 0; t < m; ++t) a[t] = f(a[t]);
+}
+
+template <typename F>
+void apply_binary(double* a, double const* b, std::size_t m, F f) {
+    for (std::size_t t = 0; t < m; ++t) a[t] = f(a[t], b[t]);
+}
+
+std::size_t result_size(instruction const& ins) {
+    return ins.reduce == reduce_op::none ? ins.length : ins.outer * ins.inner;
+}
+
+buffer make_result(instruction const& ins, std::size_t size) {
+    buffer result;
+    result.size = size;
+    if (ins.out != nullptr) {
+        result.data = ins.out;
+    } else {
+        result.owned = std::make_shared<std::vector<double>>(size);
+        result.data = result.owned->data();
+    }
+    return result;
+}
+
+buffer run_fused(instruction const& ins, std::vector<buffer> const& in) {
+    buffer result = make_result(ins, result_size(ins));
+    double* out = const_cast<double*>(result.data);
+    if (ins.reduce != reduce_op::none) {
+        std::fill(out, out + result.size, identity(ins.reduce));
+    }
+
+    std::vector<double> stack(std::max<std::size_t>(ins.depth, 1) * tile);
+    std::size_t const span = ins.n * ins.inner;
+    for (std::size_t base = 0; base < ins.length; base += tile) {
+        std::size_t const m = std::min(tile, ins.length - base);
+        std::size_t sp = 0;
+        for (auto const& s : ins.steps) {
+            if (s.op == opcode::load) {
+                double* top = &stack[sp++ * tile];
+                auto const& ref = ins.operands[s.index];
+                double const* src = in[s.index].data + ref.offset;
+                if (base + m <= ref.period) {
+                    std::copy(src + base, src + base + m, top);
+                } else {
+                    for (std::size_t t = 0; t < m; ++t) top[t] = src[(base + t) % ref.period];
+                }
+                continue;
+            }
+            if (s.op == opcode::constant) {
+                std::fill_n(&stack[sp++ * tile], m, s.value);
+                continue;
+            }
+            if (is_unary(s.op)) {
+                double* a = &stack[(sp - 1) * tile];
+                switch (s.op) {
+                    case opcode::neg: apply_unary(a, m, [](double x) { return -x; }); break;
+                    case opcode::abs: apply_unary(a, m, [](double x) { return std::fabs(x); }); break;
+                    case opcode::sqrt: apply_unary(a, m, [](double x) { return std::sqrt(x); }); break;
+                    case opcode::exp: apply_unary(a, m, [](double x) { return std::exp(x); }); break;
+                    case opcode::log: apply_unary(a, m, [](double x) { return std::log(x); }); break;
+                    case opcode::sin: apply_unary(a, m, [](double x) { return std::sin(x); }); break;
+                    case opcode::cos: apply_unary(a, m, [](double x) { return std::cos(x); }); break;
+                    default: apply_unary(a, m, [](double x) { return std::tanh(x); }); break;
+                }
+                continue;
+            }
+            double* a = &stack[(sp - 2) * tile];
+            double const* b = &stack[(sp - 1) * tile];
+            switch (s.op) {
+                case opcode::add: apply_binary(a, b, m, [](double x, double y) { return x + y; }); break;
+                case opcode::sub: apply_binary(a, b, m, [](double x, double y) { return x - y; }); break;
+                case opcode::mul: apply_binary(a, b, m, [](double x, double y) { return x * y; }); break;
+                case opcode::div: apply_binary(a, b, m, [](double x, double y) { return x / y; }); break;
+                case opcode::pow: apply_binary(a, b, m, [](double x, double y) { return std::pow(x, y); }); break;
+                case opcode::maximum: apply_binary(a, b, m, maximum); break;
+                default: apply_binary(a, b, m, minimum); break;
+            }
+            --sp;
+        }
+
+        double const* v = stack.data();
+        if (ins.reduce == reduce_op::none) {
+            std::copy(v, v + m, out + base);
+        } else if (result.size == 1) {
+            double acc = out[0];
+            for (std::size_t t = 0; t < m; ++t) acc = fold(ins.reduce, acc, v[t]);
+            out[0] = acc;
+        } else {
+            for (std::size_t t = 0; t < m; ++t) {
+                std::size_t const j = base + t;
+                std::size_t const k = (j / span) * ins.inner + j % ins.inner;
+                out[k] = fold(ins.reduce, out[k], v[t]);
+            }
+        }
+    }
+    return result;
+}
+
+void check_bounds(instruction const& ins, std::vector<buffer> const& in) {
+    for (std::size_t k = 0; k < in.size(); ++k) {
+        auto const& ref = ins.operands[k];
+        std::size_t const used = ins.kind == instruction::kind_t::concat
+            ? ref.period : std::min(ref.period, ins.length);
+        if (ref.offset + used > in[k].size) {
+            throw std::out_of_range("hpyx.Array operand range exceeds its buffer");
+        }
+    }
+}
+
+buffer run_concat(instruction const& ins, std::vector<buffer> const& in) {
+    std::size_t total = 0;
+    for (auto const& ref : ins.operands) total += ref.period;
+    if (ins.out != nullptr && ins.out_size != total) {
+        throw std::invalid_argument("hpyx.Array output buffer has the wrong size");
+    }
+    buffer result = make_result(ins, total);
+    double* out = const_cast<double*>(result.data);
+    for (std::size_t k = 0; k < in.size(); ++k) {
+        double const* src = in[k].data + ins.operands[k].offset;
+        out = std::copy(src, src + ins.operands[k].period, out);
+    }
+    return result;
+}
+
+template <typename Array>
+std::pair<double*, std::size_t> sink(nb::handle obj) {
+    if (obj.is_none()) return {nullptr, 0};
+    // No conversion: a converted temporary would not outlive the call.
+    auto arr = nb::cast<Array>(obj, false);
+    return {arr.data(), arr.size()};
+}
+
+std::vector<instruction> parse(nb::list program) {
+    std::vector<instruction> out;
+    out.reserve(program.size());
+    for (nb::handle item : program) {
+        nb::tuple spec = nb::cast<nb::tuple>(item);
+        std::string const kind = nb::cast<std::string>(spec[0]);
+        instruction ins{};
+        if (kind == "input") {
+            auto data = nb::cast<input_array>(spec[1], false);
+            ins.kind = instruction::kind_t::input;
+            ins.data = data.data();
+            ins.size = data.size();
+            out.push_back(std::move(ins));
+            continue;
+        }
+
+        for (nb::handle ref : nb::cast<nb::list>(spec[1])) {
+            nb::tuple r = nb::cast<nb::tuple>(ref);
+            operand_ref operand{nb::cast<std::size_t>(r[0]), nb::cast<std::size_t>(r[1]),
+                nb::cast<std::size_t>(r[2])};
+            if (operand.instr >= out.size()) {
+                throw std::invalid_argument("hpyx.Array instruction refers forward");
+            }
+            if (operand.period == 0) {
+                throw std::invalid_argument("hpyx.Array operand period must be positive");
+            }
+            ins.operands.push_back(operand);
+        }
+
+        if (kind == "concat") {
+            ins.kind = instruction::kind_t::concat;
+            std::tie(ins.out, ins.out_size) = sink<output_array>(spec[2]);
+        } else if (kind == "fused") {
+            ins.kind = instruction::kind_t::fused;
+            std::size_t sp = 0;
+            for (nb::handle s : nb::cast<nb::list>(spec[2])) {
+                nb::tuple t = nb::cast<nb::tuple>(s);
+                step st{parse_opcode(nb::cast<std::string>(t[0])),
+                    nb::cast<std::size_t>(t[1]), nb::cast<double>(t[2])};
+                if (st.op == opcode::load || st.op == opcode::constant) {
+                    if (st.op == opcode::load && st.index >= ins.operands.size()) {
+                        throw std::invalid_argument("hpyx.Array load of a missing operand");
+                    }
+                    ++sp;
+                } else if (is_unary(st.op)) {
+                    if (sp < 1) throw std::invalid_argument("hpyx.Array program underflows");
+                } else {
+                    if (sp < 2) throw std::invalid_argument("hpyx.Array program underflows");
+                    --sp;
+                }
+                ins.depth = std::max(ins.depth, sp);
+                ins.steps.push_back(st);
+            }
+            if (sp != 1) throw std::invalid_argument("hpyx.Array program must leave one value");
+            ins.length = nb::cast<std::size_t>(spec[3]);
+            ins.reduce = parse_reduce(nb::cast<std::string>(spec[4]));
+            ins.outer = nb::cast<std::size_t>(spec[5]);
+            ins.n = nb::cast<std::size_t>(spec[6]);
+            ins.inner = nb::cast<std::size_t>(spec[7]);
+            if (ins.reduce != reduce_op::none &&
+                (ins.inner == 0 || ins.outer * ins.n * ins.inner != ins.length)) {
+                throw std::invalid_argument("hpyx.Array reduction shape does not match length");
+            }
+            std::tie(ins.out, ins.out_size) = sink<output_array>(spec[8]);
+        } else {
+            throw std::invalid_argument("Unknown hpyx.Array instruction: " + kind);
+        }
+        if (ins.out != nullptr && ins.kind == instruction::kind_t::fused &&
+            ins.out_size != result_size(ins)) {
+            throw std::invalid_argument("hpyx.Array output buffer has the wrong size");
+        }
+        out.push_back(std::move(ins));
+    }
+    return out;
+}
+
+}  // namespace
+
+void execute(nb::list program) {
+    futures::require_stack("an hpyx.array computation");
+    // Parsing borrows pointers into the NumPy buffers referenced by
+    // `program`, which the caller keeps alive for the whole call.
+    std::vector<instruction> const instructions = parse(program);
+
+    static std::uint32_t const phase = tracing::intern_name(std::string("array.chunk"));
+    std::exception_ptr error;
+    {
+        nb::gil_scoped_release release;
+        try {
+            std::vector<hpx::shared_future<buffer>> results;
+            results.reserve(instructions.size());
+            for (auto const& ins : instructions) {
+                if (ins.kind == instruction::kind_t::input) {
+                    results.push_back(hpx::make_ready_future(
+                        buffer{ins.data, ins.size, nullptr}).share());
+                    continue;
+                }
+                std::vector<hpx::shared_future<buffer>> deps;
+                deps.reserve(ins.operands.size());
+                for (auto const& ref : ins.operands) deps.push_back(results[ref.instr]);
+                results.push_back(hpx::dataflow(hpx::launch::async,
+                    [&ins](std::vector<hpx::shared_future<buffer>> ready) {
+                        tracing::task_scope scope(tracing::pending_task::kernel(phase));
+                        std::vector<buffer> in;
+                        in.reserve(ready.size());
+                        for (auto& f : ready) in.push_back(f.get());
+                        check_bounds(ins, in);
+                        if (ins.kind == instruction::kind_t::concat) return run_concat(ins, in);
+                        return run_fused(ins, in);
+                    },
+                    std::move(deps)).share());
+            }
+            hpx::wait_all(results);
+            for (auto& f : results) f.get();  // rethrow the first failure
+        } catch (...) {
+            error = std::current_exception();
+        }
+    }
+    if (error) std::rethrow_exception(error);
+}
+
+void register_bindings(nb::module_& m) {
+    m.def("execute", &execute, "program"_a,
+          "Run a lowered hpyx.Array program as HPX dataflow tasks.");
+}
+
+}  // namespace hpyx::array
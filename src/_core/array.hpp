@@ -0,0 +1,33 @@
+#pragma once
+
+#include <nanobind/nanobind.h>
+
+namespace hpyx::array {
+
+// Run a lowered hpyx.Array program as one graph of HPX dataflow tasks.
+// `program` is a list of instructions; an instruction may only refer to
+// earlier ones. Each is one of:
+//
+//   ("input", data)
+//       A read-only flat float64 buffer.
+//   ("fused", operands, steps, length, reduce, outer, n, inner, out)
+//       Evaluate the postfix `steps` over `length` elements in cache-sized
+//       tiles. `operands` is a list of (instruction, offset, period); a
+//       ("load", k, 0.0) step reads operand k at offset + (j % period).
+//       Other steps are ("const", 0, value) and unary or binary float
+//       ops. With `reduce` ("sum", "prod", "min", "max") element j is
+//       folded into result[(j / (n * inner)) * inner + j % inner], i.e. an
+//       (outer, n, inner) array is reduced over its middle axis;
+//       otherwise `reduce` is "".
+//   ("concat", operands, out)
+//       Join operand ranges end to end; for concat an operand's period is
+//       the number of elements copied from its offset.
+//
+// `out` is None or a writable flat float64 array that receives the
+// result directly; otherwise results live in C++ for later instructions.
+// All work runs on HPX workers with the GIL released.
+void execute(nanobind::list program);
+
+void register_bindings(nanobind::module_& m);
+
+}  // namespace hpyx::array
@@ -15,6 +15,21 @@
 #include "runtime.hpp"
 #include "algorithms.hpp"
 #include "futures.hpp"
+#include "subinterp.hpp"
+#include "distributed.hpp"
+#include "tracing.hpp"
+#include "counters.hpp"
+#include "profile.hpp"
+#include "gil.hpp"
+#include "snapshot.hpp"
+#include "threads.hpp"
+#include "allocator.hpp"
+#include "array.hpp"
+#include "graph.hpp"
+#include "memmap.hpp"
+#include "stream.hpp"
+#include "io.hpp"
+#include "stencil.hpp"
 
 #define STRINGIFY(x) #x
 #define MACRO_STRINGIFY(x) STRINGIFY(x)
@@ -45,7 +60,7 @@ void bind_hpx_future(nb::module_ &m, const char *name) {
             // callback while holding the GIL.
             hpx::future<T> cont = hpx::async(hpx::launch::deferred,
                 [prev = std::move(f), callback, args]() mutable -> nb::object {
-                    nb::gil_scoped_acquire acquire;
+                    hpyx::gil::acquire acquire(hpyx::gil::site::then);
                     auto res = prev.get();
                     return callback(res, *args);
                 });
@@ -65,10 +80,65 @@ NB_MODULE(_core, m)
     // Bind HPX future for nanobind
     bind_hpx_future<nb::object>(m, "future");
 
+    auto m_counters = m.def_submodule("counters");
+    hpyx::counters::register_bindings(m_counters);
+
+    auto m_gil = m.def_submodule("gil");
+    hpyx::gil::register_bindings(m_gil);
+
+    auto m_allocator = m.def_submodule("allocator");
+    hpyx::allocator::register_bindings(m_allocator);
+
+    auto m_threads = m.def_submodule("threads");
+    hpyx::threads::register_bindings(m_threads);
+
+    auto m_snapshot = m.def_submodule("snapshot");
+    hpyx::snapshot::register_bindings(m_snapshot);
+
+    auto m_profile = m.def_submodule("profile");
+    hpyx::profile::register_bindings(m_profile);
+
+    auto m_tracing = m.def_submodule("tracing");
+    hpyx::tracing::register_bindings(m_tracing);
+
+    auto m_distributed = m.def_submodule("distributed");
+    hpyx::distributed::register_bindings(m_distributed);
+
+    auto m_subinterp = m.def_submodule("subinterp");
+    hpyx::subinterp::register_bindings(m_subinterp);
+
+    auto m_array = m.def_submodule("array");
+    hpyx::array::register_bindings(m_array);
+
+    auto m_graph = m.def_submodule("graph");
+    hpyx::graph::register_bindings(m_graph);
+
+    auto m_memmap = m.def_submodule("memmap");
+    hpyx::memmap::register_bindings(m_memmap);
+
+    auto m_stream = m.def_submodule("stream");
+    hpyx::stream::register_bindings(m_stream);
+
+    auto m_io = m.def_submodule("io");
+    hpyx::io::register_bindings(m_io);
+
+    auto m_stencil = m.def_submodule("stencil");
+    hpyx::stencil::register_bindings(m_stencil);
+
     // Binding futures/async functionalities
     m.def("hpx_async", [](nb::callable f, nb::args args) {
         return futures::hpx_async(f, args); // return hpx::future<nb::object>
     }, "f"_a, nb::arg("*args"));
+    m.def("hpx_async_stacksize", [](std::string const& stacksize, nb::callable f, nb::args args) {
+        return futures::hpx_async_stacksize(stacksize, f, args);
+    }, "stacksize"_a, "f"_a, nb::arg("*args"),
+       "Eagerly run f(*args) as an HPX thread with the given stack size");
+    m.def("hpx_async_set_result", &futures::hpx_async_set_result,
+          "fut"_a, "f"_a, "args"_a, "kwargs"_a, "stacksize"_a = "default",
+          "profile"_a.none() = nb::none(),
+          "Run f(*args, **kwargs) as an HPX thread and set the result on a concurrent.futures.Future");
+    m.def("hpx_from_future", &futures::hpx_from_future, "fut"_a,
+          "HPX future for a concurrent.futures.Future; get() waits without blocking an HPX worker");
     m.def("hpx_async_add", &futures::hpx_async_add, "a"_a, "b"_a);
 
     // Binding algorithms functionalities
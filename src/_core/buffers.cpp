@@ -0,0 +1,73 @@
+#include "buffers.hpp"
+
+#include <cstdint>
+#include <cstring>
+#include <string>
+
+namespace nb = nanobind;
+
+namespace hpyx::buffers {
+
+namespace {
+
+bool little_endian() {
+    std::uint16_t const one = 1;
+    unsigned char first = 0;
+    std::memcpy(&first, &one, 1);
+    return first == 1;
+}
+
+// The struct-module item code of `format` if it is in native byte order,
+// or 0.
+char native_code(char const* format) {
+    if (format == nullptr) return 'B';
+    char const order = format[0];
+    if (order == '@' || order == '=' || (order == '<' && little_endian()) ||
+        ((order == '>' || order == '!') && !little_endian())) {
+        ++format;
+    }
+    return format[0] != '\0' && format[1] == '\0' ? format[0] : 0;
+}
+
+}  // namespace
+
+f64_view::f64_view(nb::handle obj, char const* name) {
+    // Typed float64 buffers and DLPack tensors; never converts.
+    if (nb::try_cast(obj, array_, false)) {
+        data_ = array_.data();
+        size_ = array_.size();
+        return;
+    }
+
+    std::string const what = std::string(name) + " must be a float64 or byte buffer, or "
+        "a DLPack tensor on the CPU, got " + nb::type_name(obj.type()).c_str();
+    if (!PyObject_CheckBuffer(obj.ptr())) throw nb::type_error(what.c_str());
+    if (PyObject_GetBuffer(obj.ptr(), &buffer_, PyBUF_C_CONTIGUOUS | PyBUF_FORMAT) != 0) {
+        throw nb::python_error();
+    }
+    auto fail = [this](auto const& error) {
+        // The destructor does not run when the constructor throws.
+        PyBuffer_Release(&buffer_);
+        throw error;
+    };
+    char const code = native_code(buffer_.format);
+    if (code != 'd' && code != 'B' && code != 'b' && code != 'c') {
+        fail(nb::type_error(what.c_str()));
+    }
+    if (buffer_.len % static_cast<Py_ssize_t>(sizeof(double)) != 0) {
+        fail(nb::value_error(
+            (std::string(name) + " has a length that is not a multiple of 8 bytes").c_str()));
+    }
+    if (reinterpret_cast<std::uintptr_t>(buffer_.buf) % alignof(double) != 0) {
+        fail(nb::value_error((std::string(name) + " is not 8-byte aligned").c_str()));
+    }
+    has_buffer_ = true;
+    data_ = static_cast<double const*>(buffer_.buf);
+    size_ = static_cast<std::size_t>(buffer_.len) / sizeof(double);
+}
+
+f64_view::~f64_view() {
+    if (has_buffer_) PyBuffer_Release(&buffer_);
+}
+
+}  // namespace hpyx::buffers
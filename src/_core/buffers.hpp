@@ -0,0 +1,39 @@
+#pragma once
+
+#include <nanobind/nanobind.h>
+#include <nanobind/ndarray.h>
+
+#include <cstddef>
+
+namespace hpyx::buffers {
+
+// A read-only, C-contiguous float64 view of a Python object, taken
+// without copying. Accepts CPU DLPack tensors and capsules, and
+// buffer-protocol exporters (NumPy arrays, memoryview, bytes, bytearray,
+// mmap, Arrow buffers, ...) whose items are float64 or untyped bytes. A
+// byte buffer is read as native-endian float64 and must be 8-byte aligned
+// with a length divisible by 8. Raises TypeError or ValueError for
+// anything else, instead of converting it.
+//
+// Construct and destroy with the GIL held; data() may be read from any
+// thread in between.
+class f64_view {
+public:
+    f64_view(nanobind::handle obj, char const* name);
+    ~f64_view();
+
+    f64_view(f64_view const&) = delete;
+    f64_view& operator=(f64_view const&) = delete;
+
+    double const* data() const { return data_; }
+    std::size_t size() const { return size_; }
+
+private:
+    nanobind::ndarray<const double, nanobind::c_contig, nanobind::device::cpu> array_;
+    Py_buffer buffer_{};
+    bool has_buffer_ = false;
+    double const* data_ = nullptr;
+    std::size_t size_ = 0;
+};
+
+}  // namespace hpyx::buffers
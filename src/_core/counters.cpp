@@ -0,0 +1,100 @@
+#include "counters.hpp"
+
+#include <hpx/future.hpp>
+#include <hpx/include/performance_counters.hpp>
+#include <nanobind/stl/string.h>
+#include <nanobind/stl/vector.h>
+
+#include <algorithm>
+#include <mutex>
+#include <stdexcept>
+#include <utility>
+
+namespace nb = nanobind;
+using namespace nb::literals;
+
+namespace hpyx::counters {
+
+struct counter_set_impl {
+    std::mutex mtx;
+    std::unique_ptr<hpx::performance_counters::performance_counter_set> set;
+    std::vector<std::string> names;
+};
+
+namespace {
+
+// Every live set, so release_all() can drop counter ids before shutdown.
+std::mutex g_registry_mtx;
+std::vector<std::weak_ptr<counter_set_impl>> g_registry;
+
+// Counter creation and queries wait on HPX futures; run them on an HPX
+// thread and block this (non-HPX) thread without the GIL.
+template <typename F>
+auto run_on_hpx(F&& f) {
+    nb::gil_scoped_release release;
+    return hpx::async(std::forward<F>(f)).get();
+}
+
+}  // namespace
+
+counter_set::counter_set(std::vector<std::string> const& patterns)
+    : impl_(std::make_shared<counter_set_impl>()) {
+    run_on_hpx([this, &patterns]() {
+        impl_->set = std::make_unique<hpx::performance_counters::performance_counter_set>(
+            patterns);
+        impl_->names = impl_->set->get_names();
+    });
+    if (impl_->names.empty()) {
+        throw std::invalid_argument("No HPX performance counters match the given patterns");
+    }
+    std::lock_guard<std::mutex> lk(g_registry_mtx);
+    g_registry.erase(
+        std::remove_if(g_registry.begin(), g_registry.end(),
+            [](auto const& weak) { return weak.expired(); }),
+        g_registry.end());
+    g_registry.push_back(impl_);
+}
+
+std::vector<std::string> counter_set::names() const {
+    return impl_->names;
+}
+
+std::vector<double> counter_set::values(bool reset) const {
+    auto impl = impl_;
+    return run_on_hpx([impl, reset]() {
+        std::lock_guard<std::mutex> lk(impl->mtx);
+        if (!impl->set) {
+            throw std::runtime_error("HPX performance counters were released at shutdown");
+        }
+        return impl->set->get_values<double>(hpx::launch::sync, reset);
+    });
+}
+
+void release_all() {
+    std::vector<std::shared_ptr<counter_set_impl>> live;
+    {
+        std::lock_guard<std::mutex> lk(g_registry_mtx);
+        for (auto const& weak : g_registry) {
+            if (auto impl = weak.lock()) live.push_back(std::move(impl));
+        }
+        g_registry.clear();
+    }
+    if (live.empty()) return;
+    run_on_hpx([&live]() {
+        for (auto& impl : live) {
+            std::lock_guard<std::mutex> lk(impl->mtx);
+            impl->set.reset();
+        }
+    });
+}
+
+void register_bindings(nb::module_& m) {
+    nb::class_<counter_set>(m, "CounterSet")
+        .def(nb::init<std::vector<std::string> const&>(), "patterns"_a)
+        .def("names", &counter_set::names)
+        .def("values", &counter_set::values, "reset"_a = false);
+    m.def("release_all", &release_all,
+          "Release every counter handle. Called by the runtime before shutdown.");
+}
+
+}  // namespace hpyx::counters
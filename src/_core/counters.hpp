@@ -0,0 +1,36 @@
+#pragma once
+
+#include <nanobind/nanobind.h>
+
+#include <memory>
+#include <string>
+#include <vector>
+
+namespace hpyx::counters {
+
+struct counter_set_impl;
+
+// A resolved set of HPX performance counters. Patterns may contain
+// wildcards ("/threads{locality#0/worker-thread#*}/idle-rate"); they are
+// expanded once, at construction.
+class counter_set {
+public:
+    explicit counter_set(std::vector<std::string> const& patterns);
+
+    // Fully expanded counter names, in the order values() returns them.
+    std::vector<std::string> names() const;
+
+    // Current value of every counter; optionally reset them afterwards.
+    std::vector<double> values(bool reset) const;
+
+private:
+    std::shared_ptr<counter_set_impl> impl_;
+};
+
+// Drop every counter handle. Must run before the runtime stops; any
+// counter_set used afterwards raises.
+void release_all();
+
+void register_bindings(nanobind::module_& m);
+
+}  // namespace hpyx::counters
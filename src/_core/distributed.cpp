@@ -0,0 +1,145 @@
+#include "distributed.hpp"
+#include "futures.hpp"
+#include "gil.hpp"
+
+#include <Python.h>
+
+#include <hpx/config.hpp>
+#include <hpx/include/actions.hpp>
+#include <hpx/include/runtime.hpp>
+#include <hpx/future.hpp>
+#include <hpx/serialization/serialize_buffer.hpp>
+#include <nanobind/ndarray.h>
+#include <nanobind/stl/vector.h>
+
+#include <cstddef>
+#include <cstdint>
+#include <memory>
+#include <utility>
+#include <vector>
+
+namespace nb = nanobind;
+using namespace nb::literals;
+
+namespace hpyx::distributed {
+
+using buffer_type = hpx::serialization::serialize_buffer<char>;
+
+namespace {
+
+// Wrap a Python buffer-protocol object without copying. The Py_buffer is
+// released (under the GIL) once HPX has finished serializing the parcel.
+buffer_type borrow_buffer(nb::handle obj) {
+    auto view = std::make_unique<Py_buffer>();
+    if (PyObject_GetBuffer(obj.ptr(), view.get(), PyBUF_C_CONTIGUOUS) != 0) {
+        throw nb::python_error();
+    }
+    Py_buffer* raw = view.release();
+    return buffer_type(static_cast<char*>(raw->buf), static_cast<std::size_t>(raw->len),
+        [raw](char*) {
+            hpyx::gil::acquire acquire(hpyx::gil::site::buffer_release);
+            PyBuffer_Release(raw);
+            delete raw;
+        });
+}
+
+// Hand a received buffer to Python as a uint8 array that owns it.
+nb::object adopt_buffer(buffer_type buffer) {
+    auto* owned = new buffer_type(std::move(buffer));
+    nb::capsule owner(owned, [](void* p) noexcept {
+        delete static_cast<buffer_type*>(p);
+    });
+    std::size_t const shape[1] = {owned->size()};
+    return nb::cast(nb::ndarray<nb::numpy, std::uint8_t, nb::ndim<1>>(
+        reinterpret_cast<std::uint8_t*>(owned->data()), 1, shape, owner));
+}
+
+}  // namespace
+
+// Runs on the target locality's HPX worker.
+std::vector<buffer_type> remote_execute(
+    buffer_type payload, std::vector<buffer_type> buffers) {
+    hpyx::gil::acquire acquire(hpyx::gil::site::remote);
+    nb::list views;
+    for (auto& buffer : buffers) views.append(adopt_buffer(std::move(buffer)));
+    nb::object execute =
+        nb::module_::import_("hpyx.distributed._remote").attr("execute");
+    nb::tuple result = nb::cast<nb::tuple>(
+        execute(nb::bytes(payload.data(), payload.size()), views));
+
+    std::vector<buffer_type> out;
+    out.push_back(borrow_buffer(result[0]));
+    for (nb::handle buffer : nb::cast<nb::list>(result[1])) {
+        out.push_back(borrow_buffer(buffer));
+    }
+    return out;
+}
+
+}  // namespace hpyx::distributed
+
+HPX_PLAIN_ACTION(hpyx::distributed::remote_execute, hpyx_remote_execute_action)
+
+namespace hpyx::distributed {
+
+std::vector<std::uint32_t> find_all_localities() {
+    std::vector<std::uint32_t> ids;
+    for (auto const& id : hpx::find_all_localities()) {
+        ids.push_back(hpx::naming::get_locality_id_from_id(id));
+    }
+    return ids;
+}
+
+std::uint32_t get_locality_id() {
+    return hpx::get_locality_id();
+}
+
+bool networking_enabled() {
+#if defined(HPX_HAVE_NETWORKING)
+    return true;
+#else
+    return false;
+#endif
+}
+
+hpx::future<nb::object> remote_call(
+    std::uint32_t locality, nb::bytes payload, nb::list buffers) {
+    buffer_type in_band = borrow_buffer(payload);
+    std::vector<buffer_type> out_of_band;
+    for (nb::handle buffer : buffers) out_of_band.push_back(borrow_buffer(buffer));
+    hpx::id_type const target = hpx::naming::get_id_from_locality_id(locality);
+
+    hpx::future<std::vector<buffer_type>> raw;
+    {
+        // A call to the local locality may run inline and need the GIL.
+        nb::gil_scoped_release release;
+        raw = hpx::async(hpyx_remote_execute_action{}, target,
+            std::move(in_band), std::move(out_of_band));
+    }
+
+    // Deferred hand-back: runs in future.get() on the caller's thread.
+    return hpx::async(hpx::launch::deferred,
+        [raw = std::move(raw)]() mutable -> nb::object {
+            futures::require_stack("future.get()");
+            std::vector<buffer_type> received;
+            {
+                nb::gil_scoped_release release;
+                received = raw.get();
+            }
+            nb::bytes result_payload(received[0].data(), received[0].size());
+            nb::list result_buffers;
+            for (std::size_t i = 1; i < received.size(); ++i) {
+                result_buffers.append(adopt_buffer(std::move(received[i])));
+            }
+            return nb::make_tuple(result_payload, result_buffers);
+        });
+}
+
+void register_bindings(nb::module_& m) {
+    m.def("find_all_localities", &find_all_localities);
+    m.def("get_locality_id", &get_locality_id);
+    m.def("networking_enabled", &networking_enabled);
+    m.def("remote_call", &remote_call, "locality"_a, "payload"_a, "buffers"_a,
+          "Run a pickled task on another locality.");
+}
+
+}  // namespace hpyx::distributed
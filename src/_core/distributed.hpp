@@ -0,0 +1,29 @@
+#pragma once
+
+#include <nanobind/nanobind.h>
+#include <hpx/future.hpp>
+
+#include <cstdint>
+#include <vector>
+
+namespace hpyx::distributed {
+
+// Locality ids of every locality in the job (just {0} when running alone).
+std::vector<std::uint32_t> find_all_localities();
+
+std::uint32_t get_locality_id();
+
+// True if HPX was built with networking (parcelports) support.
+bool networking_enabled();
+
+// Run `hpyx.distributed._remote.execute(payload, buffers)` on `locality`.
+// `payload` is an in-band pickle and `buffers` its protocol-5 out-of-band
+// buffers; both are serialized straight from their Python memory. The
+// future yields `(payload, buffers)` of the pickled result, where each
+// buffer is a NumPy uint8 array owning the received parcel memory.
+hpx::future<nanobind::object> remote_call(
+    std::uint32_t locality, nanobind::bytes payload, nanobind::list buffers);
+
+void register_bindings(nanobind::module_& m);
+
+}  // namespace hpyx::distributed
@@ -1,24 +1,171 @@
 #include <nanobind/nanobind.h>
 #include <hpx/numeric.hpp>
 #include <hpx/future.hpp>
+#include <hpx/execution.hpp>
+#include <exception>
 #include <iostream>
+#include <memory>
 #include <stdexcept>
+#include <string>
+#include <utility>
+
+#include "gil.hpp"
+#include "profile.hpp"
+#include "snapshot.hpp"
+#include "tracing.hpp"
 
 namespace futures {
 
     namespace nb = nanobind;
 
     hpx::future<nb::object> hpx_async(nb::callable f, nb::args args) {
+        auto traced = hpyx::tracing::pending_task::capture(f);
         auto result = hpx::async(
             hpx::launch::deferred,
-            [f, args]() -> nb::object {
-                std::cout << "Calling hpx::async with function" << std::endl;
-                nb::gil_scoped_acquire acquire;
+            [f, args, traced]() -> nb::object {
+                hpyx::tracing::task_scope scope(traced);
+                // Deferred: runs inside future.get() on the caller's thread,
+                // which already holds the GIL, so this acquire is re-entrant
+                // and cheap. It is still required on free-threaded builds to
+                // guarantee an attached thread state.
+                hpyx::gil::acquire acquire(hpyx::gil::site::task);
+                scope.gil_acquired();
                 return f(*args);
             });
         return result;
     }
 
+    hpx::threads::thread_stacksize parse_stacksize(std::string const& stacksize) {
+        using hpx::threads::thread_stacksize;
+        if (stacksize == "nostack") return thread_stacksize::nostack;
+        if (stacksize == "small") return thread_stacksize::small_;
+        if (stacksize == "medium") return thread_stacksize::medium;
+        if (stacksize == "large") return thread_stacksize::large;
+        if (stacksize == "default") return thread_stacksize::default_;
+        throw std::invalid_argument("Invalid stacksize: " + stacksize +
+            " (expected 'nostack', 'small', 'medium' or 'large')");
+    }
+
+    void require_stack(char const* what) {
+        hpx::threads::thread_data const* self = hpx::threads::get_self_id_data();
+        if (self != nullptr && self->is_stackless()) {
+            throw std::runtime_error(std::string(what) +
+                " cannot wait for HPX tasks from a task submitted with "
+                "stacksize='nostack'; submit the waiting task with a stack, "
+                "e.g. stacksize='small'");
+        }
+    }
+
+    namespace {
+
+        hpx::execution::parallel_executor stacksize_executor(std::string const& stacksize) {
+            return hpx::execution::parallel_executor(
+                hpx::threads::thread_priority::default_, parse_stacksize(stacksize));
+        }
+
+    }
+
+    hpx::future<nb::object> hpx_async_stacksize(
+        std::string const& stacksize, nb::callable f, nb::args args) {
+        auto exec = stacksize_executor(stacksize);
+        // Python references are moved into locals under the GIL so the
+        // (GIL-less) destruction of the task object never touches them.
+        auto traced = hpyx::tracing::pending_task::capture(f);
+        hpyx::snapshot::ticket const ticket = hpyx::snapshot::track_submit();
+        hpx::future<nb::object> raw = hpx::async(exec,
+            [f = std::move(f), args = std::move(args), traced, ticket]() mutable -> nb::object {
+                hpyx::snapshot::mark_started(ticket);
+                hpyx::tracing::task_scope scope(traced);
+                hpyx::gil::acquire acquire(hpyx::gil::site::task);
+                scope.gil_acquired();
+                nb::callable fn = std::move(f);
+                nb::args fn_args = std::move(args);
+                return fn(*fn_args);
+            });
+
+        // Deferred hand-back: get() waits with the GIL released so the
+        // worker can take it, then rethrows any error with the GIL held.
+        return hpx::async(hpx::launch::deferred,
+            [raw = std::move(raw)]() mutable -> nb::object {
+                require_stack("future.get()");
+                nb::object out;
+                std::exception_ptr error;
+                {
+                    nb::gil_scoped_release release;
+                    try {
+                        out = raw.get();
+                    } catch (...) {
+                        error = std::current_exception();
+                    }
+                }
+                if (error) std::rethrow_exception(error);
+                return out;
+            });
+    }
+
+    void hpx_async_set_result(nb::object fut, nb::callable f, nb::tuple args,
+        nb::dict kwargs, std::string const& stacksize,
+        hpyx::profile::profile_stats* profile) {
+        auto exec = stacksize_executor(stacksize);
+        auto traced = hpyx::tracing::pending_task::capture(f);
+        std::shared_ptr<hpyx::profile::function_stats> stats;
+        std::int64_t submit_ns = 0;
+        if (profile != nullptr) {
+            stats = profile->slot(f);
+            submit_ns = hpyx::tracing::now_ns();
+        }
+        hpyx::snapshot::ticket const ticket = hpyx::snapshot::track_submit();
+        hpx::post(exec,
+            [fut = std::move(fut), f = std::move(f), args = std::move(args),
+                kwargs = std::move(kwargs), traced, stats = std::move(stats),
+                submit_ns, ticket]() mutable {
+                hpyx::snapshot::mark_started(ticket);
+                hpyx::tracing::task_scope scope(traced);
+                std::int64_t const start_ns = stats ? hpyx::tracing::now_ns() : 0;
+                hpyx::gil::acquire acquire(hpyx::gil::site::task);
+                scope.gil_acquired();
+                std::int64_t const acquired_ns = stats ? hpyx::tracing::now_ns() : 0;
+                nb::object target = std::move(fut);
+                nb::callable fn = std::move(f);
+                nb::tuple fn_args = std::move(args);
+                nb::dict fn_kwargs = std::move(kwargs);
+                nb::object value;
+                try {
+                    value = fn(*fn_args, **fn_kwargs);
+                } catch (nb::python_error& e) {
+                    if (stats) {
+                        stats->record(start_ns - submit_ns, acquired_ns - start_ns,
+                            hpyx::tracing::now_ns() - acquired_ns, true);
+                    }
+                    target.attr("set_exception")(e.value());
+                    return;
+                }
+                if (stats) {
+                    stats->record(start_ns - submit_ns, acquired_ns - start_ns,
+                        hpyx::tracing::now_ns() - acquired_ns, false);
+                }
+                target.attr("set_result")(value);
+            });
+    }
+
+    hpx::future<nb::object> hpx_from_future(nb::object fut) {
+        auto done = std::make_shared<hpx::promise<void>>();
+        hpx::future<void> ready = done->get_future();
+        // Runs in whichever thread completes `fut`, or here if it is done.
+        fut.attr("add_done_callback")(
+            nb::cpp_function([done](nb::handle) { done->set_value(); }));
+
+        return hpx::async(hpx::launch::deferred,
+            [fut = std::move(fut), ready = std::move(ready)]() mutable -> nb::object {
+                require_stack("future.get()");
+                {
+                    nb::gil_scoped_release release;
+                    ready.get();
+                }
+                return fut.attr("result")();
+            });
+    }
+
     float hpx_async_add(float a, float b) {
         auto add = [](float number, float value_to_add)
         {
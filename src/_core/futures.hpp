@@ -4,8 +4,12 @@
 #include <nanobind/nanobind.h>
 #include <hpx/numeric.hpp>
 #include <hpx/future.hpp>
+#include <hpx/modules/threading_base.hpp>
 #include <iostream>
 #include <stdexcept>
+#include <string>
+
+#include "profile.hpp"
 
 namespace futures {
 
@@ -14,6 +18,32 @@ namespace futures {
     // Function to create async futures with specified launch policy
     hpx::future<nb::object> hpx_async(nb::callable f, nb::args args);
 
+    // Map "nostack" | "small" | "medium" | "large" | "default" to HPX.
+    hpx::threads::thread_stacksize parse_stacksize(std::string const& stacksize);
+
+    // Throw std::runtime_error naming `what` if the calling HPX thread is
+    // stackless. Waiting for an HPX future suspends the waiting thread, and
+    // a "nostack" thread has no stack of its own to suspend.
+    void require_stack(char const* what);
+
+    // Eagerly run f(*args) as an HPX thread with the given stack size.
+    hpx::future<nb::object> hpx_async_stacksize(
+        std::string const& stacksize, nb::callable f, nb::args args);
+
+    // Run f(*args, **kwargs) as an HPX thread and deliver the outcome to
+    // the concurrent.futures.Future `fut` (set_result / set_exception).
+    // With a non-null `profile`, queue wait, GIL wait and run time are
+    // recorded under the callable's qualname.
+    void hpx_async_set_result(nb::object fut, nb::callable f, nb::tuple args,
+        nb::dict kwargs, std::string const& stacksize,
+        hpyx::profile::profile_stats* profile);
+
+    // Deferred future for the result of the concurrent.futures.Future
+    // `fut`. get() suspends the calling HPX thread until `fut` is done
+    // instead of blocking its worker, so the task that completes `fut`
+    // can still run on that worker.
+    hpx::future<nb::object> hpx_from_future(nb::object fut);
+
     // Function to demonstrate async addition
     float hpx_async_add(float a, float b);
 
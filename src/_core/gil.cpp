@@ -0,0 +1,106 @@
+#include "gil.hpp"
+
+#include <hpx/runtime.hpp>
+
+#include <array>
+#include <atomic>
+#include <cstddef>
+#include <cstdint>
+#include <iterator>
+#include <string>
+
+namespace nb = nanobind;
+using namespace nb::literals;
+
+namespace hpyx::gil {
+
+namespace {
+
+// One cache line per HPX worker so counting never contends. Workers past
+// `max_workers` and non-HPX threads share the last slot.
+struct alignas(64) counters {
+    std::atomic<std::uint64_t> acquisitions{0};
+    std::atomic<std::uint64_t> wait_ns{0};
+    std::atomic<std::uint64_t> max_wait_ns{0};
+
+    void add(std::uint64_t wait) {
+        acquisitions.fetch_add(1, std::memory_order_relaxed);
+        wait_ns.fetch_add(wait, std::memory_order_relaxed);
+        std::uint64_t seen = max_wait_ns.load(std::memory_order_relaxed);
+        while (wait > seen &&
+               !max_wait_ns.compare_exchange_weak(seen, wait, std::memory_order_relaxed)) {
+        }
+    }
+
+    nb::tuple snapshot(bool reset) {
+        if (reset) {
+            return nb::make_tuple(acquisitions.exchange(0, std::memory_order_relaxed),
+                wait_ns.exchange(0, std::memory_order_relaxed),
+                max_wait_ns.exchange(0, std::memory_order_relaxed));
+        }
+        return nb::make_tuple(acquisitions.load(std::memory_order_relaxed),
+            wait_ns.load(std::memory_order_relaxed),
+            max_wait_ns.load(std::memory_order_relaxed));
+    }
+};
+
+constexpr std::size_t max_workers = 1024;
+std::array<counters, max_workers + 1> g_counters;
+
+std::atomic<bool> g_trace_events{false};
+
+char const* const site_names[] = {
+    "gil.task", "gil.then", "gil.for_loop", "gil.remote", "gil.buffer_release", "gil.stream",
+};
+
+std::uint32_t site_name_id(site where) {
+    static std::array<std::uint32_t, std::size(site_names)> const ids = [] {
+        std::array<std::uint32_t, std::size(site_names)> out{};
+        for (std::size_t i = 0; i < out.size(); ++i) {
+            out[i] = tracing::intern_name(std::string(site_names[i]));
+        }
+        return out;
+    }();
+    return ids[static_cast<std::size_t>(where)];
+}
+
+}  // namespace
+
+void record(site where, std::int64_t start_ns, std::int64_t acquired_ns) {
+    std::size_t const worker = hpx::get_worker_thread_num();
+    std::size_t const k = worker < max_workers ? worker : max_workers;
+    std::int64_t const wait = acquired_ns - start_ns;
+    g_counters[k].add(wait > 0 ? static_cast<std::uint64_t>(wait) : 0);
+
+    if (g_trace_events.load(std::memory_order_relaxed) && tracing::is_enabled()) {
+        tracing::record(tracing::trace_event{
+            start_ns,
+            start_ns,
+            acquired_ns,
+            wait,
+            worker == std::size_t(-1) ? -1 : static_cast<std::int32_t>(worker),
+            site_name_id(where),
+            tracing::event_kind::gil,
+        });
+    }
+}
+
+// ([(acquisitions, wait_ns, max_wait_ns) per worker], external totals)
+nb::tuple stats(bool reset) {
+    std::size_t const num_workers = hpx::get_num_worker_threads();
+    nb::list workers;
+    for (std::size_t k = 0; k < num_workers && k < max_workers; ++k) {
+        workers.append(g_counters[k].snapshot(reset));
+    }
+    return nb::make_tuple(workers, g_counters[max_workers].snapshot(reset));
+}
+
+void register_bindings(nb::module_& m) {
+    m.def("stats", &stats, "reset"_a = false,
+          "Per-worker and off-worker GIL acquisition counts and wait times.");
+    m.def("set_trace_events", [](bool enabled) { g_trace_events.store(enabled); },
+          "enabled"_a, "Emit a 'gil' trace event for every acquisition while tracing.");
+    m.def("trace_events_enabled", [] { return g_trace_events.load(); });
+}
+
+}  // namespace hpyx::gil
@@ -0,0 +1,47 @@
+#pragma once
+
+#include <nanobind/nanobind.h>
+
+#include <cstdint>
+
+#include "tracing.hpp"
+
+namespace hpyx::gil {
+
+// Where a worker-side GIL acquisition happens; names the optional trace
+// event ("gil.task", "gil.then", ...).
+enum class site : std::uint8_t {
+    task,            // a Python task body (submit / HPXExecutor)
+    then,            // a future.then continuation
+    for_loop,        // one chunk of the parallel for_loop
+    remote,          // a remote call arriving from another locality
+    buffer_release,  // releasing a Py_buffer once C++ is done with it
+    stream,          // an hpyx.stream pipeline stage or source
+};
+
+// Count one acquisition that waited from `start_ns` to `acquired_ns` on
+// the calling thread, and emit a trace event if enabled.
+void record(site where, std::int64_t start_ns, std::int64_t acquired_ns);
+
+// Drop-in for nb::gil_scoped_acquire that also accounts for the wait:
+// two clock reads and a few relaxed atomic adds on the calling worker's
+// own counters.
+class acquire {
+public:
+    explicit acquire(site where)
+        : where_(where), start_ns_(tracing::now_ns()) {
+        record(where_, start_ns_, tracing::now_ns());
+    }
+
+    acquire(acquire const&) = delete;
+    acquire& operator=(acquire const&) = delete;
+
+private:
+    site where_;
+    std::int64_t start_ns_;
+    nanobind::gil_scoped_acquire gil_;  // constructed after start_ns_
+};
+
+void register_bindings(nanobind::module_& m);
+
+}  // namespace hpyx::gil
@@ -0,0 +1,145 @@
+#include "graph.hpp"
+
+#include <hpx/execution.hpp>
+#include <hpx/future.hpp>
+#include <nanobind/stl/string.h>
+
+#include <atomic>
+#include <cstddef>
+#include <cstdint>
+#include <exception>
+#include <memory>
+#include <stdexcept>
+#include <utility>
+#include <vector>
+
+#include "futures.hpp"
+#include "gil.hpp"
+#include "tracing.hpp"
+
+namespace nb = nanobind;
+using namespace nb::literals;
+
+namespace hpyx::graph {
+
+namespace {
+
+// Everything the tasks touch lives here, owned by execute(); the tasks
+// capture only a pointer and an index, so nothing Python-side is ever
+// destroyed without the GIL.
+struct graph_state {
+    std::vector<nb::callable> fns;
+    std::vector<std::vector<std::size_t>> deps;
+    std::vector<nb::object> values;
+    std::vector<std::uint32_t> name_ids;  // empty when tracing was off
+    // Consumers still to run per node; outputs hold one extra count.
+    std::unique_ptr<std::atomic<std::size_t>[]> pending;
+};
+
+void run_node(graph_state& state, std::size_t k) {
+    tracing::pending_task traced;
+    if (!state.name_ids.empty() && tracing::is_enabled()) {
+        traced = {tracing::now_ns(), state.name_ids[k], tracing::event_kind::task};
+    }
+    tracing::task_scope scope(traced);
+    hpyx::gil::acquire acquire(hpyx::gil::site::task);
+    scope.gil_acquired();
+
+    auto const& deps = state.deps[k];
+    nb::list args;
+    for (std::size_t d : deps) args.append(state.values[d]);
+    state.values[k] = state.fns[k](*args);
+
+    for (std::size_t d : deps) {
+        if (state.pending[d].fetch_sub(1, std::memory_order_acq_rel) == 1) {
+            state.values[d].reset();
+        }
+    }
+}
+
+}  // namespace
+
+nb::list execute(nb::list nodes, nb::list outputs, std::string const& stacksize) {
+    futures::require_stack("a task graph");
+    graph_state state;
+    std::size_t const n = nb::len(nodes);
+    state.fns.reserve(n);
+    state.deps.reserve(n);
+    state.values.resize(n);
+    state.pending.reset(new std::atomic<std::size_t>[n]);
+    for (std::size_t k = 0; k < n; ++k) state.pending[k].store(0);
+
+    for (std::size_t k = 0; k < n; ++k) {
+        nb::tuple node = nb::cast<nb::tuple>(nodes[k]);
+        state.fns.push_back(nb::cast<nb::callable>(node[0]));
+        std::vector<std::size_t> deps;
+        for (nb::handle dep : nb::cast<nb::list>(node[1])) {
+            std::size_t const d = nb::cast<std::size_t>(dep);
+            if (d >= k) {
+                throw std::invalid_argument(
+                    "task graph nodes must only depend on earlier nodes");
+            }
+            state.pending[d].fetch_add(1);
+            deps.push_back(d);
+        }
+        state.deps.push_back(std::move(deps));
+    }
+    std::vector<std::size_t> outs;
+    for (nb::handle out : outputs) {
+        std::size_t const k = nb::cast<std::size_t>(out);
+        if (k >= n) throw std::invalid_argument("task graph output index out of range");
+        state.pending[k].fetch_add(1);
+        outs.push_back(k);
+    }
+    if (tracing::is_enabled()) {
+        state.name_ids.reserve(n);
+        for (auto const& fn : state.fns) state.name_ids.push_back(tracing::intern_name(fn));
+    }
+
+    hpx::execution::parallel_executor exec(
+        hpx::threads::thread_priority::default_, futures::parse_stacksize(stacksize));
+
+    std::exception_ptr error;
+    {
+        nb::gil_scoped_release release;
+        std::vector<hpx::shared_future<void>> done;
+        done.reserve(n);
+        try {
+            for (std::size_t k = 0; k < n; ++k) {
+                std::vector<hpx::shared_future<void>> ready;
+                ready.reserve(state.deps[k].size());
+                for (std::size_t d : state.deps[k]) ready.push_back(done[d]);
+                done.push_back(hpx::dataflow(exec,
+                    [&state, k](std::vector<hpx::shared_future<void>> inputs) {
+                        for (auto& f : inputs) f.get();  // forward a dependency's error
+                        run_node(state, k);
+                    },
+                    std::move(ready)).share());
+            }
+        } catch (...) {
+            error = std::current_exception();
+        }
+        // Every task refers to `state`, so all of them settle before it
+        // goes out of scope, even when an output has already failed.
+        hpx::wait_all(done);
+        if (!error) {
+            try {
+                for (std::size_t k : outs) done[k].get();
+            } catch (...) {
+                error = std::current_exception();
+            }
+        }
+    }
+    if (error) std::rethrow_exception(error);
+
+    nb::list results;
+    for (std::size_t k : outs) results.append(state.values[k]);
+    return results;
+}
+
+void register_bindings(nb::module_& m) {
+    m.def("execute", &execute, "nodes"_a, "outputs"_a, "stacksize"_a = "default",
+          "Run [(fn, deps)] nodes as HPX dataflow and return the outputs' results.");
+}
+
+}  // namespace hpyx::graph
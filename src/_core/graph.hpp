@@ -0,0 +1,20 @@
+#pragma once
+
+#include <nanobind/nanobind.h>
+
+#include <string>
+
+namespace hpyx::graph {
+
+// Run a task graph as HPX dataflow. `nodes` is a list of (fn, deps)
+// pairs in topological order: `deps` lists indices of earlier nodes, and
+// node k runs fn(*[result of d for d in deps]) on an HPX worker as soon
+// as those results exist. Intermediate results are dropped once their
+// last consumer has run. Returns the results of `outputs`; the first
+// failing output's exception is raised after every task has settled.
+nanobind::list execute(nanobind::list nodes, nanobind::list outputs,
+    std::string const& stacksize);
+
+void register_bindings(nanobind::module_& m);
+
+}  // namespace hpyx::graph
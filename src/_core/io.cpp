@@ -0,0 +1,230 @@
+#include "io.hpp"
+
+#include <hpx/future.hpp>
+#include <hpx/runtime_local/service_executors.hpp>
+#include <nanobind/ndarray.h>
+#include <nanobind/stl/filesystem.h>
+#include <nanobind/stl/pair.h>
+#include <nanobind/stl/string.h>
+#include <nanobind/stl/vector.h>
+
+#include <algorithm>
+#include <cerrno>
+#include <cstddef>
+#include <cstdint>
+#include <exception>
+#include <memory>
+#include <stdexcept>
+#include <string>
+#include <system_error>
+#include <utility>
+#include <vector>
+
+#if defined(_WIN32)
+#define WIN32_LEAN_AND_MEAN
+#include <windows.h>
+#else
+#include <fcntl.h>
+#include <unistd.h>
+#endif
+
+#include "futures.hpp"
+#include "tracing.hpp"
+
+namespace nb = nanobind;
+using namespace nb::literals;
+
+namespace hpyx::io {
+
+namespace {
+
+// Upper bound of one system call; Linux transfers at most 0x7ffff000 bytes.
+constexpr std::size_t max_io = std::size_t(1) << 30;
+
+// The file ended before a range was filled.
+struct unexpected_eof : std::runtime_error {
+    explicit unexpected_eof(std::uint64_t offset)
+        : std::runtime_error("file ended at byte " + std::to_string(offset) +
+              " before the requested range was read") {}
+};
+
+class file {
+public:
+    explicit file(std::filesystem::path const& path) {
+#if defined(_WIN32)
+        handle_ = ::CreateFileW(path.c_str(), GENERIC_READ,
+            FILE_SHARE_READ | FILE_SHARE_WRITE, nullptr, OPEN_EXISTING,
+            FILE_ATTRIBUTE_NORMAL, nullptr);
+        if (handle_ == INVALID_HANDLE_VALUE) {
+            throw std::system_error(static_cast<int>(::GetLastError()), std::system_category());
+        }
+#else
+        fd_ = ::open(path.c_str(), O_RDONLY | O_CLOEXEC);
+        if (fd_ < 0) throw std::system_error(errno, std::generic_category());
+#endif
+    }
+
+    file(file const&) = delete;
+    file& operator=(file const&) = delete;
+
+    ~file() {
+#if defined(_WIN32)
+        ::CloseHandle(handle_);
+#else
+        ::close(fd_);
+#endif
+    }
+
+    // Read exactly `size` bytes at `offset` into `dst`. Safe to call from
+    // several threads at once: no call moves a shared file position.
+    void read_at(std::byte* dst, std::size_t size, std::uint64_t offset) const {
+        while (size > 0) {
+            std::size_t const want = (std::min)(size, max_io);
+#if defined(_WIN32)
+            OVERLAPPED at{};
+            at.Offset = static_cast<DWORD>(offset);
+            at.OffsetHigh = static_cast<DWORD>(offset >> 32);
+            DWORD got = 0;
+            if (!::ReadFile(handle_, dst, static_cast<DWORD>(want), &got, &at)) {
+                DWORD const code = ::GetLastError();
+                if (code != ERROR_HANDLE_EOF) {
+                    throw std::system_error(static_cast<int>(code), std::system_category());
+                }
+            }
+            std::size_t const n = got;
+#else
+            ssize_t const got = ::pread(fd_, dst, want, static_cast<off_t>(offset));
+            if (got < 0) {
+                if (errno == EINTR) continue;
+                throw std::system_error(errno, std::generic_category());
+            }
+            std::size_t const n = static_cast<std::size_t>(got);
+#endif
+            if (n == 0) throw unexpected_eof(offset);
+            dst += n;
+            offset += n;
+            size -= n;
+        }
+    }
+
+private:
+#if defined(_WIN32)
+    HANDLE handle_ = INVALID_HANDLE_VALUE;
+#else
+    int fd_ = -1;
+#endif
+};
+
+struct buffer {
+    explicit buffer(std::size_t n)
+        // Uninitialized: every byte is overwritten by a read. At least one
+        // byte so an empty range still has a valid data pointer.
+        : data(new std::byte[(std::max)(n, std::size_t(1))]), size(n) {}
+
+    std::unique_ptr<std::byte[]> data;
+    std::size_t size;
+};
+
+template <typename F>
+hpx::future<void> launch(bool io_pool, F&& f) {
+    if (io_pool) {
+        return hpx::async(hpx::parallel::execution::io_pool_executor(), std::forward<F>(f));
+    }
+    return hpx::async(std::forward<F>(f));
+}
+
+// Re-raise a read error as the matching Python exception; needs the GIL.
+[[noreturn]] void raise_read_error(
+    std::exception_ptr error, std::filesystem::path const& path) {
+    try {
+        std::rethrow_exception(error);
+    } catch (std::system_error const& e) {
+        nb::object exc = nb::handle(PyExc_OSError)(
+            e.code().value(), e.code().message(), nb::cast(path));
+        PyErr_SetObject(PyExc_OSError, exc.ptr());
+    } catch (unexpected_eof const& e) {
+        PyErr_SetString(PyExc_EOFError, e.what());
+    } catch (...) {
+        // Anything else, e.g. an hpx::exception, goes to nanobind's
+        // translators.
+        throw;
+    }
+    throw nb::python_error();
+}
+
+nb::object to_array(std::shared_ptr<buffer> const& buf) {
+    auto* owner = new std::shared_ptr<buffer>(buf);
+    nb::capsule keep(owner, [](void* p) noexcept {
+        delete static_cast<std::shared_ptr<buffer>*>(p);
+    });
+    std::size_t const shape[1] = {buf->size};
+    return nb::cast(nb::ndarray<nb::numpy, std::uint8_t, nb::ndim<1>>(
+        reinterpret_cast<std::uint8_t*>(buf->data.get()), 1, shape, keep));
+}
+
+}  // namespace
+
+nb::list read(std::filesystem::path const& path,
+    std::vector<std::pair<std::uint64_t, std::uint64_t>> const& ranges,
+    std::size_t block_bytes, std::string const& pool) {
+    if (block_bytes == 0) throw std::invalid_argument("block_bytes must be positive");
+    if (pool != "default" && pool != "io") {
+        throw std::invalid_argument(
+            "Unknown pool: " + pool + " (expected 'default' or 'io')");
+    }
+    bool const io_pool = pool == "io";
+    static std::uint32_t const phase = tracing::intern_name(std::string("io.read"));
+
+    std::shared_ptr<file const> source;
+    try {
+        source = std::make_shared<file const>(path);
+    } catch (...) {
+        raise_read_error(std::current_exception(), path);
+    }
+
+    nb::list futures;
+    for (auto const& [offset, size] : ranges) {
+        auto buf = std::make_shared<buffer>(static_cast<std::size_t>(size));
+        std::vector<hpx::future<void>> blocks;
+        blocks.reserve(static_cast<std::size_t>((size + block_bytes - 1) / block_bytes));
+        for (std::uint64_t begin = 0; begin < size; begin += block_bytes) {
+            std::size_t const n = static_cast<std::size_t>((std::min)(
+                static_cast<std::uint64_t>(block_bytes), size - begin));
+            blocks.push_back(launch(io_pool, [source, buf, begin, n, at = offset + begin]() {
+                tracing::task_scope scope(tracing::pending_task::kernel(phase));
+                source->read_at(buf->data.get() + begin, n, at);
+            }));
+        }
+        hpx::future<void> done = hpx::when_all(std::move(blocks)).then(
+            [](auto&& all) {
+                for (auto& block : all.get()) block.get();
+            });
+
+        // Deferred hand-back, as for submit: get() waits with the GIL
+        // released and wraps the buffer in an array under the GIL.
+        hpx::future<nb::object> result = hpx::async(hpx::launch::deferred,
+            [done = std::move(done), buf, path]() mutable -> nb::object {
+                futures::require_stack("future.get()");
+                std::exception_ptr error;
+                {
+                    nb::gil_scoped_release release;
+                    try {
+                        done.get();
+                    } catch (...) {
+                        error = std::current_exception();
+                    }
+                }
+                if (error) raise_read_error(error, path);
+                return to_array(buf);
+            });
+        futures.append(nb::cast(std::move(result)));
+    }
+    return futures;
+}
+
+void register_bindings(nb::module_& m) {
+    m.def("read", &read, "path"_a, "ranges"_a, "block_bytes"_a, "pool"_a = "default",
+          "Read byte ranges of a file with parallel positional reads; one future per range.");
+}
+
+}  // namespace hpyx::io
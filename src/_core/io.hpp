@@ -0,0 +1,31 @@
+#pragma once
+
+#include <nanobind/nanobind.h>
+
+#include <cstddef>
+#include <cstdint>
+#include <filesystem>
+#include <string>
+#include <utility>
+#include <vector>
+
+namespace hpyx::io {
+
+// Read byte ranges of a file in parallel. The file is opened once. Every
+// range (offset, nbytes) gets its own preallocated buffer, which is filled
+// by one task per `block_bytes` slice, each reading its slice with a
+// positional read (pread, or ReadFile at an offset on Windows). The tasks
+// start at once and run on the HPX workers (`pool` "default") or on HPX's
+// I/O service threads (`pool` "io"), which exist for blocking system
+// calls and leave the workers free for computation.
+//
+// Returns one future per range. get() waits with the GIL released and
+// yields the range as a 1-D uint8 NumPy array owning its buffer, or raises
+// OSError on a failed read and EOFError if the file ends early.
+nanobind::list read(std::filesystem::path const& path,
+    std::vector<std::pair<std::uint64_t, std::uint64_t>> const& ranges,
+    std::size_t block_bytes, std::string const& pool);
+
+void register_bindings(nanobind::module_& m);
+
+}  // namespace hpyx::io
@@ -0,0 +1,285 @@
+#include "memmap.hpp"
+
+#include <hpx/algorithm.hpp>
+#include <hpx/execution.hpp>
+#include <hpx/future.hpp>
+#include <hpx/runtime.hpp>
+#include <nanobind/stl/string.h>
+#include <nanobind/stl/tuple.h>
+
+#include <algorithm>
+#include <cmath>
+#include <cstddef>
+#include <cstdint>
+#include <exception>
+#include <functional>
+#include <numeric>
+#include <stdexcept>
+#include <string>
+#include <tuple>
+#include <utility>
+#include <vector>
+
+#if defined(__unix__) || defined(__APPLE__)
+#include <fcntl.h>
+#include <sys/mman.h>
+#include <unistd.h>
+#define HPYX_HAVE_MADVISE 1
+#endif
+
+#include "buffers.hpp"
+#include "futures.hpp"
+#include "tracing.hpp"
+
+namespace nb = nanobind;
+using namespace nb::literals;
+
+namespace hpyx::memmap {
+
+namespace {
+
+std::size_t page_size() {
+#ifdef HPYX_HAVE_MADVISE
+    static std::size_t const size = static_cast<std::size_t>(sysconf(_SC_PAGESIZE));
+    return size;
+#else
+    return 4096;
+#endif
+}
+
+// One input and, if it is file backed, the file for page-cache advice.
+class mapped_input {
+public:
+    mapped_input(buffers::f64_view const& view, nb::object const& source)
+        : data(view.data()), size(view.size()) {
+        if (source.is_none()) return;
+        auto [path, offset, release] =
+            nb::cast<std::tuple<std::string, std::int64_t, bool>>(source);
+        advise_ = true;
+        release_ = release;
+        file_offset_ = offset;
+#ifdef HPYX_HAVE_MADVISE
+        fd_ = ::open(path.c_str(), O_RDONLY | O_CLOEXEC);
+#ifdef POSIX_FADV_SEQUENTIAL
+        if (fd_ >= 0) {
+            ::posix_fadvise(fd_, file_offset_,
+                static_cast<off_t>(size * sizeof(double)), POSIX_FADV_SEQUENTIAL);
+        }
+#endif
+#endif
+    }
+
+    mapped_input(mapped_input const&) = delete;
+    mapped_input& operator=(mapped_input const&) = delete;
+
+    ~mapped_input() {
+#ifdef HPYX_HAVE_MADVISE
+        if (fd_ >= 0) ::close(fd_);
+#endif
+    }
+
+    // Start reading elements [begin, end) into the page cache.
+    void will_need(std::size_t begin, std::size_t end) const {
+        if (!advise_ || begin >= end) return;
+#ifdef HPYX_HAVE_MADVISE
+        // Round outwards: the mapping covers whole pages.
+        auto [lo, hi] = pages(begin, end, false);
+        if (hi > lo) ::madvise(reinterpret_cast<void*>(lo), hi - lo, MADV_WILLNEED);
+#ifdef POSIX_FADV_WILLNEED
+        if (fd_ >= 0) {
+            ::posix_fadvise(fd_, byte_offset(begin),
+                static_cast<off_t>((end - begin) * sizeof(double)), POSIX_FADV_WILLNEED);
+        }
+#endif
+#endif
+    }
+
+    // Drop elements [begin, end) from this process and the page cache.
+    void release(std::size_t begin, std::size_t end) const {
+        if (!release_ || begin >= end) return;
+#ifdef HPYX_HAVE_MADVISE
+        // Round inwards so pages shared with a neighbouring block stay.
+        auto [lo, hi] = pages(begin, end, true);
+        if (hi > lo) ::madvise(reinterpret_cast<void*>(lo), hi - lo, MADV_DONTNEED);
+#ifdef POSIX_FADV_DONTNEED
+        if (fd_ >= 0) {
+            ::posix_fadvise(fd_, byte_offset(begin),
+                static_cast<off_t>((end - begin) * sizeof(double)), POSIX_FADV_DONTNEED);
+        }
+#endif
+#endif
+    }
+
+    double const* data;
+    std::size_t size;
+
+private:
+    std::pair<std::uintptr_t, std::uintptr_t> pages(
+        std::size_t begin, std::size_t end, bool inward) const {
+        std::uintptr_t const page = page_size();
+        auto lo = reinterpret_cast<std::uintptr_t>(data + begin);
+        auto hi = reinterpret_cast<std::uintptr_t>(data + end);
+        if (inward) {
+            lo = (lo + page - 1) / page * page;
+            hi = hi / page * page;
+        } else {
+            lo = lo / page * page;
+            hi = (hi + page - 1) / page * page;
+        }
+        return {lo, (std::max)(lo, hi)};
+    }
+
+    std::int64_t byte_offset(std::size_t index) const {
+        return file_offset_ + static_cast<std::int64_t>(index * sizeof(double));
+    }
+
+    bool advise_ = false;
+    bool release_ = false;
+    std::int64_t file_offset_ = 0;
+    int fd_ = -1;
+};
+
+// Walk [0, size) of every input block by block, reducing each block in
+// parallel with `chunk(begin, end)` and folding chunk results in order
+// with `combine`. Called with the GIL released.
+template <typename Chunk, typename Combine>
+double walk(std::vector<mapped_input const*> const& inputs, std::size_t block_bytes,
+    std::size_t prefetch, double init, Chunk const& chunk, Combine const& combine) {
+    static std::uint32_t const phase = tracing::intern_name(std::string("memmap.chunk"));
+    std::size_t const size = inputs.front()->size;
+    std::size_t const page = page_size();
+    std::size_t const block =
+        (std::max)(block_bytes / page, std::size_t(1)) * page / sizeof(double);
+    // Shorten the first block so later boundaries fall on page boundaries.
+    std::size_t const lead =
+        reinterpret_cast<std::uintptr_t>(inputs.front()->data) % page / sizeof(double);
+    std::size_t const num_blocks = (size + lead + block - 1) / block;
+    auto bounds = [&](std::size_t i) {
+        std::size_t const begin = i == 0 ? 0 : i * block - lead;
+        return std::pair<std::size_t, std::size_t>(
+            begin, (std::min)(size, (i + 1) * block - lead));
+    };
+    auto advise = [&](std::size_t first, std::size_t last) {
+        for (std::size_t i = first; i < last; ++i) {
+            auto [begin, end] = bounds(i);
+            for (auto const* in : inputs) in->will_need(begin, end);
+        }
+    };
+
+    std::size_t const workers = static_cast<std::size_t>(hpx::get_num_worker_threads());
+    double result = init;
+    advise(0, 1);
+    std::size_t advised = 1;
+    for (std::size_t i = 0; i < num_blocks; ++i) {
+        // Readahead of the next blocks overlaps with reducing this one.
+        std::size_t const target = (std::min)(num_blocks, i + 1 + prefetch);
+        hpx::future<void> ahead = hpx::make_ready_future();
+        if (target > advised) {
+            ahead = hpx::async([&advise, first = advised, target]() { advise(first, target); });
+            advised = target;
+        }
+
+        auto [begin, end] = bounds(i);
+        std::size_t const num_chunks = (std::min)(end - begin, 4 * workers);
+        std::vector<double> partial(num_chunks, init);
+        hpx::experimental::for_loop(
+            hpx::execution::par, std::size_t(0), num_chunks,
+            [&, begin = begin, end = end](std::size_t c) {
+                tracing::task_scope scope(tracing::pending_task::kernel(phase));
+                std::size_t const n = end - begin;
+                partial[c] = chunk(begin + c * n / num_chunks, begin + (c + 1) * n / num_chunks);
+            });
+        for (double value : partial) result = combine(result, value);
+
+        ahead.get();
+        for (auto const* in : inputs) in->release(begin, end);
+    }
+    return result;
+}
+
+template <typename Chunk, typename Combine>
+double run(std::vector<mapped_input const*> const& inputs, std::size_t block_bytes,
+    std::size_t prefetch, double init, Chunk const& chunk, Combine const& combine) {
+    if (inputs.front()->size == 0) return init;
+    std::exception_ptr error;
+    double result = init;
+    {
+        nb::gil_scoped_release release;
+        try {
+            result = walk(inputs, block_bytes, prefetch, init, chunk, combine);
+        } catch (...) {
+            error = std::current_exception();
+        }
+    }
+    if (error) std::rethrow_exception(error);
+    return result;
+}
+
+double nan_min(double a, double b) {
+    return (std::isnan(a) || a < b) ? a : b;
+}
+
+double nan_max(double a, double b) {
+    return (std::isnan(a) || a > b) ? a : b;
+}
+
+}  // namespace
+
+double dot(nb::handle a, nb::handle b, nb::object a_source, nb::object b_source,
+    std::size_t block_bytes, std::size_t prefetch) {
+    futures::require_stack("memmap_dot");
+    buffers::f64_view const a_view(a, "a");
+    buffers::f64_view const b_view(b, "b");
+    if (a_view.size() != b_view.size()) {
+        throw std::invalid_argument("Arrays must have the same size");
+    }
+    mapped_input const x(a_view, a_source);
+    mapped_input const y(b_view, b_source);
+    return run({&x, &y}, block_bytes, prefetch, 0.0,
+        [&](std::size_t begin, std::size_t end) {
+            return std::inner_product(x.data + begin, x.data + end, y.data + begin, 0.0);
+        },
+        std::plus<double>());
+}
+
+double reduce(nb::handle a, std::string const& op, nb::object source,
+    std::size_t block_bytes, std::size_t prefetch) {
+    futures::require_stack(("memmap_" + op).c_str());
+    buffers::f64_view const view(a, "a");
+    mapped_input const x(view, source);
+    double const* data = x.data;
+    if (op == "sum") {
+        return run({&x}, block_bytes, prefetch, 0.0,
+            [data](std::size_t begin, std::size_t end) {
+                return std::accumulate(data + begin, data + end, 0.0);
+            },
+            std::plus<double>());
+    }
+    if (op == "min" || op == "max") {
+        if (x.size == 0) {
+            std::string const name = op == "min" ? "minimum" : "maximum";
+            throw std::invalid_argument(
+                "zero-size array to reduction operation " + name + " which has no identity");
+        }
+        bool const is_min = op == "min";
+        auto const combine = is_min ? &nan_min : &nan_max;
+        return run({&x}, block_bytes, prefetch, data[0],
+            [data, combine](std::size_t begin, std::size_t end) {
+                double value = data[begin];
+                for (std::size_t i = begin + 1; i < end; ++i) value = combine(value, data[i]);
+                return value;
+            },
+            combine);
+    }
+    throw std::invalid_argument("Unknown reduction: " + op);
+}
+
+void register_bindings(nb::module_& m) {
+    m.def("dot", &dot, "a"_a, "b"_a, "a_source"_a.none(), "b_source"_a.none(),
+          "block_bytes"_a, "prefetch"_a,
+          "Dot product of two float64 buffers, walked block by block.");
+    m.def("reduce", &reduce, "a"_a, "op"_a, "source"_a.none(), "block_bytes"_a,
+          "prefetch"_a, "Reduce a float64 buffer block by block.");
+}
+
+}  // namespace hpyx::memmap
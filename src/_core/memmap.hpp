@@ -0,0 +1,33 @@
+#pragma once
+
+#include <nanobind/nanobind.h>
+
+#include <cstddef>
+#include <string>
+
+namespace hpyx::memmap {
+
+// Out-of-core reductions over float64 buffers (anything
+// hpyx::buffers::f64_view accepts), typically np.memmap views of files
+// larger than RAM. The data is walked in blocks of about `block_bytes`
+// whose boundaries fall on page boundaries of the first input. While the
+// HPX workers reduce block i, the next `prefetch` blocks are advised
+// WILLNEED (madvise and posix_fadvise), and once block i is done it is
+// released (MADV_DONTNEED and POSIX_FADV_DONTNEED), which keeps at most
+// about (1 + prefetch) blocks of each input resident.
+//
+// A `source` is None, which means no page-cache advice, or a tuple
+// (path, file_offset, release). `file_offset` is the byte offset in the
+// file of the first element. `release` must be False for private
+// (copy-on-write) mappings, because dropping their pages would discard
+// changes. Advice is best effort and is skipped on platforms without it.
+double dot(nanobind::handle a, nanobind::handle b, nanobind::object a_source,
+    nanobind::object b_source, std::size_t block_bytes, std::size_t prefetch);
+
+// Reduce every element with `op`: "sum", "min" or "max" (NaN propagates).
+double reduce(nanobind::handle a, std::string const& op, nanobind::object source,
+    std::size_t block_bytes, std::size_t prefetch);
+
+void register_bindings(nanobind::module_& m);
+
+}  // namespace hpyx::memmap
@@ -0,0 +1,98 @@
+#include "profile.hpp"
+
+#include <nanobind/stl/string.h>
+
+#include <utility>
+
+namespace nb = nanobind;
+using namespace nb::literals;
+
+namespace hpyx::profile {
+
+namespace {
+
+std::size_t bucket_of(std::int64_t ns) {
+    if (ns <= 0) return 0;
+    auto const value = static_cast<std::uint64_t>(ns);
+#if defined(__GNUC__) || defined(__clang__)
+    std::size_t const width = 64 - static_cast<std::size_t>(__builtin_clzll(value));
+#else
+    std::size_t width = 0;
+    for (std::uint64_t v = value; v != 0; v >>= 1) ++width;
+#endif
+    return width < histogram::num_buckets ? width : histogram::num_buckets - 1;
+}
+
+}  // namespace
+
+void histogram::add(std::int64_t ns) {
+    buckets[bucket_of(ns)].fetch_add(1, std::memory_order_relaxed);
+    sum_ns.fetch_add(ns > 0 ? static_cast<std::uint64_t>(ns) : 0,
+                     std::memory_order_relaxed);
+}
+
+nb::tuple histogram::snapshot() const {
+    nb::list counts;
+    for (auto const& bucket : buckets) {
+        counts.append(bucket.load(std::memory_order_relaxed));
+    }
+    return nb::make_tuple(sum_ns.load(std::memory_order_relaxed), counts);
+}
+
+void histogram::reset() {
+    for (auto& bucket : buckets) bucket.store(0, std::memory_order_relaxed);
+    sum_ns.store(0, std::memory_order_relaxed);
+}
+
+void function_stats::record(std::int64_t queue_ns, std::int64_t gil_ns,
+                            std::int64_t run_ns, bool failed) {
+    count.fetch_add(1, std::memory_order_relaxed);
+    if (failed) errors.fetch_add(1, std::memory_order_relaxed);
+    queue_wait.add(queue_ns);
+    gil_wait.add(gil_ns);
+    run.add(run_ns);
+}
+
+std::shared_ptr<function_stats> profile_stats::slot(nb::handle fn) {
+    nb::object qualname = nb::getattr(fn, "__qualname__", nb::none());
+    if (!nb::isinstance<nb::str>(qualname)) {
+        qualname = nb::getattr(fn.type(), "__qualname__", nb::str("<unknown>"));
+    }
+    std::string name = nb::cast<std::string>(qualname);
+    std::lock_guard<std::mutex> lk(mtx_);
+    auto& stats = stats_[std::move(name)];
+    if (!stats) stats = std::make_shared<function_stats>();
+    return stats;
+}
+
+nb::dict profile_stats::snapshot(bool reset) {
+    nb::dict out;
+    std::lock_guard<std::mutex> lk(mtx_);
+    for (auto const& [name, stats] : stats_) {
+        nb::dict entry;
+        entry["count"] = stats->count.load(std::memory_order_relaxed);
+        entry["errors"] = stats->errors.load(std::memory_order_relaxed);
+        entry["queue_wait"] = stats->queue_wait.snapshot();
+        entry["gil_wait"] = stats->gil_wait.snapshot();
+        entry["run"] = stats->run.snapshot();
+        out[nb::str(name.c_str(), name.size())] = entry;
+        if (reset) {
+            stats->count.store(0, std::memory_order_relaxed);
+            stats->errors.store(0, std::memory_order_relaxed);
+            stats->queue_wait.reset();
+            stats->gil_wait.reset();
+            stats->run.reset();
+        }
+    }
+    return out;
+}
+
+void register_bindings(nb::module_& m) {
+    nb::class_<profile_stats>(m, "ProfileStats")
+        .def(nb::init<>())
+        .def("snapshot", &profile_stats::snapshot, "reset"_a = false,
+             "Per-callable counts and raw histogram buckets.");
+    m.attr("NUM_BUCKETS") = histogram::num_buckets;
+}
+
+}  // namespace hpyx::profile
@@ -0,0 +1,58 @@
+#pragma once
+
+#include <nanobind/nanobind.h>
+
+#include <array>
+#include <atomic>
+#include <cstddef>
+#include <cstdint>
+#include <memory>
+#include <mutex>
+#include <string>
+#include <unordered_map>
+
+namespace hpyx::profile {
+
+// Fixed log2 buckets: bucket i counts durations in [2^(i-1), 2^i) ns
+// (bucket 0 is exactly 0 ns); the last bucket also takes everything above.
+// Updates are lock-free relaxed atomic increments.
+struct histogram {
+    static constexpr std::size_t num_buckets = 48;
+
+    std::array<std::atomic<std::uint64_t>, num_buckets> buckets{};
+    std::atomic<std::uint64_t> sum_ns{0};
+
+    void add(std::int64_t ns);
+    nanobind::tuple snapshot() const;  // (sum_ns, [count per bucket])
+    void reset();
+};
+
+struct function_stats {
+    std::atomic<std::uint64_t> count{0};
+    std::atomic<std::uint64_t> errors{0};
+    histogram queue_wait;  // submit -> task starts on a worker
+    histogram gil_wait;    // task start -> GIL acquired
+    histogram run;         // GIL acquired -> callable returned
+
+    void record(std::int64_t queue_ns, std::int64_t gil_ns, std::int64_t run_ns,
+                bool failed);
+};
+
+// Per-callable statistics for one HPXExecutor(profile=True).
+class profile_stats {
+public:
+    // Stats slot for `fn`, keyed by its __qualname__. Call with the GIL held.
+    std::shared_ptr<function_stats> slot(nanobind::handle fn);
+
+    // {qualname: {"count", "errors", "queue_wait", "gil_wait", "run"}} with
+    // each histogram as returned by histogram::snapshot().
+    nanobind::dict snapshot(bool reset);
+
+private:
+    std::mutex mtx_;
+    std::unordered_map<std::string, std::shared_ptr<function_stats>> stats_;
+};
+
+void register_bindings(nanobind::module_& m);
+
+}  // namespace hpyx::profile
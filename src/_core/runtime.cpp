@@ -1,6 +1,7 @@
 #include "runtime.hpp"
 
 #include <hpx/hpx.hpp>
+#include <hpx/hpx_init.hpp>
 #include <hpx/hpx_start.hpp>
 #include <hpx/version.hpp>
 #include <nanobind/stl/string.h>
@@ -15,6 +16,8 @@
 #include <string>
 #include <vector>
 
+#include "snapshot.hpp"
+
 namespace nb = nanobind;
 using namespace nb::literals;
 
@@ -22,11 +25,19 @@ namespace hpyx::runtime {
 
 namespace {
 
+hpx::runtime_mode parse_mode(std::string const& mode) {
+    if (mode == "default") return hpx::runtime_mode::default_;
+    if (mode == "console") return hpx::runtime_mode::console;
+    if (mode == "worker") return hpx::runtime_mode::worker;
+    throw std::invalid_argument("Invalid HPX runtime mode: " + mode);
+}
+
 struct global_runtime_manager {
-    global_runtime_manager(std::vector<std::string> const& config)
+    global_runtime_manager(std::vector<std::string> const& config, hpx::runtime_mode mode)
         : running_(false), rts_(nullptr), cfg(config) {
         hpx::init_params params;
         params.cfg = cfg;
+        params.mode = mode;
 
         hpx::function<int(int, char**)> start_function =
             hpx::bind_front(&global_runtime_manager::hpx_main, this);
@@ -72,42 +83,67 @@ struct global_runtime_manager {
     std::vector<std::string> const cfg;
 };
 
+// g_state_mtx serializes start/stop. g_mgr is atomic so the hot read-only
+// queries (runtime_is_running, num_worker_threads, ...) never take the lock;
+// without a GIL they can race with start/stop from any Python thread.
 std::mutex g_state_mtx;
-global_runtime_manager* g_mgr = nullptr;
-std::atomic<bool> g_stopped{false};
+std::atomic<global_runtime_manager*> g_mgr{nullptr};
+bool g_stopped = false;  // guarded by g_state_mtx
 
 }  // namespace
 
-bool runtime_start(std::vector<std::string> const& cfg) {
-    if (g_stopped.load()) {
+bool runtime_start(std::vector<std::string> const& cfg, std::string const& mode) {
+    hpx::runtime_mode const rt_mode = parse_mode(mode);
+    if (rt_mode == hpx::runtime_mode::worker) {
+        throw std::invalid_argument(
+            "Worker localities are started with runtime_run_worker, not runtime_start");
+    }
+    // Release the GIL before blocking on g_state_mtx: a concurrent start
+    // holds the mutex for the whole (GIL-free) HPX startup.
+    nb::gil_scoped_release release;
+    std::lock_guard<std::mutex> lk(g_state_mtx);
+    if (g_stopped) {
         throw std::runtime_error(
             "HPyX runtime has been stopped and cannot restart within this process");
     }
-    std::lock_guard<std::mutex> lk(g_state_mtx);
-    if (g_mgr != nullptr) return false;
+    if (g_mgr.load(std::memory_order_acquire) != nullptr) return false;
 
-    nb::gil_scoped_release release;
-    g_mgr = new global_runtime_manager(cfg);
+    g_mgr.store(new global_runtime_manager(cfg, rt_mode), std::memory_order_release);
     return true;
 }
 
-void runtime_stop() {
-    global_runtime_manager* to_delete = nullptr;
+int runtime_run_worker(std::vector<std::string> const& cfg) {
+    nb::gil_scoped_release release;
     {
         std::lock_guard<std::mutex> lk(g_state_mtx);
-        to_delete = g_mgr;
-        g_mgr = nullptr;
+        if (g_stopped || g_mgr.load(std::memory_order_acquire) != nullptr) {
+            throw std::runtime_error(
+                "HPyX runtime is already running or stopped in this process");
+        }
+        g_stopped = true;  // a worker locality's runtime is single-use too
     }
+    hpx::init_params params;
+    params.cfg = cfg;
+    params.mode = hpx::runtime_mode::worker;
+    // No hpx_main: a worker locality only serves actions sent by the console.
+    hpx::function<int(int, char**)> no_main;
+    return hpx::init(no_main, 0, nullptr, params);
+}
+
+void runtime_stop() {
+    nb::gil_scoped_release release;
+    std::lock_guard<std::mutex> lk(g_state_mtx);
+    global_runtime_manager* to_delete =
+        g_mgr.exchange(nullptr, std::memory_order_acq_rel);
     if (to_delete != nullptr) {
-        g_stopped.store(true);
-        nb::gil_scoped_release release;
+        g_stopped = true;
         delete to_delete;
+        hpyx::snapshot::reset();
     }
 }
 
 bool runtime_is_running() {
-    std::lock_guard<std::mutex> lk(g_state_mtx);
-    return g_mgr != nullptr;
+    return g_mgr.load(std::memory_order_acquire) != nullptr;
 }
 
 std::size_t num_worker_threads() {
@@ -127,8 +163,10 @@ std::string hpx_version_string() {
 }
 
 void register_bindings(nb::module_& m) {
-    m.def("runtime_start", &runtime_start, "cfg"_a,
+    m.def("runtime_start", &runtime_start, "cfg"_a, "mode"_a = "default",
           "Start the HPX runtime. Idempotent; returns True if this call started it.");
+    m.def("runtime_run_worker", &runtime_run_worker, "cfg"_a,
+          "Run as a worker locality until the console shuts the job down.");
     m.def("runtime_stop", &runtime_stop,
           "Stop the HPX runtime. Irreversible within this process.");
     m.def("runtime_is_running", &runtime_is_running);
@@ -11,7 +11,13 @@ namespace hpyx::runtime {
 // Thread-safe, idempotent. Returns true if this call started the runtime,
 // false if it was already running. Throws std::runtime_error if the runtime
 // was previously started and then stopped (HPX cannot restart in-process).
-bool runtime_start(std::vector<std::string> const& cfg);
+// `mode` is "default" or "console" (locality 0 of a multi-locality run).
+bool runtime_start(std::vector<std::string> const& cfg, std::string const& mode = "default");
+
+// Run this process as a worker locality of a multi-locality job. Blocks
+// (with the GIL released) until the console locality shuts the job down,
+// serving remote actions meanwhile. Returns HPX's exit code.
+int runtime_run_worker(std::vector<std::string> const& cfg);
 
 // Blocks until HPX drains. Idempotent — safe to call after a prior stop
 // (no-op in that case). Does NOT re-enable starting.
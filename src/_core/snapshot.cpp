@@ -0,0 +1,193 @@
+#include "snapshot.hpp"
+
+#include <hpx/runtime.hpp>
+#include <hpx/runtime_local/thread_pool_helpers.hpp>
+#include <hpx/modules/thread_pools.hpp>
+#include <nanobind/stl/string.h>
+
+#include <array>
+#include <atomic>
+#include <cstddef>
+#include <cstdint>
+#include <string>
+#include <vector>
+
+#include "tracing.hpp"
+
+namespace nb = nanobind;
+
+namespace hpyx::snapshot {
+
+namespace {
+
+// Queued tasks are counted as tickets issued minus tasks started. Started
+// tasks are counted per worker, one cache line each, like the GIL
+// counters; workers past `max_workers` and non-HPX threads share the last.
+struct alignas(64) started_count {
+    std::atomic<std::uint64_t> value{0};
+};
+
+constexpr std::size_t max_workers = 1024;
+std::array<started_count, max_workers + 1> g_started;
+std::atomic<std::uint64_t> g_next_ticket{1};
+std::atomic<std::uint64_t> g_reset_ticket{0};  // tickets at or below were reset
+
+// Submit times of queued tasks, in slots picked by ticket; 0 marks a free
+// slot. A task whose slot is still taken by an older queued task is not
+// recorded. The older task is the one that matters for the oldest age,
+// so the age is exact until more than `num_slots` tasks are queued.
+constexpr std::size_t slots_per_line = 8;
+constexpr std::size_t num_lines = 2048;
+constexpr std::size_t num_slots = slots_per_line * num_lines;
+std::array<std::atomic<std::int64_t>, num_slots> g_submit_ns{};
+
+// Consecutive tickets land on different cache lines, so a submitter and
+// the workers starting neighbouring tasks rarely share one.
+std::size_t slot_of(std::uint64_t id) {
+    return (id % num_lines) * slots_per_line + (id / num_lines) % slots_per_line;
+}
+
+struct worker_counts {
+    std::int64_t pending = 0;
+    std::int64_t active = 0;
+    std::int64_t suspended = 0;
+    std::int64_t staged = 0;
+    std::int64_t terminated = 0;
+    std::int64_t queue_length = 0;
+};
+
+struct pool_counts {
+    std::string name;
+    std::size_t thread_offset = 0;
+    std::vector<worker_counts> workers;
+};
+
+worker_counts read_worker(hpx::threads::thread_pool_base& pool, std::size_t k) {
+    worker_counts c;
+    c.pending = pool.get_thread_count_pending(k, false);
+    c.active = pool.get_thread_count_active(k, false);
+    c.suspended = pool.get_thread_count_suspended(k, false);
+    c.staged = pool.get_thread_count_staged(k, false);
+    c.terminated = pool.get_thread_count_terminated(k, false);
+    c.queue_length = pool.get_queue_length(k, false);
+    return c;
+}
+
+nb::dict to_dict(worker_counts const& c) {
+    nb::dict d;
+    d["pending"] = c.pending;
+    d["active"] = c.active;
+    d["suspended"] = c.suspended;
+    d["staged"] = c.staged;
+    d["terminated"] = c.terminated;
+    d["queue_length"] = c.queue_length;
+    return d;
+}
+
+void accumulate(worker_counts& total, worker_counts const& c) {
+    total.pending += c.pending;
+    total.active += c.active;
+    total.suspended += c.suspended;
+    total.staged += c.staged;
+    total.terminated += c.terminated;
+    total.queue_length += c.queue_length;
+}
+
+}  // namespace
+
+ticket track_submit() {
+    ticket t{g_next_ticket.fetch_add(1, std::memory_order_relaxed), tracing::now_ns()};
+    std::int64_t expected = 0;
+    g_submit_ns[slot_of(t.id)].compare_exchange_strong(
+        expected, t.submit_ns, std::memory_order_relaxed);
+    return t;
+}
+
+void mark_started(ticket const& t) {
+    std::size_t const worker = hpx::get_worker_thread_num();
+    g_started[worker < max_workers ? worker : max_workers].value.fetch_add(
+        1, std::memory_order_relaxed);
+    std::int64_t expected = t.submit_ns;
+    g_submit_ns[slot_of(t.id)].compare_exchange_strong(
+        expected, 0, std::memory_order_relaxed);
+}
+
+void reset() {
+    g_reset_ticket.store(g_next_ticket.load() - 1);
+    for (auto& s : g_started) s.value.store(0);
+    for (auto& slot : g_submit_ns) slot.store(0);
+}
+
+nb::dict snapshot() {
+    std::vector<pool_counts> pools;
+    std::size_t in_flight = 0;
+    std::int64_t oldest_submit_ns = 0;
+    std::int64_t now = 0;
+    {
+        nb::gil_scoped_release release;
+        std::size_t const num_pools = hpx::resource::get_num_thread_pools();
+        pools.reserve(num_pools);
+        for (std::size_t p = 0; p < num_pools; ++p) {
+            auto& pool = hpx::resource::get_thread_pool(p);
+            pool_counts counts;
+            counts.name = pool.get_pool_name();
+            counts.thread_offset = pool.get_thread_offset();
+            std::size_t const threads = pool.get_os_thread_count();
+            for (std::size_t k = 0; k < threads; ++k) {
+                counts.workers.push_back(read_worker(pool, k));
+            }
+            pools.push_back(std::move(counts));
+        }
+        // Read the started counts before the tickets, so tasks that start
+        // meanwhile are not counted as started but never submitted.
+        std::uint64_t started = 0;
+        for (auto const& s : g_started) started += s.value.load();
+        std::uint64_t const submitted = g_next_ticket.load() - 1 - g_reset_ticket.load();
+        in_flight = submitted > started ? static_cast<std::size_t>(submitted - started) : 0;
+        if (in_flight != 0) {
+            for (auto const& slot : g_submit_ns) {
+                std::int64_t const submit_ns = slot.load(std::memory_order_relaxed);
+                if (submit_ns != 0 && (oldest_submit_ns == 0 || submit_ns < oldest_submit_ns)) {
+                    oldest_submit_ns = submit_ns;
+                }
+            }
+        }
+        now = tracing::now_ns();
+    }
+
+    nb::list pool_list;
+    worker_counts total;
+    for (auto const& counts : pools) {
+        nb::list workers;
+        worker_counts pool_total;
+        for (std::size_t k = 0; k < counts.workers.size(); ++k) {
+            nb::dict w = to_dict(counts.workers[k]);
+            w["worker"] = counts.thread_offset + k;
+            workers.append(w);
+            accumulate(pool_total, counts.workers[k]);
+        }
+        accumulate(total, pool_total);
+        nb::dict pool = to_dict(pool_total);
+        pool["name"] = counts.name;
+        pool["workers"] = workers;
+        pool_list.append(pool);
+    }
+
+    nb::dict python_tasks;
+    python_tasks["queued"] = in_flight;
+    python_tasks["oldest_queued_age_ns"] =
+        oldest_submit_ns == 0 ? nb::none() : nb::cast(now - oldest_submit_ns);
+
+    nb::dict out = to_dict(total);
+    out["timestamp_ns"] = now;
+    out["pools"] = pool_list;
+    out["python_tasks"] = python_tasks;
+    return out;
+}
+
+void register_bindings(nb::module_& m) {
+    m.def("snapshot", &snapshot,
+          "Thread counts by state and queue lengths per pool and worker.");
+}
+
+}  // namespace hpyx::snapshot
@@ -0,0 +1,33 @@
+#pragma once
+
+#include <nanobind/nanobind.h>
+
+#include <cstdint>
+
+namespace hpyx::snapshot {
+
+// A queued Python task, as returned by `track_submit`.
+struct ticket {
+    std::uint64_t id;
+    std::int64_t submit_ns;
+};
+
+// In-flight bookkeeping for Python tasks queued on HPX workers, so a
+// snapshot can report how many are queued and how long the oldest one has
+// been waiting. Call `track_submit()` when scheduling and
+// `mark_started(t)` first thing in the task body. Both are a few relaxed
+// atomic operations: no lock and no allocation.
+ticket track_submit();
+void mark_started(ticket const& t);
+
+// Forget every task still counted as queued. Called once the runtime has
+// stopped, when tasks that never started will not start any more.
+void reset();
+
+// Structured view of the scheduler: per pool and per worker thread counts
+// by state and queue lengths, plus the in-flight Python task summary.
+nanobind::dict snapshot();
+
+void register_bindings(nanobind::module_& m);
+
+}  // namespace hpyx::snapshot
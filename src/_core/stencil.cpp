@@ -0,0 +1,273 @@
+#include "stencil.hpp"
+
+#include <hpx/future.hpp>
+#include <hpx/runtime.hpp>
+#include <nanobind/stl/string.h>
+
+#include <algorithm>
+#include <cstddef>
+#include <cstdint>
+#include <deque>
+#include <exception>
+#include <memory>
+#include <numeric>
+#include <stdexcept>
+#include <string>
+#include <utility>
+#include <vector>
+
+#include "futures.hpp"
+#include "tracing.hpp"
+
+namespace nb = nanobind;
+using namespace nb::literals;
+
+namespace hpyx::stencil {
+
+namespace {
+
+// Smallest tile worth a task of its own, in elements.
+constexpr std::size_t min_tile_elements = std::size_t(1) << 14;
+
+// Steps whose tasks may be created before the oldest of them has finished;
+// bounds the dataflow nodes alive at once for long sweeps.
+constexpr std::size_t max_steps_in_flight = 16;
+
+enum class boundary_kind { constant, nearest, periodic, reflect };
+
+boundary_kind parse_boundary(std::string const& name) {
+    if (name == "constant") return boundary_kind::constant;
+    if (name == "nearest") return boundary_kind::nearest;
+    if (name == "periodic") return boundary_kind::periodic;
+    if (name == "reflect") return boundary_kind::reflect;
+    throw std::invalid_argument("Unknown boundary: " + name +
+        " (expected 'constant', 'nearest', 'periodic' or 'reflect')");
+}
+
+// The in-range index position `i` reads from, or -1 for the constant.
+std::ptrdiff_t map_index(std::ptrdiff_t i, std::ptrdiff_t n, boundary_kind b) {
+    if (i >= 0 && i < n) return i;
+    switch (b) {
+    case boundary_kind::constant:
+        return -1;
+    case boundary_kind::nearest:
+        return i < 0 ? 0 : n - 1;
+    case boundary_kind::periodic:
+        return (i % n + n) % n;
+    case boundary_kind::reflect: {
+        std::ptrdiff_t const m = (i % (2 * n) + 2 * n) % (2 * n);
+        return m < n ? m : 2 * n - 1 - m;
+    }
+    }
+    return -1;
+}
+
+// How one axis is cut into tiles, and which tiles each tile reads.
+struct axis {
+    axis(std::ptrdiff_t n, std::ptrdiff_t radius, std::size_t tiles, boundary_kind b)
+        : bounds(tiles + 1), reads(tiles) {
+        for (std::size_t t = 0; t <= tiles; ++t) {
+            bounds[t] = static_cast<std::ptrdiff_t>(t) * n / static_cast<std::ptrdiff_t>(tiles);
+        }
+        std::vector<std::size_t> tile_of(static_cast<std::size_t>(n));
+        for (std::size_t t = 0; t < tiles; ++t) {
+            std::fill(tile_of.begin() + bounds[t], tile_of.begin() + bounds[t + 1], t);
+        }
+        for (std::size_t t = 0; t < tiles; ++t) {
+            auto& out = reads[t];
+            for (std::ptrdiff_t i = bounds[t] - radius; i < bounds[t + 1] + radius; ++i) {
+                std::ptrdiff_t const j = map_index(i, n, b);
+                if (j >= 0) out.push_back(tile_of[static_cast<std::size_t>(j)]);
+            }
+            std::sort(out.begin(), out.end());
+            out.erase(std::unique(out.begin(), out.end()), out.end());
+        }
+    }
+
+    std::vector<std::ptrdiff_t> bounds;
+    std::vector<std::vector<std::size_t>> reads;
+};
+
+struct problem {
+    std::ptrdiff_t ny, nx, ky, kx;
+    std::vector<double> weights;
+    std::vector<double> row_sums;  // of the weights, for constant rows
+    boundary_kind boundary;
+    double cval;
+
+    double at(double const* row, std::ptrdiff_t j) const {
+        std::ptrdiff_t const m = map_index(j, nx, boundary);
+        return m < 0 ? cval : row[m];
+    }
+
+    // One step of rows [r0, r1) and columns [c0, c1), from src into dst.
+    void run_tile(double const* src, double* dst, std::ptrdiff_t r0, std::ptrdiff_t r1,
+        std::ptrdiff_t c0, std::ptrdiff_t c1) const {
+        std::ptrdiff_t const ry = ky / 2;
+        std::ptrdiff_t const rx = kx / 2;
+        for (std::ptrdiff_t i = r0; i < r1; ++i) {
+            double* out = dst + i * nx;
+            std::fill(out + c0, out + c1, 0.0);
+            for (std::ptrdiff_t wi = 0; wi < ky; ++wi) {
+                std::ptrdiff_t const si = map_index(i + wi - ry, ny, boundary);
+                if (si < 0) {
+                    double const value = cval * row_sums[static_cast<std::size_t>(wi)];
+                    for (std::ptrdiff_t j = c0; j < c1; ++j) out[j] += value;
+                    continue;
+                }
+                double const* row = src + si * nx;
+                double const* w = weights.data() + wi * kx;
+                for (std::ptrdiff_t wj = 0; wj < kx; ++wj) {
+                    double const wv = w[wj];
+                    if (wv == 0.0) continue;
+                    std::ptrdiff_t const off = wj - rx;
+                    // Columns whose neighbor at `off` is inside the row.
+                    std::ptrdiff_t const lo = (std::min)(c1, (std::max)(c0, -off));
+                    std::ptrdiff_t const hi = (std::max)(lo, (std::min)(c1, nx - off));
+                    for (std::ptrdiff_t j = c0; j < lo; ++j) out[j] += wv * at(row, j + off);
+                    for (std::ptrdiff_t j = lo; j < hi; ++j) out[j] += wv * row[j + off];
+                    for (std::ptrdiff_t j = hi; j < c1; ++j) out[j] += wv * at(row, j + off);
+                }
+            }
+        }
+    }
+};
+
+struct tile {
+    std::ptrdiff_t r0, r1, c0, c1;
+    std::vector<std::size_t> deps;
+};
+
+std::vector<tile> make_tiles(problem const& p) {
+    std::size_t const size = static_cast<std::size_t>(p.ny * p.nx);
+    std::size_t const workers = static_cast<std::size_t>(hpx::get_num_worker_threads());
+    std::size_t const target = std::clamp(size / min_tile_elements, std::size_t(1), 4 * workers);
+    // Prefer bands of whole rows, which are contiguous in memory.
+    std::size_t const ty = (std::min)(static_cast<std::size_t>(p.ny), target);
+    std::size_t const tx =
+        (std::min)(static_cast<std::size_t>(p.nx), (target + ty - 1) / ty);
+    axis const rows(p.ny, p.ky / 2, ty, p.boundary);
+    axis const cols(p.nx, p.kx / 2, tx, p.boundary);
+
+    std::vector<tile> tiles(ty * tx);
+    std::vector<std::vector<std::size_t>> readers(tiles.size());
+    for (std::size_t i = 0; i < ty; ++i) {
+        for (std::size_t j = 0; j < tx; ++j) {
+            std::size_t const t = i * tx + j;
+            tiles[t] = {rows.bounds[i], rows.bounds[i + 1], cols.bounds[j], cols.bounds[j + 1], {}};
+            for (std::size_t si : rows.reads[i]) {
+                for (std::size_t sj : cols.reads[j]) {
+                    tiles[t].deps.push_back(si * tx + sj);
+                    readers[si * tx + sj].push_back(t);
+                }
+            }
+        }
+    }
+    // A step overwrites the buffer the previous step read, so a tile also
+    // waits for the previous step's tiles that read it.
+    for (std::size_t t = 0; t < tiles.size(); ++t) {
+        auto& deps = tiles[t].deps;
+        deps.insert(deps.end(), readers[t].begin(), readers[t].end());
+        std::sort(deps.begin(), deps.end());
+        deps.erase(std::unique(deps.begin(), deps.end()), deps.end());
+    }
+    return tiles;
+}
+
+void sweep(std::shared_ptr<problem const> const& p, double const* a, double* out,
+    double* scratch, std::size_t steps) {
+    static std::uint32_t const phase = tracing::intern_name(std::string("stencil.tile"));
+    auto const tiles = std::make_shared<std::vector<tile> const>(make_tiles(*p));
+    std::size_t const n = tiles->size();
+
+    std::vector<hpx::shared_future<void>> prev(n, hpx::make_ready_future());
+    std::deque<std::vector<hpx::shared_future<void>>> in_flight;
+    double const* src = a;
+    for (std::size_t k = 1; k <= steps; ++k) {
+        // The last step writes `out`; the ones before alternate with it.
+        double* dst = (steps - k) % 2 == 0 ? out : scratch;
+        std::vector<hpx::shared_future<void>> next(n);
+        for (std::size_t t = 0; t < n; ++t) {
+            std::vector<hpx::shared_future<void>> inputs;
+            inputs.reserve((*tiles)[t].deps.size());
+            for (std::size_t d : (*tiles)[t].deps) inputs.push_back(prev[d]);
+            next[t] = hpx::dataflow(
+                [p, tiles, t, src, dst](std::vector<hpx::shared_future<void>> ready) {
+                    for (auto& f : ready) f.get();  // propagate an earlier failure
+                    tracing::task_scope scope(tracing::pending_task::kernel(phase));
+                    tile const& tl = (*tiles)[t];
+                    p->run_tile(src, dst, tl.r0, tl.r1, tl.c0, tl.c1);
+                },
+                std::move(inputs));
+        }
+        if (in_flight.size() == max_steps_in_flight) {
+            hpx::wait_all(in_flight.front());
+            in_flight.pop_front();
+        }
+        in_flight.push_back(next);
+        prev = std::move(next);
+        src = dst;
+    }
+    hpx::wait_all(prev);
+    for (auto& f : prev) f.get();
+}
+
+}  // namespace
+
+void apply(input a, input weights, output out, output scratch, std::size_t steps,
+    std::string const& boundary, double cval) {
+    futures::require_stack("stencil");
+    std::size_t const ndim = a.ndim();
+    if (ndim != 1 && ndim != 2) {
+        throw std::invalid_argument("stencil input must be 1-D or 2-D");
+    }
+    if (weights.ndim() != ndim) {
+        throw std::invalid_argument("stencil weights must have as many dimensions as the input");
+    }
+    for (std::size_t d = 0; d < ndim; ++d) {
+        if (weights.shape(d) % 2 == 0) {
+            throw std::invalid_argument("stencil weights must have an odd length along every axis");
+        }
+        if (out.ndim() != ndim || scratch.ndim() != ndim || out.shape(d) != a.shape(d) ||
+            scratch.shape(d) != a.shape(d)) {
+            throw std::invalid_argument("stencil buffers must have the shape of the input");
+        }
+    }
+
+    auto p = std::make_shared<problem>();
+    p->ny = ndim == 2 ? static_cast<std::ptrdiff_t>(a.shape(0)) : 1;
+    p->nx = static_cast<std::ptrdiff_t>(a.shape(ndim - 1));
+    p->ky = ndim == 2 ? static_cast<std::ptrdiff_t>(weights.shape(0)) : 1;
+    p->kx = static_cast<std::ptrdiff_t>(weights.shape(ndim - 1));
+    p->weights.assign(weights.data(), weights.data() + weights.size());
+    for (std::ptrdiff_t wi = 0; wi < p->ky; ++wi) {
+        double const* row = p->weights.data() + wi * p->kx;
+        p->row_sums.push_back(std::accumulate(row, row + p->kx, 0.0));
+    }
+    p->boundary = parse_boundary(boundary);
+    p->cval = cval;
+
+    if (a.size() == 0) return;
+    if (steps == 0) {
+        std::copy(a.data(), a.data() + a.size(), out.data());
+        return;
+    }
+    std::exception_ptr error;
+    {
+        nb::gil_scoped_release release;
+        try {
+            sweep(p, a.data(), out.data(), scratch.data(), steps);
+        } catch (...) {
+            error = std::current_exception();
+        }
+    }
+    if (error) std::rethrow_exception(error);
+}
+
+void register_bindings(nb::module_& m) {
+    m.def("apply", &apply, "a"_a, "weights"_a, "out"_a, "scratch"_a, "steps"_a,
+          "boundary"_a, "cval"_a = 0.0,
+          "Apply a 1-D or 2-D stencil `steps` times as per-tile HPX dataflow.");
+}
+
+}  // namespace hpyx::stencil
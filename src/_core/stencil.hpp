@@ -0,0 +1,33 @@
+#pragma once
+
+#include <nanobind/nanobind.h>
+#include <nanobind/ndarray.h>
+
+#include <cstddef>
+#include <string>
+
+namespace hpyx::stencil {
+
+using input = nanobind::ndarray<const double, nanobind::c_contig, nanobind::device::cpu>;
+using output = nanobind::ndarray<double, nanobind::c_contig, nanobind::device::cpu>;
+
+// Apply the stencil `weights` to the 1-D or 2-D array `a` `steps` times:
+// each step sets out[i] = sum_k weights[k] * prev[i + k - r] (a
+// correlation, r being the center of the odd-sized weights), reading
+// positions outside the array according to `boundary`: "constant" (the
+// value `cval`), "nearest" (the edge element), "periodic" or "reflect"
+// (mirrored about the edge, edge included).
+//
+// The array is split into tiles and every (step, tile) is an HPX dataflow
+// node that waits only for the tiles of the previous step it reads from
+// and for those that read the buffer it overwrites, so neighboring tiles
+// run ahead of distant ones with no barrier between steps. Steps alternate
+// between `out` and `scratch`, ending in `out`; `a` is only read, by the
+// first step, and must not overlap either buffer. The GIL is released
+// while the steps run.
+void apply(input a, input weights, output out, output scratch, std::size_t steps,
+    std::string const& boundary, double cval);
+
+void register_bindings(nanobind::module_& m);
+
+}  // namespace hpyx::stencil
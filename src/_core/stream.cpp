@@ -0,0 +1,439 @@
+#include "stream.hpp"
+
+#include <Python.h>
+
+#include <hpx/future.hpp>
+#include <nanobind/stl/string.h>
+
+#include <atomic>
+#include <cstddef>
+#include <cstdint>
+#include <deque>
+#include <exception>
+#include <map>
+#include <mutex>
+#include <stdexcept>
+#include <string>
+#include <utility>
+#include <vector>
+
+#include "futures.hpp"
+#include "gil.hpp"
+#include "tracing.hpp"
+
+namespace nb = nanobind;
+using namespace nb::literals;
+
+namespace hpyx::stream {
+
+namespace {
+
+// An item in flight: an owned reference, passed between threads without
+// the GIL. A null `value` is a hole, an item a filter dropped, which an
+// ordered channel needs in order to move past its sequence number.
+struct item {
+    std::uint64_t seq = 0;
+    PyObject* value = nullptr;
+};
+
+void release(item& x) {
+    if (x.value == nullptr) return;
+    hpyx::gil::acquire acquire(hpyx::gil::site::stream);
+    Py_DECREF(x.value);
+    x.value = nullptr;
+}
+
+// Bounded queue between two stages. Waiters block on HPX futures: an HPX
+// task waiting on a full or empty channel suspends and frees its worker,
+// and the consuming Python thread simply blocks on the future.
+//
+// An unordered channel is FIFO and holds up to `capacity` items. An
+// ordered one hands items out by sequence number, skipping holes, and
+// only admits the next `capacity` numbers, which bounds the reordering
+// buffer behind a parallel stage. It renumbers the items it hands out
+// densely, so the next channel sees no gaps.
+class channel {
+public:
+    channel(std::size_t capacity, bool ordered) : capacity_(capacity), ordered_(ordered) {}
+
+    // Block until there is room, then take ownership of `x`. Returns
+    // false, leaving `x` with the caller, once the channel is cancelled.
+    bool put(item const& x) {
+        for (;;) {
+            hpx::future<void> ready;
+            {
+                std::unique_lock<std::mutex> lk(mtx_);
+                if (cancelled_) return false;
+                bool const room = ordered_ ? x.seq < next_ + capacity_
+                                           : fifo_.size() < capacity_;
+                if (room) {
+                    if (ordered_) {
+                        pending_.emplace(x.seq, x);
+                    } else {
+                        fifo_.push_back(x);
+                    }
+                    wake(lk, getters_);
+                    return true;
+                }
+                putters_.emplace_back();
+                ready = putters_.back().get_future();
+            }
+            ready.get();
+        }
+    }
+
+    // Block until the next item is available and move it into `x`.
+    // Returns false at the end of the stream or once cancelled.
+    bool get(item& x) {
+        for (;;) {
+            hpx::future<void> ready;
+            {
+                std::unique_lock<std::mutex> lk(mtx_);
+                if (cancelled_) return false;
+                std::uint64_t const before = next_;
+                bool const taken = take(x);
+                if (taken || next_ != before) wake(lk, putters_);
+                if (taken) return true;
+                if (closed_ && pending_.empty() && fifo_.empty()) return false;
+                getters_.emplace_back();
+                ready = getters_.back().get_future();
+            }
+            ready.get();
+        }
+    }
+
+    // Every producer is done: getters drain what is left, then stop.
+    void close() {
+        std::unique_lock<std::mutex> lk(mtx_);
+        closed_ = true;
+        wake(lk, getters_);
+    }
+
+    // Fail every current and future put and get.
+    void cancel() {
+        std::unique_lock<std::mutex> lk(mtx_);
+        cancelled_ = true;
+        wake(lk, getters_, &putters_);
+    }
+
+    // Hand over the references still buffered. Call after every task
+    // using the channel has exited.
+    void drain(std::vector<PyObject*>& out) {
+        std::lock_guard<std::mutex> lk(mtx_);
+        for (auto& [seq, x] : pending_) {
+            if (x.value != nullptr) out.push_back(x.value);
+        }
+        for (auto& x : fifo_) out.push_back(x.value);
+        pending_.clear();
+        fifo_.clear();
+    }
+
+private:
+    bool take(item& x) {
+        if (!ordered_) {
+            if (fifo_.empty()) return false;
+            x = fifo_.front();
+            fifo_.pop_front();
+            return true;
+        }
+        while (!pending_.empty() && pending_.begin()->first == next_) {
+            item const head = pending_.begin()->second;
+            pending_.erase(pending_.begin());
+            ++next_;
+            if (head.value != nullptr) {
+                x = {delivered_++, head.value};
+                return true;
+            }
+        }
+        return false;
+    }
+
+    // Wake every waiter in `a` (and `b`); they re-check after the lock is
+    // released.
+    static void wake(std::unique_lock<std::mutex>& lk, std::vector<hpx::promise<void>>& a,
+        std::vector<hpx::promise<void>>* b = nullptr) {
+        std::vector<hpx::promise<void>> woken = std::move(a);
+        a.clear();
+        if (b != nullptr) {
+            for (auto& p : *b) woken.push_back(std::move(p));
+            b->clear();
+        }
+        lk.unlock();
+        for (auto& p : woken) p.set_value();
+        lk.lock();
+    }
+
+    std::mutex mtx_;
+    std::size_t const capacity_;
+    bool const ordered_;
+    bool closed_ = false;
+    bool cancelled_ = false;
+    std::deque<item> fifo_;
+    std::map<std::uint64_t, item> pending_;
+    std::uint64_t next_ = 0;       // ordered: sequence number to hand out next
+    std::uint64_t delivered_ = 0;  // ordered: items handed out
+    std::vector<hpx::promise<void>> getters_;
+    std::vector<hpx::promise<void>> putters_;
+};
+
+enum class stage_kind : std::uint8_t { map, filter, batch };
+
+struct stage {
+    stage_kind kind;
+    nb::object fn;  // map and filter
+    std::size_t parallelism = 1;
+    std::size_t batch = 0;
+    std::uint32_t name_id = 0;  // 0 when tracing was off
+    std::atomic<std::size_t> running{0};
+};
+
+}  // namespace
+
+// Owned by `run`; the tasks capture a pointer to it, and `run` joins
+// them before it is destroyed.
+struct pipeline_state {
+    nb::object source;
+    bool ordered = true;
+    std::vector<std::unique_ptr<stage>> stages;
+    // channels[k] feeds stage k; the last one feeds the consumer.
+    std::vector<std::unique_ptr<channel>> channels;
+    std::vector<hpx::future<void>> tasks;
+
+    std::mutex error_mtx;
+    std::exception_ptr error;
+
+    void fail(std::exception_ptr e) {
+        {
+            std::lock_guard<std::mutex> lk(error_mtx);
+            if (!error) error = std::move(e);
+        }
+        for (auto& c : channels) c->cancel();
+    }
+
+    // The last worker of stage k to exit ends its output.
+    void finish(std::size_t k) {
+        if (stages[k]->running.fetch_sub(1, std::memory_order_acq_rel) == 1) {
+            channels[k + 1]->close();
+        }
+    }
+};
+
+namespace {
+
+void feed(pipeline_state& s) {
+    channel& out = *s.channels.front();
+    try {
+        for (std::uint64_t seq = 0;; ++seq) {
+            item x{seq, nullptr};
+            {
+                hpyx::gil::acquire acquire(hpyx::gil::site::stream);
+                x.value = PyIter_Next(s.source.ptr());
+                if (x.value == nullptr) {
+                    if (PyErr_Occurred()) throw nb::python_error();
+                    break;
+                }
+            }
+            if (!out.put(x)) {
+                release(x);
+                return;
+            }
+        }
+        out.close();
+    } catch (...) {
+        s.fail(std::current_exception());
+    }
+}
+
+// A worker of a map or filter stage.
+void work(pipeline_state& s, std::size_t k) {
+    stage const& st = *s.stages[k];
+    channel& in = *s.channels[k];
+    channel& out = *s.channels[k + 1];
+    item x;
+    try {
+        while (in.get(x)) {
+            item y{x.seq, nullptr};
+            {
+                tracing::pending_task traced;
+                if (st.name_id != 0 && tracing::is_enabled()) {
+                    traced = {tracing::now_ns(), st.name_id, tracing::event_kind::task};
+                }
+                tracing::task_scope scope(traced);
+                hpyx::gil::acquire acquire(hpyx::gil::site::stream);
+                scope.gil_acquired();
+                nb::object value = nb::steal(x.value);
+                x.value = nullptr;
+                nb::object result = st.fn(value);
+                if (st.kind == stage_kind::map) {
+                    y.value = result.release().ptr();
+                } else {
+                    int const keep = PyObject_IsTrue(result.ptr());
+                    if (keep < 0) throw nb::python_error();
+                    if (keep) {
+                        y.value = value.release().ptr();
+                    } else if (!s.ordered) {
+                        continue;  // unordered channels need no hole
+                    }
+                }
+            }
+            if (!out.put(y)) {
+                release(y);
+                break;
+            }
+        }
+    } catch (...) {
+        s.fail(std::current_exception());
+    }
+    s.finish(k);
+}
+
+void batch(pipeline_state& s, std::size_t k) {
+    std::size_t const n = s.stages[k]->batch;
+    channel& in = *s.channels[k];
+    channel& out = *s.channels[k + 1];
+    std::vector<PyObject*> held;
+    held.reserve(n);
+    std::uint64_t seq = 0;
+
+    auto emit = [&]() -> bool {
+        item y{seq++, nullptr};
+        {
+            hpyx::gil::acquire acquire(hpyx::gil::site::stream);
+            PyObject* list = PyList_New(static_cast<Py_ssize_t>(held.size()));
+            if (list == nullptr) throw nb::python_error();
+            for (std::size_t i = 0; i < held.size(); ++i) {
+                PyList_SET_ITEM(list, static_cast<Py_ssize_t>(i), held[i]);
+            }
+            held.clear();
+            y.value = list;
+        }
+        if (out.put(y)) return true;
+        release(y);
+        return false;
+    };
+
+    try {
+        item x;
+        bool open = true;
+        while (open && in.get(x)) {
+            held.push_back(x.value);
+            if (held.size() == n) open = emit();
+        }
+        if (open && !held.empty()) emit();
+    } catch (...) {
+        s.fail(std::current_exception());
+    }
+    if (!held.empty()) {
+        hpyx::gil::acquire acquire(hpyx::gil::site::stream);
+        for (PyObject* obj : held) Py_DECREF(obj);
+    }
+    s.finish(k);
+}
+
+std::size_t positive(nb::handle value, char const* what) {
+    std::size_t const n = nb::cast<std::size_t>(value);
+    if (n == 0) throw std::invalid_argument(std::string(what) + " must be positive");
+    return n;
+}
+
+}  // namespace
+
+run::run(nb::object source, nb::list stages, std::size_t capacity, bool ordered)
+    : state_(new pipeline_state) {
+    futures::require_stack("a stream pipeline");
+    if (capacity == 0) throw std::invalid_argument("capacity must be positive");
+    pipeline_state& s = *state_;
+    s.source = std::move(source);
+    s.ordered = ordered;
+    bool const traced = tracing::is_enabled();
+    for (nb::handle spec_obj : stages) {
+        nb::tuple spec = nb::cast<nb::tuple>(spec_obj);
+        std::string const kind = nb::cast<std::string>(spec[0]);
+        auto st = std::make_unique<stage>();
+        if (kind == "map" || kind == "filter") {
+            st->kind = kind == "map" ? stage_kind::map : stage_kind::filter;
+            st->fn = nb::borrow(spec[1]);
+            st->parallelism = positive(spec[2], "parallelism");
+            if (traced) st->name_id = tracing::intern_name(st->fn);
+        } else if (kind == "batch") {
+            st->kind = stage_kind::batch;
+            st->batch = positive(spec[1], "batch size");
+        } else {
+            throw std::invalid_argument("Unknown pipeline stage: " + kind);
+        }
+        st->running.store(st->parallelism);
+        s.stages.push_back(std::move(st));
+    }
+    for (std::size_t k = 0; k <= s.stages.size(); ++k) {
+        s.channels.push_back(std::make_unique<channel>(capacity, ordered));
+    }
+
+    pipeline_state* p = state_.get();
+    try {
+        s.tasks.push_back(hpx::async(hpx::launch::async, [p] { feed(*p); }));
+        for (std::size_t k = 0; k < s.stages.size(); ++k) {
+            for (std::size_t w = 0; w < s.stages[k]->parallelism; ++w) {
+                if (s.stages[k]->kind == stage_kind::batch) {
+                    s.tasks.push_back(hpx::async(hpx::launch::async, [p, k] { batch(*p, k); }));
+                } else {
+                    s.tasks.push_back(hpx::async(hpx::launch::async, [p, k] { work(*p, k); }));
+                }
+            }
+        }
+    } catch (...) {
+        close();
+        throw;
+    }
+}
+
+run::~run() {
+    close();
+}
+
+void run::join() {
+    nb::gil_scoped_release release;
+    hpx::wait_all(state_->tasks);
+    state_->tasks.clear();
+}
+
+nb::object run::next() {
+    if (done_) throw nb::stop_iteration();
+    item x;
+    bool got;
+    {
+        nb::gil_scoped_release release;
+        got = state_->channels.back()->get(x);
+    }
+    if (got) return nb::steal(x.value);
+
+    done_ = true;
+    join();
+    if (state_->error) {
+        std::exception_ptr error = std::move(state_->error);
+        state_->error = nullptr;
+        close();
+        std::rethrow_exception(error);
+    }
+    throw nb::stop_iteration();
+}
+
+void run::close() {
+    done_ = true;
+    for (auto& c : state_->channels) c->cancel();
+    join();
+    std::vector<PyObject*> left;
+    for (auto& c : state_->channels) c->drain(left);
+    for (PyObject* obj : left) Py_DECREF(obj);
+}
+
+void register_bindings(nb::module_& m) {
+    nb::class_<run>(m, "Run")
+        .def(nb::init<nb::object, nb::list, std::size_t, bool>(),
+             "source"_a, "stages"_a, "capacity"_a, "ordered"_a)
+        .def("__iter__", [](nb::handle self) { return self; })
+        .def("__next__", &run::next)
+        .def("close", &run::close,
+             "Cancel the pipeline, wait for its tasks and drop buffered items.");
+}
+
+}  // namespace hpyx::stream
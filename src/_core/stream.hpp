@@ -0,0 +1,47 @@
+#pragma once
+
+#include <nanobind/nanobind.h>
+
+#include <cstddef>
+#include <memory>
+
+namespace hpyx::stream {
+
+struct pipeline_state;
+
+// One running hpyx.stream pipeline. `start` launches, as long-running HPX
+// tasks, a source task that pulls from a Python iterator and the workers
+// of every stage. Stages are connected by bounded channels, so a full
+// channel stalls the stages before it (and the source) instead of
+// buffering. Iterating the run yields the last stage's outputs.
+//
+// `stages` is a list of ("map", fn, parallelism), ("filter", fn,
+// parallelism) or ("batch", n). With `ordered`, outputs keep the source
+// order; otherwise they come out as soon as they are ready.
+class run {
+public:
+    run(nanobind::object source, nanobind::list stages, std::size_t capacity,
+        bool ordered);
+    ~run();
+
+    run(run const&) = delete;
+    run& operator=(run const&) = delete;
+
+    // The next output; raises StopIteration at the end and rethrows the
+    // first error raised by the source or a stage.
+    nanobind::object next();
+
+    // Cancel every stage, wait for the tasks to exit and drop buffered
+    // items. Idempotent.
+    void close();
+
+private:
+    void join();
+
+    std::unique_ptr<pipeline_state> state_;
+    bool done_ = false;
+};
+
+void register_bindings(nanobind::module_& m);
+
+}  // namespace hpyx::stream
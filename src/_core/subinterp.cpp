@@ -0,0 +1,295 @@
+#include "subinterp.hpp"
+#include "gil.hpp"
+
+#include <Python.h>
+
+#include <hpx/execution.hpp>
+#include <hpx/future.hpp>
+#include <hpx/runtime.hpp>
+#include <nanobind/stl/string.h>
+
+#include <atomic>
+#include <cstddef>
+#include <cstdint>
+#include <exception>
+#include <memory>
+#include <mutex>
+#include <stdexcept>
+#include <string>
+#include <utility>
+#include <vector>
+
+namespace nb = nanobind;
+using namespace nb::literals;
+
+namespace hpyx::subinterp {
+
+namespace {
+
+// One PEP 684 interpreter per HPX worker OS thread. Slot `k` is only ever
+// touched from worker `k` (creation, task execution, teardown), so the
+// slots themselves need no locking.
+struct worker_interpreter {
+    PyThreadState* tstate = nullptr;
+    PyObject* run = nullptr;  // `_hpyx_run` from the bootstrap, strong ref
+    // The worker's main-interpreter thread state, held from before the
+    // subinterpreter is created until it ends. CPython binds a thread's
+    // PyGILState slot to the first thread state created on it, so without
+    // this the slot would point at the subinterpreter, and a later
+    // PyGILState_Ensure on this worker would take the subinterpreter's GIL.
+    PyGILState_STATE main_gstate{};
+    PyThreadState* main_tstate = nullptr;
+};
+
+std::mutex g_cfg_mtx;
+std::string g_bootstrap;
+std::string g_init_payload;
+std::vector<worker_interpreter> g_interps;
+std::atomic<bool> g_enabled{false};
+
+// Py_buffer views exported by main-interpreter objects. The hand-back
+// continuation releases them on the caller's thread once the task is done;
+// the destructor only covers futures that are dropped without get().
+struct buffer_set {
+    std::vector<Py_buffer> views;
+
+    // Call with the main-interpreter GIL held.
+    void release() {
+        for (auto& view : views) PyBuffer_Release(&view);
+        views.clear();
+    }
+
+    ~buffer_set() {
+        if (views.empty()) return;
+        hpyx::gil::acquire acquire(hpyx::gil::site::buffer_release);
+        release();
+    }
+};
+
+// Format and clear the pending Python error of the *current* interpreter.
+std::string take_error_message() {
+    PyObject* exc = PyErr_GetRaisedException();
+    if (exc == nullptr) return "unknown error";
+    std::string message = Py_TYPE(exc)->tp_name;
+    if (PyObject* str = PyObject_Str(exc)) {
+        if (char const* text = PyUnicode_AsUTF8(str)) {
+            message += ": ";
+            message += text;
+        }
+        Py_DECREF(str);
+    }
+    PyErr_Clear();
+    Py_DECREF(exc);
+    return message;
+}
+
+// Create this worker's interpreter. Called on an HPX worker with no
+// thread state attached; returns with none attached.
+void create_interpreter(worker_interpreter& slot) {
+    // Attach a main-interpreter thread state first (reusing the worker's
+    // persistent one if it has been registered), so that it, not the new
+    // interpreter's, stays bound to this thread's PyGILState slot.
+    slot.main_gstate = PyGILState_Ensure();
+    PyThreadState* const main = PyThreadState_Get();
+
+    PyInterpreterConfig config{};
+    config.use_main_obmalloc = 0;
+    config.allow_fork = 0;
+    config.allow_exec = 0;
+    config.allow_threads = 1;
+    config.allow_daemon_threads = 0;
+    config.check_multi_interp_extensions = 1;
+    config.gil = PyInterpreterConfig_OWN_GIL;
+
+    PyThreadState* tstate = nullptr;
+    PyStatus status = Py_NewInterpreterFromConfig(&tstate, &config);
+    if (PyStatus_Exception(status)) {
+        PyGILState_Release(slot.main_gstate);
+        throw std::runtime_error(
+            std::string("HPyX could not create a worker subinterpreter: ") +
+            (status.err_msg != nullptr ? status.err_msg : "unknown error"));
+    }
+
+    // The new interpreter's GIL is held here; the main one was released.
+    std::string error;
+    PyObject* globals = PyModule_GetDict(PyImport_AddModule("__main__"));
+    PyObject* ran = PyRun_String(g_bootstrap.c_str(), Py_file_input, globals, globals);
+    if (ran == nullptr) {
+        error = take_error_message();
+    } else {
+        Py_DECREF(ran);
+        PyObject* init = PyDict_GetItemString(globals, "_hpyx_init");
+        PyObject* run = PyDict_GetItemString(globals, "_hpyx_run");
+        PyObject* done = init == nullptr ? nullptr
+            : PyObject_CallFunction(init, "y#", g_init_payload.data(),
+                  static_cast<Py_ssize_t>(g_init_payload.size()));
+        if (done == nullptr || run == nullptr) {
+            error = PyErr_Occurred() ? take_error_message()
+                                     : "bootstrap is missing _hpyx_init/_hpyx_run";
+        } else {
+            Py_DECREF(done);
+            Py_INCREF(run);
+            slot.run = run;
+        }
+    }
+
+    if (!error.empty()) {
+        Py_EndInterpreter(tstate);
+        PyEval_RestoreThread(main);
+        PyGILState_Release(slot.main_gstate);
+        throw std::runtime_error("HPyX worker subinterpreter bootstrap failed: " + error);
+    }
+    slot.tstate = PyEval_SaveThread();
+    PyEval_RestoreThread(main);
+    slot.main_tstate = PyEval_SaveThread();
+}
+
+worker_interpreter& current_interpreter() {
+    std::size_t const k = hpx::get_worker_thread_num();
+    if (k >= g_interps.size()) {
+        throw std::runtime_error(
+            "HPyX subinterpreter tasks must run on an HPX worker thread");
+    }
+    auto& slot = g_interps[k];
+    if (slot.tstate == nullptr) create_interpreter(slot);
+    return slot;
+}
+
+std::string run_task(std::string const& payload, buffer_set const& buffers) {
+    auto& slot = current_interpreter();
+    PyEval_RestoreThread(slot.tstate);
+
+    std::string error;
+    std::string out;
+    PyObject* views = PyList_New(static_cast<Py_ssize_t>(buffers.views.size()));
+    for (std::size_t i = 0; views != nullptr && i < buffers.views.size(); ++i) {
+        auto const& view = buffers.views[i];
+        PyObject* mv = PyMemoryView_FromMemory(static_cast<char*>(view.buf), view.len,
+            view.readonly ? PyBUF_READ : PyBUF_WRITE);
+        if (mv == nullptr) {
+            Py_CLEAR(views);
+            break;
+        }
+        PyList_SET_ITEM(views, static_cast<Py_ssize_t>(i), mv);
+    }
+    PyObject* result = views == nullptr ? nullptr
+        : PyObject_CallFunction(slot.run, "y#O", payload.data(),
+              static_cast<Py_ssize_t>(payload.size()), views);
+    Py_XDECREF(views);
+
+    char* data = nullptr;
+    Py_ssize_t size = 0;
+    if (result == nullptr || PyBytes_AsStringAndSize(result, &data, &size) != 0) {
+        error = take_error_message();
+    } else {
+        out.assign(data, static_cast<std::size_t>(size));
+    }
+    Py_XDECREF(result);
+
+    slot.tstate = PyEval_SaveThread();
+    if (!error.empty()) throw std::runtime_error(error);
+    return out;
+}
+
+void end_interpreter(worker_interpreter& slot) {
+    if (slot.tstate == nullptr) return;
+    PyEval_RestoreThread(slot.tstate);
+    Py_CLEAR(slot.run);
+    Py_EndInterpreter(slot.tstate);
+    slot.tstate = nullptr;
+    PyEval_RestoreThread(slot.main_tstate);
+    slot.main_tstate = nullptr;
+    PyGILState_Release(slot.main_gstate);
+}
+
+}  // namespace
+
+void configure(std::string bootstrap, nb::bytes init_payload) {
+    std::lock_guard<std::mutex> lk(g_cfg_mtx);
+    if (g_enabled.load()) {
+        throw std::runtime_error("HPyX subinterpreters are already configured");
+    }
+    g_bootstrap = std::move(bootstrap);
+    g_init_payload.assign(init_payload.c_str(), init_payload.size());
+    g_interps.assign(hpx::get_num_worker_threads(), worker_interpreter{});
+    g_enabled.store(true);
+}
+
+bool is_enabled() {
+    return g_enabled.load();
+}
+
+hpx::future<nb::object> submit(nb::bytes payload, nb::list buffers) {
+    if (!is_enabled()) {
+        throw std::runtime_error(
+            "HPyX subinterpreters are not enabled; call hpyx.init(subinterpreters=True)");
+    }
+
+    auto views = std::make_shared<buffer_set>();
+    views->views.reserve(nb::len(buffers));
+    for (nb::handle obj : buffers) {
+        Py_buffer view;
+        if (PyObject_GetBuffer(obj.ptr(), &view, PyBUF_C_CONTIGUOUS) != 0) {
+            throw nb::python_error();
+        }
+        views->views.push_back(view);
+    }
+    std::string data(payload.c_str(), payload.size());
+
+    // The worker side never touches main-interpreter objects.
+    hpx::future<std::string> raw = hpx::async(hpx::launch::async,
+        [data = std::move(data), views]() { return run_task(data, *views); });
+
+    // Deferred hand-back: runs in future.get() on the caller's thread, waits
+    // with the GIL released, then releases the views and builds the bytes
+    // object under the GIL. The task has returned by then, so releasing the
+    // views here keeps PyBuffer_Release off the workers.
+    return hpx::async(hpx::launch::deferred,
+        [raw = std::move(raw), views]() mutable -> nb::object {
+            std::string out;
+            std::exception_ptr error;
+            {
+                nb::gil_scoped_release release;
+                try {
+                    out = raw.get();
+                } catch (...) {
+                    error = std::current_exception();
+                }
+            }
+            views->release();
+            if (error) std::rethrow_exception(error);
+            return nb::bytes(out.data(), out.size());
+        });
+}
+
+void shutdown() {
+    std::lock_guard<std::mutex> lk(g_cfg_mtx);
+    if (!g_enabled.exchange(false)) return;
+
+    nb::gil_scoped_release release;
+    std::vector<hpx::future<void>> done;
+    for (std::size_t k = 0; k < g_interps.size(); ++k) {
+        if (g_interps[k].tstate == nullptr) continue;
+        // Bound priority + thread hint pins the teardown to worker k, the
+        // OS thread that owns the interpreter's thread state.
+        hpx::execution::parallel_executor exec(
+            hpx::threads::thread_priority::bound,
+            hpx::threads::thread_stacksize::default_,
+            hpx::threads::thread_schedule_hint(static_cast<std::int16_t>(k)));
+        done.push_back(hpx::async(exec, [k]() { end_interpreter(g_interps[k]); }));
+    }
+    hpx::wait_all(done);
+    g_interps.clear();
+}
+
+void register_bindings(nb::module_& m) {
+    m.def("configure", &configure, "bootstrap"_a, "init_payload"_a,
+          "Enable per-worker PEP 684 subinterpreters.");
+    m.def("is_enabled", &is_enabled);
+    m.def("submit", &submit, "payload"_a, "buffers"_a,
+          "Run a pickled task in the current HPX worker's subinterpreter.");
+    m.def("shutdown", &shutdown,
+          "End every worker subinterpreter. Call before stopping the runtime.");
+}
+
+}  // namespace hpyx::subinterp
@@ -0,0 +1,33 @@
+#pragma once
+
+#include <nanobind/nanobind.h>
+#include <hpx/future.hpp>
+
+#include <cstddef>
+#include <string>
+
+namespace hpyx::subinterp {
+
+// Enable per-worker subinterpreters. `bootstrap` is Python source run in
+// each new interpreter's __main__; it must define `_hpyx_init(bytes)` and
+// `_hpyx_run(bytes, list[memoryview]) -> bytes`. `init_payload` is passed
+// to `_hpyx_init` once per interpreter. Interpreters are created lazily,
+// the first time a task lands on each HPX worker.
+void configure(std::string bootstrap, nanobind::bytes init_payload);
+
+bool is_enabled();
+
+// Run `_hpyx_run(payload, views)` in the subinterpreter owned by whichever
+// HPX worker picks up the task. Each entry of `buffers` must export a
+// C-contiguous buffer; it is exposed to the subinterpreter as a flat
+// memoryview over the same memory (no copy) and kept alive until the task
+// finishes. The returned future yields the bytes returned by `_hpyx_run`.
+hpx::future<nanobind::object> submit(nanobind::bytes payload, nanobind::list buffers);
+
+// End every subinterpreter on the worker that owns it. Must be called
+// while the HPX runtime is still running; idempotent.
+void shutdown();
+
+void register_bindings(nanobind::module_& m);
+
+}  // namespace hpyx::subinterp
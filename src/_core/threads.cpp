@@ -0,0 +1,138 @@
+#include "threads.hpp"
+
+#include <Python.h>
+
+#include <hpx/execution.hpp>
+#include <hpx/future.hpp>
+#include <hpx/modules/thread_pools.hpp>
+#include <hpx/runtime.hpp>
+#include <hpx/runtime_local/thread_pool_helpers.hpp>
+
+#if defined(__linux__) || defined(__APPLE__)
+#include <pthread.h>
+#endif
+
+#include <algorithm>
+#include <cstddef>
+#include <cstdint>
+#include <exception>
+#include <mutex>
+#include <string>
+#include <utility>
+#include <vector>
+
+namespace nb = nanobind;
+using namespace nb::literals;
+
+namespace hpyx::threads {
+
+namespace {
+
+// A worker's persistent Python thread state. While it exists,
+// PyGILState_Ensure on that worker reuses it instead of creating and
+// destroying a thread state per acquisition, and `threading` keeps the
+// worker's name.
+struct worker_state {
+    hpx::threads::thread_pool_base* pool = nullptr;
+    std::size_t index = 0;  // pool-local thread number
+    PyGILState_STATE gstate{};
+    PyThreadState* tstate = nullptr;
+};
+
+std::mutex g_mtx;
+std::vector<worker_state> g_workers;
+
+void set_os_thread_name(std::string const& pool, std::size_t index) {
+    // Linux limits thread names to 15 bytes; keep the thread number and
+    // shorten the pool name instead.
+    std::string const suffix = "-" + std::to_string(index);
+    std::size_t const room = 15 - std::min<std::size_t>(15, 5 + suffix.size());
+    std::string const name = "hpyx-" + pool.substr(0, room) + suffix;
+#if defined(__linux__)
+    pthread_setname_np(pthread_self(), name.c_str());
+#elif defined(__APPLE__)
+    pthread_setname_np(name.c_str());
+#else
+    (void) name;
+#endif
+}
+
+hpx::execution::parallel_executor pinned_executor(
+    hpx::threads::thread_pool_base* pool, std::size_t index) {
+    // Bound priority + thread hint runs the task on that exact OS thread.
+    return hpx::execution::parallel_executor(pool,
+        hpx::threads::thread_priority::bound,
+        hpx::threads::thread_stacksize::default_,
+        hpx::threads::thread_schedule_hint(static_cast<std::int16_t>(index)));
+}
+
+}  // namespace
+
+void register_workers(nb::callable callback) {
+    std::lock_guard<std::mutex> lk(g_mtx);
+    if (!g_workers.empty()) return;
+
+    std::vector<worker_state> workers;
+    std::vector<std::string> pool_names;
+    std::size_t const num_pools = hpx::resource::get_num_thread_pools();
+    for (std::size_t p = 0; p < num_pools; ++p) {
+        auto& pool = hpx::resource::get_thread_pool(p);
+        for (std::size_t k = 0; k < pool.get_os_thread_count(); ++k) {
+            workers.push_back(worker_state{&pool, k});
+            pool_names.push_back(pool.get_pool_name());
+        }
+    }
+
+    std::vector<std::exception_ptr> errors(workers.size());
+    {
+        nb::gil_scoped_release release;
+        std::vector<hpx::future<void>> done;
+        for (std::size_t i = 0; i < workers.size(); ++i) {
+            done.push_back(hpx::async(pinned_executor(workers[i].pool, workers[i].index),
+                [&, i]() {
+                    auto& w = workers[i];
+                    std::size_t const global = w.pool->get_thread_offset() + w.index;
+                    set_os_thread_name(pool_names[i], w.index);
+                    w.gstate = PyGILState_Ensure();
+                    try {
+                        callback(global, pool_names[i], w.index,
+                            "hpyx-worker-" + pool_names[i] + "-" + std::to_string(w.index));
+                    } catch (...) {
+                        errors[i] = std::current_exception();
+                    }
+                    w.tstate = PyEval_SaveThread();
+                }));
+        }
+        hpx::wait_all(done);
+    }
+    g_workers = std::move(workers);
+    for (auto const& error : errors) {
+        if (error) std::rethrow_exception(error);
+    }
+}
+
+void release_workers() {
+    std::lock_guard<std::mutex> lk(g_mtx);
+    if (g_workers.empty()) return;
+    nb::gil_scoped_release release;
+    std::vector<hpx::future<void>> done;
+    for (auto& w : g_workers) {
+        if (w.tstate == nullptr) continue;
+        done.push_back(hpx::async(pinned_executor(w.pool, w.index), [&w]() {
+            PyEval_RestoreThread(w.tstate);
+            w.tstate = nullptr;
+            PyGILState_Release(w.gstate);
+        }));
+    }
+    hpx::wait_all(done);
+    g_workers.clear();
+}
+
+void register_bindings(nb::module_& m) {
+    m.def("register_workers", &register_workers, "callback"_a,
+          "Name every HPX worker thread and give it a persistent Python thread state.");
+    m.def("release_workers", &release_workers,
+          "Drop the worker thread states. Call before stopping the runtime.");
+}
+
+}  // namespace hpyx::threads
@@ -0,0 +1,25 @@
+#pragma once
+
+#include <nanobind/nanobind.h>
+
+namespace hpyx::threads {
+
+// Run once on every HPX worker OS thread, pinned there:
+// - set the OS thread name to "hpyx-<pool>-<n>", where <n> is the
+//   pool-local thread number and the pool name is shortened to fit the
+//   15-byte kernel limit;
+// - give the thread a Python thread state that persists until
+//   `release_workers()`;
+// - call `callback(worker, pool, index, name)` with the GIL held so Python
+//   can register the thread. `worker` is the global worker id and `name`
+//   the full "hpyx-worker-<pool>-<n>".
+// Waits with the GIL released; idempotent.
+void register_workers(nanobind::callable callback);
+
+// Drop the thread states created by `register_workers`, each on its own
+// worker. Must run while the runtime is still up; idempotent.
+void release_workers();
+
+void register_bindings(nanobind::module_& m);
+
+}  // namespace hpyx::threads
@@ -0,0 +1,261 @@
+#include "tracing.hpp"
+
+#include <hpx/runtime.hpp>
+#include <nanobind/stl/string.h>
+
+#include <chrono>
+#include <condition_variable>
+#include <cstddef>
+#include <cstdint>
+#include <cstdio>
+#include <deque>
+#include <fstream>
+#include <memory>
+#include <mutex>
+#include <stdexcept>
+#include <string>
+#include <thread>
+#include <unordered_map>
+#include <utility>
+
+namespace nb = nanobind;
+using namespace nb::literals;
+
+namespace hpyx::tracing {
+
+std::atomic<bool> g_enabled{false};
+
+namespace {
+
+// Single-producer / single-consumer ring. The producer is the one OS
+// thread behind an HPX worker; the consumer is the flusher thread.
+struct ring {
+    static constexpr std::uint64_t capacity = std::uint64_t{1} << 16;
+
+    std::unique_ptr<trace_event[]> slots{new trace_event[capacity]};
+    alignas(64) std::atomic<std::uint64_t> head{0};  // next slot to write
+    alignas(64) std::atomic<std::uint64_t> tail{0};  // next slot to read
+    std::atomic<std::uint64_t> dropped{0};
+
+    void push(trace_event const& event) {
+        std::uint64_t const h = head.load(std::memory_order_relaxed);
+        if (h - tail.load(std::memory_order_acquire) >= capacity) {
+            dropped.fetch_add(1, std::memory_order_relaxed);
+            return;
+        }
+        slots[h & (capacity - 1)] = event;
+        head.store(h + 1, std::memory_order_release);
+    }
+
+    template <typename F>
+    void drain(F&& f) {
+        std::uint64_t t = tail.load(std::memory_order_relaxed);
+        std::uint64_t const h = head.load(std::memory_order_acquire);
+        for (; t != h; ++t) f(slots[t & (capacity - 1)]);
+        tail.store(t, std::memory_order_release);
+    }
+};
+
+// Rings are allocated on first start() and never freed, so a task that
+// finishes while tracing is being disabled can always record safely.
+// Slot `num_workers` collects events from non-HPX threads (deferred tasks
+// run inside future.get()); its producers serialize on g_external_mtx.
+ring* g_rings = nullptr;
+std::size_t g_num_workers = 0;
+std::mutex g_external_mtx;
+
+std::mutex g_names_mtx;
+std::unordered_map<std::string, std::uint32_t> g_name_ids;
+std::deque<std::string> g_names;  // JSON-escaped, indexed by name id
+
+std::mutex g_ctl_mtx;  // guards start/stop and the flusher state below
+std::thread g_flusher;
+std::mutex g_out_mtx;  // guards g_out; held while draining into it
+std::ofstream g_out;
+std::condition_variable g_flush_cv;
+std::mutex g_flush_mtx;
+bool g_flush_stop = false;
+
+std::string json_escape(std::string const& text) {
+    std::string out;
+    out.reserve(text.size());
+    for (char c : text) {
+        switch (c) {
+            case '"': out += "\\\""; break;
+            case '\\': out += "\\\\"; break;
+            case '\n': out += "\\n"; break;
+            case '\t': out += "\\t"; break;
+            default:
+                if (static_cast<unsigned char>(c) < 0x20) {
+                    char buf[8];
+                    std::snprintf(buf, sizeof(buf), "\\u%04x", c);
+                    out += buf;
+                } else {
+                    out += c;
+                }
+        }
+    }
+    return out;
+}
+
+char const* kind_name(event_kind kind) {
+    switch (kind) {
+        case event_kind::kernel: return "kernel";
+        case event_kind::gil: return "gil";
+        default: return "task";
+    }
+}
+
+void drain_all(std::ostream* out) {
+    std::lock_guard<std::mutex> names(g_names_mtx);
+    char line[160];
+    for (std::size_t k = 0; k <= g_num_workers; ++k) {
+        g_rings[k].drain([&](trace_event const& e) {
+            if (out == nullptr) return;
+            *out << "{\"name\":\"" << g_names[e.name_id] << "\",\"cat\":\""
+                 << kind_name(e.kind) << '"';
+            std::snprintf(line, sizeof(line),
+                ",\"worker_thread_id\":%d,\"submit_ns\":%lld,\"start_ns\":%lld,"
+                "\"end_ns\":%lld,\"gil_wait_ns\":%lld}\n",
+                static_cast<int>(e.worker), static_cast<long long>(e.submit_ns),
+                static_cast<long long>(e.start_ns), static_cast<long long>(e.end_ns),
+                static_cast<long long>(e.gil_wait_ns));
+            *out << line;
+        });
+    }
+}
+
+void flush_out() {
+    std::lock_guard<std::mutex> lk(g_out_mtx);
+    if (!g_out.is_open()) return;
+    drain_all(&g_out);
+    g_out.flush();
+}
+
+void flush_loop(std::chrono::milliseconds interval) {
+    bool stopping = false;
+    while (!stopping) {
+        {
+            std::unique_lock<std::mutex> lk(g_flush_mtx);
+            g_flush_cv.wait_for(lk, interval, [] { return g_flush_stop; });
+            stopping = g_flush_stop;
+        }
+        flush_out();
+    }
+    std::lock_guard<std::mutex> lk(g_out_mtx);
+    g_out.close();
+}
+
+}  // namespace
+
+std::int64_t now_ns() {
+    return std::chrono::duration_cast<std::chrono::nanoseconds>(
+        std::chrono::steady_clock::now().time_since_epoch()).count();
+}
+
+std::uint32_t intern_name(nb::handle fn) {
+    nb::object qualname = nb::getattr(fn, "__qualname__", nb::none());
+    if (!nb::isinstance<nb::str>(qualname)) {
+        qualname = nb::getattr(fn.type(), "__qualname__", nb::str("<unknown>"));
+    }
+    return intern_name(nb::cast<std::string>(qualname));
+}
+
+std::uint32_t intern_name(std::string const& name) {
+    std::lock_guard<std::mutex> lk(g_names_mtx);
+    auto [it, inserted] =
+        g_name_ids.try_emplace(name, static_cast<std::uint32_t>(g_names.size()));
+    if (inserted) g_names.push_back(json_escape(it->first));
+    return it->second;
+}
+
+void record(trace_event const& event) {
+    if (g_rings == nullptr) return;
+    std::size_t const k = static_cast<std::size_t>(event.worker);
+    if (event.worker >= 0 && k < g_num_workers) {
+        g_rings[k].push(event);
+    } else {
+        std::lock_guard<std::mutex> lk(g_external_mtx);
+        g_rings[g_num_workers].push(event);
+    }
+}
+
+task_scope::~task_scope() {
+    if (task_.submit_ns == 0) return;
+    std::int64_t const end = now_ns();
+    std::size_t const worker = hpx::get_worker_thread_num();
+    record(trace_event{
+        task_.submit_ns,
+        start_ns_,
+        end,
+        gil_ns_ != 0 ? gil_ns_ - start_ns_ : 0,
+        worker == std::size_t(-1) ? -1 : static_cast<std::int32_t>(worker),
+        task_.name_id,
+        task_.kind,
+    });
+}
+
+void start(std::string const& path, std::int64_t flush_interval_ms) {
+    std::lock_guard<std::mutex> lk(g_ctl_mtx);
+    if (g_flusher.joinable()) {
+        throw std::runtime_error("HPyX tracing is already enabled");
+    }
+    {
+        std::lock_guard<std::mutex> olk(g_out_mtx);
+        g_out.open(path, std::ios::app);
+        if (!g_out) {
+            g_out.close();
+            throw std::runtime_error("Cannot open trace file: " + path);
+        }
+        if (g_rings == nullptr) {
+            g_num_workers = hpx::get_num_worker_threads();
+            g_rings = new ring[g_num_workers + 1];
+        } else {
+            drain_all(nullptr);  // discard stragglers from a previous session
+        }
+    }
+    {
+        std::lock_guard<std::mutex> flk(g_flush_mtx);
+        g_flush_stop = false;
+    }
+    g_flusher = std::thread(flush_loop, std::chrono::milliseconds(flush_interval_ms));
+    g_enabled.store(true, std::memory_order_release);
+}
+
+void stop() {
+    std::lock_guard<std::mutex> lk(g_ctl_mtx);
+    g_enabled.store(false, std::memory_order_release);
+    if (!g_flusher.joinable()) return;
+    {
+        std::lock_guard<std::mutex> flk(g_flush_mtx);
+        g_flush_stop = true;
+    }
+    g_flush_cv.notify_all();
+    g_flusher.join();
+}
+
+void flush() {
+    flush_out();
+}
+
+std::uint64_t dropped() {
+    std::uint64_t total = 0;
+    for (std::size_t k = 0; g_rings != nullptr && k <= g_num_workers; ++k) {
+        total += g_rings[k].dropped.load(std::memory_order_relaxed);
+    }
+    return total;
+}
+
+void register_bindings(nb::module_& m) {
+    m.def("start", &start, "path"_a, "flush_interval_ms"_a = 100,
+          nb::call_guard<nb::gil_scoped_release>(),
+          "Enable per-task tracing, flushing JSONL to `path` in the background.");
+    m.def("stop", &stop, nb::call_guard<nb::gil_scoped_release>(),
+          "Disable tracing and flush every buffered event. Idempotent.");
+    m.def("flush", &flush, nb::call_guard<nb::gil_scoped_release>(),
+          "Write every buffered event to the trace file now.");
+    m.def("is_enabled", &is_enabled);
+    m.def("dropped", &dropped, "Events dropped because a ring buffer was full.");
+}
+
+}  // namespace hpyx::tracing
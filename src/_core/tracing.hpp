@@ -0,0 +1,95 @@
+#pragma once
+
+#include <nanobind/nanobind.h>
+
+#include <atomic>
+#include <cstdint>
+#include <string>
+
+namespace hpyx::tracing {
+
+enum class event_kind : std::uint8_t {
+    task = 0,    // a Python callable scheduled as an HPX task
+    kernel = 1,  // a phase inside a C++ kernel, e.g. one chunk of for_loop
+    gil = 2,     // one GIL acquisition (see hpyx::gil), start to acquired
+};
+
+// One task's timeline. Times are steady_clock nanoseconds.
+struct trace_event {
+    std::int64_t submit_ns;
+    std::int64_t start_ns;     // task body began (before taking the GIL)
+    std::int64_t end_ns;
+    std::int64_t gil_wait_ns;  // time spent acquiring the GIL
+    std::int32_t worker;       // HPX worker thread, -1 off-worker
+    std::uint32_t name_id;     // interned function qualname / phase name
+    event_kind kind;
+};
+
+// Near zero-cost when disabled: one atomic load.
+extern std::atomic<bool> g_enabled;
+
+inline bool is_enabled() { return g_enabled.load(std::memory_order_acquire); }
+
+std::int64_t now_ns();
+
+// Intern `fn.__qualname__` (GIL held). Cheap after the first call per name.
+std::uint32_t intern_name(nanobind::handle fn);
+
+// Intern a fixed name such as a kernel phase; callable without the GIL.
+std::uint32_t intern_name(std::string const& name);
+
+// Push an event into the calling worker's ring buffer. Never blocks on an
+// HPX worker; drops the event (and counts it) if the ring is full.
+void record(trace_event const& event);
+
+// Captured at submit time (GIL held) and moved into the task.
+struct pending_task {
+    std::int64_t submit_ns = 0;  // 0: tracing was off at submit
+    std::uint32_t name_id = 0;
+    event_kind kind = event_kind::task;
+
+    static pending_task capture(nanobind::handle fn) {
+        if (!is_enabled()) return {};
+        return {now_ns(), intern_name(fn), event_kind::task};
+    }
+
+    // A kernel phase starting now; `name_id` from intern_name(std::string).
+    static pending_task kernel(std::uint32_t name_id) {
+        if (!is_enabled()) return {};
+        return {now_ns(), name_id, event_kind::kernel};
+    }
+};
+
+// Times a task body. Construct before acquiring the GIL, call
+// `gil_acquired()` right after; the event is recorded on destruction,
+// including when the body throws.
+class task_scope {
+public:
+    explicit task_scope(pending_task const& task)
+        : task_(task), start_ns_(task.submit_ns != 0 ? now_ns() : 0) {}
+
+    void gil_acquired() {
+        if (task_.submit_ns != 0) gil_ns_ = now_ns();
+    }
+
+    ~task_scope();
+
+    task_scope(task_scope const&) = delete;
+    task_scope& operator=(task_scope const&) = delete;
+
+private:
+    pending_task task_;
+    std::int64_t start_ns_;
+    std::int64_t gil_ns_ = 0;
+};
+
+// Start the background flusher appending JSONL to `path`; idempotent stop.
+void start(std::string const& path, std::int64_t flush_interval_ms);
+void stop();
+
+// Write every buffered event to the trace file now.
+void flush();
+
+void register_bindings(nanobind::module_& m);
+
+}  // namespace hpyx::tracing
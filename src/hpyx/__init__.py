@@ -7,36 +7,72 @@ try:
 except ImportError:
     __version__ = "0.0.0"
 
-from hpyx import _runtime, config, debug
+from hpyx import _runtime, cache, config, debug, io, stream
 from hpyx._runtime import is_running, shutdown
 
 from hpyx.executor import HPXExecutor
 from hpyx.runtime import HPXRuntime
-from hpyx import futures, multiprocessing
+from hpyx import array, dask, distributed, futures, kernels, multiprocessing
+from hpyx.array import Array
+from hpyx._delayed import Delayed, compute, delayed
+from hpyx._taskgraph import run_graph
+from hpyx.distributed import find_all_localities
 
 
 def init(
     *,
     os_threads: int | None = None,
     cfg: list[str] | None = None,
+    subinterpreters: bool | None = None,
+    small_stack_size: int | None = None,
+    tcp_enable: bool | None = None,
 ) -> None:
     """Explicitly start the HPX runtime. Idempotent within a process.
 
+    With ``subinterpreters=True`` every HPX worker owns a PEP 684
+    subinterpreter with its own GIL, and `hpyx.futures.submit` and parallel
+    `hpyx.multiprocessing.for_loop` run Python callables there.
+
+    ``small_stack_size`` sets the size in bytes of HPX's "small" stacks,
+    the default for HPX threads and for ``stacksize="small"`` tasks.
+
+    ``tcp_enable=True`` switches on HPX's TCP parcelport, which a
+    multi-locality job (see `hpyx.distributed`) needs.
+
     Raises RuntimeError if the runtime is already started with conflicting
     config, or if the runtime was previously stopped (HPX cannot restart).
     """
-    _runtime.ensure_started(os_threads=os_threads, cfg=cfg)
+    _runtime.ensure_started(
+        os_threads=os_threads,
+        cfg=cfg,
+        subinterpreters=subinterpreters,
+        small_stack_size=small_stack_size,
+        tcp_enable=tcp_enable,
+    )
 
 
 __all__ = [
+    "Array",
+    "Delayed",
     "HPXExecutor",
     "HPXRuntime",
     "__version__",
+    "array",
+    "cache",
+    "compute",
     "config",
+    "dask",
     "debug",
+    "delayed",
+    "distributed",
+    "find_all_localities",
     "futures",
     "init",
+    "io",
     "is_running",
+    "kernels",
     "multiprocessing",
+    "run_graph",
     "shutdown",
+    "stream",
 ]
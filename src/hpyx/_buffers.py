@@ -0,0 +1,53 @@
+"""Zero-copy exchange of arrays with other libraries.
+
+Native kernels read any buffer-protocol object or CPU DLPack tensor in
+place (see ``src/_core/buffers.hpp``); `is_native_input` tells the Python
+wrappers when to hand an object over as it is. `to_framework` returns
+results in the caller's array library through DLPack.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+import numpy as np
+
+
+def is_native_input(obj: Any) -> bool:
+    """Whether native kernels can read `obj` without converting it first."""
+    if isinstance(obj, np.ndarray) or hasattr(obj, "__dlpack__"):
+        return True
+    if type(obj).__name__ == "PyCapsule":  # a raw DLPack capsule
+        return True
+    try:
+        memoryview(obj).release()
+    except TypeError:
+        return False
+    return True
+
+
+def to_framework(result: np.ndarray, framework: Any) -> Any:
+    """Return `result` as an array of `framework`, without copying.
+
+    Parameters
+    ----------
+    result : numpy.ndarray
+        A result computed by HPyX.
+    framework : module or None
+        ``None`` or `numpy` keep the NumPy array. Any other module must
+        provide ``from_dlpack``, as ``torch``, ``jax.numpy`` and
+        ``cupy`` do; the array is handed over through DLPack.
+
+    Raises
+    ------
+    TypeError
+        If `framework` has no ``from_dlpack``.
+    """
+    if framework is None or framework is np:
+        return result
+    from_dlpack = getattr(framework, "from_dlpack", None)
+    if from_dlpack is None:
+        name = getattr(framework, "__name__", type(framework).__name__)
+        msg = f"{name} has no from_dlpack, so HPyX cannot return arrays in it"
+        raise TypeError(msg)
+    return from_dlpack(np.asarray(result))
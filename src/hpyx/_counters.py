@@ -0,0 +1,207 @@
+"""HPX performance counters: snapshots and a periodic sampler.
+
+Re-exported by `hpyx.debug`. Counter names follow HPX's syntax,
+``/object{locality#L/instance}/counter``; ``*`` wildcards in the instance
+part expand to every match (e.g. one counter per worker thread).
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import threading
+import time
+from collections.abc import Callable, Iterable
+from pathlib import Path
+from typing import Any, Self
+
+from hpyx import _core, _runtime
+
+DEFAULT_COUNTERS: tuple[str, ...] = (
+    "/threads{locality#0/total}/idle-rate",
+    "/threadqueue{locality#0/total}/length",
+    "/threads{locality#0/total}/count/cumulative",
+    "/threads{locality#0/total}/time/average-overhead",
+)
+
+_sets_lock = threading.Lock()
+_sets: dict[tuple[str, ...], Any] = {}
+
+_COUNTER_NAME = re.compile(r"^/(?P<object>[^{/]+)\{(?P<instance>[^}]*)\}/(?P<counter>.+)$")
+
+
+def _normalize(patterns: str | Iterable[str]) -> tuple[str, ...]:
+    if isinstance(patterns, str):
+        return (patterns,)
+    return tuple(patterns)
+
+
+def _counter_set(patterns: tuple[str, ...]) -> Any:
+    _runtime.ensure_started()
+    with _sets_lock:
+        counter_set = _sets.get(patterns)
+        if counter_set is None:
+            counter_set = _core.counters.CounterSet(list(patterns))
+            _sets[patterns] = counter_set
+        return counter_set
+
+
+def counters(
+    patterns: str | Iterable[str] = DEFAULT_COUNTERS, *, reset: bool = False
+) -> dict[str, float]:
+    """Return a snapshot of HPX performance counters.
+
+    Parameters
+    ----------
+    patterns : str or iterable of str, default DEFAULT_COUNTERS
+        Counter names or wildcard patterns, e.g.
+        ``"/threads{locality#0/worker-thread#*}/idle-rate"``.
+    reset : bool, default False
+        Reset the counters after reading them, so the next snapshot covers
+        only the interval in between.
+
+    Returns
+    -------
+    dict of str to float
+        Expanded counter name to its current value, in HPX's units
+        (``idle-rate`` is in 0.01%, times are in nanoseconds).
+
+    Raises
+    ------
+    ValueError
+        If no counter matches `patterns`.
+    """
+    counter_set = _counter_set(_normalize(patterns))
+    return dict(zip(counter_set.names(), counter_set.values(reset), strict=True))
+
+
+def _metric_name(counter: str) -> tuple[str, str]:
+    match = _COUNTER_NAME.match(counter)
+    if match is None:
+        return "hpx_" + re.sub(r"\W", "_", counter).strip("_"), ""
+    path = f"{match['object']}_{match['counter']}"
+    return "hpx_" + re.sub(r"\W", "_", path), match["instance"]
+
+
+def format_prometheus(values: dict[str, float]) -> str:
+    """Render counter values in the Prometheus text exposition format.
+
+    ``/threads{locality#0/total}/idle-rate`` becomes
+    ``hpx_threads_idle_rate{instance="locality#0/total"}``.
+    """
+    by_metric: dict[str, list[tuple[str, float]]] = {}
+    for counter, value in values.items():
+        metric, instance = _metric_name(counter)
+        by_metric.setdefault(metric, []).append((instance, value))
+    lines: list[str] = []
+    for metric, samples in by_metric.items():
+        lines.append(f"# TYPE {metric} gauge")
+        for instance, value in samples:
+            if not instance:
+                lines.append(f"{metric} {value!r}")
+                continue
+            label = instance.replace("\\", "\\\\").replace('"', '\\"')
+            lines.append(f'{metric}{{instance="{label}"}} {value!r}')
+    return "\n".join(lines) + "\n"
+
+
+class CounterSampler:
+    """Sample HPX performance counters periodically on a background thread.
+
+    Each sample is passed to `callback` as ``callback(timestamp, values)``
+    and/or written to `prometheus_path` in the Prometheus text format
+    (replaced atomically, for node_exporter's textfile collector).
+
+    Parameters
+    ----------
+    patterns : str or iterable of str, default DEFAULT_COUNTERS
+        Counters to sample; see `counters`.
+    interval : float, default 1.0
+        Seconds between samples.
+    callback : callable, optional
+        Called with ``(time.time(), {name: value})`` after every sample.
+        Exceptions it raises stop the sampler and are re-raised by `stop`.
+    prometheus_path : str or path-like, optional
+        File to rewrite with the latest sample.
+    reset : bool, default False
+        Reset counters after each sample (per-interval values).
+
+    Examples
+    --------
+    >>> with CounterSampler(interval=0.5, callback=print):
+    ...     run_workload()
+    """
+
+    def __init__(
+        self,
+        patterns: str | Iterable[str] = DEFAULT_COUNTERS,
+        interval: float = 1.0,
+        *,
+        callback: Callable[[float, dict[str, float]], Any] | None = None,
+        prometheus_path: str | os.PathLike[str] | None = None,
+        reset: bool = False,
+    ) -> None:
+        if interval <= 0:
+            msg = f"interval must be positive, got {interval!r}"
+            raise ValueError(msg)
+        if callback is None and prometheus_path is None:
+            msg = "CounterSampler needs a callback, a prometheus_path, or both"
+            raise ValueError(msg)
+        self._patterns = _normalize(patterns)
+        self._interval = interval
+        self._callback = callback
+        self._path = None if prometheus_path is None else Path(prometheus_path)
+        self._reset = reset
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._error: BaseException | None = None
+        self.latest: dict[str, float] = {}
+
+    def start(self) -> Self:
+        """Start sampling. Returns `self`."""
+        if self._thread is not None:
+            msg = "CounterSampler is already started"
+            raise RuntimeError(msg)
+        _counter_set(self._patterns)  # resolve names now, so bad patterns raise here
+        self._thread = threading.Thread(target=self._run, name="hpyx-counter-sampler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop sampling, taking one final sample first."""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    def __enter__(self) -> Self:
+        return self.start()
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.stop()
+
+    def _sample(self) -> None:
+        values = counters(self._patterns, reset=self._reset)
+        self.latest = values
+        if self._path is not None:
+            tmp = self._path.with_name(self._path.name + ".tmp")
+            with tmp.open("w", encoding="utf-8") as f:
+                f.write(format_prometheus(values))
+            tmp.replace(self._path)
+        if self._callback is not None:
+            self._callback(time.time(), values)
+
+    def _run(self) -> None:
+        try:
+            while not self._stop.wait(self._interval):
+                if not _runtime.is_running():
+                    return
+                self._sample()
+            if _runtime.is_running():
+                self._sample()
+        except BaseException as exc:  # re-raised by stop()
+            self._error = exc
@@ -0,0 +1,257 @@
+"""Lazy task graphs: `delayed` and `compute`.
+
+``@hpyx.delayed`` turns a function into one that records a call instead of
+making it. The returned `Delayed` stands for the eventual result and can be
+passed to other delayed calls; `compute` optimizes the recorded graph and
+runs it as HPX dataflow (see `hpyx._taskgraph`).
+"""
+
+from __future__ import annotations
+
+import functools
+import operator
+import uuid
+from collections.abc import Callable, Hashable, Iterator
+from typing import Any
+
+from ._taskgraph import Ref, Task, execute
+
+
+def _funcname(func: Callable[..., Any]) -> str:
+    return getattr(func, "__name__", type(func).__name__)
+
+
+def _to_arg(obj: Any, deps: dict[Hashable, Delayed]) -> Any:
+    """Replace the `Delayed` objects nested in `obj` by `Ref`s."""
+    if isinstance(obj, Delayed):
+        deps[obj._key] = obj
+        return Ref(obj._key)
+    if type(obj) in (tuple, list):
+        items = [_to_arg(item, deps) for item in obj]
+        return tuple(items) if type(obj) is tuple else items
+    if type(obj) is dict:
+        return {k: _to_arg(v, deps) for k, v in obj.items()}
+    return obj
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+def _apply(func: Callable[..., Any], args: tuple[Any, ...], kwargs: dict[str, Any]) -> Any:
+    return func(*args, **kwargs)
+
+
+def _call(
+    func: Callable[..., Any],
+    args: tuple[Any, ...],
+    kwargs: dict[str, Any],
+    *,
+    pure: bool,
+    name: str | None = None,
+) -> Delayed:
+    deps: dict[Hashable, Delayed] = {}
+    task = Task(func, _to_arg(args, deps), _to_arg(kwargs, deps), pure=pure)
+    key = f"{name or _funcname(func)}-{uuid.uuid4().hex}"
+    return Delayed(key, task, tuple(deps.values()))
+
+
+def _binop(
+    op: Callable[[Any, Any], Any], reflected: bool = False
+) -> Callable[[Delayed, Any], Delayed]:
+    def method(self: Delayed, other: Any) -> Delayed:
+        args = (other, self) if reflected else (self, other)
+        return _call(op, args, {}, pure=True)
+
+    return method
+
+
+class Delayed:
+    """The lazily computed result of a `delayed` call.
+
+    Attribute access, indexing, calls and arithmetic on a `Delayed` are
+    recorded as further tasks. Evaluate with `compute` or `Delayed.compute`.
+    """
+
+    __slots__ = ("_dependencies", "_key", "_task")
+
+    def __init__(self, key: Hashable, task: Any, dependencies: tuple[Delayed, ...]) -> None:
+        self._key = key
+        self._task = task
+        self._dependencies = dependencies
+
+    @property
+    def key(self) -> Hashable:
+        """This result's key in the task graph."""
+        return self._key
+
+    def compute(self, **kwargs: Any) -> Any:
+        """Compute this value; keyword arguments are those of `compute`."""
+        return compute(self, **kwargs)[0]
+
+    def __repr__(self) -> str:
+        return f"Delayed({self._key!r})"
+
+    def __getattr__(self, name: str) -> Delayed:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return _call(getattr, (self, name), {}, pure=True, name=name)
+
+    def __getitem__(self, index: Any) -> Delayed:
+        return _call(operator.getitem, (self, index), {}, pure=True, name="getitem")
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Delayed:
+        return _call(_apply, (self, args, kwargs), {}, pure=False, name="call")
+
+    def __bool__(self) -> bool:
+        msg = "the truth value of a Delayed object is unknown until it is computed"
+        raise TypeError(msg)
+
+    def __iter__(self) -> Iterator[Any]:
+        msg = "Delayed objects are not iterable; index them or compute them first"
+        raise TypeError(msg)
+
+    __add__ = _binop(operator.add)
+    __radd__ = _binop(operator.add, reflected=True)
+    __sub__ = _binop(operator.sub)
+    __rsub__ = _binop(operator.sub, reflected=True)
+    __mul__ = _binop(operator.mul)
+    __rmul__ = _binop(operator.mul, reflected=True)
+    __truediv__ = _binop(operator.truediv)
+    __rtruediv__ = _binop(operator.truediv, reflected=True)
+    __floordiv__ = _binop(operator.floordiv)
+    __rfloordiv__ = _binop(operator.floordiv, reflected=True)
+    __mod__ = _binop(operator.mod)
+    __rmod__ = _binop(operator.mod, reflected=True)
+    __pow__ = _binop(operator.pow)
+    __rpow__ = _binop(operator.pow, reflected=True)
+    __matmul__ = _binop(operator.matmul)
+    __rmatmul__ = _binop(operator.matmul, reflected=True)
+
+    def __neg__(self) -> Delayed:
+        return _call(operator.neg, (self,), {}, pure=True)
+
+
+def delayed(obj: Any = None, *, pure: bool = False, name: str | None = None) -> Any:
+    """Record calls to a function, or wrap a value, for lazy evaluation.
+
+    Use as ``@hpyx.delayed`` or ``@hpyx.delayed(pure=True)`` on a function:
+    calling the result records the call and returns a `Delayed`. Arguments
+    may be other `Delayed` objects, also inside lists, tuples and dicts.
+    Applied to any other value, ``delayed(value)`` returns a `Delayed` for
+    it, with nested `Delayed` objects resolved at compute time.
+
+    Parameters
+    ----------
+    obj : callable or object, optional
+        The function to wrap or the value to make lazy.
+    pure : bool, default False
+        Declare that the function has no side effects and depends only on
+        its arguments. Identical pure calls in one graph are computed once.
+    name : str, optional
+        Prefix of the recorded tasks' keys; defaults to the function name.
+
+    Returns
+    -------
+    callable or Delayed
+
+    Examples
+    --------
+    >>> import hpyx
+    >>> @hpyx.delayed
+    ... def inc(x):
+    ...     return x + 1
+    >>> @hpyx.delayed(pure=True)
+    ... def add(x, y):
+    ...     return x + y
+    >>> total = add(inc(1), inc(2))
+    >>> hpyx.compute(total)
+    (5,)
+    """
+    if obj is None:
+        return functools.partial(delayed, pure=pure, name=name)
+    if isinstance(obj, Delayed):
+        return obj
+    if callable(obj):
+
+        @functools.wraps(obj)
+        def record(*args: Any, **kwargs: Any) -> Delayed:
+            return _call(obj, args, kwargs, pure=pure, name=name)
+
+        return record
+    deps: dict[Hashable, Delayed] = {}
+    value = _to_arg(obj, deps)
+    key = f"{name or type(obj).__name__}-{uuid.uuid4().hex}"
+    if not deps:
+        return Delayed(key, value, ())
+    return Delayed(key, Task(_identity, (value,), pure=True), tuple(deps.values()))
+
+
+def _collect(roots: list[Delayed]) -> dict[Hashable, Any]:
+    graph: dict[Hashable, Any] = {}
+    stack = list(roots)
+    while stack:
+        node = stack.pop()
+        if node._key in graph:
+            continue
+        graph[node._key] = node._task
+        stack.extend(node._dependencies)
+    return graph
+
+
+def compute(
+    *objs: Any, optimize_graph: bool = True, stacksize: str | None = None
+) -> tuple[Any, ...]:
+    """Compute several lazy objects in one optimized HPX dataflow graph.
+
+    Unused tasks are culled. With `optimize_graph`, identical pure tasks are
+    merged and linear chains of tasks are fused into single HPX tasks,
+    which removes per-task overhead from long chains of cheap steps.
+    `hpyx.Array` arguments are computed together with `hpyx.array.compute`;
+    other values are returned as they are, after resolving any `Delayed`
+    objects nested in lists, tuples and dicts.
+
+    Parameters
+    ----------
+    *objs
+        `Delayed` objects, `hpyx.Array`\\ s or plain values.
+    optimize_graph : bool, default True
+        Merge identical pure tasks and fuse linear chains.
+    stacksize : {"nostack", "small", "medium", "large"}, optional
+        HPX stack size for every task. ``"nostack"`` tasks must not
+        wait for other HPX work; see `hpyx.futures.submit`.
+
+    Returns
+    -------
+    tuple
+        One result per argument.
+    """
+    from .array import Array
+    from .array import compute as compute_arrays
+
+    results: list[Any] = list(objs)
+    arrays = {i: obj for i, obj in enumerate(objs) if isinstance(obj, Array)}
+    if arrays:
+        for i, value in zip(arrays, compute_arrays(*arrays.values()), strict=True):
+            results[i] = value
+
+    lazy: dict[int, Delayed] = {}
+    for i, obj in enumerate(objs):
+        if isinstance(obj, Delayed):
+            lazy[i] = obj
+        elif i not in arrays and type(obj) in (tuple, list, dict):
+            nested: dict[Hashable, Delayed] = {}
+            _to_arg(obj, nested)
+            if nested:
+                lazy[i] = delayed(obj)
+    if lazy:
+        roots = list(lazy.values())
+        values = execute(
+            _collect(roots),
+            [root._key for root in roots],
+            optimize=optimize_graph,
+            stacksize=stacksize,
+        )
+        for i, value in zip(lazy, values, strict=True):
+            results[i] = value
+    return tuple(results)
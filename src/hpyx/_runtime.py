@@ -6,41 +6,90 @@ it raises instead of auto-starting).
 
 Shutdown is registered with `atexit` on first start; users should not call
 `_core.runtime.runtime_stop()` directly.
+
+HPX worker threads do not survive `fork()`. A child forked from a process
+with a running runtime is marked unusable: `ensure_started()` raises and the
+atexit handler skips the (hanging) C++ shutdown.
 """
 
 from __future__ import annotations
 
 import atexit
+import os
 import threading
 from typing import Any
 
 from hpyx import config as _config
-from hpyx import _core
+from hpyx import _core, _worker_threads
 
 _lock = threading.Lock()
 _started = False
 _started_cfg: dict[str, Any] | None = None
 _atexit_registered = False
+_forked_from_running = False
+
+
+def _split_address(address: str, *, what: str) -> tuple[str, int]:
+    host, sep, port = address.rpartition(":")
+    if not sep or not host or not port.isdigit():
+        msg = f"{what} must be 'host:port', got {address!r}"
+        raise ValueError(msg)
+    return host, int(port)
 
 
 def _build_cfg_strings(
-    *, os_threads: int | None, cfg: list[str]
+    *,
+    os_threads: int | None,
+    cfg: list[str],
+    small_stack_size: int | None = None,
+    tcp_enable: bool = False,
+    localities: int = 1,
+    locality_id: int = 0,
+    agas_address: str | None = None,
+    parcel_address: str | None = None,
+    worker: bool = False,
 ) -> list[str]:
-    """Translate Python kwargs into HPX-style config strings."""
+    """Translate Python kwargs into HPX-style config strings.
+
+    With ``tcp_enable`` the TCP parcelport is switched on and, for
+    ``localities > 1``, this process joins a multi-locality job:
+    ``agas_address`` is locality 0's listening endpoint and
+    ``parcel_address`` this locality's own (both ``host:port``).
+    """
     result: list[str] = []
     if os_threads is not None:
         result.append(f"hpx.os_threads!={int(os_threads)}")
-    result.append("hpx.run_hpx_main!=1")
+    if small_stack_size is not None:
+        result.append(f"hpx.stacks.small_size!={int(small_stack_size):#x}")
+    result.append(f"hpx.run_hpx_main!={0 if worker else 1}")
     result.append("hpx.commandline.allow_unknown!=1")
     result.append("hpx.commandline.aliasing!=0")
     result.append("hpx.diagnostics_on_terminate!=0")
-    result.append("hpx.parcel.tcp.enable!=0")
+    result.append(f"hpx.parcel.tcp.enable!={1 if tcp_enable else 0}")
+    if tcp_enable:
+        result.append("hpx.parcel.bootstrap!=tcp")
+        result.append(f"hpx.localities!={int(localities)}")
+        result.append(f"hpx.locality!={int(locality_id)}")
+        result.append(f"hpx.agas.service_mode!={'hosted' if locality_id else 'bootstrap'}")
+        if agas_address is not None:
+            host, port = _split_address(agas_address, what="agas_address")
+            result.append(f"hpx.agas.address!={host}")
+            result.append(f"hpx.agas.port!={port}")
+        if parcel_address is not None:
+            host, port = _split_address(parcel_address, what="parcel_address")
+            result.append(f"hpx.parcel.address!={host}")
+            result.append(f"hpx.parcel.port!={port}")
     result.extend(cfg)
     return result
 
 
 def _normalized_cfg(
-    *, os_threads: int | None = None, cfg: list[str] | None = None
+    *,
+    os_threads: int | None = None,
+    cfg: list[str] | None = None,
+    subinterpreters: bool | None = None,
+    small_stack_size: int | None = None,
+    tcp_enable: bool | None = None,
 ) -> dict[str, Any]:
     """Merge kwargs → env vars → DEFAULTS into a canonical config dict."""
     env = _config.from_env()
@@ -48,16 +97,48 @@ def _normalized_cfg(
         os_threads = env["os_threads"]
     if cfg is None:
         cfg = env["cfg"]
+    if subinterpreters is None:
+        subinterpreters = env["subinterpreters"]
+    if small_stack_size is None:
+        small_stack_size = env["small_stack_size"]
+    if tcp_enable is None:
+        tcp_enable = env["tcp_enable"]
     return {
         "os_threads": os_threads,
         "cfg": list(cfg),
         "autoinit": env["autoinit"],
         "trace_path": env["trace_path"],
+        "subinterpreters": bool(subinterpreters),
+        "small_stack_size": small_stack_size,
+        "tcp_enable": bool(tcp_enable),
+        "localities": env["localities"],
+        "locality_id": env["locality_id"],
+        "agas_address": env["agas_address"],
+        "parcel_address": env["parcel_address"],
     }
 
 
+def _cfg_strings_for(normalized: dict[str, Any], *, worker: bool = False) -> list[str]:
+    return _build_cfg_strings(
+        os_threads=normalized["os_threads"],
+        cfg=normalized["cfg"],
+        small_stack_size=normalized["small_stack_size"],
+        tcp_enable=normalized["tcp_enable"],
+        localities=normalized["localities"],
+        locality_id=normalized["locality_id"],
+        agas_address=normalized["agas_address"],
+        parcel_address=normalized["parcel_address"],
+        worker=worker,
+    )
+
+
 def ensure_started(
-    *, os_threads: int | None = None, cfg: list[str] | None = None
+    *,
+    os_threads: int | None = None,
+    cfg: list[str] | None = None,
+    subinterpreters: bool | None = None,
+    small_stack_size: int | None = None,
+    tcp_enable: bool | None = None,
 ) -> None:
     """Start the HPX runtime if not already started. Idempotent.
 
@@ -68,9 +149,34 @@ def ensure_started(
     kwargs always start the runtime.
     """
     global _started, _started_cfg, _atexit_registered
-    normalized = _normalized_cfg(os_threads=os_threads, cfg=cfg)
+    # Lock-free fast path for the common "already running, use defaults"
+    # call made by every public API; a plain bool read is atomic on both
+    # GIL and free-threaded builds.
+    explicit = (
+        os_threads is not None
+        or cfg is not None
+        or subinterpreters is not None
+        or small_stack_size is not None
+        or tcp_enable is not None
+    )
+    if _started and not explicit:
+        return
+    normalized = _normalized_cfg(
+        os_threads=os_threads,
+        cfg=cfg,
+        subinterpreters=subinterpreters,
+        small_stack_size=small_stack_size,
+        tcp_enable=tcp_enable,
+    )
 
     with _lock:
+        if _forked_from_running:
+            msg = (
+                "HPyX runtime cannot be used in a process forked from a parent "
+                "with a running runtime (HPX cannot restart after fork); use "
+                "the 'spawn' or 'forkserver' multiprocessing start method"
+            )
+            raise RuntimeError(msg)
         if _started:
             if _started_cfg is not None:
                 # Only raise on an explicit conflict — caller passing None means
@@ -83,51 +189,145 @@ def ensure_started(
                     cfg is not None
                     and _started_cfg["cfg"] != list(cfg)
                 )
-                if conflict_threads or conflict_cfg:
+                conflict_subinterp = (
+                    subinterpreters is not None
+                    and _started_cfg["subinterpreters"] != bool(subinterpreters)
+                )
+                conflict_stack = (
+                    small_stack_size is not None
+                    and _started_cfg["small_stack_size"] != small_stack_size
+                )
+                conflict_tcp = (
+                    tcp_enable is not None
+                    and _started_cfg["tcp_enable"] != bool(tcp_enable)
+                )
+                if (
+                    conflict_threads
+                    or conflict_cfg
+                    or conflict_subinterp
+                    or conflict_stack
+                    or conflict_tcp
+                ):
                     raise RuntimeError(
                         "HPyX runtime already started with different config: "
                         f"existing={_started_cfg!r}, requested={normalized!r}"
                     )
             return
 
-        explicit = os_threads is not None or cfg is not None
         if not explicit and not normalized["autoinit"]:
             raise RuntimeError(
                 "HPyX auto-init is disabled (HPYX_AUTOINIT=0) and no "
                 "explicit hpyx.init(...) call was made"
             )
 
-        cfg_strings = _build_cfg_strings(
-            os_threads=normalized["os_threads"], cfg=normalized["cfg"]
-        )
-        _core.runtime.runtime_start(cfg_strings)
+        if normalized["tcp_enable"] and normalized["locality_id"] != 0:
+            msg = (
+                f"HPYX_LOCALITY_ID={normalized['locality_id']} is a worker "
+                "locality; run it with `python -m hpyx.distributed.worker`"
+            )
+            raise RuntimeError(msg)
+        multi = normalized["tcp_enable"] and normalized["localities"] > 1
+        _core.runtime.runtime_start(_cfg_strings_for(normalized), "console" if multi else "default")
         _started = True
         _started_cfg = normalized
+        _core.threads.register_workers(_worker_threads.register)
+        if normalized["trace_path"]:
+            _core.tracing.start(normalized["trace_path"], 100)
+        if normalized["subinterpreters"]:
+            from hpyx import _subinterp
+
+            _subinterp.configure()
 
         if not _atexit_registered:
             atexit.register(_atexit_shutdown)
             _atexit_registered = True
 
 
+def run_worker() -> int:
+    """Serve as a worker locality of a multi-locality job until it ends.
+
+    Configuration comes from HPYX_* environment variables, as set by
+    `hpyx.distributed.launch`. Blocks the calling thread; returns HPX's exit
+    code once the console locality shuts the job down.
+    """
+    global _started, _started_cfg
+    normalized = _normalized_cfg(tcp_enable=True)
+    cfg_strings = _cfg_strings_for(normalized, worker=True)
+    with _lock:
+        if _started:
+            msg = "HPyX runtime is already running in this process"
+            raise RuntimeError(msg)
+        _started = True
+        _started_cfg = normalized
+    try:
+        return int(_core.runtime.runtime_run_worker(cfg_strings))
+    finally:
+        # HPX has stopped by now; it cannot be restarted in this process.
+        with _lock:
+            _started = False
+            _started_cfg = None
+
+
+def _stop() -> None:
+    """Tear down runtime-owned state, then stop HPX. Caller holds `_lock`."""
+    global _started
+    # Flush buffered trace events while the workers can still finish tasks.
+    _core.tracing.stop()
+    # Counter handles are AGAS ids; they cannot be released after stop.
+    _core.counters.release_all()
+    if _started_cfg is not None and _started_cfg["subinterpreters"]:
+        # Subinterpreters live on HPX workers; end them while those still run.
+        _core.subinterp.shutdown()
+    # Worker thread states must be dropped on their own threads.
+    _core.threads.release_workers()
+    _worker_threads.clear()
+    _core.runtime.runtime_stop()
+    _started = False
+
+
 def _atexit_shutdown() -> None:
     """Called at process exit. Tolerant of double-shutdown."""
     global _started
-    if _started:
-        try:
-            _core.runtime.runtime_stop()
-        except Exception:  # noqa: BLE001 — atexit must never raise
-            pass
-        _started = False
+    with _lock:
+        if _started:
+            try:
+                _stop()
+            except Exception:  # noqa: BLE001 — atexit must never raise
+                pass
+            _started = False
 
 
 def shutdown() -> None:
     """Explicit shutdown. Irreversible within the process."""
-    global _started
     with _lock:
         if _started:
-            _core.runtime.runtime_stop()
-            _started = False
+            _stop()
+
+
+def subinterpreters_enabled() -> bool:
+    """True if the runtime was started with per-worker subinterpreters."""
+    cfg = _started_cfg
+    return _started and cfg is not None and bool(cfg["subinterpreters"])
 
 
 def is_running() -> bool:
+    if _forked_from_running:
+        return False
     return _core.runtime.runtime_is_running()
+
+
+def _after_fork_in_child() -> None:
+    """Mark a forked child unusable if the parent's runtime was running.
+
+    The child inherits the C++ runtime manager but none of its worker
+    threads, so any call into `_core.runtime` would block forever.
+    """
+    global _lock, _started, _forked_from_running
+    _lock = threading.Lock()
+    if _started:
+        _started = False
+        _forked_from_running = True
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork_in_child)
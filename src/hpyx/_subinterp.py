@@ -0,0 +1,108 @@
+"""Main-interpreter side of the per-worker subinterpreter execution mode.
+
+Enabled with ``hpyx.init(subinterpreters=True)`` (or ``HPYX_SUBINTERPRETERS=1``).
+Each HPX worker then lazily creates its own PEP 684 subinterpreter with its
+own GIL, and `hpyx.futures.submit` / parallel `for_loop` run the callable
+there, so pure-Python CPU work scales with ``os_threads`` on a standard
+CPython build.
+
+Callables and arguments cross the interpreter boundary as pickles, so the
+callable must be importable by module path in a fresh interpreter (not
+defined in ``__main__``). C-contiguous NumPy arrays are not pickled: their
+memory is exposed to the task as a memoryview (``arr.data`` semantics,
+zero copy), because NumPy itself cannot be imported in a subinterpreter.
+See `_subinterp_bootstrap` for the wire format.
+"""
+
+from __future__ import annotations
+
+import io
+import itertools
+import pickle
+import sys
+from collections.abc import Callable
+from importlib import resources
+from typing import Any
+
+import numpy as np
+
+from hpyx import _core
+
+# memoryview.cast() formats that NumPy can turn back into a dtype.
+_SHAREABLE_FORMATS = frozenset("bBhHiIlLqQfd?")
+
+
+class _TaskPickler(pickle.Pickler):
+    def __init__(self, file: io.BytesIO) -> None:
+        super().__init__(file, protocol=5)
+        self.arrays: list[np.ndarray] = []
+
+    def persistent_id(self, obj: object) -> tuple[Any, ...] | None:
+        if (
+            type(obj) is np.ndarray
+            and obj.ndim >= 1
+            and obj.flags.c_contiguous
+            and obj.dtype.char in _SHAREABLE_FORMATS
+            and obj.dtype.isnative
+        ):
+            self.arrays.append(obj)
+            return ("input", len(self.arrays) - 1, obj.dtype.char, obj.shape)
+        return None
+
+
+class _ResultUnpickler(pickle.Unpickler):
+    def __init__(self, data: bytes, arrays: list[np.ndarray]) -> None:
+        super().__init__(io.BytesIO(data))
+        self._arrays = arrays
+
+    def persistent_load(self, pid: tuple[Any, ...]) -> Any:
+        if pid[0] == "input":
+            return self._arrays[pid[1]]
+        _tag, data, fmt, shape = pid
+        return np.frombuffer(bytearray(data), dtype=np.dtype(fmt)).reshape(shape)
+
+
+def _encode(task: tuple[Any, ...]) -> tuple[bytes, list[np.ndarray]]:
+    out = io.BytesIO()
+    pickler = _TaskPickler(out)
+    pickler.dump(task)
+    return out.getvalue(), pickler.arrays
+
+
+def _decode(payload: bytes, arrays: list[np.ndarray]) -> Any:
+    ok, value, text = _ResultUnpickler(payload, arrays).load()
+    if ok:
+        return value
+    if text:
+        value.add_note(f"Raised in an HPyX worker subinterpreter:\n{text}")
+    raise value
+
+
+def configure() -> None:
+    """Enable subinterpreters in `_core`. Called once by `_runtime`."""
+    source = resources.files("hpyx").joinpath("_subinterp_bootstrap.py").read_text()
+    init_payload = pickle.dumps({"sys_path": list(sys.path)})
+    _core.subinterp.configure(source, init_payload)
+
+
+def submit(task: tuple[Any, ...]) -> _core.future:
+    """Run an encoded task tuple in a worker subinterpreter."""
+    payload, arrays = _encode(task)
+    return _core.subinterp.submit(payload, arrays).then(_decode, arrays)
+
+
+def call(fn: Callable[..., Any], /, *args: Any, **kwargs: Any) -> _core.future:
+    """Return a future for ``fn(*args, **kwargs)`` run in a worker subinterpreter."""
+    return submit(("call", fn, args, kwargs))
+
+
+def map_chunks(fn: Callable[[Any], Any], items: list[Any], num_chunks: int) -> list[Any]:
+    """Apply `fn` to `items` in parallel, one subinterpreter task per chunk."""
+    size = len(items)
+    num_chunks = max(1, min(size, num_chunks))
+    bounds = [size * i // num_chunks for i in range(num_chunks + 1)]
+    futures = [submit(("map", fn, items[lo:hi])) for lo, hi in itertools.pairwise(bounds)]
+    results: list[Any] = []
+    for future in futures:
+        results.extend(future.get())
+    return results
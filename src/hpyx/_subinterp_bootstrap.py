@@ -0,0 +1,83 @@
+"""Bootstrap run inside each HPyX worker subinterpreter.
+
+The C++ side executes this file's *source* in the ``__main__`` namespace of
+every PEP 684 subinterpreter it creates. Those interpreters cannot import
+``hpyx`` (its nanobind extension and NumPy are single-interpreter modules),
+so this file must stay standard-library only.
+
+Wire format (shared with `hpyx._subinterp`):
+
+- Task payload: pickle of ``("call", fn, args, kwargs)`` or
+  ``("map", fn, items)``. NumPy arrays from the caller are replaced by
+  persistent ids ``("input", index, format, shape)`` and arrive as
+  zero-copy memoryviews over the caller's memory.
+- Result payload: pickle of ``(ok, value, traceback_text)``. A memoryview
+  that is one of the inputs is sent back as ``("input", index)``; any other
+  memoryview is copied once as ``("array", data, format, shape)``.
+"""
+
+from __future__ import annotations
+
+import io
+import pickle
+import sys
+import traceback
+from typing import Any
+
+
+def _hpyx_init(payload: bytes) -> None:
+    config = pickle.loads(payload)
+    sys.path[:] = config["sys_path"]
+
+
+class _TaskUnpickler(pickle.Unpickler):
+    def __init__(self, data: bytes, buffers: list[memoryview]) -> None:
+        super().__init__(io.BytesIO(data))
+        self._buffers = buffers
+        self.inputs: dict[int, int] = {}
+
+    def persistent_load(self, pid: tuple[Any, ...]) -> memoryview:
+        _tag, index, fmt, shape = pid
+        view: memoryview = self._buffers[index].cast(fmt, shape)
+        self.inputs[id(view)] = index
+        return view
+
+
+class _ResultPickler(pickle.Pickler):
+    def __init__(self, file: io.BytesIO, inputs: dict[int, int]) -> None:
+        super().__init__(file, protocol=5)
+        self._inputs = inputs
+
+    def persistent_id(self, obj: object) -> tuple[Any, ...] | None:
+        if not isinstance(obj, memoryview):
+            return None
+        index = self._inputs.get(id(obj))
+        if index is not None:
+            return ("input", index)
+        return ("array", obj.tobytes(), obj.format, obj.shape)
+
+
+def _dump_result(result: tuple[Any, ...], inputs: dict[int, int]) -> bytes:
+    out = io.BytesIO()
+    _ResultPickler(out, inputs).dump(result)
+    return out.getvalue()
+
+
+def _hpyx_run(payload: bytes, buffers: list[memoryview]) -> bytes:
+    unpickler = _TaskUnpickler(payload, buffers)
+    try:
+        task = unpickler.load()
+        if task[0] == "map":
+            _kind, fn, items = task
+            value = [fn(item) for item in items]
+        else:
+            _kind, fn, args, kwargs = task
+            value = fn(*args, **kwargs)
+        return _dump_result((True, value, None), unpickler.inputs)
+    except BaseException as exc:  # shipped back to the caller
+        text = traceback.format_exc()
+        try:
+            return _dump_result((False, exc, text), {})
+        except Exception:  # the exception itself is unpicklable
+            fallback = RuntimeError(f"{type(exc).__name__}: {exc}")
+            return _dump_result((False, fallback, text), {})
@@ -0,0 +1,485 @@
+"""Task graphs: optimization passes and execution as HPX dataflow.
+
+A graph maps hashable keys to `Task`s or to literal values. A task's
+arguments may hold `Ref` placeholders, nested inside lists, tuples and
+dicts, that stand for the results of other keys. Before running a graph,
+`execute`:
+
+- culls every key the requested outputs do not depend on;
+- merges tasks marked ``pure`` that call the same function with identical
+  arguments (common-subexpression elimination);
+- fuses linear chains, where each task's only input is the result of a task
+  nothing else uses, into one HPX task;
+
+and then hands the graph to `_core.graph.execute`. That wires every node
+with ``hpx::dataflow``, so each task runs on an HPX worker as soon as its
+inputs exist.
+
+`run_graph` runs plain ``{key: (fn, *args)}`` dictionaries the same way,
+one HPX node per task, without the `Task` wrappers or the optimization
+passes.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Hashable, Iterable, Iterator
+from typing import Any
+
+from hpyx import _core, _runtime
+
+# Argument values compared by value when merging identical tasks; all
+# other objects must be the same object.
+_VALUE_TYPES = (type(None), bool, int, float, complex, str, bytes)
+
+
+class Ref:
+    """Placeholder for the result of `key` in a task's arguments."""
+
+    __slots__ = ("key",)
+
+    def __init__(self, key: Hashable) -> None:
+        self.key = key
+
+    def __repr__(self) -> str:
+        return f"Ref({self.key!r})"
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, Ref) and other.key == self.key
+
+    def __hash__(self) -> int:
+        return hash(("Ref", self.key))
+
+
+class Task:
+    """A call ``func(*args, **kwargs)`` whose arguments may contain `Ref`s.
+
+    ``pure`` marks the call as free of side effects and dependent only on
+    its arguments, which allows identical calls to be merged.
+    """
+
+    __slots__ = ("args", "func", "kwargs", "pure")
+
+    def __init__(
+        self,
+        func: Callable[..., Any],
+        args: tuple[Any, ...] = (),
+        kwargs: dict[str, Any] | None = None,
+        *,
+        pure: bool = False,
+    ) -> None:
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs or {}
+        self.pure = pure
+
+    def __repr__(self) -> str:
+        name = getattr(self.func, "__qualname__", type(self.func).__qualname__)
+        return f"Task({name}, args={self.args!r}, kwargs={self.kwargs!r})"
+
+    def dependencies(self) -> list[Hashable]:
+        """Keys referenced by the arguments, in first-use order."""
+        return list(dict.fromkeys(_refs((self.args, self.kwargs))))
+
+
+def _refs(obj: Any) -> Iterator[Hashable]:
+    if isinstance(obj, Ref):
+        yield obj.key
+    elif isinstance(obj, (list, tuple)):
+        for item in obj:
+            yield from _refs(item)
+    elif isinstance(obj, dict):
+        for item in obj.values():
+            yield from _refs(item)
+
+
+def substitute(obj: Any, values: dict[Hashable, Any]) -> Any:
+    """Replace every `Ref` in `obj` by ``values[ref.key]``."""
+    if isinstance(obj, Ref):
+        return values[obj.key]
+    if type(obj) is tuple:
+        return tuple(substitute(item, values) for item in obj)
+    if type(obj) is list:
+        return [substitute(item, values) for item in obj]
+    if type(obj) is dict:
+        return {k: substitute(v, values) for k, v in obj.items()}
+    return obj
+
+
+def _rename(obj: Any, renames: dict[Hashable, Hashable]) -> Any:
+    return substitute(obj, _RenameMap(renames))
+
+
+class _RenameMap(dict[Hashable, Hashable]):
+    """Substitution map that renames refs instead of resolving them."""
+
+    def __getitem__(self, key: Hashable) -> Ref:
+        return Ref(self.get(key, key))
+
+
+def _dependencies(value: Any) -> list[Hashable]:
+    return value.dependencies() if isinstance(value, Task) else []
+
+
+def toposort(graph: dict[Hashable, Any], outputs: Iterable[Hashable]) -> list[Hashable]:
+    """Keys reachable from `outputs`, dependencies first.
+
+    Raises
+    ------
+    KeyError
+        If a key is referenced but missing from `graph`.
+    ValueError
+        If the graph has a cycle.
+    """
+    order: list[Hashable] = []
+    state: dict[Hashable, bool] = {}  # False: on the stack, True: done
+    for root in outputs:
+        if root in state:
+            continue
+        stack = [(root, iter(_dependencies(graph[root])))]
+        state[root] = False
+        while stack:
+            key, deps = stack[-1]
+            for dep in deps:
+                seen = state.get(dep)
+                if seen is None:
+                    if dep not in graph:
+                        msg = f"task graph has no key {dep!r} (needed by {key!r})"
+                        raise KeyError(msg)
+                    state[dep] = False
+                    stack.append((dep, iter(_dependencies(graph[dep]))))
+                    break
+                if seen is False:
+                    msg = f"task graph has a cycle through {dep!r}"
+                    raise ValueError(msg)
+            else:
+                stack.pop()
+                state[key] = True
+                order.append(key)
+    return order
+
+
+def cull(graph: dict[Hashable, Any], outputs: Iterable[Hashable]) -> dict[Hashable, Any]:
+    """Return the part of `graph` that `outputs` depend on, in dependency order."""
+    return {key: graph[key] for key in toposort(graph, outputs)}
+
+
+def _signature(obj: Any, renames: dict[Hashable, Hashable]) -> Hashable:
+    if isinstance(obj, Ref):
+        return ("ref", renames.get(obj.key, obj.key))
+    if isinstance(obj, float | complex):
+        # By repr, not value: 0.0 == -0.0, but math.copysign tells them apart.
+        return (type(obj), repr(obj))
+    if isinstance(obj, _VALUE_TYPES):
+        return (type(obj), obj)
+    if type(obj) in (tuple, list):
+        return (type(obj), tuple(_signature(item, renames) for item in obj))
+    if type(obj) is dict:
+        return (
+            dict,
+            tuple((_signature(k, renames), _signature(v, renames)) for k, v in obj.items()),
+        )
+    return ("id", id(obj))
+
+
+def merge_identical(
+    graph: dict[Hashable, Any],
+) -> tuple[dict[Hashable, Any], dict[Hashable, Hashable]]:
+    """Merge pure tasks that make the same call on the same inputs.
+
+    `graph` must be in dependency order (see `cull`). Returns the reduced
+    graph and a mapping from every dropped key to the key that replaced it.
+    """
+    renames: dict[Hashable, Hashable] = {}
+    seen: dict[Hashable, Hashable] = {}
+    merged: dict[Hashable, Any] = {}
+    for key, value in graph.items():
+        if isinstance(value, Task) and value.pure:
+            sig = (
+                id(value.func),
+                _signature(value.args, renames),
+                _signature(value.kwargs, renames),
+            )
+            if sig in seen:
+                renames[key] = seen[sig]
+                continue
+            seen[sig] = key
+        if renames and isinstance(value, Task):
+            merged[key] = Task(
+                value.func,
+                _rename(value.args, renames),
+                _rename(value.kwargs, renames),
+                pure=value.pure,
+            )
+        else:
+            merged[key] = value
+    return merged, renames
+
+
+class _Runner:
+    """One HPX task: run a fused chain of tasks on the chain's inputs."""
+
+    def __init__(self, steps: list[tuple[Hashable, Task]], inputs: list[Hashable]) -> None:
+        self.steps = steps
+        self.inputs = inputs
+        names = [getattr(t.func, "__qualname__", type(t.func).__qualname__) for _k, t in steps]
+        # Names the task in traces.
+        self.__qualname__ = " -> ".join(names)
+
+    def __call__(self, *values: Any) -> Any:
+        env = dict(zip(self.inputs, values, strict=True))
+        result = None
+        for key, task in self.steps:
+            result = task.func(*substitute(task.args, env), **substitute(task.kwargs, env))
+            env[key] = result
+        return result
+
+
+def fuse_linear(
+    graph: dict[Hashable, Any], outputs: Iterable[Hashable], *, fuse: bool = True
+) -> list[tuple[Hashable, list[tuple[Hashable, Task]], list[Hashable]]]:
+    """Group the tasks of `graph` into chains run as single HPX tasks.
+
+    A task joins its input's chain when that input is its only dependency,
+    is a task, and is used by nothing else (and is not an output). Literal
+    values are inlined into the tasks that use them. `graph` must be in
+    dependency order.
+
+    Returns
+    -------
+    list of (key, steps, inputs)
+        One entry per HPX task, in dependency order; ``key`` is the key of
+        the chain's last step and ``inputs`` the chain heads' dependencies.
+    """
+    outputs = set(outputs)
+    literals = {k: v for k, v in graph.items() if not isinstance(v, Task)}
+    deps = {
+        k: [d for d in v.dependencies() if d not in literals]
+        for k, v in graph.items()
+        if isinstance(v, Task)
+    }
+    users: dict[Hashable, int] = dict.fromkeys(deps, 0)
+    for ds in deps.values():
+        for d in ds:
+            users[d] += 1
+
+    chains: dict[Hashable, list[tuple[Hashable, Task]]] = {}
+    inputs: dict[Hashable, list[Hashable]] = {}
+    for key, ds in deps.items():
+        task = graph[key]
+        if literals:
+            task = Task(
+                task.func,
+                substitute(task.args, _Inline(literals)),
+                substitute(task.kwargs, _Inline(literals)),
+                pure=task.pure,
+            )
+        if fuse and len(ds) == 1 and users[ds[0]] == 1 and ds[0] not in outputs:
+            (head,) = ds
+            chain = chains.pop(head)
+            chain.append((key, task))
+            chains[key] = chain
+            inputs[key] = inputs.pop(head)
+        else:
+            chains[key] = [(key, task)]
+            inputs[key] = ds
+    return [(key, chains[key], inputs[key]) for key in chains]
+
+
+class _Inline(dict[Hashable, Any]):
+    """Substitution map that inlines literals and keeps other refs."""
+
+    def __init__(self, literals: dict[Hashable, Any]) -> None:
+        super().__init__()
+        self._literals = literals
+
+    def __getitem__(self, key: Hashable) -> Any:
+        if key in self._literals:
+            return self._literals[key]
+        return Ref(key)
+
+
+def execute(
+    graph: dict[Hashable, Any],
+    outputs: list[Hashable],
+    *,
+    optimize: bool = True,
+    stacksize: str | None = None,
+) -> list[Any]:
+    """Run the part of `graph` needed for `outputs`; return their values.
+
+    Parameters
+    ----------
+    graph : dict
+        Keys to `Task`s or literal values.
+    outputs : list
+        Keys whose values to return, in order.
+    optimize : bool, default True
+        Merge identical pure tasks and fuse linear chains. Culling always
+        happens.
+    stacksize : {"nostack", "small", "medium", "large"}, optional
+        HPX stack size of every task. ``"nostack"`` tasks must not wait
+        for other HPX work; see `hpyx.futures.submit`.
+    """
+    graph = cull(graph, outputs)
+    renames: dict[Hashable, Hashable] = {}
+    if optimize:
+        graph, renames = merge_identical(graph)
+    outputs = [renames.get(key, key) for key in outputs]
+
+    nodes = fuse_linear(graph, outputs, fuse=optimize)
+    index = {key: i for i, (key, _steps, _inputs) in enumerate(nodes)}
+    program = [
+        (_Runner(steps, inputs), [index[d] for d in inputs]) for _key, steps, inputs in nodes
+    ]
+    tasks = [key for key in outputs if key in index]
+    values = {}
+    if tasks:
+        _runtime.ensure_started()
+        results = _core.graph.execute(
+            program, [index[key] for key in tasks], stacksize or "default"
+        )
+        values = dict(zip(tasks, results, strict=True))
+    return [values[key] if key in values else graph[key] for key in outputs]
+
+
+def _is_key(obj: Any, graph: dict[Hashable, Any]) -> bool:
+    try:
+        return obj in graph
+    except TypeError:  # unhashable literal
+        return False
+
+
+def _is_call(value: Any) -> bool:
+    return type(value) is tuple and bool(value) and callable(value[0])
+
+
+class _Bind:
+    """Call ``func`` with literal arguments merged into the task results."""
+
+    __slots__ = ("__qualname__", "args", "func", "slots")
+
+    def __init__(self, func: Callable[..., Any], args: list[Any], slots: list[int]) -> None:
+        self.func = func
+        self.args = args
+        self.slots = slots
+        # Names the task in traces.
+        self.__qualname__ = getattr(func, "__qualname__", type(func).__qualname__)
+
+    def __call__(self, *values: Any) -> Any:
+        args = list(self.args)
+        for slot, value in zip(self.slots, values, strict=True):
+            args[slot] = value
+        return self.func(*args)
+
+
+def run_graph(
+    graph: dict[Hashable, Any],
+    outputs: Hashable | list[Hashable],
+    *,
+    stacksize: str | None = None,
+) -> Any:
+    """Run a ``{key: (fn, *args)}`` task graph as HPX dataflow.
+
+    Every task becomes one node of a single ``hpx::dataflow`` graph built
+    in C++: it runs ``fn(*args)`` on an HPX worker as soon as the tasks it
+    depends on have finished, and the requested results are gathered
+    without a scheduler loop in Python. Only the tasks the outputs depend
+    on run.
+
+    Parameters
+    ----------
+    graph : dict
+        Maps keys to tasks or to plain values. A task is a tuple whose first
+        element is callable, ``(fn, arg1, arg2, ...)``. An argument that is
+        a key of `graph` is replaced by that key's result; any other
+        argument, including lists and other containers, is passed as it is.
+    outputs : key or list of keys
+        The key whose result to return, or a list of keys.
+    stacksize : {"nostack", "small", "medium", "large"}, optional
+        HPX stack size of every task. ``"nostack"`` tasks must not wait
+        for other HPX work; see `hpyx.futures.submit`.
+
+    Returns
+    -------
+    object or list
+        The result of `outputs`, or a list of results if it is a list.
+
+    Raises
+    ------
+    KeyError
+        If an output is not a key of `graph`.
+    ValueError
+        If the tasks the outputs need form a cycle.
+
+    Examples
+    --------
+    >>> import operator
+    >>> import hpyx
+    >>> graph = {
+    ...     "x": 1,
+    ...     "y": (operator.add, "x", 10),
+    ...     "z": (operator.mul, "y", "y"),
+    ...     "w": (sum, ["x", "y"]),  # lists are not searched for keys
+    ... }
+    >>> hpyx.run_graph(graph, "z")
+    121
+    >>> hpyx.run_graph(graph, ["y", "x"])
+    [11, 1]
+    """
+    from .futures._submit import _check_stacksize
+
+    _check_stacksize(stacksize)
+    keys = outputs if isinstance(outputs, list) else [outputs]
+    for key in keys:
+        if not _is_key(key, graph):
+            msg = f"task graph has no key {key!r}"
+            raise KeyError(msg)
+
+    # Depth-first post-order over the tasks, so nodes come after their
+    # dependencies; `index` doubles as the visited set.
+    nodes: list[tuple[Callable[..., Any], list[int]]] = []
+    index: dict[Hashable, int] = {}
+    on_stack: set[Hashable] = set()
+    for root in keys:
+        if root in index or not _is_call(graph[root]):
+            continue
+        stack = [(root, iter(graph[root][1:]))]
+        on_stack.add(root)
+        while stack:
+            key, args = stack[-1]
+            for arg in args:
+                if not _is_key(arg, graph) or arg in index or not _is_call(graph[arg]):
+                    continue
+                if arg in on_stack:
+                    msg = f"task graph has a cycle through {arg!r}"
+                    raise ValueError(msg)
+                on_stack.add(arg)
+                stack.append((arg, iter(graph[arg][1:])))
+                break
+            else:
+                stack.pop()
+                on_stack.discard(key)
+                func, *call_args = graph[key]
+                deps: list[int] = []
+                slots: list[int] = []
+                for i, arg in enumerate(call_args):
+                    if _is_key(arg, graph):
+                        value = graph[arg]
+                        if _is_call(value):
+                            deps.append(index[arg])
+                            slots.append(i)
+                        else:
+                            call_args[i] = value
+                if len(slots) != len(call_args):
+                    func = _Bind(func, call_args, slots)
+                index[key] = len(nodes)
+                nodes.append((func, deps))
+
+    values = {}
+    tasks = [key for key in keys if key in index]
+    if tasks:
+        _runtime.ensure_started()
+        results = _core.graph.execute(nodes, [index[key] for key in tasks], stacksize or "default")
+        values = dict(zip(tasks, results, strict=True))
+    results = [values[key] if key in values else graph[key] for key in keys]
+    return results if isinstance(outputs, list) else results[0]
@@ -0,0 +1,105 @@
+"""Convert HPyX JSONL traces to the Chrome / Perfetto trace event format.
+
+Re-exported by `hpyx.debug` as `export_trace`. The output is the JSON
+"Trace Event Format" that both ``chrome://tracing`` and
+https://ui.perfetto.dev open directly: one row per HPX worker, a slice per
+task or kernel phase, and a nested "GIL wait" slice wherever the task
+waited for the GIL before running. Standalone GIL acquisitions traced with
+``enable_tracing(gil_events=True)`` appear as their own ``cat="gil"`` slices.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import Any
+
+FORMATS = ("chrome", "perfetto")
+
+# Row (tid) for events recorded off the HPX workers, e.g. deferred tasks
+# run inside future.get() on a Python thread.
+_OFF_WORKER_TID = 0
+
+
+def load_events(path: str | os.PathLike[str]) -> list[dict[str, Any]]:
+    """Read the task events of a JSONL trace written by `enable_tracing`."""
+    with Path(path).open(encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def _tid(worker: int) -> int:
+    return _OFF_WORKER_TID if worker < 0 else worker + 1
+
+
+def to_trace_events(events: list[dict[str, Any]], *, pid: int) -> list[dict[str, Any]]:
+    """Build Trace Event Format records (timestamps in microseconds)."""
+    out: list[dict[str, Any]] = [
+        {"ph": "M", "name": "process_name", "pid": pid, "tid": 0, "args": {"name": "hpyx"}},
+    ]
+    if not events:
+        return out
+    t0 = min(e["submit_ns"] for e in events)
+    workers = sorted({e["worker_thread_id"] for e in events})
+    for worker in workers:
+        name = "non-HPX threads" if worker < 0 else f"HPX worker {worker}"
+        out.append(
+            {
+                "ph": "M",
+                "name": "thread_name",
+                "pid": pid,
+                "tid": _tid(worker),
+                "args": {"name": name},
+            }
+        )
+        out.append(
+            {
+                "ph": "M",
+                "name": "thread_sort_index",
+                "pid": pid,
+                "tid": _tid(worker),
+                "args": {"sort_index": _tid(worker)},
+            }
+        )
+
+    for e in events:
+        tid = _tid(e["worker_thread_id"])
+        start_us = (e["start_ns"] - t0) / 1000
+        out.append(
+            {
+                "ph": "X",
+                "name": e["name"],
+                "cat": e.get("cat", "task"),
+                "pid": pid,
+                "tid": tid,
+                "ts": start_us,
+                "dur": (e["end_ns"] - e["start_ns"]) / 1000,
+                "args": {
+                    "queued_us": (e["start_ns"] - e["submit_ns"]) / 1000,
+                    "gil_wait_us": e["gil_wait_ns"] / 1000,
+                },
+            }
+        )
+        # A "gil" event is itself the wait; only tasks and kernels nest one.
+        if e["gil_wait_ns"] > 0 and e.get("cat") != "gil":
+            out.append(
+                {
+                    "ph": "X",
+                    "name": "GIL wait",
+                    "cat": "gil",
+                    "pid": pid,
+                    "tid": tid,
+                    "ts": start_us,
+                    "dur": e["gil_wait_ns"] / 1000,
+                }
+            )
+    return out
+
+
+def write(events: list[dict[str, Any]], path: str | os.PathLike[str], *, pid: int) -> None:
+    trace = {
+        "traceEvents": to_trace_events(events, pid=pid),
+        "displayTimeUnit": "ns",
+    }
+    with Path(path).open("w", encoding="utf-8") as f:
+        json.dump(trace, f)
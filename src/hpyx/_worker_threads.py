@@ -0,0 +1,43 @@
+"""Registry of HPX worker OS threads, filled when the runtime starts.
+
+`_core.threads.register_workers` runs `register` once on every HPX worker
+with the GIL held. The worker's Python thread state lives until shutdown,
+so the name given to its `threading` entry sticks, and sampling profilers
+(py-spy, austin) that label threads by their Python name show
+``hpyx-worker-<pool>-<n>``. The OS thread name is set in C++ as well, for
+perf and gdb.
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import Any
+
+_workers: dict[int, dict[str, Any]] = {}
+_lock = threading.Lock()
+
+
+def register(worker: int, pool: str, index: int, name: str) -> None:
+    """Record the calling HPX worker thread. Runs on that worker."""
+    threading.current_thread().name = name
+    info = {
+        "worker": worker,
+        "pool": pool,
+        "index": index,
+        "name": name,
+        "native_id": threading.get_native_id(),
+        "ident": threading.get_ident(),
+    }
+    with _lock:
+        _workers[worker] = info
+
+
+def workers() -> list[dict[str, Any]]:
+    """Registered workers, ordered by global worker id."""
+    with _lock:
+        return [dict(_workers[k]) for k in sorted(_workers)]
+
+
+def clear() -> None:
+    with _lock:
+        _workers.clear()
@@ -0,0 +1,54 @@
+"""
+HPyX array subpackage: chunked, lazily evaluated NumPy-style arrays.
+
+`from_array` wraps NumPy data in an `Array`. Arithmetic, the ufuncs below,
+reductions and slicing build an expression graph; `Array.compute` (or
+`compute` for several arrays at once) lowers it to one HPX dataflow graph
+of native chunk kernels that run without the GIL. Elementwise chains are
+fused into one pass per chunk and reductions into the kernel feeding them,
+so intermediates are never written to memory.
+
+Arrays are float64 and chunked along axis 0. Broadcasting covers scalars
+and operands whose shape matches the trailing dimensions of the other.
+
+Examples
+--------
+>>> import numpy as np
+>>> import hpyx
+>>> x = hpyx.array.from_array(np.linspace(0.0, 1.0, 1_000_000))
+>>> y = hpyx.array.sqrt(x * x + 1.0).sum()
+>>> float(y.compute())  # doctest: +SKIP
+1147793.6...
+"""
+
+from __future__ import annotations
+
+from ._array import (
+    Array,
+    absolute,
+    compute,
+    cos,
+    exp,
+    from_array,
+    log,
+    maximum,
+    minimum,
+    sin,
+    sqrt,
+    tanh,
+)
+
+__all__ = [
+    "Array",
+    "absolute",
+    "compute",
+    "cos",
+    "exp",
+    "from_array",
+    "log",
+    "maximum",
+    "minimum",
+    "sin",
+    "sqrt",
+    "tanh",
+]
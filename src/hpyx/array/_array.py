@@ -0,0 +1,397 @@
+"""The lazy, chunked `Array` and its constructors and ufuncs."""
+
+from __future__ import annotations
+
+import math
+import numbers
+import operator
+import os
+from collections.abc import Callable, Iterable
+from typing import Any, SupportsInt
+
+import numpy as np
+
+from hpyx import _core, _runtime
+from hpyx._buffers import to_framework
+
+from ._graph import Elementwise, Index, Node, Reduce, RowSlice, Source, nrows, row_size
+from ._lower import evaluate
+
+# Chunks smaller than this spend more time scheduling than computing.
+_MIN_CHUNK_ELEMENTS = 32_768
+_CHUNKS_PER_WORKER = 4
+
+
+def _num_workers() -> int:
+    if _runtime.is_running():
+        return int(_core.runtime.num_worker_threads())
+    return os.cpu_count() or 1
+
+
+def _split(rows: int, per_chunk: int) -> tuple[int, ...]:
+    if rows == 0:
+        return (0,)
+    full, rest = divmod(rows, per_chunk)
+    return (per_chunk,) * full + ((rest,) if rest else ())
+
+
+def _normalize_chunks(
+    shape: tuple[int, ...], chunks: int | numbers.Integral | Iterable[SupportsInt] | None
+) -> tuple[int, ...]:
+    rows = nrows(shape)
+    if chunks is None:
+        target = max(
+            math.ceil(rows / (_CHUNKS_PER_WORKER * _num_workers())),
+            math.ceil(_MIN_CHUNK_ELEMENTS / max(row_size(shape), 1)),
+            1,
+        )
+        return _split(rows, target)
+    if not shape:
+        msg = "a 0-d array cannot be chunked"
+        raise ValueError(msg)
+    if isinstance(chunks, (int, numbers.Integral)):
+        if chunks < 1:
+            msg = f"chunks must be positive, got {chunks}"
+            raise ValueError(msg)
+        return _split(rows, int(chunks))
+    sizes = tuple(int(c) for c in chunks)
+    if sum(sizes) != rows or any(c < 0 for c in sizes):
+        msg = f"chunks {sizes} do not add up to the {rows} rows along axis 0"
+        raise ValueError(msg)
+    return sizes or (0,)
+
+
+def _indexed_shape(shape: tuple[int, ...], key: Any) -> tuple[int, ...]:
+    # Index a zero-strided stand-in so NumPy validates `key` and reports
+    # the result shape without touching the real data.
+    probe = np.lib.stride_tricks.as_strided(
+        np.zeros(1), shape=shape, strides=(0,) * len(shape), writeable=False
+    )
+    return np.shape(probe[key])
+
+
+def _as_operand(value: Any) -> Node | float | None:
+    """Convert `value` to a node or constant; None if unsupported."""
+    if isinstance(value, Array):
+        return value._node
+    if isinstance(value, (numbers.Real, np.bool_)):
+        return float(value)
+    if isinstance(value, (np.ndarray, list, tuple)):
+        arr = np.asarray(value)
+        if arr.ndim == 0 and arr.dtype.kind in "biuf":
+            return float(arr)
+        return from_array(arr)._node
+    return None
+
+
+def _elementwise(op: str, *values: Any) -> Array:
+    operands = []
+    for value in values:
+        operand = _as_operand(value)
+        if operand is None:
+            msg = f"unsupported operand type for hpyx.Array: {type(value).__name__}"
+            raise TypeError(msg)
+        operands.append(operand)
+
+    nodes = [o for o in operands if isinstance(o, Node)]
+    shape = max((n.shape for n in nodes), key=len)
+    for node in nodes:
+        if node.shape != shape[len(shape) - len(node.shape) :]:
+            np.broadcast_shapes(*(n.shape for n in nodes))  # ValueError if invalid
+            msg = (
+                "hpyx.Array only broadcasts scalars and trailing dimensions, "
+                f"not {node.shape} against {shape}"
+            )
+            raise NotImplementedError(msg)
+    chunks = next(n.chunks for n in nodes if n.shape == shape)
+    return Array(Elementwise(op, tuple(operands), shape, chunks))
+
+
+def _binary(op: str, reflected: bool = False) -> Callable[[Array, Any], Array]:
+    def method(self: Array, other: Any) -> Any:
+        if _as_operand(other) is None:
+            return NotImplemented
+        return _elementwise(op, other, self) if reflected else _elementwise(op, self, other)
+
+    return method
+
+
+class Array:
+    """A chunked, lazily evaluated float64 array.
+
+    Operations build an expression graph; nothing runs until `compute`,
+    which lowers the graph to one HPX dataflow graph of native chunk
+    kernels that run on the HPX workers without the GIL. Chains of
+    elementwise operations are fused into a single pass over each chunk.
+
+    Arrays are split into chunks along axis 0 only. Create them with
+    `from_array`.
+
+    Attributes
+    ----------
+    shape : tuple of int
+        The array's shape.
+    chunks : tuple of int
+        Rows per chunk along axis 0; each chunk is one HPX task.
+    """
+
+    __slots__ = ("_node",)
+
+    # Ensure NumPy defers binary operators (ndarray + Array) to Array.
+    __array_priority__ = 20
+
+    def __init__(self, node: Node) -> None:
+        self._node = node
+
+    @property
+    def shape(self) -> tuple[int, ...]:
+        return self._node.shape
+
+    @property
+    def chunks(self) -> tuple[int, ...]:
+        return self._node.chunks
+
+    @property
+    def ndim(self) -> int:
+        return len(self._node.shape)
+
+    @property
+    def size(self) -> int:
+        return self._node.size
+
+    @property
+    def dtype(self) -> np.dtype:
+        return np.dtype(np.float64)
+
+    def __repr__(self) -> str:
+        return f"hpyx.Array<shape={self.shape}, chunks={len(self.chunks)}, dtype={self.dtype}>"
+
+    def __len__(self) -> int:
+        if not self.shape:
+            msg = "len() of unsized object"
+            raise TypeError(msg)
+        return self.shape[0]
+
+    def compute(self, *, framework: Any = None) -> Any:
+        """Evaluate the array.
+
+        Results are NumPy arrays, and 0-d results `numpy.float64`. With
+        `framework`, a module such as ``torch`` or ``jax.numpy``, they are
+        handed to that library through DLPack instead, without a copy.
+        """
+        return compute(self, framework=framework)[0]
+
+    def __array__(self, dtype: Any = None, copy: bool | None = None) -> np.ndarray:
+        return np.asarray(self.compute(), dtype=dtype)
+
+    def __array_ufunc__(self, ufunc: np.ufunc, method: str, *inputs: Any, **kwargs: Any) -> Any:
+        op = _UFUNC_OPS.get(ufunc)
+        if method != "__call__" or kwargs or op is None:
+            return NotImplemented
+        if any(_as_operand(x) is None for x in inputs):
+            return NotImplemented
+        return _elementwise(op, *inputs)
+
+    __add__ = _binary("add")
+    __radd__ = _binary("add", reflected=True)
+    __sub__ = _binary("sub")
+    __rsub__ = _binary("sub", reflected=True)
+    __mul__ = _binary("mul")
+    __rmul__ = _binary("mul", reflected=True)
+    __truediv__ = _binary("div")
+    __rtruediv__ = _binary("div", reflected=True)
+    __pow__ = _binary("pow")
+    __rpow__ = _binary("pow", reflected=True)
+
+    def __neg__(self) -> Array:
+        return _elementwise("neg", self)
+
+    def __pos__(self) -> Array:
+        return self
+
+    def __abs__(self) -> Array:
+        return _elementwise("abs", self)
+
+    def __getitem__(self, key: Any) -> Array:
+        """Index like NumPy.
+
+        A step-1 slice along axis 0 stays lazy and is fused into the
+        kernels that read it. Other keys on an array built by `from_array`
+        index the wrapped NumPy array right away; on a computed expression
+        they compute it first, as a separate pass, when the result is
+        needed.
+        """
+        if isinstance(key, tuple) and len(key) == 1:
+            key = key[0]
+        if isinstance(key, Array):
+            msg = "indexing with a lazy hpyx.Array is not supported"
+            raise NotImplementedError(msg)
+        node = self._node
+        if isinstance(key, slice) and self.shape:
+            start, stop, step = key.indices(self.shape[0])
+            if step == 1:
+                return Array(RowSlice(node, start, max(start, stop)))
+        if isinstance(node, Source):
+            return from_array(node.data[key])
+        shape = _indexed_shape(self.shape, key)
+        return Array(Index(node, key, shape, _normalize_chunks(shape, None)))
+
+    # -- reductions ----------------------------------------------------------
+
+    def _reduce(self, op: str, axis: int | tuple[int, ...] | None) -> Array:
+        if axis is not None:
+            if isinstance(axis, tuple):
+                msg = "hpyx.Array reduces over one axis or all of them"
+                raise NotImplementedError(msg)
+            axis = operator.index(axis)
+            if not -self.ndim <= axis < self.ndim:
+                raise np.exceptions.AxisError(axis, self.ndim)
+            axis %= self.ndim
+            if self.ndim == 1:
+                axis = None
+        empty = self.size == 0 if axis is None else self.shape[axis] == 0
+        if op in ("min", "max") and empty:
+            name = "minimum" if op == "min" else "maximum"
+            msg = f"zero-size array to reduction operation {name} which has no identity"
+            raise ValueError(msg)
+        return Array(Reduce(op, self._node, axis))
+
+    def sum(self, axis: int | None = None) -> Array:
+        """Sum over `axis`, or over all elements."""
+        return self._reduce("sum", axis)
+
+    def prod(self, axis: int | None = None) -> Array:
+        """Product over `axis`, or over all elements."""
+        return self._reduce("prod", axis)
+
+    def min(self, axis: int | None = None) -> Array:
+        """Minimum over `axis`, or over all elements; NaN propagates."""
+        return self._reduce("min", axis)
+
+    def max(self, axis: int | None = None) -> Array:
+        """Maximum over `axis`, or over all elements; NaN propagates."""
+        return self._reduce("max", axis)
+
+    def mean(self, axis: int | None = None) -> Array:
+        """Arithmetic mean over `axis`, or over all elements."""
+        total = self.sum(axis)
+        count = self.size if axis is None else self.shape[operator.index(axis)]
+        return total / count
+
+
+def from_array(
+    x: Any, chunks: int | numbers.Integral | Iterable[SupportsInt] | None = None
+) -> Array:
+    """Wrap an array-like as a lazy `Array`.
+
+    The data is converted to C-contiguous float64 (without a copy when it
+    already is) and read when the array is computed, so later in-place
+    changes to `x` are visible to expressions built on it.
+
+    Parameters
+    ----------
+    x : array_like
+        Real numeric data. Complex data is rejected. CPU tensors of other
+        libraries are read through DLPack, without a copy when they hold
+        float64.
+    chunks : int or tuple of int, optional
+        Rows per chunk along axis 0, or the row count of every chunk.
+        The default aims at a few chunks per HPX worker of at least
+        32768 elements each.
+
+    Returns
+    -------
+    Array
+
+    Raises
+    ------
+    TypeError
+        If `x` is complex or not numeric.
+    ValueError
+        If `chunks` does not partition axis 0.
+    """
+    if isinstance(x, Array):
+        if chunks is not None:
+            msg = "rechunking an hpyx.Array is not supported; pass chunks to from_array"
+            raise NotImplementedError(msg)
+        return x
+    if not isinstance(x, np.ndarray) and hasattr(x, "__dlpack__"):
+        x = np.from_dlpack(x)
+    arr = np.asarray(x)
+    if arr.dtype.kind not in "biuf":
+        msg = f"hpyx.Array supports real numeric data, got dtype {arr.dtype}"
+        raise TypeError(msg)
+    data = np.asarray(arr, dtype=np.float64, order="C")
+    return Array(Source(data, _normalize_chunks(data.shape, chunks)))
+
+
+def compute(*arrays: Array, framework: Any = None) -> tuple[Any, ...]:
+    """Evaluate several arrays in one HPX dataflow graph.
+
+    Inputs and reductions shared between the arrays are read or computed
+    once.
+
+    Parameters
+    ----------
+    *arrays : Array
+        The arrays to evaluate.
+    framework : module, optional
+        Return the results as arrays of this library (``torch``,
+        ``jax.numpy``, ...) through DLPack; see `Array.compute`.
+
+    Returns
+    -------
+    tuple
+        One result per argument, as for `Array.compute`.
+    """
+    results = evaluate([from_array(a)._node for a in arrays])
+    if framework is not None and framework is not np:
+        return tuple(to_framework(r, framework) for r in results)
+    return tuple(r[()] if r.ndim == 0 else r for r in results)
+
+
+def _unary(op: str, name: str) -> Callable[[Any], Array]:
+    def ufunc(x: Any) -> Array:
+        return _elementwise(op, x)
+
+    ufunc.__name__ = ufunc.__qualname__ = name
+    ufunc.__doc__ = f"Lazy elementwise ``numpy.{name}`` for `Array` operands."
+    return ufunc
+
+
+def _binary_ufunc(op: str, name: str) -> Callable[[Any, Any], Array]:
+    def ufunc(x1: Any, x2: Any) -> Array:
+        return _elementwise(op, x1, x2)
+
+    ufunc.__name__ = ufunc.__qualname__ = name
+    ufunc.__doc__ = f"Lazy elementwise ``numpy.{name}`` for `Array` operands."
+    return ufunc
+
+
+sqrt = _unary("sqrt", "sqrt")
+exp = _unary("exp", "exp")
+log = _unary("log", "log")
+sin = _unary("sin", "sin")
+cos = _unary("cos", "cos")
+tanh = _unary("tanh", "tanh")
+absolute = _unary("abs", "absolute")
+maximum = _binary_ufunc("maximum", "maximum")
+minimum = _binary_ufunc("minimum", "minimum")
+
+_UFUNC_OPS = {
+    np.add: "add",
+    np.subtract: "sub",
+    np.multiply: "mul",
+    np.true_divide: "div",
+    np.power: "pow",
+    np.maximum: "maximum",
+    np.minimum: "minimum",
+    np.negative: "neg",
+    np.absolute: "abs",
+    np.sqrt: "sqrt",
+    np.exp: "exp",
+    np.log: "log",
+    np.sin: "sin",
+    np.cos: "cos",
+    np.tanh: "tanh",
+}
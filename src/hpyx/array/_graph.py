@@ -0,0 +1,122 @@
+"""Expression nodes behind `hpyx.array.Array`.
+
+Every node knows its ``shape`` and its ``chunks``: the row counts along
+axis 0 that the lowering turns into one HPX task each. Nodes are
+immutable and may be shared between expressions.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Any
+
+import numpy as np
+
+UNARY_OPS = frozenset({"neg", "abs", "sqrt", "exp", "log", "sin", "cos", "tanh"})
+BINARY_OPS = frozenset({"add", "sub", "mul", "div", "pow", "maximum", "minimum"})
+REDUCE_OPS = frozenset({"sum", "prod", "min", "max"})
+
+
+def nrows(shape: tuple[int, ...]) -> int:
+    """Rows along axis 0; a 0-d array is one row of one element."""
+    return shape[0] if shape else 1
+
+
+def row_size(shape: tuple[int, ...]) -> int:
+    """Elements per row along axis 0."""
+    return math.prod(shape[1:])
+
+
+class Node:
+    """Base class: a lazily evaluated float64 array."""
+
+    __slots__ = ("chunks", "shape")
+
+    def __init__(self, shape: tuple[int, ...], chunks: tuple[int, ...]) -> None:
+        self.shape = shape
+        self.chunks = chunks
+
+    @property
+    def size(self) -> int:
+        return math.prod(self.shape)
+
+
+class Source(Node):
+    """A concrete, C-contiguous float64 NumPy array."""
+
+    __slots__ = ("data",)
+
+    def __init__(self, data: np.ndarray, chunks: tuple[int, ...]) -> None:
+        super().__init__(data.shape, chunks)
+        self.data = data
+
+
+class Elementwise(Node):
+    """A unary or binary float op; operands are nodes or Python floats.
+
+    Operand shapes equal ``shape`` or one of its trailing-dimension
+    suffixes (including ``()``).
+    """
+
+    __slots__ = ("op", "operands")
+
+    def __init__(
+        self,
+        op: str,
+        operands: tuple[Node | float, ...],
+        shape: tuple[int, ...],
+        chunks: tuple[int, ...],
+    ) -> None:
+        super().__init__(shape, chunks)
+        self.op = op
+        self.operands = operands
+
+
+class Reduce(Node):
+    """Reduce `child` over one axis, or over all axes when ``axis`` is None."""
+
+    __slots__ = ("axis", "child", "op")
+
+    def __init__(self, op: str, child: Node, axis: int | None) -> None:
+        if axis is None:
+            shape: tuple[int, ...] = ()
+        else:
+            shape = child.shape[:axis] + child.shape[axis + 1 :]
+        # Partials over axis 0 are combined into a single, unchunked result.
+        chunks = (nrows(shape),) if axis is None or axis == 0 else child.chunks
+        super().__init__(shape, chunks)
+        self.op = op
+        self.child = child
+        self.axis = axis
+
+
+class RowSlice(Node):
+    """Rows ``start:stop`` of `child`; never copied, only re-addressed."""
+
+    __slots__ = ("child", "start")
+
+    def __init__(self, child: Node, start: int, stop: int) -> None:
+        shape = (stop - start, *child.shape[1:])
+        chunks = []
+        row = 0
+        for rows in child.chunks:
+            lo, hi = max(row, start), min(row + rows, stop)
+            if hi > lo:
+                chunks.append(hi - lo)
+            row += rows
+        super().__init__(shape, tuple(chunks) or (0,))
+        self.child = child
+        self.start = start
+
+
+class Index(Node):
+    """Any other NumPy indexing of `child`, applied after computing it."""
+
+    __slots__ = ("child", "key")
+
+    def __init__(
+        self, child: Node, key: Any, shape: tuple[int, ...], chunks: tuple[int, ...]
+    ) -> None:
+        super().__init__(shape, chunks)
+        self.child = child
+        self.key = key
@@ -0,0 +1,232 @@
+"""Lower `hpyx.array` expression graphs to `_core.array.execute` programs.
+
+A program is a flat list of instructions (see ``src/_core/array.hpp``);
+each non-input instruction becomes one HPX dataflow task. Lowering:
+
+- fuses every chain of elementwise ops, row slices and loads into a single
+  tiled kernel per output chunk, so intermediates are never materialized;
+- folds a reduction into the kernel that computes its input, leaving one
+  partial per chunk that a final task combines;
+- shares inputs and materialized nodes between all expressions computed
+  together, so common subexpressions behind a reduction run once;
+- writes roots straight into preallocated NumPy outputs.
+"""
+
+from __future__ import annotations
+
+import itertools
+import math
+from typing import Any
+
+import numpy as np
+
+from hpyx import _core, _runtime
+
+from ._graph import Elementwise, Index, Node, Reduce, RowSlice, Source, row_size
+
+_IDENTITY = {"sum": 0.0, "prod": 1.0, "min": np.inf, "max": -np.inf}
+
+
+def _row_bounds(chunks: tuple[int, ...]) -> list[tuple[int, int]]:
+    edges = [0, *itertools.accumulate(chunks)]
+    return [(lo, hi) for lo, hi in itertools.pairwise(edges) if hi > lo]
+
+
+class _Kernel:
+    """Postfix program and operand table for one fused instruction."""
+
+    def __init__(self) -> None:
+        self.operands: list[tuple[int, int, int]] = []
+        self.steps: list[tuple[str, int, float]] = []
+        self._slots: dict[tuple[int, int, int], int] = {}
+
+    def load(self, instr: int, offset: int, period: int) -> None:
+        ref = (instr, offset, period)
+        slot = self._slots.get(ref)
+        if slot is None:
+            slot = self._slots[ref] = len(self.operands)
+            self.operands.append(ref)
+        self.steps.append(("load", slot, 0.0))
+
+    def const(self, value: float) -> None:
+        self.steps.append(("const", 0, value))
+
+    def op(self, name: str) -> None:
+        self.steps.append((name, 0, 0.0))
+
+
+class _Lowering:
+    def __init__(self) -> None:
+        self.program: list[tuple[Any, ...]] = []
+        self._inputs: dict[int, int] = {}
+        # id(node) -> [(instruction, first element, element count)] in order.
+        self._pieces: dict[int, list[tuple[int, int, int]]] = {}
+        self._concats: dict[tuple[int, int, int], int] = {}
+
+    def _add(self, instruction: tuple[Any, ...]) -> int:
+        self.program.append(instruction)
+        return len(self.program) - 1
+
+    def _input(self, data: np.ndarray) -> int:
+        instr = self._inputs.get(id(data))
+        if instr is None:
+            instr = self._inputs[id(data)] = self._add(("input", data.reshape(-1)))
+        return instr
+
+    def _fused(
+        self,
+        kernel: _Kernel,
+        length: int,
+        out: np.ndarray | None,
+        reduce: str = "",
+        shape: tuple[int, int, int] | None = None,
+    ) -> int:
+        outer, n, inner = shape if shape is not None else (1, length, 1)
+        return self._add(
+            (
+                "fused",
+                kernel.operands,
+                kernel.steps,
+                length,
+                reduce,
+                outer,
+                n,
+                inner,
+                out,
+            )
+        )
+
+    # -- fused kernels -------------------------------------------------------
+
+    def _emit(self, kernel: _Kernel, node: Node, offset: int, period: int) -> None:
+        """Push `node`'s flat elements ``offset + (j % period)`` onto the stack."""
+        if isinstance(node, Elementwise):
+            for operand in node.operands:
+                if not isinstance(operand, Node):
+                    kernel.const(operand)
+                elif operand.shape == node.shape:
+                    self._emit(kernel, operand, offset, period)
+                else:
+                    # A trailing-dimension suffix repeats every operand.size
+                    # elements, and offset is always a multiple of that.
+                    self._emit(kernel, operand, 0, operand.size)
+            kernel.op(node.op)
+        elif isinstance(node, RowSlice):
+            self._emit(kernel, node.child, offset + node.start * row_size(node.shape), period)
+        elif isinstance(node, Source):
+            kernel.load(self._input(node.data), offset, period)
+        else:
+            kernel.load(*self._locate(node, offset, period), period)
+
+    def _locate(self, node: Node, offset: int, length: int) -> tuple[int, int]:
+        """Return (instruction, offset) holding elements offset:offset+length."""
+        pieces = self._materialize(node)
+        for instr, start, count in pieces:
+            if start <= offset and offset + length <= start + count:
+                return instr, offset - start
+        key = (id(node), offset, length)
+        if key not in self._concats:
+            refs = []
+            for instr, start, count in pieces:
+                lo, hi = max(start, offset), min(start + count, offset + length)
+                if hi > lo:
+                    refs.append((instr, lo - start, hi - lo))
+            self._concats[key] = self._add(("concat", refs, None))
+        return self._concats[key], 0
+
+    def _materialize(self, node: Node) -> list[tuple[int, int, int]]:
+        pieces = self._pieces.get(id(node))
+        if pieces is not None:
+            return pieces
+        if isinstance(node, Reduce):
+            pieces = self._reduce(node, None)
+        elif isinstance(node, Index):
+            # Pre-pass: compute the child on its own, then index in NumPy.
+            (value,) = evaluate([node.child])
+            data = np.asarray(value[node.key], dtype=np.float64, order="C")
+            pieces = [(self._input(data), 0, data.size)]
+        else:
+            msg = f"cannot materialize {type(node).__name__} nodes"
+            raise TypeError(msg)
+        self._pieces[id(node)] = pieces
+        return pieces
+
+    # -- reductions ----------------------------------------------------------
+
+    def _reduce(self, node: Reduce, out: np.ndarray | None) -> list[tuple[int, int, int]]:
+        child, axis = node.child, node.axis
+        size = math.prod(node.shape)
+        if child.size == 0:
+            data = np.full(size, _IDENTITY[node.op])
+            if out is not None:
+                out[:] = data
+            return [(self._input(data), 0, size)]
+
+        rs = row_size(child.shape)
+        partials = []
+        for lo, hi in _row_bounds(child.chunks):
+            rows = hi - lo
+            if axis is None:
+                shape = (1, rows * rs, 1)
+            elif axis == 0:
+                shape = (1, rows, rs)
+            else:
+                shape = (
+                    rows * math.prod(child.shape[1:axis]),
+                    child.shape[axis],
+                    math.prod(child.shape[axis + 1 :]),
+                )
+            kernel = _Kernel()
+            self._emit(kernel, child, lo * rs, rows * rs)
+            partials.append((kernel, rows * rs, shape, lo, hi))
+
+        if axis is not None and axis > 0:
+            # Row-wise: one output chunk per input chunk, no combine step.
+            out_rs = row_size(node.shape)
+            pieces = []
+            for kernel, length, shape, lo, hi in partials:
+                sink = None if out is None else out[lo * out_rs : hi * out_rs]
+                instr = self._fused(kernel, length, sink, node.op, shape)
+                pieces.append((instr, lo * out_rs, (hi - lo) * out_rs))
+            return pieces
+
+        if len(partials) == 1:
+            kernel, length, shape, _lo, _hi = partials[0]
+            return [(self._fused(kernel, length, out, node.op, shape), 0, size)]
+        refs = [
+            (self._fused(kernel, length, None, node.op, shape), 0, size)
+            for kernel, length, shape, _lo, _hi in partials
+        ]
+        joined = self._add(("concat", refs, None))
+        combine = _Kernel()
+        combine.load(joined, 0, len(refs) * size)
+        instr = self._fused(combine, len(refs) * size, out, node.op, (1, len(refs), size))
+        return [(instr, 0, size)]
+
+    # -- roots ---------------------------------------------------------------
+
+    def root(self, node: Node, out: np.ndarray) -> None:
+        """Compute `node` into the flat, C-contiguous float64 array `out`."""
+        if isinstance(node, Reduce) and id(node) not in self._pieces:
+            self._pieces[id(node)] = self._reduce(node, out)
+            return
+        rs = row_size(node.shape)
+        for lo, hi in _row_bounds(node.chunks):
+            kernel = _Kernel()
+            self._emit(kernel, node, lo * rs, (hi - lo) * rs)
+            self._fused(kernel, (hi - lo) * rs, out[lo * rs : hi * rs])
+
+
+def evaluate(nodes: list[Node]) -> list[np.ndarray]:
+    """Compute `nodes` as one HPX dataflow graph; return NumPy arrays."""
+    _runtime.ensure_started()
+    lowering = _Lowering()
+    results = []
+    for node in nodes:
+        out = np.empty(node.shape)
+        if node.size:
+            lowering.root(node, out.reshape(-1))
+        results.append(out)
+    if lowering.program:
+        _core.array.execute(lowering.program)
+    return results
@@ -0,0 +1,436 @@
+"""Content-addressed cache for the results of pure tasks.
+
+`hpyx.futures.submit(..., cache=True)` and ``HPXExecutor(cache=True)`` look
+up every task in a `ResultCache` before running it. The cache key is a
+128-bit hash of the function and its arguments. NumPy arrays are hashed
+by dtype, shape and content, so an equal array built elsewhere still hits.
+The hash is xxHash (XXH3) when the optional ``xxhash`` package is
+installed, and BLAKE2b otherwise.
+
+- A task whose key is cached is not run; its result is returned at once.
+- A task whose key is being computed is not started again; it shares the
+  future of the task already in flight.
+- Finished results are kept in memory up to a byte budget, least recently
+  used first out. Evicted results go to an optional on-disk tier (pickled
+  into ``spill_dir``) with its own budget, and are read back on a hit.
+
+Only cache pure tasks: ones whose result depends on nothing but the
+function's code and arguments, and that have no side effects. Cached
+results are shared between callers, so do not modify them in place.
+Failed tasks are not cached.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import os
+import pickle
+import sys
+import threading
+import types
+from collections import OrderedDict
+from collections.abc import Callable
+from concurrent.futures import Future
+from functools import partial
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+try:
+    import xxhash
+except ImportError:  # pragma: no cover - depends on the environment
+    xxhash = None
+
+_DEFAULT_MAX_BYTES = 256 * 2**20
+
+_STAT_NAMES = ("hits", "disk_hits", "misses", "coalesced", "evictions", "spills")
+
+
+def _hasher() -> Any:
+    if xxhash is not None:
+        return xxhash.xxh3_128()
+    return hashlib.blake2b(digest_size=16)
+
+
+def _feed_bytes(h: Any, tag: bytes, data: Any) -> None:
+    view = memoryview(data).cast("B")
+    h.update(b"%s%d:" % (tag, view.nbytes))
+    h.update(view)
+
+
+def _feed_code(h: Any, code: types.CodeType) -> None:
+    _feed_bytes(h, b"c", code.co_code)
+    _feed(h, code.co_consts)
+    _feed(h, code.co_names)
+
+
+def _feed_function(h: Any, fn: Any) -> None:
+    name = getattr(fn, "__qualname__", None) or getattr(fn, "__name__", "")
+    _feed(h, (getattr(fn, "__module__", None), name))
+    if isinstance(fn, types.FunctionType):
+        _feed_code(h, fn.__code__)
+        _feed(h, fn.__defaults__)
+        _feed(h, fn.__kwdefaults__)
+        # A recursive inner function closes over itself.
+        _feed(
+            h,
+            tuple(
+                "<self>" if cell.cell_contents is fn else cell.cell_contents
+                for cell in fn.__closure__ or ()
+            ),
+        )
+    elif isinstance(fn, types.BuiltinFunctionType):
+        owner = fn.__self__
+        if owner is not None and not isinstance(owner, types.ModuleType):
+            _feed(h, owner)
+
+
+def _feed(h: Any, obj: Any) -> None:
+    """Hash `obj` into `h`; values that compare equal hash the same."""
+    t = type(obj)
+    if obj is None or t in (bool, int, float, complex):
+        h.update(b"%s:%s;" % (t.__name__.encode(), repr(obj).encode()))
+    elif t is str:
+        _feed_bytes(h, b"s", obj.encode("utf-8", "surrogatepass"))
+    elif t in (bytes, bytearray):
+        _feed_bytes(h, b"b", obj)
+    elif isinstance(obj, (np.ndarray, np.generic)):
+        a = np.asarray(obj)
+        # A structured dtype's str is only its size; descr has its fields.
+        dtype = a.dtype.str if a.dtype.names is None else repr(a.dtype.descr)
+        h.update(b"nd%s%s;" % (dtype.encode(), repr(a.shape).encode()))
+        if a.dtype.hasobject:
+            _feed(h, a.ravel().tolist())
+        else:
+            h.update(np.ascontiguousarray(a).reshape(-1).view(np.uint8))
+    elif t in (tuple, list):
+        h.update(b"%s%d:" % (t.__name__.encode(), len(obj)))
+        for item in obj:
+            _feed(h, item)
+    elif t is dict:
+        h.update(b"dict%d:" % len(obj))
+        for key, value in obj.items():
+            _feed(h, key)
+            _feed(h, value)
+    elif t in (set, frozenset):
+        h.update(b"%s%d:" % (t.__name__.encode(), len(obj)))
+        for digest in sorted(_digest(item) for item in obj):
+            h.update(digest)
+    elif isinstance(obj, (types.FunctionType, types.BuiltinFunctionType, type)):
+        _feed_function(h, obj)
+    elif isinstance(obj, types.MethodType):
+        _feed_function(h, obj.__func__)
+        _feed(h, obj.__self__)
+    elif isinstance(obj, types.CodeType):
+        _feed_code(h, obj)
+    elif t is partial:
+        _feed(h, (obj.func, obj.args, obj.keywords))
+    else:
+        _feed_pickled(h, obj)
+
+
+def _feed_pickled(h: Any, obj: Any) -> None:
+    buffers: list[pickle.PickleBuffer] = []
+    try:
+        data = pickle.dumps(obj, protocol=5, buffer_callback=buffers.append)
+    except Exception as exc:
+        msg = (
+            f"cannot hash an argument of type {type(obj).__qualname__} for the "
+            "result cache; cached tasks need arguments that can be pickled"
+        )
+        raise TypeError(msg) from exc
+    _feed_bytes(h, b"p", data)
+    for buffer in buffers:
+        _feed_bytes(h, b"pb", buffer.raw())
+
+
+def _digest(obj: Any) -> bytes:
+    h = _hasher()
+    _feed(h, obj)
+    digest: bytes = h.digest()
+    return digest
+
+
+def _nbytes(obj: Any) -> int:
+    """Approximate memory held by a result, counting array data once."""
+    if isinstance(obj, np.ndarray):
+        return sys.getsizeof(obj) + (0 if obj.base is None else obj.nbytes)
+    if isinstance(obj, (list, tuple)):
+        return sys.getsizeof(obj) + sum(_nbytes(item) for item in obj)
+    if isinstance(obj, dict):
+        return sys.getsizeof(obj) + sum(_nbytes(key) + _nbytes(value) for key, value in obj.items())
+    return sys.getsizeof(obj)
+
+
+def _completed(value: Any) -> Future[Any]:
+    future: Future[Any] = Future()
+    future.set_result(value)
+    return future
+
+
+class ResultCache:
+    """Results of pure tasks by content hash, in memory and optionally on disk.
+
+    Parameters
+    ----------
+    max_bytes : int, default 256 MiB
+        Memory budget for cached results. Sizes are estimated: array data
+        plus the size of the Python objects holding it. A result larger than
+        the budget goes straight to the disk tier, or is not cached.
+    spill_dir : str or os.PathLike, optional
+        Directory for results evicted from memory. Without it, evicted
+        results are dropped. The directory is created if needed; its files
+        belong to the cache and are removed by `clear`.
+    max_spill_bytes : int, optional
+        Budget for the files in `spill_dir`; unlimited by default.
+
+    Examples
+    --------
+    >>> import hpyx
+    >>> results = hpyx.cache.ResultCache(max_bytes=2**30, spill_dir="/tmp/hpyx-cache")
+    >>> with hpyx.HPXExecutor(os_threads=4, cache=results) as executor:
+    ...     first = executor.submit(sum, range(10)).result()
+    ...     again = executor.submit(sum, range(10)).result()  # not run again
+    >>> results.stats()["hits"]
+    1
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = _DEFAULT_MAX_BYTES,
+        *,
+        spill_dir: str | os.PathLike[str] | None = None,
+        max_spill_bytes: int | None = None,
+    ) -> None:
+        if max_bytes < 0:
+            msg = f"max_bytes must be non-negative, got {max_bytes}"
+            raise ValueError(msg)
+        if max_spill_bytes is not None and max_spill_bytes < 0:
+            msg = f"max_spill_bytes must be non-negative, got {max_spill_bytes}"
+            raise ValueError(msg)
+        self.max_bytes = max_bytes
+        self.max_spill_bytes = max_spill_bytes
+        self.spill_dir = None if spill_dir is None else os.fspath(spill_dir)
+        if self.spill_dir is not None:
+            Path(self.spill_dir).mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._memory: OrderedDict[bytes, tuple[Any, int]] = OrderedDict()
+        self._disk: OrderedDict[bytes, int] = OrderedDict()
+        self._pending: dict[bytes, Future[Any]] = {}
+        self._bytes = 0
+        self._spill_bytes = 0
+        self._stats = dict.fromkeys(_STAT_NAMES, 0)
+
+    def key(
+        self,
+        fn: Callable[..., Any],
+        args: tuple[Any, ...] = (),
+        kwargs: dict[str, Any] | None = None,
+    ) -> bytes:
+        """Return the cache key of the call ``fn(*args, **kwargs)``.
+
+        A function is identified by its module, name, bytecode, constants,
+        defaults and closure; other callables by their pickled form. Globals
+        the function reads are not part of the key.
+
+        Raises
+        ------
+        TypeError
+            If an argument is neither a built-in container or value, a NumPy
+            array, nor picklable.
+        """
+        h = _hasher()
+        try:
+            _feed(h, fn)
+            _feed(h, tuple(args))
+            _feed(h, kwargs or {})
+        except RecursionError as exc:
+            msg = "cannot hash a self-referencing task for the result cache"
+            raise TypeError(msg) from exc
+        digest: bytes = h.digest()
+        return digest
+
+    def submit(self, key: bytes, start: Callable[[Future[Any]], Any]) -> Future[Any]:
+        """Return a future for the result cached under `key`.
+
+        On a miss, ``start(future)`` is called with a new running future and
+        must arrange for the task's result or exception to be set on it.
+        Its result is cached once it is set. Requests for a key already
+        being computed, or read back from disk, share that future.
+        """
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+                self._stats["hits"] += 1
+                return _completed(entry[0])
+            future = self._pending.get(key)
+            if future is not None:
+                self._stats["coalesced"] += 1
+                return future
+            future = Future()
+            future.set_running_or_notify_cancel()
+            future.add_done_callback(partial(self._finish, key))
+            self._pending[key] = future
+            size = self._disk.pop(key, None)
+            if size is None:
+                self._stats["misses"] += 1
+            else:
+                self._spill_bytes -= size
+
+        if size is not None:
+            try:
+                value = self._read(key)
+            except (OSError, pickle.UnpicklingError, EOFError):
+                with self._lock:
+                    self._stats["misses"] += 1
+            else:
+                with self._lock:
+                    self._stats["disk_hits"] += 1
+                future.set_result(value)
+                return future
+        try:
+            start(future)
+        except BaseException as exc:
+            future.set_exception(exc)
+            if not isinstance(exc, Exception):
+                raise
+        return future
+
+    def _path(self, key: bytes) -> Path:
+        if self.spill_dir is None:
+            msg = "this ResultCache has no spill_dir"
+            raise RuntimeError(msg)
+        return Path(self.spill_dir) / f"{key.hex()}.pkl"
+
+    def _read(self, key: bytes) -> Any:
+        path = self._path(key)
+        try:
+            with path.open("rb") as f:
+                return pickle.load(f)
+        finally:
+            _remove(path)
+
+    def _finish(self, key: bytes, future: Future[Any]) -> None:
+        with self._lock:
+            self._pending.pop(key, None)
+        if future.cancelled() or future.exception() is not None:
+            return
+        value = future.result()
+        size = _nbytes(value)
+        evicted = []
+        with self._lock:
+            if size > self.max_bytes:
+                evicted.append((key, value))
+            elif key not in self._memory:
+                self._memory[key] = (value, size)
+                self._bytes += size
+                while self._bytes > self.max_bytes:
+                    old_key, (old_value, old_size) = self._memory.popitem(last=False)
+                    self._bytes -= old_size
+                    self._stats["evictions"] += 1
+                    evicted.append((old_key, old_value))
+        if self.spill_dir is not None:
+            for old_key, old_value in evicted:
+                self._spill(old_key, old_value)
+
+    def _spill(self, key: bytes, value: Any) -> None:
+        path = self._path(key)
+        try:
+            with path.open("wb") as f:
+                pickle.dump(value, f, protocol=5)
+            size = path.stat().st_size
+        except (OSError, pickle.PicklingError, TypeError, AttributeError, RecursionError):
+            _remove(path)
+            return
+        dropped = []
+        with self._lock:
+            if key in self._memory or key in self._disk or key in self._pending:
+                dropped.append(path)
+            else:
+                self._disk[key] = size
+                self._spill_bytes += size
+                self._stats["spills"] += 1
+                limit = self.max_spill_bytes
+                while limit is not None and self._spill_bytes > limit:
+                    old_key, old_size = self._disk.popitem(last=False)
+                    self._spill_bytes -= old_size
+                    dropped.append(self._path(old_key))
+        for old_path in dropped:
+            _remove(old_path)
+
+    def clear(self) -> None:
+        """Drop every cached result, in memory and on disk.
+
+        Tasks in flight still complete, and their results are cached.
+        """
+        with self._lock:
+            keys = list(self._disk)
+            self._memory.clear()
+            self._disk.clear()
+            self._bytes = 0
+            self._spill_bytes = 0
+        for key in keys:
+            _remove(self._path(key))
+
+    def stats(self) -> dict[str, int]:
+        """Return the cache's counters and current size.
+
+        ``hits``, ``disk_hits`` and ``misses`` count lookups answered from
+        memory, from disk and by running the task. ``coalesced`` counts
+        lookups that joined a task already in flight. ``evictions`` and
+        ``spills`` count results pushed out of memory and written to disk.
+        ``entries``/``bytes`` and ``spilled_entries``/``spill_bytes``
+        describe what is held in memory and on disk.
+        """
+        with self._lock:
+            return {
+                **self._stats,
+                "entries": len(self._memory),
+                "bytes": self._bytes,
+                "spilled_entries": len(self._disk),
+                "spill_bytes": self._spill_bytes,
+            }
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._memory) + len(self._disk)
+
+
+def _remove(path: Path) -> None:
+    with contextlib.suppress(FileNotFoundError):
+        path.unlink()
+
+
+_default: ResultCache | None = None
+_default_lock = threading.Lock()
+
+
+def default_cache() -> ResultCache:
+    """Return the process-wide cache used by ``cache=True``.
+
+    It is created on first use with a 256 MiB memory budget and no disk
+    tier. Pass a `ResultCache` as ``cache=`` for other limits.
+    """
+    global _default
+    with _default_lock:
+        if _default is None:
+            _default = ResultCache()
+        return _default
+
+
+def resolve(cache: object) -> ResultCache | None:
+    """Map a ``cache=`` argument to the cache to use, or None."""
+    if cache is None or cache is False:
+        return None
+    if cache is True:
+        return default_cache()
+    if isinstance(cache, ResultCache):
+        return cache
+    msg = f"cache must be a bool or a ResultCache, got {type(cache).__qualname__}"
+    raise TypeError(msg)
+
+
+__all__ = ["ResultCache", "default_cache"]
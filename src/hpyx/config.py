@@ -13,6 +13,13 @@ DEFAULTS: dict[str, Any] = {
     "cfg": [],
     "autoinit": True,
     "trace_path": None,
+    "subinterpreters": False,
+    "small_stack_size": None,
+    "tcp_enable": False,
+    "localities": 1,
+    "locality_id": 0,
+    "agas_address": None,
+    "parcel_address": None,
 }
 
 _TRUE_VALUES = frozenset({"1", "true", "yes", "on"})
@@ -57,6 +64,47 @@ def from_env() -> dict[str, Any]:
     if raw_autoinit is not None:
         cfg["autoinit"] = _parse_bool(raw_autoinit, var_name="HPYX_AUTOINIT")
 
+    raw_subinterp = os.environ.get("HPYX_SUBINTERPRETERS")
+    if raw_subinterp is not None:
+        cfg["subinterpreters"] = _parse_bool(
+            raw_subinterp, var_name="HPYX_SUBINTERPRETERS"
+        )
+
+    raw_stack = os.environ.get("HPYX_SMALL_STACK_SIZE")
+    if raw_stack is not None:
+        try:
+            cfg["small_stack_size"] = int(raw_stack, 0)
+        except ValueError as exc:
+            msg = (
+                f"HPYX_SMALL_STACK_SIZE={raw_stack!r} must be an integer "
+                "number of bytes (e.g. 65536 or 0x10000)"
+            )
+            raise ValueError(msg) from exc
+
+    raw_tcp = os.environ.get("HPYX_TCP_ENABLE")
+    if raw_tcp is not None:
+        cfg["tcp_enable"] = _parse_bool(raw_tcp, var_name="HPYX_TCP_ENABLE")
+
+    for key, var_name in (
+        ("localities", "HPYX_LOCALITIES"),
+        ("locality_id", "HPYX_LOCALITY_ID"),
+    ):
+        raw = os.environ.get(var_name)
+        if raw is not None:
+            try:
+                cfg[key] = int(raw)
+            except ValueError as exc:
+                msg = f"{var_name}={raw!r} must be an integer"
+                raise ValueError(msg) from exc
+
+    for key, var_name in (
+        ("agas_address", "HPYX_AGAS_ADDRESS"),
+        ("parcel_address", "HPYX_PARCEL_ADDRESS"),
+    ):
+        raw = os.environ.get(var_name)
+        if raw is not None:
+            cfg[key] = raw
+
     raw_trace = os.environ.get("HPYX_TRACE_PATH")
     if raw_trace is not None:
         cfg["trace_path"] = raw_trace
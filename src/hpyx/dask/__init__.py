@@ -0,0 +1,26 @@
+"""
+HPyX Dask integration: a Dask scheduler backed by the HPX runtime.
+
+`get` runs any Dask task graph (arrays, bags, dataframes, delayed) with
+one HPX dataflow node per task, in place of Dask's threaded scheduler::
+
+    import dask
+    import hpyx
+
+    with dask.config.set(scheduler=hpyx.dask.get):
+        result = x.sum().compute()
+
+Chunk tasks that call ``np.dot``-style products on 1-D float64 chunks, or
+``np.sum`` over whole float64 chunks, run HPyX's native kernels instead.
+
+Important
+---------
+Dask is an optional dependency (``pip install hpyx[dask]``); it is
+imported when a graph is run, not when this module is.
+"""
+
+from __future__ import annotations
+
+from ._scheduler import get
+
+__all__ = ["get"]
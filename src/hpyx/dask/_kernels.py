@@ -0,0 +1,87 @@
+"""Native stand-ins for NumPy functions found in Dask chunk tasks.
+
+Each stand-in takes the NumPy function's arguments, runs an HPyX kernel
+when the inputs suit it and otherwise calls the NumPy function, so a
+substitution never changes a task's result beyond floating-point
+summation order.
+"""
+
+from __future__ import annotations
+
+import functools
+from collections.abc import Callable
+from typing import Any
+
+import numpy as np
+
+from hpyx import _core
+from hpyx.array import from_array
+
+# Below this many elements a chunk is summed faster by NumPy alone.
+_MIN_NATIVE_SUM = 1 << 16
+
+
+def _is_vector(x: Any) -> bool:
+    return type(x) is np.ndarray and x.ndim == 1 and x.dtype == np.float64 and x.flags.c_contiguous
+
+
+def _dot_like(fallback: Callable[..., Any]) -> Callable[..., Any]:
+    @functools.wraps(fallback)
+    def kernel(a: Any, b: Any, *args: Any, **kwargs: Any) -> Any:
+        if not args and not kwargs and _is_vector(a) and _is_vector(b) and a.size == b.size:
+            return np.float64(_core.dot1d(a, b))
+        return fallback(a, b, *args, **kwargs)
+
+    return kernel
+
+
+def _covers_all_axes(axis: Any, ndim: int) -> bool:
+    if axis is None:
+        return True
+    axes = axis if isinstance(axis, tuple) else (axis,)
+    return sorted(a % ndim for a in axes) == list(range(ndim))
+
+
+def _sum(
+    a: Any,
+    axis: Any = None,
+    dtype: Any = None,
+    out: Any = None,
+    keepdims: bool = False,
+    **kwargs: Any,
+) -> Any:
+    if (
+        type(a) is np.ndarray
+        and a.dtype == np.float64
+        and a.flags.c_contiguous
+        and a.size >= _MIN_NATIVE_SUM
+        and dtype in (None, np.float64)
+        and out is None
+        and not kwargs
+        and _covers_all_axes(axis, a.ndim)
+    ):
+        total = from_array(a).sum().compute()
+        return np.full((1,) * a.ndim, total) if keepdims else total
+    return np.sum(a, axis=axis, dtype=dtype, out=out, keepdims=keepdims, **kwargs)
+
+
+KERNELS: dict[Callable[..., Any], Callable[..., Any]] = {
+    np.dot: _dot_like(np.dot),
+    np.vdot: _dot_like(np.vdot),
+    np.inner: _dot_like(np.inner),
+    np.matmul: _dot_like(np.matmul),
+    np.sum: _sum,
+}
+
+
+def native_for(func: Any) -> Callable[..., Any] | None:
+    """The native stand-in for `func`, looking through `functools.partial`."""
+    if isinstance(func, functools.partial):
+        inner = native_for(func.func)
+        if inner is None:
+            return None
+        return functools.partial(inner, *func.args, **func.keywords)
+    try:
+        return KERNELS.get(func)
+    except TypeError:  # unhashable callable
+        return None
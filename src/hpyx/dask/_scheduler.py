@@ -0,0 +1,131 @@
+"""Run Dask task graphs on the HPX runtime.
+
+`get` converts a Dask graph into an `hpyx._taskgraph` graph, one task per
+Dask key, and runs it with `hpyx._taskgraph.execute`: every key becomes
+an HPX dataflow node that starts as soon as its dependencies are done.
+Both graph formats are supported: the task-spec objects of current Dask
+(``dask._task_spec``) and the legacy ``(func, *args)`` tuples.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Hashable, Mapping
+from typing import Any
+
+from hpyx._taskgraph import Ref, Task, execute
+
+from ._kernels import native_for
+
+
+def _run_node(node: Any, values: dict[Hashable, Any]) -> Any:
+    return node(values)
+
+
+def _run_legacy(computation: Any, values: dict[Hashable, Any]) -> Any:
+    from dask.core import _execute_task
+
+    return _execute_task(computation, values)
+
+
+def _inputs(deps: Any) -> dict[Hashable, Ref]:
+    return {dep: Ref(dep) for dep in deps}
+
+
+def _convert_spec(dsk: Mapping[Hashable, Any], native_kernels: bool) -> dict[Hashable, Any]:
+    from dask._task_spec import DataNode, convert_legacy_graph
+    from dask._task_spec import Task as DaskTask
+
+    graph: dict[Hashable, Any] = {}
+    for key, node in convert_legacy_graph(dsk).items():
+        if isinstance(node, DataNode):
+            graph[key] = node.value
+            continue
+        task = node
+        if native_kernels and isinstance(node, DaskTask):
+            kernel = native_for(node.func)
+            if kernel is not None:
+                task = DaskTask(node.key, kernel, *node.args, **node.kwargs)
+        graph[key] = Task(_run_node, (task, _inputs(task.dependencies)))
+    return graph
+
+
+def _convert_legacy(dsk: Mapping[Hashable, Any], native_kernels: bool) -> dict[Hashable, Any]:
+    from dask.core import get_dependencies, istask
+
+    dsk = dict(dsk)
+    graph: dict[Hashable, Any] = {}
+    for key, computation in dsk.items():
+        task = computation
+        if native_kernels and istask(computation):
+            kernel = native_for(computation[0])
+            if kernel is not None:
+                task = (kernel, *computation[1:])
+        deps = get_dependencies(dsk, key)
+        graph[key] = Task(_run_legacy, (task, _inputs(deps)))
+    return graph
+
+
+def _flatten(keys: Any) -> list[Hashable]:
+    if isinstance(keys, list):
+        return [k for item in keys for k in _flatten(item)]
+    return [keys]
+
+
+def _pack(keys: Any, values: dict[Hashable, Any]) -> Any:
+    # Lists of keys come back as tuples, as from Dask's own schedulers.
+    if isinstance(keys, list):
+        return tuple(_pack(item, values) for item in keys)
+    return values[keys]
+
+
+def get(
+    dsk: Any,
+    keys: Any,
+    *,
+    optimize_graph: bool = True,
+    native_kernels: bool = True,
+    stacksize: str | None = None,
+    **_kwargs: Any,
+) -> Any:
+    """Dask scheduler that executes a task graph on HPX workers.
+
+    Use it as ``dask.config.set(scheduler=hpyx.dask.get)`` or pass
+    ``scheduler=hpyx.dask.get`` to ``dask.compute``. Each Dask key becomes
+    one HPX dataflow node; linear chains of tasks are fused first (see
+    `hpyx.compute`).
+
+    Parameters
+    ----------
+    dsk : Mapping or graph expression
+        The Dask graph: a dict, a ``HighLevelGraph`` or a graph expression.
+    keys : key or nested list of keys
+        The keys to compute.
+    optimize_graph : bool, default True
+        Fuse linear chains of tasks into single HPX tasks.
+    native_kernels : bool, default True
+        Run HPyX kernels in place of NumPy functions that chunk tasks call
+        directly, such as ``np.dot`` on 1-D float64 chunks (``_core.dot1d``)
+        or ``np.sum`` over whole large float64 chunks (`hpyx.array`).
+    stacksize : {"nostack", "small", "medium", "large"}, optional
+        HPX stack size of every task. ``"nostack"`` tasks must not
+        wait for other HPX work; see `hpyx.futures.submit`.
+    **_kwargs
+        Other scheduler options that Dask passes through, such as
+        ``num_workers``; ignored.
+
+    Returns
+    -------
+    object
+        The result for `keys`; nested lists of keys give nested tuples.
+    """
+    if not isinstance(dsk, Mapping):
+        dsk = dsk.__dask_graph__()  # a dask-expr expression
+    try:
+        import dask._task_spec  # noqa: F401
+    except ImportError:
+        graph = _convert_legacy(dsk, native_kernels)
+    else:
+        graph = _convert_spec(dsk, native_kernels)
+    flat = _flatten(keys)
+    values = execute(graph, flat, optimize=optimize_graph, stacksize=stacksize)
+    return _pack(keys, dict(zip(flat, values, strict=True)))
@@ -1,13 +1,40 @@
 """Diagnostics and tracing hooks.
 
-Phase-0 scope: query-only (worker thread count + current thread id).
-`enable_tracing` / `disable_tracing` are stubbed and raise — full
-JSONL-output implementation ships in Plan 4.
+Query helpers (worker thread count, current thread id, `worker_threads`),
+scheduler state (`snapshot`), GIL contention totals (`gil_stats`), HPX
+performance counters (`counters`, `CounterSampler`), the memory allocator
+in use (`allocator_info`) and per-task tracing.
+
+While tracing is enabled every Python task scheduled through
+`hpyx.futures.submit` or `HPXExecutor` records its function qualname,
+submit/start/end times, HPX worker id and GIL wait into a per-worker ring
+buffer in C++. A background C++ thread appends them to a JSONL file, one
+object per line::
+
+    {"name": "work", "worker_thread_id": 2, "submit_ns": ..., "start_ns": ...,
+     "end_ns": ..., "gil_wait_ns": ...}
+
+Times are ``steady_clock`` nanoseconds: compare them within one trace, not
+against wall-clock time.
 """
 
 from __future__ import annotations
 
-from hpyx import _core, _runtime
+import os
+import warnings
+from typing import Any
+
+from hpyx import _core, _runtime, _trace_export, _worker_threads
+from hpyx import config as _config
+from hpyx._counters import (
+    DEFAULT_COUNTERS,
+    CounterSampler,
+    counters,
+    format_prometheus,
+)
+
+_reported_drops = 0
+_last_trace_path: str | None = None
 
 
 def get_num_worker_threads() -> int:
@@ -22,11 +49,265 @@ def get_worker_thread_id() -> int:
     return int(_core.runtime.get_worker_thread_id())
 
 
-def enable_tracing(path: str | None = None) -> None:
-    """Start capturing per-task events as JSONL. Ships in v1.x."""
-    raise NotImplementedError("hpyx.debug.enable_tracing ships in v1.x (Plan 4)")
+def allocator_info() -> dict[str, Any]:
+    """Report which memory allocator is in use and its statistics.
+
+    Returns
+    -------
+    dict
+        ``hpx_malloc``
+            Allocator HPX was built with (``HPX_WITH_MALLOC``: ``"system"``,
+            ``"tcmalloc"``, ``"jemalloc"`` or ``"mimalloc"``), or
+            ``"unknown"``.
+        ``active``
+            Allocator actually serving ``malloc`` in this process, detected
+            from its exported symbols. This accounts for ``LD_PRELOAD``, as
+            in the ``libhpx`` pixi environments, which preload tcmalloc.
+        ``stats``
+            Counters from the active allocator, in bytes. Most allocators
+            report ``allocated_bytes`` (bytes currently allocated by the
+            program). The other keys are specific to each allocator, for
+            example ``heap_bytes`` for tcmalloc, ``resident_bytes`` for
+            jemalloc, ``committed_bytes`` for mimalloc and ``free_bytes``
+            for glibc. The dict is empty if the allocator exposes no
+            statistics.
+
+    Notes
+    -----
+    The allocator strongly affects task-spawn throughput; compare them with
+    ``benchmarks/test_bench_allocator.py``. Rebuild HPX with
+    ``pixi run build-hpx <tag> <malloc>`` to change it.
+    """
+    return _core.allocator.info()
+
+
+def worker_threads() -> list[dict[str, Any]]:
+    """Map HPX worker ids to their OS threads.
+
+    HPX worker OS threads are named when the runtime starts: the OS name is
+    ``hpyx-<pool>-<n>`` (what ``perf``, ``top -H`` and gdb show) and the
+    Python `threading` name is ``hpyx-worker-<pool>-<n>``. Each worker
+    keeps one Python thread state for its lifetime, so sampling profilers
+    such as py-spy attribute Python callbacks to the right worker.
+
+    Returns
+    -------
+    list of dict
+        One dict per worker, ordered by ``worker`` (the global HPX worker
+        id, as returned by `get_worker_thread_id`), with ``pool``,
+        ``index`` (thread number within the pool), ``name``, ``native_id``
+        (the OS thread id, as in ``threading.get_native_id`` and py-spy)
+        and ``ident`` (``threading.get_ident``).
+    """
+    _runtime.ensure_started()
+    return _worker_threads.workers()
+
+
+def snapshot() -> dict[str, Any]:
+    """Return a structured view of what the HPX scheduler is doing right now.
+
+    Cheap enough to call every second from a health-check endpoint: it reads
+    the schedulers' counters and the in-flight task counters. No task is
+    scheduled and no lock is taken.
+
+    Returns
+    -------
+    dict
+        ``pending``, ``active``, ``suspended``, ``staged``, ``terminated``
+        (HPX thread counts by state) and ``queue_length``, summed over all
+        pools. ``pools`` lists each thread pool with the same keys, its
+        ``name`` and ``workers``: one dict per worker OS thread with the same
+        keys plus its global ``worker`` id. ``python_tasks`` has ``queued``,
+        the number of Python tasks scheduled on HPX threads (``submit(...,
+        stacksize=...)``, `HPXExecutor`) that have not started yet, and
+        ``oldest_queued_age_ns``, how long the oldest of them has waited
+        (None if there are none). The age is exact while up to 16384 tasks
+        are queued; beyond that some queued tasks are not timed. ``timestamp_ns`` is the ``steady_clock``
+        time of the snapshot.
+
+    Notes
+    -----
+    A growing ``oldest_queued_age_ns`` with every worker ``active`` means the
+    workers are saturated or blocked; with ``pending`` tasks but idle
+    workers it points at a stalled scheduler. Tasks from the default
+    ``submit(fn)`` path are deferred to ``get()`` and never queue on HPX.
+
+    Examples
+    --------
+    >>> snap = debug.snapshot()
+    >>> snap["pending"], snap["python_tasks"]["oldest_queued_age_ns"]
+    (0, None)
+    """
+    _runtime.ensure_started()
+    return _core.snapshot.snapshot()
+
+
+def _gil_totals(acquisitions: int, wait_ns: int, max_wait_ns: int) -> dict[str, Any]:
+    return {
+        "acquisitions": acquisitions,
+        "wait_ns": wait_ns,
+        "mean_wait_ns": wait_ns / acquisitions if acquisitions else 0.0,
+        "max_wait_ns": max_wait_ns,
+    }
+
+
+def gil_stats(reset: bool = False) -> dict[str, Any]:
+    """Return how often HPX threads took the GIL and how long they waited.
+
+    Every place where C++ code on an HPX thread acquires the GIL is counted:
+    Python task bodies, ``future.then`` continuations, parallel `for_loop`
+    chunks, remote calls and buffer releases. Counting is always on and costs
+    two clock reads per acquisition.
+
+    Parameters
+    ----------
+    reset : bool, default False
+        Zero the counters after reading them.
+
+    Returns
+    -------
+    dict
+        ``acquisitions``, ``wait_ns``, ``mean_wait_ns`` and ``max_wait_ns``
+        summed over all threads, plus ``workers`` (one such dict per HPX
+        worker, indexed by worker id) and ``external`` (threads that are not
+        HPX workers, such as deferred continuations run inside ``get()``).
+
+    Notes
+    -----
+    A high ``wait_ns`` relative to task run time means the workload is
+    serialized on the GIL. Move it to a native kernel, to subinterpreters
+    (``hpyx.init(subinterpreters=True)``) or to a process pool.
+    """
+    _runtime.ensure_started()
+    workers, external = _core.gil.stats(reset)
+    acquisitions = sum(w[0] for w in workers) + external[0]
+    wait_ns = sum(w[1] for w in workers) + external[1]
+    max_wait_ns = max([w[2] for w in workers] + [external[2]])
+    return {
+        **_gil_totals(acquisitions, wait_ns, max_wait_ns),
+        "workers": [_gil_totals(*w) for w in workers],
+        "external": _gil_totals(*external),
+    }
+
+
+def enable_tracing(
+    path: str | os.PathLike[str] | None = None,
+    *,
+    flush_interval: float = 0.1,
+    gil_events: bool = False,
+) -> None:
+    """Start capturing per-task events as JSONL appended to `path`.
+
+    Parameters
+    ----------
+    path : str or path-like, optional
+        Output file. Defaults to ``HPYX_TRACE_PATH``. Setting that variable
+        also enables tracing as soon as the runtime starts.
+    flush_interval : float, default 0.1
+        Seconds between background flushes of the ring buffers.
+    gil_events : bool, default False
+        Also record every GIL acquisition on an HPX thread as a
+        ``cat="gil"`` event named after its site (``gil.task``,
+        ``gil.then``, ``gil.for_loop``, ...). Task events already carry
+        their own ``gil_wait_ns``; this shows every other acquisition too.
+
+    Raises
+    ------
+    ValueError
+        If no path is given and ``HPYX_TRACE_PATH`` is unset.
+    RuntimeError
+        If tracing is already enabled.
+    """
+    if path is None:
+        path = _config.from_env()["trace_path"]
+    if path is None:
+        msg = "enable_tracing() needs a path argument or HPYX_TRACE_PATH"
+        raise ValueError(msg)
+    global _last_trace_path
+    _runtime.ensure_started()
+    _core.gil.set_trace_events(gil_events)
+    _core.tracing.start(os.fspath(path), max(1, int(flush_interval * 1000)))
+    _last_trace_path = os.fspath(path)
 
 
 def disable_tracing() -> None:
-    """Stop capturing per-task events. Ships in v1.x."""
-    raise NotImplementedError("hpyx.debug.disable_tracing ships in v1.x (Plan 4)")
+    """Stop capturing and flush every buffered event. No-op if not enabled.
+
+    Warns with `RuntimeWarning` if events were dropped because a worker's
+    ring buffer filled up faster than the flusher drained it.
+    """
+    global _reported_drops
+    _core.tracing.stop()
+    dropped = int(_core.tracing.dropped())
+    if dropped > _reported_drops:
+        warnings.warn(
+            f"HPyX tracing dropped {dropped - _reported_drops} events "
+            "(ring buffer full); use a shorter flush_interval",
+            RuntimeWarning,
+            stacklevel=2,
+        )
+        _reported_drops = dropped
+
+
+def tracing_enabled() -> bool:
+    """True while per-task tracing is enabled."""
+    return bool(_core.tracing.is_enabled())
+
+
+def export_trace(
+    path: str | os.PathLike[str],
+    format: str = "chrome",
+    *,
+    source: str | os.PathLike[str] | None = None,
+) -> None:
+    """Export a per-worker task timeline for chrome://tracing or Perfetto.
+
+    Parameters
+    ----------
+    path : str or path-like
+        Output JSON file.
+    format : {"chrome", "perfetto"}, default "chrome"
+        Target viewer. Both use the JSON Trace Event Format, which
+        ``chrome://tracing`` and https://ui.perfetto.dev load directly.
+    source : str or path-like, optional
+        JSONL trace to convert. Defaults to the file of the current or most
+        recent `enable_tracing` call, else ``HPYX_TRACE_PATH``. Events still
+        buffered by an active trace are flushed first.
+
+    Notes
+    -----
+    Each HPX worker gets one row. Python tasks appear as ``cat="task"``
+    slices named after the callable, chunks of parallel kernels (`for_loop`,
+    `dot1d`) as ``cat="kernel"`` slices, and the time a slice spent waiting
+    for the GIL as a nested "GIL wait" slice.
+    """
+    if format not in _trace_export.FORMATS:
+        msg = f"format must be one of {_trace_export.FORMATS}, got {format!r}"
+        raise ValueError(msg)
+    if source is None:
+        source = _last_trace_path or _config.from_env()["trace_path"]
+    if source is None:
+        msg = "export_trace() needs a source trace; call enable_tracing() first"
+        raise ValueError(msg)
+    if tracing_enabled():
+        _core.tracing.flush()
+    events = _trace_export.load_events(source)
+    _trace_export.write(events, path, pid=os.getpid())
+
+
+__all__ = [
+    "DEFAULT_COUNTERS",
+    "CounterSampler",
+    "allocator_info",
+    "counters",
+    "disable_tracing",
+    "enable_tracing",
+    "export_trace",
+    "format_prometheus",
+    "get_num_worker_threads",
+    "get_worker_thread_id",
+    "gil_stats",
+    "snapshot",
+    "tracing_enabled",
+    "worker_threads",
+]
@@ -0,0 +1,88 @@
+"""
+Multi-locality execution over the HPX TCP parcelport.
+
+A multi-locality job is a set of HPyX processes (localities) that share one
+HPX runtime. Locality 0 (the console) runs your script; the others are
+workers that serve remote tasks until the console exits. Start a job with
+the launcher::
+
+    python -m hpyx.distributed -n 4 script.py            # all on localhost
+    python -m hpyx.distributed --hosts a,b script.py     # one per host (ssh)
+
+and, inside ``script.py``, send work with `submit`::
+
+    import hpyx
+    from hpyx import distributed
+
+    futures = [distributed.submit(work, i, locality=k)
+               for k in hpyx.find_all_localities()]
+
+Callables and arguments are pickled (protocol 5), so callables must be
+importable by module path on every locality. Contiguous buffers such as
+NumPy array data are sent out of band, without an extra copy.
+
+Multi-locality mode needs an HPX build with networking enabled
+(``HPX_WITH_NETWORKING=ON``); see `networking_enabled`.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from typing import Any
+
+from hpyx import _core, _runtime
+from hpyx.distributed import _remote
+from hpyx.distributed._launch import launch
+
+
+def find_all_localities() -> list[int]:
+    """Return the ids of every locality in the job (``[0]`` when alone)."""
+    _runtime.ensure_started()
+    return list(_core.distributed.find_all_localities())
+
+
+def get_locality_id() -> int:
+    """Return the id of the locality this process is running as."""
+    _runtime.ensure_started()
+    return int(_core.distributed.get_locality_id())
+
+
+def networking_enabled() -> bool:
+    """True if the underlying HPX build supports multiple localities."""
+    return bool(_core.distributed.networking_enabled())
+
+
+def submit(fn: Callable[..., Any], /, *args: Any, locality: int, **kwargs: Any) -> _core.future:
+    """Run ``fn(*args, **kwargs)`` on `locality` and return a future.
+
+    Parameters
+    ----------
+    fn : callable
+        The callable to run. It is pickled, so it must be importable by
+        module path on the target locality (not a lambda or a function
+        defined in ``__main__``).
+    *args, **kwargs
+        Arguments for `fn`, pickled with protocol 5. Contiguous buffers
+        (e.g. NumPy arrays) are sent out of band.
+    locality : int
+        Target locality id, as returned by `find_all_localities`.
+
+    Returns
+    -------
+    future
+        An HPX future; ``get()`` returns the result or re-raises the remote
+        exception with the remote traceback attached as a note.
+    """
+    _runtime.ensure_started()
+    payload, buffers = _remote.dumps((fn, args, kwargs))
+    future = _core.distributed.remote_call(int(locality), payload, buffers)
+    return future.then(_remote.decode, int(locality))
+
+
+__all__ = [
+    "find_all_localities",
+    "get_locality_id",
+    "launch",
+    "networking_enabled",
+    "submit",
+]
@@ -0,0 +1,47 @@
+"""Command-line launcher: ``python -m hpyx.distributed -n 4 script.py``."""
+
+from __future__ import annotations
+
+import argparse
+import sys
+
+from hpyx.distributed._launch import launch
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m hpyx.distributed",
+        description="Run a script as locality 0 of a multi-locality HPyX job.",
+    )
+    parser.add_argument(
+        "-n",
+        "--localities",
+        type=int,
+        default=None,
+        help="number of localities (default: one per host, or 2 on localhost)",
+    )
+    parser.add_argument(
+        "--hosts",
+        default=None,
+        help="comma-separated hosts, first one is this machine (default: localhost)",
+    )
+    parser.add_argument(
+        "--port", type=int, default=7910, help="base TCP port; locality k uses port + k"
+    )
+    parser.add_argument(
+        "--os-threads", type=int, default=None, help="HPX worker threads per locality"
+    )
+    parser.add_argument("script", help="Python script to run on locality 0")
+    parser.add_argument("args", nargs=argparse.REMAINDER, help="arguments for the script")
+    ns = parser.parse_args(argv)
+    return launch(
+        [ns.script, *ns.args],
+        localities=ns.localities,
+        hosts=ns.hosts.split(",") if ns.hosts else None,
+        base_port=ns.port,
+        os_threads=ns.os_threads,
+    )
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,122 @@
+"""Launcher for multi-locality HPyX jobs (``python -m hpyx.distributed``)."""
+
+from __future__ import annotations
+
+import os
+import shlex
+import socket
+import subprocess
+import sys
+from collections.abc import Sequence
+
+_LOCAL_HOSTS = frozenset({"localhost", "127.0.0.1", "::1"})
+
+
+def _is_local(host: str) -> bool:
+    return host in _LOCAL_HOSTS or host in {socket.gethostname(), socket.getfqdn()}
+
+
+def _locality_env(
+    locality_id: int,
+    *,
+    localities: int,
+    host: str,
+    agas_host: str,
+    base_port: int,
+    os_threads: int | None,
+) -> dict[str, str]:
+    env = {
+        "HPYX_TCP_ENABLE": "1",
+        "HPYX_LOCALITIES": str(localities),
+        "HPYX_LOCALITY_ID": str(locality_id),
+        "HPYX_AGAS_ADDRESS": f"{agas_host}:{base_port}",
+        "HPYX_PARCEL_ADDRESS": f"{host}:{base_port + locality_id}",
+    }
+    if os_threads is not None:
+        env["HPYX_OS_THREADS"] = str(os_threads)
+    return env
+
+
+def launch(
+    argv: Sequence[str],
+    *,
+    localities: int | None = None,
+    hosts: Sequence[str] | None = None,
+    base_port: int = 7910,
+    os_threads: int | None = None,
+    python: str = sys.executable,
+    timeout: float | None = None,
+) -> int:
+    """Run ``python *argv`` as locality 0 of a multi-locality job.
+
+    Parameters
+    ----------
+    argv : sequence of str
+        Script and arguments for the console locality, e.g.
+        ``["script.py", "--size", "10"]``.
+    localities : int, optional
+        Number of localities. Defaults to ``len(hosts)``, or 2 on localhost.
+    hosts : sequence of str, optional
+        Hosts to place localities on, round-robin. ``hosts[0]`` must be the
+        machine running the launcher: it hosts the console and the AGAS
+        service every other locality connects to. Non-local hosts are
+        reached with ``ssh`` and need the same Python environment.
+        Defaults to ``["localhost"]``.
+    base_port : int, default 7910
+        Locality ``k`` listens on ``base_port + k``.
+    os_threads : int, optional
+        HPX worker threads per locality.
+    python : str, default sys.executable
+        Interpreter used to start each locality.
+    timeout : float, optional
+        Seconds to wait for the console locality before killing the job.
+
+    Returns
+    -------
+    int
+        The console locality's exit code.
+    """
+    hosts = list(hosts) if hosts else ["localhost"]
+    if localities is None:
+        localities = len(hosts) if len(hosts) > 1 else 2
+    if localities < 1:
+        msg = f"localities must be >= 1, got {localities}"
+        raise ValueError(msg)
+
+    def env_for(k: int) -> dict[str, str]:
+        return _locality_env(
+            k,
+            localities=localities,
+            host=hosts[k % len(hosts)],
+            agas_host=hosts[0],
+            base_port=base_port,
+            os_threads=os_threads,
+        )
+
+    workers: list[subprocess.Popen[bytes]] = []
+    try:
+        for k in range(1, localities):
+            host = hosts[k % len(hosts)]
+            cmd = [python, "-m", "hpyx.distributed.worker"]
+            if _is_local(host):
+                workers.append(subprocess.Popen(cmd, env={**os.environ, **env_for(k)}))
+            else:
+                assignments = [f"{name}={value}" for name, value in env_for(k).items()]
+                remote = shlex.join(["env", *assignments, *cmd])
+                workers.append(subprocess.Popen(["ssh", host, remote]))
+
+        console = subprocess.run(
+            [python, *argv],
+            env={**os.environ, **env_for(0)},
+            timeout=timeout,
+            check=False,
+        )
+        # Workers exit on their own once the console's runtime shuts down.
+        for worker in workers:
+            worker.wait(timeout=30)
+        return console.returncode
+    finally:
+        for worker in workers:
+            if worker.poll() is None:
+                worker.kill()
+                worker.wait()
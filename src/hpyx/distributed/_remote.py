@@ -0,0 +1,56 @@
+"""Wire format for tasks sent between HPyX localities.
+
+A task is a pickle (protocol 5) of ``(fn, args, kwargs)``; its result a
+pickle of ``(ok, value, traceback_text)``. Contiguous buffers, such as
+NumPy array data, travel out of band: `_core.distributed` ships them as
+separate HPX serialization buffers straight from Python memory, and the
+receiver rebuilds them around the received parcel memory without a copy.
+"""
+
+from __future__ import annotations
+
+import pickle
+import traceback
+from typing import Any
+
+
+def dumps(obj: Any) -> tuple[bytes, list[memoryview]]:
+    """Pickle `obj`, returning the in-band payload and out-of-band buffers."""
+    buffers: list[memoryview] = []
+
+    def keep(buffer: pickle.PickleBuffer) -> bool:
+        try:
+            buffers.append(buffer.raw())
+        except BufferError:
+            return True  # non-contiguous: serialize it in band instead
+        return False
+
+    return pickle.dumps(obj, protocol=5, buffer_callback=keep), buffers
+
+
+def loads(payload: bytes, buffers: list[Any]) -> Any:
+    return pickle.loads(payload, buffers=buffers)
+
+
+def execute(payload: bytes, buffers: list[Any]) -> tuple[bytes, list[memoryview]]:
+    """Run a task on this locality. Called by `_core.distributed`."""
+    try:
+        fn, args, kwargs = loads(payload, buffers)
+        return dumps((True, fn(*args, **kwargs), None))
+    except BaseException as exc:  # shipped back to the caller
+        text = traceback.format_exc()
+        try:
+            return dumps((False, exc, text))
+        except Exception:  # the exception itself is unpicklable
+            return dumps((False, RuntimeError(f"{type(exc).__name__}: {exc}"), text))
+
+
+def decode(result: tuple[bytes, list[Any]], locality: int) -> Any:
+    """Unpickle a task result, re-raising a remote exception locally."""
+    payload, buffers = result
+    ok, value, text = loads(payload, buffers)
+    if ok:
+        return value
+    if text:
+        value.add_note(f"Raised on HPyX locality {locality}:\n{text}")
+    raise value
@@ -0,0 +1,19 @@
+"""Entry point for worker localities: ``python -m hpyx.distributed.worker``.
+
+Started by `hpyx.distributed.launch`, which passes the job layout through
+HPYX_* environment variables.
+"""
+
+from __future__ import annotations
+
+import sys
+
+from hpyx import _runtime
+
+
+def main() -> int:
+    return _runtime.run_worker()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -17,6 +17,7 @@ from concurrent.futures import Executor, Future
 from typing import Any
 
 import hpyx
+from hpyx.cache import ResultCache, resolve
 
 
 class HPXExecutor(Executor):
@@ -55,6 +56,9 @@ class HPXExecutor(Executor):
         os_threads: int = 1,
         diagnostics_on_terminate: bool = False,
         tcp_enable: bool = False,
+        stacksize: str | None = None,
+        profile: bool = False,
+        cache: bool | ResultCache = False,
     ) -> None:
         """
         Initialize the HPXExecutor with configurable runtime options.
@@ -72,7 +76,24 @@ class HPXExecutor(Executor):
         diagnostics_on_terminate : bool, default False
             Print diagnostic information during forced runtime termination.
         tcp_enable : bool, default False
-            Enable the TCP parcelport for distributed computing.
+            Enable the TCP parcelport for distributed computing. Needed to
+            start a multi-locality job by hand; `hpyx.distributed.launch`
+            enables it through ``HPYX_TCP_ENABLE`` instead.
+        stacksize : {"nostack", "small", "medium", "large"}, optional
+            Stack size of the HPX thread created for every submitted task.
+            Defaults to HPX's default (small) stack. Use ``"nostack"`` for
+            large numbers of tiny tasks that do not recurse deeply and do
+            not wait for other HPX work; see `hpyx.futures.submit`.
+        profile : bool, default False
+            Record per-callable task counts and queue-wait, GIL-wait and
+            run-time histograms, read back with `stats`. Costs three clock
+            reads and a few atomic increments per task.
+        cache : bool or hpyx.cache.ResultCache, default False
+            Treat every submitted task as pure and memoize it by a content
+            hash of the callable and its arguments. An identical task that
+            already finished returns its cached result without running, and
+            one still running is shared instead of started again. ``True``
+            uses `hpyx.cache.default_cache`.
                 
         Notes
         -----
@@ -81,7 +102,17 @@ class HPXExecutor(Executor):
         at a time within a process.
         """
         from hpyx import _runtime
-        _runtime.ensure_started(os_threads=os_threads)
+        from hpyx.futures._submit import _check_stacksize
+
+        _check_stacksize(stacksize)
+        self._stacksize = stacksize
+        self._cache = resolve(cache)
+        self._profile = hpyx._core.profile.ProfileStats() if profile else None
+        # Only an explicit request to enable TCP is forwarded, so the default
+        # does not conflict with a runtime started by the launcher.
+        _runtime.ensure_started(
+            os_threads=os_threads, tcp_enable=True if tcp_enable else None
+        )
 
     def submit(self: HPXExecutor, fn: Callable[..., Any], /, *args: Any, **kwargs: Any) -> Any:
         """
@@ -99,21 +130,82 @@ class HPXExecutor(Executor):
 
         Returns
         -------
-        HPXFuture
-            An HPXFuture representing the execution of the callable. The future
-            can be used to retrieve the result when computation is complete or
-            to check execution status.
+        concurrent.futures.Future
+            A Future representing the execution of the callable. The task runs
+            eagerly as an HPX thread with the executor's ``stacksize``; its
+            result or exception is set on the future when it finishes. With
+            ``cache`` enabled, a cache hit returns an already completed
+            future, and identical tasks in flight share one future.
             
         Notes
         -----
         The returned future is compatible with Python's concurrent.futures
         interface but uses HPX's asynchronous execution system internally.
         """
-        fut: hpyx._core.HPXFuture = Future()
+        if self._cache is not None:
+            return self._cache.submit(
+                self._cache.key(fn, args, kwargs),
+                lambda fut: self._start(fut, fn, args, kwargs),
+            )
+        fut: Future = Future()
         fut.set_running_or_notify_cancel()
-        fut._hpx_cont = hpyx._core.hpx_async_set_result(fut, fn, *args, **kwargs)
+        self._start(fut, fn, args, kwargs)
         return fut
 
+    def _start(self, fut: Future, fn: Callable[..., Any], args: tuple, kwargs: dict) -> None:
+        hpyx._core.hpx_async_set_result(
+            fut, fn, args, kwargs, self._stacksize or "default", self._profile
+        )
+
+    def stats(self, reset: bool = False) -> dict[str, dict[str, Any]]:
+        """
+        Return per-callable profiling statistics.
+
+        Parameters
+        ----------
+        reset : bool, default False
+            Zero every counter and histogram after reading them.
+
+        Returns
+        -------
+        dict
+            Maps each submitted callable's ``__qualname__`` to a dict with
+            ``count`` and ``errors`` (tasks finished and tasks that raised)
+            and one histogram summary each for ``queue_wait`` (submit until
+            the task starts on a worker), ``gil_wait`` (waiting for the GIL)
+            and ``run`` (the call itself). A summary holds ``count``,
+            ``total_ns``, ``mean_ns``, ``p50_ns``, ``p90_ns``, ``p99_ns`` and
+            ``buckets``, a list of ``(upper_bound_ns, count)`` pairs for the
+            non-empty power-of-two buckets. Percentiles are bucket upper
+            bounds, so they are accurate to within a factor of two.
+
+        Raises
+        ------
+        RuntimeError
+            If the executor was created without ``profile=True``.
+
+        Examples
+        --------
+        >>> with HPXExecutor(os_threads=4, profile=True) as executor:
+        ...     results = list(executor.map(abs, range(100)))
+        ...     executor.stats()["abs"]["count"]
+        100
+        """
+        if self._profile is None:
+            msg = "profiling is disabled; create the executor with HPXExecutor(profile=True)"
+            raise RuntimeError(msg)
+        raw = self._profile.snapshot(reset)
+        return {
+            name: {
+                "count": entry["count"],
+                "errors": entry["errors"],
+                "queue_wait": _histogram_summary(*entry["queue_wait"]),
+                "gil_wait": _histogram_summary(*entry["gil_wait"]),
+                "run": _histogram_summary(*entry["run"]),
+            }
+            for name, entry in raw.items()
+        }
+
     def shutdown(self, wait: bool = True, *, cancel_futures: bool = False) -> None:
         """
         Signal the executor to stop accepting new tasks and shutdown.
@@ -137,3 +229,37 @@ class HPXExecutor(Executor):
         within the same process.
         """
         return None
+
+
+def _percentile(bounded: list[tuple[int, int]], total: int, q: float) -> int:
+    """Upper bound of the bucket holding the ``q`` quantile."""
+    rank = q * total
+    seen = 0
+    for bound, count in bounded:
+        seen += count
+        if seen >= rank:
+            return bound
+    return bounded[-1][0]
+
+
+def _histogram_summary(sum_ns: int, counts: list[int]) -> dict[str, Any]:
+    """Summarize raw log2 bucket counts from ``_core.profile``.
+
+    Bucket ``i`` holds durations below ``2**i`` ns (bucket 0 is exactly 0).
+    """
+    bounded = [(0 if i == 0 else 2**i, n) for i, n in enumerate(counts) if n]
+    total = sum(counts)
+    if not total:
+        return {
+            "count": 0, "total_ns": 0, "mean_ns": 0.0,
+            "p50_ns": 0, "p90_ns": 0, "p99_ns": 0, "buckets": [],
+        }
+    return {
+        "count": total,
+        "total_ns": sum_ns,
+        "mean_ns": sum_ns / total,
+        "p50_ns": _percentile(bounded, total, 0.50),
+        "p90_ns": _percentile(bounded, total, 0.90),
+        "p99_ns": _percentile(bounded, total, 0.99),
+        "buckets": bounded,
+    }
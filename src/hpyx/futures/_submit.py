@@ -8,11 +8,51 @@ using the HPX runtime system with a deferred execution policy.
 from __future__ import annotations
 
 from collections.abc import Callable
+from concurrent.futures import Future
+from typing import Any
 
-from .._core import future, hpx_async
+from .. import _runtime
+from .._core import (
+    future,
+    hpx_async,
+    hpx_async_set_result,
+    hpx_async_stacksize,
+    hpx_from_future,
+)
+from ..cache import ResultCache, resolve
 
+STACKSIZES = ("nostack", "small", "medium", "large")
 
-def submit(function: Callable, *args) -> future:
+
+def _check_stacksize(stacksize: str | None) -> None:
+    if stacksize is not None and stacksize not in STACKSIZES:
+        msg = f"stacksize must be one of {STACKSIZES} or None, got {stacksize!r}"
+        raise ValueError(msg)
+
+
+def _start_cached(
+    fut: Future[Any],
+    function: Callable[..., Any],
+    args: tuple[Any, ...],
+    stacksize: str | None,
+) -> None:
+    if _runtime.subinterpreters_enabled():
+        from .. import _subinterp
+
+        # Wait for the subinterpreter's result on an HPX thread, which
+        # suspends rather than blocking its worker.
+        hpx_async_set_result(fut, _subinterp.call(function, *args).get, (), {})
+    else:
+        hpx_async_set_result(fut, function, args, {}, stacksize or "default")
+
+
+def submit(
+    function: Callable,
+    *args,
+    locality: int | None = None,
+    stacksize: str | None = None,
+    cache: bool | ResultCache = False,
+) -> future:
     """
     Submit a function to be executed asynchronously using HPX.
     
@@ -27,6 +67,27 @@ def submit(function: Callable, *args) -> future:
         if used in distributed contexts.
     *args : tuple
         Variable length argument list to pass to the function.
+    locality : int, optional
+        Run the function on this locality of a multi-locality job instead
+        of locally; see `hpyx.distributed.submit`.
+    stacksize : {"nostack", "small", "medium", "large"}, optional
+        Run the function eagerly as an HPX thread with this stack size
+        instead of deferring it. ``"nostack"`` runs it on the worker's own
+        OS stack with no per-task stack allocation, the cheapest choice
+        for millions of tiny tasks. A stackless task cannot suspend, so it
+        must not wait for other HPX work: ``get()`` on an eager future, a
+        nested `hpyx.compute` or `hpyx.run_graph`, and HPyX kernels that
+        run in parallel (``dot1d``, parallel ``for_loop``, `hpyx.array`,
+        `hpyx.kernels`, `hpyx.stream`) raise `RuntimeError`. HPX's "small"
+        size is set with ``hpyx.init(small_stack_size=...)``.
+    cache : bool or hpyx.cache.ResultCache, default False
+        Treat the call as pure and memoize it: return the cached result of
+        an identical earlier call, or join an identical call still running,
+        instead of running the function again. ``True`` uses
+        `hpyx.cache.default_cache`. A call that does run is started eagerly
+        as an HPX thread, or in a subinterpreter if they are enabled.
+        ``get()`` on the returned future may be called from inside another
+        task. See `hpyx.cache` for how calls are keyed.
 
     Returns
     -------
@@ -43,6 +104,11 @@ def submit(function: Callable, *args) -> future:
     
     This function requires an active HPX runtime. Ensure that you call
     this function within an HPXRuntime context manager.
+
+    If the runtime was started with ``hpyx.init(subinterpreters=True)``,
+    the function instead runs eagerly in the subinterpreter of whichever
+    HPX worker picks it up. It must then be importable by module path,
+    and NumPy array arguments arrive as zero-copy memoryviews.
         
     Examples
     --------
@@ -54,4 +120,27 @@ def submit(function: Callable, *args) -> future:
     ...     result = future_result.get()  # This triggers execution
     ...     print(result)  # Outputs: 25
     """
+    _check_stacksize(stacksize)
+    store = resolve(cache)
+    if store is not None:
+        if locality is not None:
+            msg = "cache cannot be combined with locality; results are cached per process"
+            raise ValueError(msg)
+        _runtime.ensure_started()
+        result = store.submit(
+            store.key(function, args),
+            lambda fut: _start_cached(fut, function, args, stacksize),
+        )
+        return hpx_from_future(result)
+    if locality is not None:
+        from .. import distributed
+
+        return distributed.submit(function, *args, locality=locality)
+    if _runtime.subinterpreters_enabled():
+        from .. import _subinterp
+
+        return _subinterp.call(function, *args)
+    if stacksize is not None:
+        _runtime.ensure_started()
+        return hpx_async_stacksize(stacksize, function, *args)
     return hpx_async(function, *args)
@@ -0,0 +1,251 @@
+"""Parallel loading of binary files and ``.npy`` arrays.
+
+Reading a large input with `numpy.fromfile` or `numpy.load` uses one
+thread. The functions here split the file into byte ranges and read every
+range with a positional read (``pread``) from its own HPX task, straight
+into a preallocated array. They return futures at once, so a job can set
+up the rest of its work while the data arrives::
+
+    import hpyx
+
+    pending = hpyx.io.load_npy("inputs.npy")
+    weights = build_weights()       # overlaps with the reads
+    inputs = pending.get()          # waits for the remaining reads
+
+By default the reads run on the HPX workers. With ``pool="io"`` they run on
+HPX's I/O service threads instead, which are meant for blocking system
+calls and leave the workers free for computation. Their number is set with
+``hpyx.init(cfg=["hpx.threadpools.io_pool_size=8"])``.
+
+Parallel reads pay off on NVMe drives, RAID arrays, network and parallel
+file systems, and for files already in the page cache. A single spinning
+disk gains little.
+"""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import Any, Literal
+
+import numpy as np
+from numpy.lib import format as npy_format
+
+from hpyx import _core, _runtime
+
+_DEFAULT_BLOCK_SIZE = 8 * 2**20
+_POOLS = ("default", "io")
+_NPY_HEADER_READERS = {
+    (1, 0): npy_format.read_array_header_1_0,
+    (2, 0): npy_format.read_array_header_2_0,
+}
+
+
+def _check_options(block_size: int, pool: str) -> None:
+    if block_size < 1:
+        msg = f"block_size must be a positive number of bytes, got {block_size}"
+        raise ValueError(msg)
+    if pool not in _POOLS:
+        msg = f"pool must be one of {_POOLS}, got {pool!r}"
+        raise ValueError(msg)
+
+
+def _check_dtype(dtype: np.dtype) -> None:
+    if dtype.hasobject or dtype.itemsize == 0:
+        msg = f"cannot read arrays of dtype {dtype} from raw bytes"
+        raise ValueError(msg)
+
+
+def _read(
+    file: str | os.PathLike[str],
+    ranges: list[tuple[int, int]],
+    block_size: int,
+    pool: str,
+) -> list[_core.future]:
+    _runtime.ensure_started()
+    futures: list[_core.future] = _core.io.read(os.fspath(file), ranges, block_size, pool)
+    return futures
+
+
+def _as_array(
+    raw: np.ndarray, dtype: np.dtype, shape: tuple[int, ...], order: Literal["C", "F"]
+) -> np.ndarray:
+    array: np.ndarray = raw.view(dtype).reshape(shape, order=order)
+    return array
+
+
+def fromfile(
+    file: str | os.PathLike[str],
+    dtype: Any = float,
+    count: int = -1,
+    *,
+    offset: int = 0,
+    block_size: int = _DEFAULT_BLOCK_SIZE,
+    pool: str = "default",
+) -> _core.future:
+    """Read raw binary data into a 1-D array, like `numpy.fromfile`.
+
+    Parameters
+    ----------
+    file : str or os.PathLike
+        Path of the file.
+    dtype : data-type, default float
+        Type of the items in the file, in the file's byte order.
+    count : int, default -1
+        Number of items to read; -1 reads every whole item after `offset`.
+    offset : int, default 0
+        Byte offset in the file of the first item.
+    block_size : int, default 8 MiB
+        Bytes read by each HPX task.
+    pool : {"default", "io"}, default "default"
+        Run the reads on the HPX workers or on HPX's I/O threads.
+
+    Returns
+    -------
+    hpx_future
+        Resolves to the array; ``get()`` raises OSError if a read fails.
+
+    Raises
+    ------
+    ValueError
+        If the file holds fewer than `count` items after `offset`.
+
+    Examples
+    --------
+    >>> import numpy as np, hpyx
+    >>> np.arange(6.0).tofile("/tmp/values.bin")
+    >>> hpyx.io.fromfile("/tmp/values.bin", np.float64, offset=16).get()
+    array([2., 3., 4., 5.])
+    """
+    _check_options(block_size, pool)
+    dtype = np.dtype(dtype)
+    _check_dtype(dtype)
+    if offset < 0:
+        msg = f"offset must be non-negative, got {offset}"
+        raise ValueError(msg)
+    available = max(Path(file).stat().st_size - offset, 0) // dtype.itemsize
+    if count < 0:
+        count = available
+    elif count > available:
+        msg = (
+            f"{os.fspath(file)!r} holds {available} items of {dtype} after byte "
+            f"{offset}, fewer than count={count}"
+        )
+        raise ValueError(msg)
+    (raw,) = _read(file, [(offset, count * dtype.itemsize)], block_size, pool)
+    return raw.then(_as_array, dtype, (count,), "C")
+
+
+def load_npy(
+    file: str | os.PathLike[str],
+    *,
+    block_size: int = _DEFAULT_BLOCK_SIZE,
+    pool: str = "default",
+) -> _core.future:
+    """Read an array saved with `numpy.save`, like `numpy.load`.
+
+    The header is parsed on the calling thread and the data is read in
+    parallel. C- and Fortran-ordered arrays of any fixed-size dtype,
+    structured ones included, are supported.
+
+    Parameters
+    ----------
+    file : str or os.PathLike
+        Path of the ``.npy`` file.
+    block_size : int, default 8 MiB
+        Bytes read by each HPX task.
+    pool : {"default", "io"}, default "default"
+        Run the reads on the HPX workers or on HPX's I/O threads.
+
+    Returns
+    -------
+    hpx_future
+        Resolves to the array; ``get()`` raises EOFError if the file is
+        truncated and OSError if a read fails.
+
+    Raises
+    ------
+    ValueError
+        If the file is not a version 1 or 2 ``.npy`` file or holds Python
+        objects, which need `numpy.load` with ``allow_pickle=True``.
+    """
+    _check_options(block_size, pool)
+    with Path(file).open("rb") as f:
+        version = npy_format.read_magic(f)
+        reader = _NPY_HEADER_READERS.get(version)
+        if reader is None:
+            msg = f".npy format version {version} is not supported; use numpy.load"
+            raise ValueError(msg)
+        shape, fortran_order, dtype = reader(f)
+        offset = f.tell()
+    _check_dtype(dtype)
+    nbytes = int(np.prod(shape, dtype=np.int64)) * dtype.itemsize
+    (raw,) = _read(file, [(offset, nbytes)], block_size, pool)
+    return raw.then(_as_array, dtype, shape, "F" if fortran_order else "C")
+
+
+def read_blocks(
+    file: str | os.PathLike[str],
+    block_size: int,
+    *,
+    dtype: Any = np.uint8,
+    offset: int = 0,
+    length: int | None = None,
+    pool: str = "default",
+) -> list[_core.future]:
+    """Read a file as consecutive blocks, all in flight at once.
+
+    Every block is read by its own HPX task into its own array, so blocks
+    can be processed as they arrive while later ones are still loading.
+
+    Parameters
+    ----------
+    file : str or os.PathLike
+        Path of the file.
+    block_size : int
+        Bytes per block, a multiple of the itemsize of `dtype`. The last
+        block may be shorter.
+    dtype : data-type, default numpy.uint8
+        Type of the items in the file.
+    offset : int, default 0
+        Byte offset in the file of the first block.
+    length : int, optional
+        Bytes to read; defaults to the rest of the file.
+    pool : {"default", "io"}, default "default"
+        Run the reads on the HPX workers or on HPX's I/O threads.
+
+    Returns
+    -------
+    list of hpx_future
+        One future per block, in file order, each resolving to a 1-D array.
+
+    Examples
+    --------
+    >>> import numpy as np, hpyx
+    >>> blocks = hpyx.io.read_blocks("/tmp/values.bin", 64 * 2**20, dtype=np.float64)
+    >>> total = sum(block.get().sum() for block in blocks)
+    """
+    _check_options(block_size, pool)
+    dtype = np.dtype(dtype)
+    _check_dtype(dtype)
+    if offset < 0:
+        msg = f"offset must be non-negative, got {offset}"
+        raise ValueError(msg)
+    if block_size % dtype.itemsize:
+        msg = f"block_size={block_size} is not a multiple of the {dtype} itemsize"
+        raise ValueError(msg)
+    if length is None:
+        length = max(Path(file).stat().st_size - offset, 0)
+    if length % dtype.itemsize:
+        msg = f"length={length} is not a multiple of the {dtype} itemsize"
+        raise ValueError(msg)
+    ranges = [
+        (offset + begin, min(block_size, length - begin)) for begin in range(0, length, block_size)
+    ]
+    return [
+        raw.then(_as_array, dtype, (size // dtype.itemsize,), "C")
+        for raw, (_begin, size) in zip(_read(file, ranges, block_size, pool), ranges, strict=True)
+    ]
+
+
+__all__ = ["fromfile", "load_npy", "read_blocks"]
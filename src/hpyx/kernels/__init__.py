@@ -0,0 +1,35 @@
+"""
+HPyX kernels subpackage: native kernels that run on the HPX workers.
+
+The out-of-core kernels `memmap_dot`, `memmap_sum`, `memmap_min` and
+`memmap_max` reduce float64 data that does not fit in memory, typically
+``np.memmap`` views of large files. They walk the data in large,
+page-aligned blocks. While the workers reduce one block, the next ones
+are read ahead, and each finished block is dropped from memory, so the
+resident memory stays bounded by a few blocks.
+
+`stencil` applies a 1-D or 2-D stencil repeatedly, for example an explicit
+heat-equation sweep. Each step of each tile of the array is an HPX
+dataflow task that waits only for its neighbors, with no barrier between
+steps.
+
+Examples
+--------
+>>> import numpy as np
+>>> import hpyx
+>>> a = np.memmap("features.f64", dtype=np.float64, mode="r")  # doctest: +SKIP
+>>> hpyx.kernels.memmap_dot(a, a)  # doctest: +SKIP
+"""
+
+from __future__ import annotations
+
+from ._memmap import memmap_dot, memmap_max, memmap_min, memmap_sum
+from ._stencil import stencil
+
+__all__ = [
+    "memmap_dot",
+    "memmap_max",
+    "memmap_min",
+    "memmap_sum",
+    "stencil",
+]
@@ -0,0 +1,138 @@
+"""Out-of-core reductions over memory-mapped float64 data."""
+
+from __future__ import annotations
+
+import mmap
+import os
+from typing import Any
+
+import numpy as np
+
+from hpyx import _core, _runtime
+from hpyx._buffers import is_native_input
+
+_DEFAULT_BLOCK_SIZE = 64 * 1024 * 1024
+
+
+def _source(a: Any) -> tuple[str, int, bool] | None:
+    """Return ``(path, file offset of a[0], release)`` for file-backed `a`."""
+    if not isinstance(a, np.ndarray):
+        return None
+    root: Any = a
+    while isinstance(root, np.ndarray) and not isinstance(root.base, mmap.mmap):
+        root = root.base
+    if not isinstance(root, np.memmap) or root.filename is None:
+        return None
+    offset = root.offset + (a.ctypes.data - root.ctypes.data)
+    # Dropping the pages of a copy-on-write mapping would discard changes.
+    return os.fspath(root.filename), offset, root.mode != "c"
+
+
+def _as_input(a: Any, name: str) -> Any:
+    if not isinstance(a, np.ndarray):
+        if is_native_input(a):
+            return a  # buffers and DLPack tensors are checked natively
+        a = np.asanyarray(a)
+    if a.dtype != np.float64:
+        msg = (
+            f"{name} must have dtype float64, got {a.dtype}; converting it "
+            "would read the whole array into memory"
+        )
+        raise TypeError(msg)
+    if not a.flags.c_contiguous:
+        msg = f"{name} must be C-contiguous"
+        raise ValueError(msg)
+    return a
+
+
+def _check_options(block_size: int, prefetch: int) -> None:
+    if block_size < 1:
+        msg = f"block_size must be positive, got {block_size}"
+        raise ValueError(msg)
+    if prefetch < 0:
+        msg = f"prefetch must be non-negative, got {prefetch}"
+        raise ValueError(msg)
+
+
+def memmap_dot(
+    a: Any,
+    b: Any,
+    *,
+    block_size: int = _DEFAULT_BLOCK_SIZE,
+    prefetch: int = 1,
+) -> float:
+    """Dot product of two 1-D float64 arrays that may not fit in memory.
+
+    The arrays are walked in blocks of about `block_size` bytes. While the
+    HPX workers compute on one block, the next `prefetch` blocks are read
+    ahead with ``madvise``/``posix_fadvise``. Blocks of ``np.memmap``
+    inputs opened with mode ``"r"``, ``"r+"`` or ``"w+"`` are dropped from
+    memory once they are done, so each input keeps at most about
+    ``(1 + prefetch) * block_size`` bytes resident. Other arrays are
+    reduced the same way, without the memory advice.
+
+    Parameters
+    ----------
+    a, b : array_like
+        1-D, C-contiguous float64 arrays of the same length, or any
+        buffers or CPU DLPack tensors of float64 data, read in place.
+        Untyped byte buffers are read as float64. Other dtypes are
+        rejected rather than converted.
+    block_size : int, default 64 MiB
+        Bytes per block, rounded down to whole pages (at least one).
+    prefetch : int, default 1
+        Blocks to read ahead of the one being reduced; 0 disables
+        readahead.
+
+    Returns
+    -------
+    float
+
+    Raises
+    ------
+    TypeError
+        If an input is not float64.
+    ValueError
+        If an input is not 1-D and C-contiguous, or the lengths differ.
+    """
+    a = _as_input(a, "a")
+    b = _as_input(b, "b")
+    if any(isinstance(x, np.ndarray) and x.ndim != 1 for x in (a, b)):
+        msg = f"memmap_dot takes 1-D arrays, got shapes {np.shape(a)} and {np.shape(b)}"
+        raise ValueError(msg)
+    _check_options(block_size, prefetch)
+    _runtime.ensure_started()
+    return float(_core.memmap.dot(a, b, _source(a), _source(b), block_size, prefetch))
+
+
+def _reduce(op: str, a: Any, block_size: int, prefetch: int) -> float:
+    a = _as_input(a, "a")
+    _check_options(block_size, prefetch)
+    _runtime.ensure_started()
+    flat = a.reshape(-1) if isinstance(a, np.ndarray) else a
+    return float(_core.memmap.reduce(flat, op, _source(a), block_size, prefetch))
+
+
+def memmap_sum(a: Any, *, block_size: int = _DEFAULT_BLOCK_SIZE, prefetch: int = 1) -> float:
+    """Sum of all elements of a float64 array that may not fit in memory.
+
+    `a` must be C-contiguous; blocks are read and released as in
+    `memmap_dot`, whose parameters these are.
+    """
+    return _reduce("sum", a, block_size, prefetch)
+
+
+def memmap_min(a: Any, *, block_size: int = _DEFAULT_BLOCK_SIZE, prefetch: int = 1) -> float:
+    """Minimum of a float64 array that may not fit in memory; NaN propagates.
+
+    See `memmap_sum`.
+    """
+    return _reduce("min", a, block_size, prefetch)
+
+
+def memmap_max(a: Any, *, block_size: int = _DEFAULT_BLOCK_SIZE, prefetch: int = 1) -> float:
+    """Maximum of a float64 array that may not fit in memory; NaN propagates.
+
+    See `memmap_sum`.
+    """
+    return _reduce("max", a, block_size, prefetch)
@@ -7,6 +7,9 @@ algorithms to provide efficient execution across multiple cores.
 
 The multiprocessing module offers familiar interfaces for parallel computation
 while utilizing HPX's advanced runtime system for optimal performance.
+`for_loop` runs on HPX worker threads; `ProcessPool` and `map` run GIL-bound
+Python callables in worker processes, each with its own HPX runtime, and
+hand NumPy arrays over through shared memory.
 
 Important
 ---------
@@ -18,5 +21,7 @@ of the HPX runtime system before calling any functions from this module.
 from __future__ import annotations
 
 from ._for_loop import for_loop
+from ._process_pool import ProcessPool, map
+from ._shared import shared_empty
 
-__all__ = ["for_loop"]
+__all__ = ["ProcessPool", "for_loop", "map", "shared_empty"]
@@ -11,6 +11,9 @@ from __future__ import annotations
 from collections.abc import Callable, Iterable
 from typing import Literal
 
+import numpy as np
+
+from .. import _runtime
 from .._core import hpx_for_loop
 
 
@@ -34,8 +37,13 @@ def for_loop(
         function one by one.
     policy : {'seq', 'par'}, default 'seq'
         Execution policy for the loop.
-        - 'seq' : Sequential execution
-        - 'par' : Parallel execution using available cores (*not yet implemented*)
+        - 'seq' : Sequential execution on the calling thread
+        - 'par' : Parallel execution in chunks across the HPX worker threads.
+          Each chunk holds the GIL while it runs, so pure-Python bodies
+          only scale on a free-threaded (3.13t) interpreter or with
+          ``hpyx.init(subinterpreters=True)``, where each chunk runs in
+          its worker's own subinterpreter (the function must then be
+          importable by module path).
 
     Notes
     -----
@@ -56,7 +64,20 @@ def for_loop(
     ...     for_loop(square_inplace, enumerate(data), policy="seq")
     ...     print(data)  # data is now modified
     """
-    if policy == "par":
-        msg = "Parallel execution policy is not yet implemented in this version."
-        raise NotImplementedError(msg)
+    if policy == "par" and _runtime.subinterpreters_enabled():
+        _for_loop_subinterpreters(function, iterable)
+        return
     hpx_for_loop(function, iterable, policy)
+
+
+def _for_loop_subinterpreters(function: Callable, iterable: Iterable) -> None:
+    from .. import _core, _subinterp
+
+    if isinstance(iterable, np.ndarray) and iterable.ndim == 1:
+        # NumPy scalars cannot be unpickled in a subinterpreter.
+        items = iterable.tolist()
+    else:
+        items = [iterable[i] for i in range(len(iterable))]
+    num_chunks = 4 * int(_core.runtime.num_worker_threads())
+    for i, value in enumerate(_subinterp.map_chunks(function, items, num_chunks)):
+        iterable[i] = value
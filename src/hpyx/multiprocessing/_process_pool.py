@@ -0,0 +1,263 @@
+"""
+Process-pool execution for GIL-bound Python callables.
+
+This module provides the ProcessPool executor and the `map` convenience
+function. Each worker process starts its own HPX runtime, so callables
+can use the rest of the HPyX API, and NumPy arguments and results are
+exchanged through shared memory (see `_shared`).
+"""
+
+from __future__ import annotations
+
+import itertools
+import multiprocessing as mp
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from typing import Any
+
+from . import _shared
+
+
+def _default_start_method() -> str:
+    # "fork" is never a safe default: a child forked while HPX worker
+    # threads are running inherits a runtime it can neither use nor restart.
+    if "forkserver" in mp.get_all_start_methods():
+        return "forkserver"
+    return "spawn"
+
+
+def _init_worker(os_threads: int | None, cfg: list[str] | None) -> None:
+    from hpyx import _runtime
+
+    _runtime.ensure_started(os_threads=os_threads, cfg=cfg)
+
+
+_TaskResult = tuple[bytes, list[_shared.BufferRef], list[str]]
+
+
+def _run_task(payload: bytes, refs: list[_shared.BufferRef]) -> _TaskResult:
+    fn, args, kwargs = _shared.loads(payload, refs)
+    return _shared.dumps(fn(*args, **kwargs))
+
+
+class ProcessPool(Executor):
+    """
+    An Executor that runs callables in worker processes with their own HPX runtime.
+
+    Use ProcessPool for pure-Python, GIL-bound work that cannot scale on
+    HPX worker threads. Contiguous NumPy arrays in the arguments and the
+    result are passed through shared memory instead of being pickled:
+    arrays allocated with `shared_empty` are not copied at all, and other
+    arrays are copied once into a shared segment.
+
+    Parameters
+    ----------
+    max_workers : int, optional
+        Number of worker processes. Defaults to ``os.process_cpu_count()``.
+    os_threads : int, default 1
+        HPX worker OS threads started in each worker process.
+    cfg : list[str], optional
+        Extra HPX config strings for each worker runtime.
+    start_method : {'forkserver', 'spawn', 'fork'}, optional
+        Multiprocessing start method. Defaults to 'forkserver' where
+        available and 'spawn' otherwise.
+
+    Raises
+    ------
+    RuntimeError
+        If `start_method` is 'fork' while the HPX runtime is running in
+        this process. HPX cannot be restarted in a forked child.
+
+    Examples
+    --------
+    >>> from hpyx.multiprocessing import ProcessPool
+    >>> with ProcessPool(max_workers=4) as pool:
+    ...     print(list(pool.map(pow, [2, 3], [5, 2])))  # Outputs: [32, 9]
+    """
+
+    def __init__(
+        self,
+        max_workers: int | None = None,
+        *,
+        os_threads: int = 1,
+        cfg: list[str] | None = None,
+        start_method: str | None = None,
+    ) -> None:
+        from hpyx import _runtime
+
+        if start_method is None:
+            start_method = _default_start_method()
+        if start_method == "fork" and _runtime.is_running():
+            msg = (
+                "ProcessPool cannot use the 'fork' start method while the HPX "
+                "runtime is running; use 'spawn' or 'forkserver'"
+            )
+            raise RuntimeError(msg)
+        self._pool = ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=mp.get_context(start_method),
+            initializer=_init_worker,
+            initargs=(os_threads, cfg),
+        )
+
+    def submit(self, fn: Callable[..., Any], /, *args: Any, **kwargs: Any) -> Future[Any]:
+        """
+        Submit a callable for execution in a worker process.
+
+        Parameters
+        ----------
+        fn : callable
+            The callable to execute. Must be picklable (a module-level
+            function or an importable object).
+        *args : tuple
+            Positional arguments to pass to the callable.
+        **kwargs : dict
+            Keyword arguments to pass to the callable.
+
+        Returns
+        -------
+        concurrent.futures.Future
+            A future resolving to the callable's result. NumPy arrays in
+            the result view shared memory mapped from the worker.
+        """
+        payload, refs, created = _shared.dumps((fn, args, kwargs))
+        try:
+            inner = self._pool.submit(_run_task, payload, refs)
+        except BaseException:
+            _shared.unlink_segments(created)
+            raise
+
+        outer = _PoolFuture(inner)
+
+        def _on_done(done: Future[_TaskResult]) -> None:
+            try:
+                if done.cancelled():
+                    # Move to CANCELLED_AND_NOTIFIED so wait() and
+                    # as_completed() see the future as done.
+                    outer.cancel()
+                    outer.set_running_or_notify_cancel()
+                    return
+                result_payload, result_refs, result_created = done.result()
+                try:
+                    result = _shared.loads(result_payload, result_refs)
+                finally:
+                    _shared.unlink_segments(result_created)
+            except BaseException as exc:  # forwarded to the caller
+                outer.set_exception(exc)
+            else:
+                outer.set_result(result)
+            finally:
+                _shared.unlink_segments(created)
+
+        inner.add_done_callback(_on_done)
+        return outer
+
+    def map(
+        self,
+        fn: Callable[..., Any],
+        *iterables: Iterable[Any],
+        timeout: float | None = None,
+        chunksize: int = 1,
+    ) -> Iterator[Any]:
+        """
+        Apply `fn` to every item of `iterables` in worker processes.
+
+        Parameters
+        ----------
+        fn : callable
+            A picklable callable taking as many arguments as there are
+            iterables.
+        *iterables : iterable
+            Argument iterables, consumed in lockstep.
+        timeout : float, optional
+            Seconds to wait for each result before raising TimeoutError.
+        chunksize : int, default 1
+            Number of items sent to a worker per task. Larger chunks
+            amortize inter-process overhead for cheap callables.
+
+        Returns
+        -------
+        iterator
+            Results in input order.
+        """
+        if chunksize < 1:
+            msg = "chunksize must be >= 1"
+            raise ValueError(msg)
+        if chunksize == 1:
+            return super().map(fn, *iterables, timeout=timeout)
+        batches = _batched(zip(*iterables, strict=False), chunksize)
+        results = super().map(_call_batch, itertools.repeat(fn), batches, timeout=timeout)
+        return itertools.chain.from_iterable(results)
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False) -> None:
+        """
+        Stop the worker processes. Each worker shuts its HPX runtime down on exit.
+
+        Parameters
+        ----------
+        wait : bool, default True
+            If True, block until all pending tasks finish and workers exit.
+        cancel_futures : bool, default False
+            If True, cancel tasks that have not started yet.
+        """
+        self._pool.shutdown(wait=wait, cancel_futures=cancel_futures)
+
+
+class _PoolFuture(Future[Any]):
+    # The future handed to callers. It stays pending until the worker's
+    # result has been unpickled, and cancelling it cancels the queued task.
+
+    def __init__(self, inner: Future[_TaskResult]) -> None:
+        super().__init__()
+        self._inner = inner
+
+    def cancel(self) -> bool:
+        return self._inner.cancel() and super().cancel()
+
+
+def _batched(items: Iterable[Any], n: int) -> Iterator[list[Any]]:
+    iterator = iter(items)
+    while batch := list(itertools.islice(iterator, n)):
+        yield batch
+
+
+def _call_batch(fn: Callable[..., Any], batch: list[tuple[Any, ...]]) -> list[Any]:
+    return [fn(*args) for args in batch]
+
+
+def map(  # mirrors multiprocessing.Pool.map
+    fn: Callable[..., Any],
+    *iterables: Iterable[Any],
+    max_workers: int | None = None,
+    chunksize: int = 1,
+    os_threads: int = 1,
+) -> list[Any]:
+    """
+    Apply `fn` to every item of `iterables` in a temporary ProcessPool.
+
+    Parameters
+    ----------
+    fn : callable
+        A picklable callable taking as many arguments as there are iterables.
+    *iterables : iterable
+        Argument iterables, consumed in lockstep.
+    max_workers : int, optional
+        Number of worker processes.
+    chunksize : int, default 1
+        Number of items sent to a worker per task.
+    os_threads : int, default 1
+        HPX worker OS threads started in each worker process.
+
+    Returns
+    -------
+    list
+        Results in input order.
+
+    Examples
+    --------
+    >>> import hpyx
+    >>> hpyx.multiprocessing.map(abs, [-1, -2, 3])
+    [1, 2, 3]
+    """
+    with ProcessPool(max_workers=max_workers, os_threads=os_threads) as pool:
+        return list(pool.map(fn, *iterables, chunksize=chunksize))
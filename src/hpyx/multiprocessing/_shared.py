@@ -0,0 +1,196 @@
+"""
+Shared-memory hand-off of NumPy buffers between processes.
+
+Objects are serialized with pickle protocol 5. Every out-of-band buffer
+(the data of a contiguous NumPy array) travels through a
+`multiprocessing.shared_memory` segment and only its location is pickled.
+Buffers that already live in a segment known to this process — arrays
+allocated with `shared_empty`, or arguments received from another
+process — are referenced in place without copying. Any other buffer is
+copied into a fresh segment exactly once.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import pickle
+import weakref
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, NamedTuple
+
+import numpy as np
+
+
+class BufferRef(NamedTuple):
+    """Location of one out-of-band pickle buffer inside a shared segment."""
+
+    name: str
+    offset: int
+    nbytes: int
+
+
+class _Mapping:
+    """One attachment of a shared segment, closed when no longer referenced."""
+
+    def __init__(self, shm: SharedMemory, *, unlink: bool) -> None:
+        self.shm = shm
+        self.address = _address(_buf(shm))
+        weakref.finalize(self, _release, shm, unlink)
+
+
+class _Segment:
+    """Buffer provider for one slice of a `_Mapping`.
+
+    NumPy arrays reconstructed from a segment hold a reference to it, so
+    the mapping is closed (and, for segments this process owns, unlinked)
+    only after the last array viewing it is garbage collected.
+    """
+
+    def __init__(self, mapping: _Mapping, offset: int, nbytes: int) -> None:
+        self.name = mapping.shm.name
+        self.offset = offset
+        self.nbytes = nbytes
+        self.address = mapping.address + offset
+        self._mapping = mapping
+        _live_segments.add(self)
+
+    def __buffer__(self, flags: int) -> memoryview:
+        return _buf(self._mapping.shm)[self.offset : self.offset + self.nbytes]
+
+    def __release_buffer__(self, view: memoryview) -> None:
+        view.release()
+
+
+_live_segments: weakref.WeakSet[_Segment] = weakref.WeakSet()
+
+
+def _buf(shm: SharedMemory) -> memoryview:
+    buf = shm.buf
+    if buf is None:
+        msg = f"shared memory segment {shm.name!r} is closed"
+        raise ValueError(msg)
+    return buf
+
+
+def _address(buf: memoryview) -> int:
+    return int(np.frombuffer(buf, dtype=np.uint8).ctypes.data)
+
+
+def _release(shm: SharedMemory, unlink: bool) -> None:
+    try:
+        shm.close()
+    except BufferError:  # a stray memoryview still points into the mapping
+        return
+    if unlink:
+        with contextlib.suppress(FileNotFoundError):
+            shm.unlink()
+
+
+def _lookup(raw: memoryview) -> BufferRef | None:
+    """Return a reference to `raw` if it already lives in a known segment."""
+    if raw.nbytes == 0:
+        return None
+    start = _address(raw)
+    end = start + raw.nbytes
+    for segment in list(_live_segments):
+        seg_end = segment.address + segment.nbytes
+        if segment.address <= start and end <= seg_end:
+            return BufferRef(segment.name, segment.offset + (start - segment.address), raw.nbytes)
+    return None
+
+
+def shared_empty(shape: int | tuple[int, ...], dtype: Any = float) -> np.ndarray:
+    """
+    Allocate an uninitialized NumPy array backed by shared memory.
+
+    Arrays allocated here (and any contiguous view of them) are handed to
+    `ProcessPool` workers without copying: only the segment name, offset
+    and length are sent, and the worker maps the same physical pages.
+
+    Parameters
+    ----------
+    shape : int or tuple of int
+        Shape of the new array.
+    dtype : data-type, default float
+        NumPy dtype of the new array.
+
+    Returns
+    -------
+    numpy.ndarray
+        A writable, C-contiguous array. The shared segment is released
+        when the array (and every view of it) is garbage collected.
+    """
+    dtype = np.dtype(dtype)
+    nbytes = int(np.prod(shape, dtype=np.int64)) * dtype.itemsize
+    shm = SharedMemory(create=True, size=max(nbytes, 1), track=False)
+    segment = _Segment(_Mapping(shm, unlink=True), 0, nbytes)
+    return np.frombuffer(segment, dtype=dtype, count=nbytes // dtype.itemsize).reshape(shape)
+
+
+def dumps(obj: Any) -> tuple[bytes, list[BufferRef], list[str]]:
+    """
+    Serialize `obj`, moving its out-of-band buffers into shared memory.
+
+    Returns
+    -------
+    tuple
+        ``(payload, refs, created)`` where `payload` is the in-band pickle,
+        `refs` locates each out-of-band buffer in order, and `created`
+        names the segments allocated by this call. The caller owns
+        `created` and must `unlink_segments` it once the receiver has
+        attached.
+    """
+    buffers: list[pickle.PickleBuffer] = []
+    payload = pickle.dumps(obj, protocol=5, buffer_callback=buffers.append)
+    refs: list[BufferRef] = []
+    created: list[str] = []
+    for buffer in buffers:
+        raw = buffer.raw()
+        ref = _lookup(raw)
+        if ref is None:
+            shm = SharedMemory(create=True, size=max(raw.nbytes, 1), track=False)
+            _buf(shm)[: raw.nbytes] = raw
+            shm.close()
+            ref = BufferRef(shm.name, 0, raw.nbytes)
+            created.append(shm.name)
+        refs.append(ref)
+    return payload, refs, created
+
+
+def loads(payload: bytes, refs: list[BufferRef]) -> Any:
+    """
+    Rebuild an object serialized by `dumps`, mapping its buffers in place.
+
+    Parameters
+    ----------
+    payload : bytes
+        The in-band pickle returned by `dumps`.
+    refs : list of BufferRef
+        Buffer locations returned by `dumps`.
+
+    Returns
+    -------
+    object
+        The rebuilt object. Its arrays view the shared pages directly and
+        keep the mappings open for as long as they are alive.
+    """
+    attached: dict[str, _Mapping] = {}
+    segments = []
+    for ref in refs:
+        mapping = attached.get(ref.name)
+        if mapping is None:
+            shm = SharedMemory(name=ref.name, track=False)
+            mapping = attached[ref.name] = _Mapping(shm, unlink=False)
+        segments.append(_Segment(mapping, ref.offset, ref.nbytes))
+    return pickle.loads(payload, buffers=segments)
+
+
+def unlink_segments(names: list[str]) -> None:
+    """Remove shared segments by name. Existing mappings stay valid."""
+    for name in names:
+        try:
+            shm = SharedMemory(name=name, track=False)
+        except FileNotFoundError:
+            continue
+        shm.close()
+        shm.unlink()
@@ -0,0 +1,142 @@
+"""Streaming pipelines whose stages run as long-lived HPX tasks.
+
+A `Pipeline` pulls records from an iterable, often an unbounded generator,
+and passes them through a chain of stages::
+
+    batches = (
+        Pipeline(read_lines(path))
+        .map(parse, parallelism=4)
+        .filter(is_valid)
+        .map(transform, parallelism=8)
+        .batch(1000)
+    )
+    for batch in batches:
+        store(batch)
+
+Iterating starts one HPX task that pulls from the source and
+``parallelism`` HPX tasks per `map` or `filter` stage. Stages are linked by
+bounded channels. When a channel is full, the stages before it and the
+source wait (their HPX tasks suspend and free their workers), so the
+source is only read as fast as the slowest stage drains it. Memory stays
+flat on unbounded inputs while every stage with work keeps its workers
+busy.
+
+Stage functions run on the HPX workers under the GIL, so pure-Python
+stages run in parallel only on a free-threaded build. Stages that release
+the GIL, such as NumPy, I/O or HPyX kernels, overlap on any build.
+"""
+
+from __future__ import annotations
+
+import functools
+from collections.abc import Callable, Generator, Iterable
+from typing import Any
+
+from hpyx import _core, _runtime
+
+_MISSING = object()
+
+
+def _positive(value: int, name: str) -> int:
+    if value < 1:
+        msg = f"{name} must be a positive integer, got {value}"
+        raise ValueError(msg)
+    return value
+
+
+class Pipeline:
+    """A lazily evaluated chain of stages over an iterable.
+
+    Each method returns a new pipeline with one more stage; nothing runs
+    until the pipeline is iterated (or `reduce` is called). The source is
+    iterated once, so iterate a pipeline over a generator only once.
+
+    Parameters
+    ----------
+    source : iterable
+        The input records. It is read lazily from an HPX task, one record
+        at a time, and only while the first channel has room.
+    capacity : int, default 64
+        Records each channel between two stages may hold. Together with
+        the records being processed, this bounds the memory in use.
+    ordered : bool, default True
+        Yield results in source order. With ``False``, results come out as
+        soon as they are ready, which avoids waiting on slow records but
+        may reorder them (and the groups `batch` forms).
+
+    Examples
+    --------
+    >>> from hpyx.stream import Pipeline
+    >>> squares = Pipeline(range(10)).map(lambda x: x * x, parallelism=4)
+    >>> list(squares.filter(lambda x: x % 2))
+    [1, 9, 25, 49, 81]
+    >>> Pipeline(range(5)).batch(2).reduce(lambda acc, b: acc + [sum(b)], [])
+    [1, 5, 4]
+    """
+
+    def __init__(
+        self,
+        source: Iterable[Any],
+        *,
+        capacity: int = 64,
+        ordered: bool = True,
+    ) -> None:
+        self._source = source
+        self._capacity = _positive(capacity, "capacity")
+        self._ordered = ordered
+        self._stages: tuple[tuple[Any, ...], ...] = ()
+
+    def _then(self, stage: tuple[Any, ...]) -> Pipeline:
+        pipeline = Pipeline(self._source, capacity=self._capacity, ordered=self._ordered)
+        pipeline._stages = (*self._stages, stage)
+        return pipeline
+
+    def map(self, fn: Callable[[Any], Any], *, parallelism: int = 1) -> Pipeline:
+        """Apply `fn` to every record, in up to `parallelism` HPX tasks at once."""
+        return self._then(("map", fn, _positive(parallelism, "parallelism")))
+
+    def filter(self, predicate: Callable[[Any], Any], *, parallelism: int = 1) -> Pipeline:
+        """Keep the records for which `predicate` is true; see `map`."""
+        return self._then(("filter", predicate, _positive(parallelism, "parallelism")))
+
+    def batch(self, n: int) -> Pipeline:
+        """Group records into lists of `n`; the last list may be shorter."""
+        return self._then(("batch", _positive(n, "n")))
+
+    def __iter__(self) -> Generator[Any]:
+        """Run the pipeline and yield the records leaving its last stage.
+
+        An exception raised by the source or any stage stops every stage
+        and is raised here. Leaving the loop early cancels the pipeline.
+        """
+        _runtime.ensure_started()
+        run = _core.stream.Run(
+            iter(self._source), list(self._stages), self._capacity, self._ordered
+        )
+        try:
+            yield from run
+        finally:
+            run.close()
+
+    def reduce(self, fn: Callable[[Any, Any], Any], initial: Any = _MISSING) -> Any:
+        """Run the pipeline and fold its records with ``fn(acc, record)``.
+
+        The fold runs on the calling thread while the stages keep working.
+        It sees the records in source order only if the pipeline is
+        ordered.
+
+        Raises
+        ------
+        TypeError
+            If the pipeline yields nothing and no `initial` is given.
+        """
+        records = iter(self)
+        try:
+            if initial is _MISSING:
+                return functools.reduce(fn, records)
+            return functools.reduce(fn, records, initial)
+        finally:
+            records.close()
+
+
+__all__ = ["Pipeline"]
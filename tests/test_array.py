@@ -0,0 +1,213 @@
+"""Tests for the lazy, chunked hpyx.Array."""
+
+from __future__ import annotations
+
+import types
+
+import numpy as np
+import pytest
+
+import hpyx
+from hpyx import array as ha
+
+
+@pytest.fixture
+def data():
+    return np.random.default_rng(0).random((1000, 7))
+
+
+@pytest.fixture
+def x(data):
+    return ha.from_array(data, chunks=64)
+
+
+def test_exported():
+    assert hpyx.Array is ha.Array
+    assert isinstance(ha.from_array(np.ones(3)), hpyx.Array)
+
+
+def test_from_array_chunks():
+    x = ha.from_array(np.ones((10, 2)), chunks=4)
+    assert x.shape == (10, 2)
+    assert x.chunks == (4, 4, 2)
+    assert x.dtype == np.float64
+    assert len(x) == 10
+    assert ha.from_array(np.ones(10), chunks=(3, 7)).chunks == (3, 7)
+    with pytest.raises(ValueError, match="do not add up"):
+        ha.from_array(np.ones(10), chunks=(3, 3))
+
+
+def test_from_array_default_chunks_are_coarse():
+    x = ha.from_array(np.ones(1000))
+    assert x.chunks == (1000,)
+
+
+def test_from_array_rejects_complex_and_non_numeric():
+    with pytest.raises(TypeError, match="real numeric"):
+        ha.from_array(np.ones(3, dtype=complex))
+    with pytest.raises(TypeError, match="real numeric"):
+        ha.from_array(np.array(["a", "b"]))
+
+
+def test_operations_are_lazy(x):
+    y = ha.sqrt(x * x + 1.0)
+    assert isinstance(y, ha.Array)
+    assert y.shape == (1000, 7)
+    assert "hpyx.Array<shape=(1000, 7)" in repr(y)
+
+
+def test_fused_elementwise_chain(x, data):
+    y = ha.sqrt(x * x + 1.0) - 0.5 * ha.exp(-x) / (x + 2.0) ** 2
+    expected = np.sqrt(data * data + 1.0) - 0.5 * np.exp(-data) / (data + 2.0) ** 2
+    np.testing.assert_allclose(y.compute(), expected)
+
+
+@pytest.mark.parametrize(
+    ("lazy", "eager"),
+    [
+        (lambda a: -abs(a - 0.5), lambda a: -abs(a - 0.5)),
+        (lambda a: 2.0**a, lambda a: 2.0**a),
+        (lambda a: 1 / (a + 1), lambda a: 1 / (a + 1)),
+        (lambda a: ha.log(a + 1) * ha.tanh(a), lambda a: np.log(a + 1) * np.tanh(a)),
+        (lambda a: ha.sin(a) + ha.cos(a), lambda a: np.sin(a) + np.cos(a)),
+        (lambda a: ha.maximum(a, 0.5), lambda a: np.maximum(a, 0.5)),
+        (lambda a: ha.minimum(0.5, a), lambda a: np.minimum(0.5, a)),
+        (lambda a: ha.absolute(a - 1), lambda a: np.absolute(a - 1)),
+    ],
+)
+def test_elementwise_ops(x, data, lazy, eager):
+    np.testing.assert_allclose(lazy(x).compute(), eager(data))
+
+
+def test_numpy_interop(x, data):
+    y = np.sqrt(x) + np.float64(2.0) * x + np.ones(7)
+    assert isinstance(y, ha.Array)
+    np.testing.assert_allclose(np.asarray(y), np.sqrt(data) + 2.0 * data + 1.0)
+
+
+def test_trailing_dimension_broadcasting(x, data):
+    row = data[0]
+    np.testing.assert_allclose((x - row).compute(), data - row)
+    np.testing.assert_allclose((x - x.mean(axis=0)).compute(), data - data.mean(axis=0))
+
+
+def test_unsupported_broadcasting(x):
+    with pytest.raises(NotImplementedError, match="trailing dimensions"):
+        x + np.ones((1000, 1))
+    with pytest.raises(ValueError):
+        x + np.ones(6)
+
+
+@pytest.mark.parametrize("op", ["sum", "prod", "min", "max", "mean"])
+@pytest.mark.parametrize("axis", [None, 0, 1, 2, -1])
+def test_reductions(op, axis):
+    data = np.random.default_rng(1).random((50, 4, 5)) + 0.5
+    x = ha.from_array(data, chunks=(10, 20, 20))
+    result = getattr(x, op)(axis=axis).compute()
+    np.testing.assert_allclose(result, getattr(data, op)(axis=axis))
+
+
+def test_reduction_of_fused_expression(x, data):
+    result = (x * x).sum().compute()
+    assert isinstance(result, np.float64)
+    np.testing.assert_allclose(result, (data * data).sum())
+
+
+def test_min_max_propagate_nan():
+    data = np.array([1.0, np.nan, 3.0])
+    assert np.isnan(ha.from_array(data, chunks=1).max().compute())
+    assert np.isnan(ha.from_array(data).min().compute())
+
+
+def test_empty_reductions():
+    empty = ha.from_array(np.zeros((0, 3)))
+    assert empty.sum().compute() == 0.0
+    assert empty.prod(axis=1).compute().shape == (0,)
+    assert (empty + 1).compute().shape == (0, 3)
+    with pytest.raises(ValueError, match="no identity"):
+        empty.max()
+
+
+def test_axis_errors(x):
+    with pytest.raises(np.exceptions.AxisError):
+        x.sum(axis=2)
+    with pytest.raises(NotImplementedError):
+        x.sum(axis=(0, 1))
+
+
+def test_row_slices_are_fused(x, data):
+    y = x[10:500] + x[:490]
+    np.testing.assert_allclose(y.compute(), data[10:500] + data[:490])
+    np.testing.assert_allclose((x[10:500] * 3).sum(axis=1).compute(), (data[10:500] * 3).sum(axis=1))
+
+
+def test_slicing_reduction_results(x, data):
+    y = (x + 1).sum(axis=1)[100:300] * ha.from_array(data.sum(axis=1), chunks=17)[100:300]
+    np.testing.assert_allclose(y.compute(), (data + 1).sum(axis=1)[100:300] * data.sum(axis=1)[100:300])
+
+
+def test_general_indexing(x, data):
+    np.testing.assert_allclose(x[::2].compute(), data[::2])
+    np.testing.assert_allclose(x[5, 3].compute(), data[5, 3])
+    y = x + 1
+    np.testing.assert_allclose((y[::3] * 2).compute(), (data + 1)[::3] * 2)
+    np.testing.assert_allclose(y[5].compute(), (data + 1)[5])
+    np.testing.assert_allclose(y[data[:, 0] > 0.5].compute(), (data + 1)[data[:, 0] > 0.5])
+
+
+def test_compute_many_shares_inputs(x, data):
+    total, shifted = ha.compute(x.sum(), x - x.sum() / x.size)
+    assert isinstance(total, np.float64)
+    np.testing.assert_allclose(total, data.sum())
+    np.testing.assert_allclose(shifted, data - data.mean())
+
+
+def test_zero_dimensional():
+    z = ha.from_array(3.0)
+    assert z.shape == ()
+    assert (z * 2).compute() == 6.0
+    with pytest.raises(TypeError):
+        len(z)
+
+
+def test_from_array_reads_data_at_compute_time():
+    data = np.zeros(4)
+    y = ha.from_array(data) + 1
+    data[:] = 1.0
+    np.testing.assert_array_equal(y.compute(), np.full(4, 2.0))
+
+
+class _DLPackOnly:
+    def __init__(self, array):
+        self._array = array
+
+    def __dlpack__(self, **kwargs):
+        return self._array.__dlpack__(**kwargs)
+
+    def __dlpack_device__(self):
+        return self._array.__dlpack_device__()
+
+
+def test_from_array_reads_dlpack_without_copy(data):
+    x = ha.from_array(_DLPackOnly(data))
+    assert np.shares_memory(x._node.data, data)
+    np.testing.assert_allclose((x * 2).compute(), data * 2)
+
+
+def test_compute_framework(data):
+    framework = types.SimpleNamespace(__name__="fake", from_dlpack=np.from_dlpack)
+    x = ha.from_array(data)
+    total, doubled = ha.compute(x.sum(), x * 2, framework=framework)
+    assert isinstance(total, np.ndarray)
+    assert total.ndim == 0
+    np.testing.assert_allclose(total, data.sum())
+    np.testing.assert_allclose((x * 2).compute(framework=np), data * 2)
+    with pytest.raises(TypeError, match="from_dlpack"):
+        x.compute(framework=types.SimpleNamespace(__name__="nothing"))
+
+
+def test_compute_framework_torch(data):
+    torch = pytest.importorskip("torch")
+    result = (ha.from_array(data) + 1).compute(framework=torch)
+    assert isinstance(result, torch.Tensor)
+    np.testing.assert_allclose(result.numpy(), data + 1)
@@ -0,0 +1,252 @@
+"""Tests for hpyx.cache and cached submission."""
+
+import threading
+from concurrent.futures import Future
+
+import numpy as np
+import pytest
+
+import hpyx
+from hpyx.cache import ResultCache
+from hpyx.futures import submit
+
+_calls = []
+_release = threading.Event()
+
+
+def _square(x):
+    _calls.append(x)
+    return x * x
+
+
+def _blocked_sum(a):
+    _calls.append("sum")
+    _release.wait(timeout=30)
+    return float(np.sum(a))
+
+
+def _nested_cached(store, barrier):
+    barrier.wait(timeout=30)
+    return submit(_square, 5, cache=store).get()
+
+
+def _fail(x):
+    _calls.append(x)
+    raise ValueError(x)
+
+
+@pytest.fixture(autouse=True)
+def _reset_calls():
+    _calls.clear()
+    _release.clear()
+    yield
+    _release.set()
+
+
+def _run(store, fn, *args):
+    """Look up ``fn(*args)`` in `store`, running it inline on a miss."""
+
+    def start(future):
+        try:
+            future.set_result(fn(*args))
+        except Exception as exc:
+            future.set_exception(exc)
+
+    return store.submit(store.key(fn, args), start)
+
+
+def test_key_hashes_arrays_by_content():
+    store = ResultCache()
+    a = np.arange(1000.0)
+    assert store.key(_square, (a,)) == store.key(_square, (a.copy(),))
+    assert store.key(_square, (a[::2],)) == store.key(_square, (np.arange(0.0, 1000.0, 2),))
+    assert store.key(_square, (a,)) != store.key(_square, (a.astype(np.float32),))
+    assert store.key(_square, (a,)) != store.key(_square, (a.reshape(10, 100),))
+    changed = a.copy()
+    changed[-1] = -1
+    assert store.key(_square, (a,)) != store.key(_square, (changed,))
+
+
+def test_key_hashes_structured_dtypes_by_fields():
+    store = ResultCache()
+    xy = np.zeros(4, dtype=[("x", "<f8"), ("y", "<f8")])
+    ab = np.zeros(4, dtype=[("a", "<f8"), ("b", "<f8")])
+    xi = np.zeros(4, dtype=[("x", "<i8"), ("y", "<f8")])
+    assert store.key(_square, (xy,)) == store.key(_square, (xy.copy(),))
+    assert store.key(_square, (xy,)) != store.key(_square, (ab,))
+    assert store.key(_square, (xy,)) != store.key(_square, (xi,))
+
+
+def test_key_distinguishes_functions_and_arguments():
+    store = ResultCache()
+    assert store.key(_square, (2,)) == store.key(_square, (2,))
+    assert store.key(_square, (2,)) != store.key(_square, (3,))
+    assert store.key(_square, (1,)) != store.key(_square, (True,))
+    assert store.key(_square, (2,)) != store.key(_fail, (2,))
+    assert store.key(pow, (2, 3)) != store.key(pow, (3, 2))
+    assert store.key(int, ("ff",), {"base": 16}) != store.key(int, ("ff",))
+    assert store.key(lambda x: x + 1, (1,)) == store.key(lambda x: x + 1, (1,))
+    assert store.key(lambda x: x + 1, (1,)) != store.key(lambda x: x + 2, (1,))
+
+
+def test_key_rejects_unpicklable_arguments():
+    with pytest.raises(TypeError, match="result cache"):
+        ResultCache().key(_square, (threading.Lock(),))
+
+
+def test_hit_returns_cached_result():
+    store = ResultCache()
+    assert _run(store, _square, 4).result() == 16
+    assert _run(store, _square, 4).result() == 16
+    assert _calls == [4]
+    stats = store.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 1, 1)
+
+
+def test_failures_are_not_cached():
+    store = ResultCache()
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            _run(store, _fail, 1).result()
+    assert _calls == [1, 1]
+    assert len(store) == 0
+
+
+def test_interrupt_in_start_propagates():
+    store = ResultCache()
+
+    def start(_future):
+        raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        store.submit(b"key", start)
+    assert _run(store, _square, 3).result() == 9
+    assert store.stats()["misses"] == 2
+
+
+def test_concurrent_identical_lookups_share_one_task():
+    store = ResultCache()
+    started = []
+    key = store.key(_square, (3,))
+    first = store.submit(key, started.append)
+    second = store.submit(key, started.append)
+    assert second is first
+    assert len(started) == 1
+    started[0].set_result(9)
+    assert _run(store, _square, 3).result() == 9
+    assert store.stats()["coalesced"] == 1
+
+
+def test_lru_eviction_respects_memory_budget():
+    row = np.zeros(1000)
+    store = ResultCache(max_bytes=3 * row.nbytes + 1000)
+    for i in range(5):
+        _run(store, np.full, 1000, float(i))
+    _run(store, np.full, 1000, 2.0)  # refresh 2 so 3 is the oldest
+    _run(store, np.full, 1000, 5.0)
+    stats = store.stats()
+    assert stats["bytes"] <= store.max_bytes
+    assert stats["evictions"] == 3
+    assert _run(store, np.full, 1000, 2.0).result()[0] == 2.0
+    assert store.stats()["hits"] == 2
+
+
+def test_evicted_results_spill_to_disk(tmp_path):
+    row = np.arange(1000.0)
+    store = ResultCache(max_bytes=row.nbytes + 1000, spill_dir=tmp_path)
+    _run(store, np.multiply, row, 2.0)
+    _run(store, np.multiply, row, 3.0)
+    assert store.stats()["spills"] == 1
+    assert len(list(tmp_path.iterdir())) == 1
+
+    result = _run(store, np.multiply, row, 2.0).result()
+    np.testing.assert_array_equal(result, row * 2.0)
+    stats = store.stats()
+    assert stats["disk_hits"] == 1
+    assert stats["misses"] == 2
+    assert len(store) == 2
+
+    store.clear()
+    assert len(store) == 0
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_unreadable_spill_file_counts_as_miss(tmp_path):
+    row = np.arange(1000.0)
+    store = ResultCache(max_bytes=row.nbytes + 1000, spill_dir=tmp_path)
+    _run(store, np.multiply, row, 2.0)
+    _run(store, np.multiply, row, 3.0)
+    (spilled,) = tmp_path.iterdir()
+    spilled.write_bytes(b"not a pickle")
+
+    result = _run(store, np.multiply, row, 2.0).result()
+    np.testing.assert_array_equal(result, row * 2.0)
+    stats = store.stats()
+    assert (stats["disk_hits"], stats["misses"]) == (0, 3)
+
+
+def test_spill_budget_drops_oldest_files(tmp_path):
+    row = np.arange(1000.0)
+    store = ResultCache(max_bytes=0, spill_dir=tmp_path, max_spill_bytes=2 * row.nbytes + 1000)
+    for i in range(4):
+        _run(store, np.add, row, float(i))
+    stats = store.stats()
+    assert stats["spill_bytes"] <= store.max_spill_bytes
+    assert stats["spilled_entries"] == len(list(tmp_path.iterdir())) == 2
+
+
+def test_invalid_cache_arguments():
+    with pytest.raises(ValueError, match="max_bytes"):
+        ResultCache(max_bytes=-1)
+    with pytest.raises(TypeError, match="ResultCache"):
+        submit(abs, -1, cache="yes")
+
+
+def test_submit_cache_reuses_results():
+    store = ResultCache()
+    a = np.arange(10_000.0)
+    assert submit(_square, 7, cache=store).get() == 49
+    assert submit(_square, 7, cache=store).get() == 49
+    assert submit(np.sum, a, cache=store).get() == submit(np.sum, a.copy(), cache=store).get()
+    assert _calls == [7]
+    assert store.stats()["hits"] == 2
+
+
+def test_submit_cache_coalesces_tasks_in_flight():
+    store = ResultCache()
+    a = np.ones(1000)
+    futures = [submit(_blocked_sum, a, cache=store) for _ in range(8)]
+    _release.set()
+    assert [f.get() for f in futures] == [1000.0] * 8
+    assert _calls == ["sum"]
+    assert store.stats()["coalesced"] == 7
+
+
+def test_submit_cache_wait_inside_tasks():
+    # Every worker waits on the cached call before it has started; the
+    # waits must suspend their HPX threads so it can still run.
+    store = ResultCache()
+    barrier = threading.Barrier(4)
+    futures = [submit(_nested_cached, store, barrier, stacksize="small") for _ in range(4)]
+    assert [f.get() for f in futures] == [25] * 4
+    assert _calls == [5]
+
+
+def test_submit_cache_default_and_locality():
+    assert submit(_square, 11, cache=True).get() == 121
+    assert submit(_square, 11, cache=True).get() == 121
+    assert _calls.count(11) <= 1
+    with pytest.raises(ValueError, match="locality"):
+        submit(_square, 1, cache=True, locality=0)
+
+
+def test_executor_cache():
+    store = ResultCache()
+    with hpyx.HPXExecutor(os_threads=4, cache=store) as executor:
+        futures = [executor.submit(_square, i % 4) for i in range(20)]
+        assert [f.result(timeout=30) for f in futures] == [(i % 4) ** 2 for i in range(20)]
+        hit = executor.submit(int, "ff", base=16)
+        assert hit.result(timeout=30) == 255
+        assert executor.submit(int, "ff", base=16).done()
+    assert sorted(_calls) == [0, 1, 2, 3]
+    assert isinstance(hit, Future)
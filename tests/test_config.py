@@ -9,11 +9,20 @@ def test_defaults_present():
         "cfg": [],
         "autoinit": True,
         "trace_path": None,
+        "subinterpreters": False,
+        "small_stack_size": None,
+        "tcp_enable": False,
+        "localities": 1,
+        "locality_id": 0,
+        "agas_address": None,
+        "parcel_address": None,
     }
 
 
 def test_from_env_empty(monkeypatch):
-    for k in ("HPYX_OS_THREADS", "HPYX_CFG", "HPYX_AUTOINIT", "HPYX_TRACE_PATH"):
+    for k in ("HPYX_OS_THREADS", "HPYX_CFG", "HPYX_AUTOINIT", "HPYX_TRACE_PATH",
+              "HPYX_SUBINTERPRETERS", "HPYX_SMALL_STACK_SIZE", "HPYX_TCP_ENABLE", "HPYX_LOCALITIES",
+              "HPYX_LOCALITY_ID", "HPYX_AGAS_ADDRESS", "HPYX_PARCEL_ADDRESS"):
         monkeypatch.delenv(k, raising=False)
     assert config.from_env() == config.DEFAULTS
 
@@ -57,3 +66,39 @@ def test_from_env_autoinit(monkeypatch, value, expected):
 def test_from_env_trace_path(monkeypatch):
     monkeypatch.setenv("HPYX_TRACE_PATH", "/tmp/hpyx.jsonl")
     assert config.from_env()["trace_path"] == "/tmp/hpyx.jsonl"
+
+
+def test_from_env_subinterpreters(monkeypatch):
+    monkeypatch.setenv("HPYX_SUBINTERPRETERS", "1")
+    assert config.from_env()["subinterpreters"] is True
+
+
+def test_from_env_subinterpreters_invalid_raises(monkeypatch):
+    monkeypatch.setenv("HPYX_SUBINTERPRETERS", "maybe")
+    with pytest.raises(ValueError, match="HPYX_SUBINTERPRETERS"):
+        config.from_env()
+
+
+@pytest.mark.parametrize("value", ["32768", "0x8000"])
+def test_from_env_small_stack_size(monkeypatch, value):
+    monkeypatch.setenv("HPYX_SMALL_STACK_SIZE", value)
+    assert config.from_env()["small_stack_size"] == 32768
+
+
+def test_from_env_multi_locality(monkeypatch):
+    monkeypatch.setenv("HPYX_TCP_ENABLE", "1")
+    monkeypatch.setenv("HPYX_LOCALITIES", "3")
+    monkeypatch.setenv("HPYX_LOCALITY_ID", "2")
+    monkeypatch.setenv("HPYX_AGAS_ADDRESS", "node0:7910")
+    monkeypatch.setenv("HPYX_PARCEL_ADDRESS", "node2:7912")
+    env = config.from_env()
+    assert env["tcp_enable"] is True
+    assert (env["localities"], env["locality_id"]) == (3, 2)
+    assert env["agas_address"] == "node0:7910"
+    assert env["parcel_address"] == "node2:7912"
+
+
+def test_from_env_localities_invalid_raises(monkeypatch):
+    monkeypatch.setenv("HPYX_LOCALITIES", "many")
+    with pytest.raises(ValueError, match="HPYX_LOCALITIES"):
+        config.from_env()
@@ -0,0 +1,80 @@
+"""Tests for HPX performance counters in hpyx.debug."""
+
+import threading
+
+import pytest
+
+from hpyx import debug
+from hpyx.futures import submit
+
+_CUMULATIVE = "/threads{locality#0/total}/count/cumulative"
+_QUEUE = "/threadqueue{locality#0/total}/length"
+
+
+def test_counters_snapshot():
+    values = debug.counters([_CUMULATIVE, _QUEUE])
+    assert set(values) == {_CUMULATIVE, _QUEUE}
+    assert all(isinstance(v, float) for v in values.values())
+    assert values[_QUEUE] >= 0
+
+
+def test_counters_cumulative_grows_with_tasks():
+    before = debug.counters(_CUMULATIVE)[_CUMULATIVE]
+    for f in [submit(abs, -i, stacksize="small") for i in range(200)]:
+        f.get()
+    assert debug.counters(_CUMULATIVE)[_CUMULATIVE] >= before + 200
+
+
+def test_counters_wildcard_expands_per_worker():
+    values = debug.counters("/threads{locality#0/worker-thread#*}/count/cumulative")
+    assert len(values) == debug.get_num_worker_threads()
+
+
+def test_counters_unknown_pattern_raises():
+    with pytest.raises((ValueError, RuntimeError)):
+        debug.counters("/no-such-object{locality#0/total}/nothing")
+
+
+def test_format_prometheus():
+    text = debug.format_prometheus({
+        "/threads{locality#0/total}/idle-rate": 1234.0,
+        "/threads{locality#0/worker-thread#1}/idle-rate": 5.0,
+    })
+    assert text == (
+        "# TYPE hpx_threads_idle_rate gauge\n"
+        'hpx_threads_idle_rate{instance="locality#0/total"} 1234.0\n'
+        'hpx_threads_idle_rate{instance="locality#0/worker-thread#1"} 5.0\n'
+    )
+
+
+def test_sampler_callback_and_prometheus_file(tmp_path):
+    path = tmp_path / "hpyx.prom"
+    samples = []
+    got_two = threading.Event()
+
+    def collect(timestamp, values):
+        samples.append((timestamp, values))
+        if len(samples) >= 2:
+            got_two.set()
+
+    with debug.CounterSampler(
+        [_CUMULATIVE], interval=0.02, callback=collect, prometheus_path=path
+    ) as sampler:
+        assert got_two.wait(timeout=10)
+    assert set(samples[-1][1]) == {_CUMULATIVE}
+    assert sampler.latest == samples[-1][1]
+    assert "hpx_threads_count_cumulative" in path.read_text()
+
+
+def test_sampler_reraises_callback_error():
+    def boom(timestamp, values):
+        raise KeyError("boom")
+
+    sampler = debug.CounterSampler([_QUEUE], interval=0.01, callback=boom).start()
+    with pytest.raises(KeyError, match="boom"):
+        sampler.stop()
+
+
+def test_sampler_requires_a_sink():
+    with pytest.raises(ValueError, match="callback"):
+        debug.CounterSampler([_QUEUE])
@@ -0,0 +1,83 @@
+"""Tests for the Dask scheduler backed by HPX (hpyx.dask.get)."""
+
+from __future__ import annotations
+
+import operator
+
+import numpy as np
+import pytest
+
+import hpyx
+from hpyx.dask import _kernels
+
+dask = pytest.importorskip("dask")
+da = pytest.importorskip("dask.array")
+
+
+def test_get_legacy_tuple_graph():
+    dsk = {
+        "x": 1,
+        "y": (operator.add, "x", 10),
+        "z": (sum, ["x", "y"]),
+        "unused": (operator.truediv, 1, 0),
+    }
+    assert hpyx.dask.get(dsk, "z") == 12
+    assert hpyx.dask.get(dsk, ["z", ["x", "y"]]) == (12, (1, 11))
+
+
+def test_get_propagates_errors():
+    dsk = {"x": (operator.truediv, 1, 0), "y": (operator.neg, "x")}
+    with pytest.raises(ZeroDivisionError):
+        hpyx.dask.get(dsk, "y")
+
+
+def test_dask_array_with_hpyx_scheduler():
+    data = np.random.default_rng(0).random((400, 300))
+    x = da.from_array(data, chunks=(100, 100))
+    expr = (x + x.T[:300, :300].sum()) * 2 - x.mean(axis=0)
+    expected = expr.compute(scheduler="sync")
+    with dask.config.set(scheduler=hpyx.dask.get):
+        np.testing.assert_allclose(expr.compute(), expected)
+
+
+def test_dask_delayed_with_hpyx_scheduler():
+    parts = [dask.delayed(operator.mul)(i, i) for i in range(20)]
+    total = dask.delayed(sum)(parts)
+    assert total.compute(scheduler=hpyx.dask.get) == sum(i * i for i in range(20))
+
+
+def test_dask_persist_and_multiple_collections():
+    x = da.arange(1000, chunks=100)
+    a, b = dask.compute(x.sum(), (x * 2).max(), scheduler=hpyx.dask.get)
+    assert (a, b) == (499500, 1998)
+
+
+@pytest.mark.parametrize("native_kernels", [True, False])
+def test_native_dot_substitution(native_kernels):
+    a = np.random.default_rng(1).random(1000)
+    b = np.random.default_rng(2).random(1000)
+    dsk = {"a": a, "b": b, "dot": (np.dot, "a", "b")}
+    result = hpyx.dask.get(dsk, "dot", native_kernels=native_kernels)
+    assert result == pytest.approx(np.dot(a, b))
+
+
+def test_native_kernels_fall_back_to_numpy():
+    dot = _kernels.native_for(np.dot)
+    m = np.arange(6.0).reshape(2, 3)
+    np.testing.assert_array_equal(dot(m, m.T), np.dot(m, m.T))
+    assert dot(np.arange(3), np.arange(3)) == 5
+
+    total = _kernels.native_for(np.sum)
+    big = np.random.default_rng(3).random((512, 256))
+    assert total(big) == pytest.approx(big.sum())
+    np.testing.assert_allclose(total(big, axis=(0, 1), keepdims=True), big.sum(keepdims=True))
+    np.testing.assert_allclose(total(big, axis=1), big.sum(axis=1))
+    assert total(np.arange(5)) == 10
+
+
+def test_native_for_sees_through_partial():
+    import functools
+
+    kernel = _kernels.native_for(functools.partial(np.sum, axis=0))
+    assert isinstance(kernel, functools.partial)
+    assert _kernels.native_for(len) is None
@@ -1,6 +1,22 @@
+import json
+import os
+import subprocess
+import sys
+import textwrap
+
 import pytest
 
-from hpyx import debug
+from hpyx import HPXExecutor, debug
+from hpyx.futures import submit
+
+
+def _double(x):
+    return 2 * x
+
+
+def _read_trace(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
 
 
 def test_get_num_worker_threads_positive():
@@ -19,11 +35,256 @@ def test_get_worker_thread_id_from_hpx_thread_is_valid():
     pytest.xfail("HPXExecutor is rewritten in Plan 2")
 
 
-def test_enable_tracing_is_stubbed():
-    with pytest.raises(NotImplementedError, match="v1.x"):
-        debug.enable_tracing("/tmp/hpyx.jsonl")
+def test_tracing_records_task_events(tmp_path):
+    path = tmp_path / "trace.jsonl"
+    debug.enable_tracing(path)
+    try:
+        assert debug.tracing_enabled()
+        assert submit(_double, 1).get() == 2
+        assert submit(_double, 2, stacksize="small").get() == 4
+        assert HPXExecutor(os_threads=4).submit(_double, 3).result(timeout=30) == 6
+    finally:
+        debug.disable_tracing()
+    assert not debug.tracing_enabled()
+
+    events = _read_trace(path)
+    assert [e["name"] for e in events].count("_double") == 3
+    for event in events:
+        assert event["submit_ns"] <= event["start_ns"] <= event["end_ns"]
+        assert event["gil_wait_ns"] >= 0
+    # The stacksize and executor tasks ran on HPX workers.
+    assert sum(e["worker_thread_id"] >= 0 for e in events) >= 2
+
+
+def test_tracing_many_tasks_are_all_flushed(tmp_path):
+    path = tmp_path / "trace.jsonl"
+    debug.enable_tracing(path, flush_interval=0.01)
+    try:
+        futures = [submit(abs, -i, stacksize="nostack") for i in range(20_000)]
+        assert sum(f.get() for f in futures) == sum(range(20_000))
+    finally:
+        debug.disable_tracing()
+    assert len(_read_trace(path)) == 20_000
+
+
+def test_tracing_off_records_nothing(tmp_path):
+    path = tmp_path / "trace.jsonl"
+    debug.enable_tracing(path)
+    debug.disable_tracing()
+    submit(_double, 1).get()
+    assert _read_trace(path) == []
+
+
+def test_enable_tracing_twice_raises(tmp_path):
+    debug.enable_tracing(tmp_path / "a.jsonl")
+    try:
+        with pytest.raises(RuntimeError, match="already enabled"):
+            debug.enable_tracing(tmp_path / "b.jsonl")
+    finally:
+        debug.disable_tracing()
+
+
+def test_enable_tracing_without_path_raises(monkeypatch):
+    monkeypatch.delenv("HPYX_TRACE_PATH", raising=False)
+    with pytest.raises(ValueError, match="HPYX_TRACE_PATH"):
+        debug.enable_tracing()
+
+
+def test_disable_tracing_when_disabled_is_noop():
+    debug.disable_tracing()
+    assert not debug.tracing_enabled()
+
+
+def test_trace_path_env_enables_tracing_at_startup(tmp_path):
+    path = tmp_path / "trace.jsonl"
+    script = textwrap.dedent("""
+        import hpyx
+        from hpyx.futures import submit
+
+        hpyx.init(os_threads=2)
+        assert hpyx.debug.tracing_enabled()
+        submit(divmod, 7, 2, stacksize="small").get()
+        hpyx.shutdown()
+    """)
+    result = subprocess.run(
+        [sys.executable, "-c", script],
+        env={**os.environ, "HPYX_TRACE_PATH": str(path)},
+        capture_output=True, text=True, timeout=120,
+    )
+    assert result.returncode == 0, result.stderr
+    assert [e["name"] for e in _read_trace(path)] == ["divmod"]
+
+
+def test_trace_events_conversion():
+    from hpyx import _trace_export
+
+    events = [
+        {"name": "work", "cat": "task", "worker_thread_id": 1, "submit_ns": 1000,
+         "start_ns": 3000, "end_ns": 9000, "gil_wait_ns": 2000},
+        {"name": "for_loop.chunk", "cat": "kernel", "worker_thread_id": -1,
+         "submit_ns": 2000, "start_ns": 2000, "end_ns": 4000, "gil_wait_ns": 0},
+    ]
+    records = _trace_export.to_trace_events(events, pid=7)
+    slices = [r for r in records if r["ph"] == "X"]
+    assert [(s["name"], s["cat"], s["tid"]) for s in slices] == [
+        ("work", "task", 2), ("GIL wait", "gil", 2), ("for_loop.chunk", "kernel", 0),
+    ]
+    assert slices[0]["ts"] == 2.0 and slices[0]["dur"] == 6.0
+    assert slices[1]["dur"] == 2.0
+    names = {r["args"]["name"] for r in records if r["name"] == "thread_name"}
+    assert names == {"HPX worker 1", "non-HPX threads"}
+
+
+def test_trace_events_gil_slice_is_not_nested():
+    from hpyx import _trace_export
+
+    events = [
+        {"name": "gil.then", "cat": "gil", "worker_thread_id": 0, "submit_ns": 0,
+         "start_ns": 0, "end_ns": 500, "gil_wait_ns": 500},
+    ]
+    slices = [r for r in _trace_export.to_trace_events(events, pid=1) if r["ph"] == "X"]
+    assert [(s["name"], s["cat"]) for s in slices] == [("gil.then", "gil")]
+
+
+@pytest.mark.parametrize("fmt", ["chrome", "perfetto"])
+def test_export_trace_timeline(tmp_path, fmt):
+    import numpy as np
 
+    import hpyx
 
-def test_disable_tracing_is_stubbed():
-    with pytest.raises(NotImplementedError, match="v1.x"):
+    debug.enable_tracing(tmp_path / "trace.jsonl")
+    try:
+        submit(_double, 1, stacksize="small").get()
+        hpyx.multiprocessing.for_loop(_double, list(range(100)), "par")
+        hpyx._core.dot1d(np.ones(1000), np.ones(1000))
+        out = tmp_path / "run.json"
+        debug.export_trace(out, format=fmt)  # flushes the live trace first
+    finally:
         debug.disable_tracing()
+
+    trace = json.loads(out.read_text())
+    slices = [r for r in trace["traceEvents"] if r["ph"] == "X"]
+    names = {s["name"] for s in slices}
+    assert {"_double", "for_loop.chunk", "dot1d.chunk"} <= names
+    assert {s["cat"] for s in slices} >= {"task", "kernel"}
+    assert all(s["dur"] >= 0 for s in slices)
+
+
+def test_export_trace_bad_format_raises(tmp_path):
+    with pytest.raises(ValueError, match="format"):
+        debug.export_trace(tmp_path / "run.json", format="svg")
+
+
+def test_gil_stats_counts_worker_acquisitions():
+    debug.gil_stats(reset=True)
+    futures = [submit(_double, i, stacksize="small") for i in range(200)]
+    assert sum(f.get() for f in futures) == 2 * sum(range(200))
+
+    stats = debug.gil_stats()
+    assert len(stats["workers"]) == debug.get_num_worker_threads()
+    assert sum(w["acquisitions"] for w in stats["workers"]) >= 200
+    assert stats["acquisitions"] == (
+        sum(w["acquisitions"] for w in stats["workers"]) + stats["external"]["acquisitions"]
+    )
+    assert stats["wait_ns"] >= 0
+    assert stats["max_wait_ns"] * stats["acquisitions"] >= stats["wait_ns"]
+
+
+def test_gil_stats_reset():
+    submit(_double, 1, stacksize="small").get()
+    assert debug.gil_stats(reset=True)["acquisitions"] >= 1
+    assert debug.gil_stats()["acquisitions"] == 0
+
+
+def test_tracing_gil_events(tmp_path):
+    path = tmp_path / "trace.jsonl"
+    debug.enable_tracing(path, gil_events=True)
+    try:
+        submit(_double, 1, stacksize="small").then(_double).get()
+    finally:
+        debug.disable_tracing()
+    gil = [e for e in _read_trace(path) if e["cat"] == "gil"]
+    assert {"gil.task", "gil.then"} <= {e["name"] for e in gil}
+    for event in gil:
+        assert event["end_ns"] - event["start_ns"] == event["gil_wait_ns"]
+
+
+def test_snapshot_structure():
+    snap = debug.snapshot()
+    for key in ("pending", "active", "suspended", "staged", "terminated", "queue_length"):
+        assert snap[key] >= 0
+        assert snap[key] == sum(pool[key] for pool in snap["pools"])
+    workers = [w for pool in snap["pools"] for w in pool["workers"]]
+    assert sorted(w["worker"] for w in workers) == list(range(len(workers)))
+    assert len(workers) >= debug.get_num_worker_threads()
+    assert snap["python_tasks"]["queued"] == 0
+    assert snap["python_tasks"]["oldest_queued_age_ns"] is None
+
+
+def test_snapshot_reports_queued_python_tasks():
+    import threading
+
+    release = threading.Event()
+    # Block every worker so later tasks stay queued.
+    blockers = [
+        submit(release.wait, 30, stacksize="small")
+        for _ in range(debug.get_num_worker_threads())
+    ]
+    try:
+        queued = [submit(abs, -1, stacksize="small") for _ in range(100)]
+        snap = debug.snapshot()
+        assert snap["python_tasks"]["queued"] >= 1
+        assert snap["python_tasks"]["oldest_queued_age_ns"] > 0
+    finally:
+        release.set()
+    assert all(f.get() for f in blockers)
+    assert [f.get() for f in queued] == [1] * 100
+    assert debug.snapshot()["python_tasks"]["queued"] == 0
+
+
+def _current_thread_info():
+    import threading
+
+    return debug.get_worker_thread_id(), threading.current_thread().name, threading.get_native_id()
+
+
+def test_worker_threads_are_registered():
+    workers = debug.worker_threads()
+    assert [w["worker"] for w in workers] == list(range(debug.get_num_worker_threads()))
+    assert len({w["native_id"] for w in workers}) == len(workers)
+    for w in workers:
+        assert w["name"] == f"hpyx-worker-{w['pool']}-{w['index']}"
+
+
+def test_worker_thread_names_seen_from_tasks():
+    by_id = {w["worker"]: w for w in debug.worker_threads()}
+    futures = [submit(_current_thread_info, stacksize="small") for _ in range(50)]
+    for worker, name, native_id in (f.get() for f in futures):
+        assert worker in by_id
+        assert name == by_id[worker]["name"]
+        assert native_id == by_id[worker]["native_id"]
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="reads /proc")
+def test_worker_os_thread_names():
+    for w in debug.worker_threads():
+        with open(f"/proc/self/task/{w['native_id']}/comm", encoding="utf-8") as f:
+            assert f.read().strip().startswith("hpyx-")
+
+
+def test_allocator_info():
+    info = debug.allocator_info()
+    assert isinstance(info["hpx_malloc"], str)
+    assert info["active"] in {"system", "tcmalloc", "jemalloc", "mimalloc"}
+    assert all(isinstance(v, int) and v >= 0 for v in info["stats"].values())
+
+
+def test_allocator_stats_track_allocations():
+    info = debug.allocator_info()
+    if "allocated_bytes" not in info["stats"]:
+        pytest.skip(f"{info['active']} reports no allocated_bytes here")
+    before = info["stats"]["allocated_bytes"]
+    block = bytearray(64 * 1024 * 1024)
+    after = debug.allocator_info()["stats"]["allocated_bytes"]
+    assert after - before >= len(block) // 2
+    del block
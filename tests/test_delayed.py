@@ -0,0 +1,180 @@
+"""Tests for hpyx.delayed / hpyx.compute and the task-graph passes."""
+
+from __future__ import annotations
+
+import math
+import threading
+
+import numpy as np
+import pytest
+
+import hpyx
+from hpyx import _taskgraph
+from hpyx._taskgraph import Ref, Task
+
+
+@hpyx.delayed
+def inc(x):
+    return x + 1
+
+
+@hpyx.delayed(pure=True)
+def add(x, y):
+    return x + y
+
+
+def test_delayed_records_instead_of_calling():
+    calls = []
+
+    @hpyx.delayed
+    def record(x):
+        calls.append(x)
+        return x
+
+    value = record(1)
+    assert isinstance(value, hpyx.Delayed)
+    assert calls == []
+    assert value.compute() == 1
+    assert calls == [1]
+
+
+def test_compute_diamond():
+    assert hpyx.compute(add(inc(1), inc(2))) == (5,)
+
+
+def test_compute_several_and_plain_values():
+    a = inc(1)
+    assert hpyx.compute(a, inc(a), 7, "s") == (2, 3, 7, "s")
+
+
+def test_nested_containers():
+    result = hpyx.compute([inc(1), {"a": inc(2)}, (inc(3), 0)])
+    assert result == ([2, {"a": 3}, (4, 0)],)
+
+
+def test_delayed_value_operators_and_attributes():
+    d = hpyx.delayed({"k": [1, 2]})
+    assert (d["k"][1] + 10).compute() == 12
+    assert (2 * inc(1) - 1).compute() == 3
+    assert hpyx.delayed("abc").upper().compute() == "ABC"
+    with pytest.raises(TypeError):
+        bool(inc(1))
+
+
+def test_errors_propagate():
+    @hpyx.delayed
+    def fail(x):
+        raise ValueError(f"bad {x}")
+
+    with pytest.raises(ValueError, match="bad 1"):
+        inc(fail(1)).compute()
+
+
+def test_pure_duplicates_run_once():
+    calls = []
+    lock = threading.Lock()
+
+    @hpyx.delayed(pure=True)
+    def square(x):
+        with lock:
+            calls.append(x)
+        return x * x
+
+    total = add(square(3), square(3))
+    assert total.compute() == 18
+    assert calls == [3]
+    assert total.compute(optimize_graph=False) == 18
+    assert calls == [3, 3, 3]
+
+
+def test_pure_calls_on_signed_zeros_are_not_merged():
+    copysign = hpyx.delayed(math.copysign, pure=True)
+    assert hpyx.compute(copysign(1.0, 0.0), copysign(1.0, -0.0)) == (1.0, -1.0)
+    cplx = hpyx.delayed(complex, pure=True)
+    a, b = hpyx.compute(cplx(0.0, 0.0), cplx(0.0, -0.0))
+    assert (str(a), str(b)) == ("0j", "-0j")
+    a, b = hpyx.compute(cplx(complex(0, 0.0)), cplx(complex(0, -0.0)))
+    assert (str(a), str(b)) == ("0j", "-0j")
+
+
+def test_impure_duplicates_are_kept():
+    counter = iter(range(100))
+
+    @hpyx.delayed
+    def tick(_):
+        return next(counter)
+
+    a, b = hpyx.compute(tick(0), tick(0))
+    assert a != b
+
+
+def test_long_chain():
+    x = inc(0)
+    for _ in range(2000):
+        x = inc(x)
+    assert x.compute() == 2001
+    assert x.compute(stacksize="nostack") == 2001
+
+
+def test_parallel_branches():
+    parts = [inc(i) for i in range(64)]
+    assert hpyx.delayed(sum)(parts).compute() == sum(range(1, 65))
+
+
+def test_compute_arrays_alongside_delayed():
+    x = hpyx.array.from_array(np.arange(4.0))
+    arr, value = hpyx.compute(x * 2, inc(1))
+    np.testing.assert_array_equal(arr, [0.0, 2.0, 4.0, 6.0])
+    assert value == 2
+
+
+# -- graph passes -------------------------------------------------------------
+
+
+def _graph():
+    return {
+        "a": 1,
+        "b": Task(abs, (Ref("a"),), pure=True),
+        "c": Task(abs, (Ref("a"),), pure=True),
+        "d": Task(max, (Ref("b"), Ref("c"))),
+        "e": Task(abs, (Ref("d"),)),
+        "unused": Task(abs, (Ref("a"),)),
+    }
+
+
+def test_cull_and_toposort():
+    culled = _taskgraph.cull(_graph(), ["e"])
+    assert list(culled) == ["a", "b", "c", "d", "e"]
+
+
+def test_toposort_errors():
+    with pytest.raises(ValueError, match="cycle"):
+        _taskgraph.toposort({"a": Task(abs, (Ref("b"),)), "b": Task(abs, (Ref("a"),))}, ["a"])
+    with pytest.raises(KeyError, match="missing"):
+        _taskgraph.toposort({"a": Task(abs, (Ref("missing"),))}, ["a"])
+
+
+def test_merge_identical():
+    merged, renames = _taskgraph.merge_identical(_taskgraph.cull(_graph(), ["e"]))
+    assert renames == {"c": "b"}
+    assert "c" not in merged
+    assert merged["d"].dependencies() == ["b"]
+
+
+def test_fuse_linear():
+    merged, _ = _taskgraph.merge_identical(_taskgraph.cull(_graph(), ["e"]))
+    nodes = _taskgraph.fuse_linear(merged, ["e"])
+    # b -> d -> e is one chain; the literal "a" is inlined.
+    assert [(key, [k for k, _t in steps], inputs) for key, steps, inputs in nodes] == [
+        ("e", ["b", "d", "e"], []),
+    ]
+
+
+def test_fuse_linear_keeps_outputs_and_shared_inputs():
+    merged, _ = _taskgraph.merge_identical(_taskgraph.cull(_graph(), ["d", "e"]))
+    nodes = _taskgraph.fuse_linear(merged, ["d", "e"])
+    assert [key for key, _steps, _inputs in nodes] == ["d", "e"]
+
+
+def test_execute_graph():
+    assert _taskgraph.execute(_graph(), ["e", "a", "d"]) == [1, 1, 1]
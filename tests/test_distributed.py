@@ -0,0 +1,135 @@
+"""Tests for hpyx.distributed (multi-locality mode over TCP)."""
+
+import math
+import operator
+import sys
+import textwrap
+
+import numpy as np
+import pytest
+
+import hpyx
+from hpyx import _runtime
+from hpyx.distributed import _launch, _remote
+
+
+def _roundtrip(fn, *args, **kwargs):
+    """Run a task through the wire format without leaving this process."""
+    payload, buffers = _remote.dumps((fn, args, kwargs))
+    result_payload, result_buffers = _remote.execute(payload, buffers)
+    return _remote.decode((result_payload, result_buffers), 0)
+
+
+def test_cfg_strings_single_locality_disables_tcp():
+    cfg = _runtime._build_cfg_strings(os_threads=2, cfg=[])
+    assert "hpx.parcel.tcp.enable!=0" in cfg
+    assert not any(entry.startswith("hpx.localities") for entry in cfg)
+
+
+def test_cfg_strings_console_locality():
+    cfg = _runtime._build_cfg_strings(
+        os_threads=None, cfg=[], tcp_enable=True, localities=3,
+        agas_address="node0:7910", parcel_address="node0:7910",
+    )
+    assert "hpx.parcel.tcp.enable!=1" in cfg
+    assert "hpx.localities!=3" in cfg
+    assert "hpx.run_hpx_main!=1" in cfg
+    assert "hpx.agas.service_mode!=bootstrap" in cfg
+    assert "hpx.agas.address!=node0" in cfg
+    assert "hpx.agas.port!=7910" in cfg
+
+
+def test_cfg_strings_worker_locality():
+    cfg = _runtime._build_cfg_strings(
+        os_threads=None, cfg=[], tcp_enable=True, localities=3, locality_id=2,
+        agas_address="node0:7910", parcel_address="node2:7912", worker=True,
+    )
+    assert "hpx.run_hpx_main!=0" in cfg
+    assert "hpx.agas.service_mode!=hosted" in cfg
+    assert "hpx.parcel.address!=node2" in cfg
+    assert "hpx.parcel.port!=7912" in cfg
+
+
+def test_cfg_strings_bad_address_raises():
+    with pytest.raises(ValueError, match="agas_address"):
+        _runtime._build_cfg_strings(
+            os_threads=None, cfg=[], tcp_enable=True, agas_address="node0"
+        )
+
+
+def test_run_worker_bad_address_leaves_state_untouched(monkeypatch):
+    monkeypatch.setattr(_runtime, "_started", False)
+    monkeypatch.setattr(_runtime, "_started_cfg", None)
+    monkeypatch.setenv("HPYX_AGAS_ADDRESS", "node0")
+    with pytest.raises(ValueError, match="agas_address"):
+        _runtime.run_worker()
+    assert not _runtime._started
+    assert _runtime._started_cfg is None
+
+
+def test_launcher_env_layout():
+    env = _launch._locality_env(
+        2, localities=4, host="b", agas_host="a", base_port=9000, os_threads=3
+    )
+    assert env == {
+        "HPYX_TCP_ENABLE": "1",
+        "HPYX_LOCALITIES": "4",
+        "HPYX_LOCALITY_ID": "2",
+        "HPYX_AGAS_ADDRESS": "a:9000",
+        "HPYX_PARCEL_ADDRESS": "b:9002",
+        "HPYX_OS_THREADS": "3",
+    }
+
+
+def test_wire_format_sends_arrays_out_of_band():
+    arr = np.arange(1000.0)
+    payload, buffers = _remote.dumps((np.sum, (arr,), {}))
+    assert len(buffers) == 1
+    assert len(payload) < arr.nbytes
+    assert _roundtrip(np.sum, arr) == arr.sum()
+
+
+def test_wire_format_remote_exception():
+    with pytest.raises(ValueError, match="math domain error") as excinfo:
+        _roundtrip(math.sqrt, -1)
+    assert "locality 0" in excinfo.value.__notes__[0]
+
+
+def test_single_locality():
+    assert hpyx.find_all_localities() == [0]
+    assert hpyx.distributed.get_locality_id() == 0
+
+
+def test_submit_to_own_locality():
+    arr = np.arange(10, dtype=np.int64)
+    fut = hpyx.distributed.submit(operator.mul, arr, 2, locality=0)
+    np.testing.assert_array_equal(fut.get(), arr * 2)
+
+
+def test_futures_submit_with_locality():
+    assert hpyx.futures.submit(pow, 2, 8, locality=0).get() == 256
+
+
+@pytest.mark.skipif(sys.platform != "linux", reason="localhost multi-locality on Linux")
+def test_multi_locality_localhost(tmp_path):
+    if not hpyx.distributed.networking_enabled():
+        pytest.skip("HPX built without networking (HPX_WITH_NETWORKING=OFF)")
+    script = tmp_path / "job.py"
+    script.write_text(textwrap.dedent("""
+        import os
+        import numpy as np
+        import hpyx
+        from hpyx import distributed
+
+        localities = hpyx.find_all_localities()
+        assert localities == [0, 1, 2], localities
+        pids = [distributed.submit(os.getpid, locality=k) for k in localities]
+        assert len({f.get() for f in pids}) == 3
+        arr = np.ones(1 << 16)
+        assert distributed.submit(np.sum, arr, locality=2).get() == arr.size
+        print("ok")
+    """))
+    code = _launch.launch(
+        [str(script)], localities=3, base_port=7950, os_threads=1, timeout=120
+    )
+    assert code == 0
@@ -0,0 +1,84 @@
+"""Tests for HPXExecutor."""
+
+import pytest
+
+from hpyx import HPXExecutor
+
+
+def test_executor_submit_returns_result():
+    executor = HPXExecutor(os_threads=4)
+    assert executor.submit(pow, 2, 5).result(timeout=30) == 32
+
+
+def test_executor_submit_kwargs():
+    executor = HPXExecutor(os_threads=4)
+    assert executor.submit(int, "ff", base=16).result(timeout=30) == 255
+
+
+def test_executor_submit_exception():
+    executor = HPXExecutor(os_threads=4)
+    future = executor.submit(int, "not a number")
+    with pytest.raises(ValueError):
+        future.result(timeout=30)
+
+
+def test_executor_map():
+    with HPXExecutor(os_threads=4) as executor:
+        assert list(executor.map(abs, range(-5, 0))) == [5, 4, 3, 2, 1]
+
+
+@pytest.mark.parametrize("stacksize", ["nostack", "small", "medium", "large"])
+def test_executor_stacksize(stacksize):
+    executor = HPXExecutor(os_threads=4, stacksize=stacksize)
+    futures = [executor.submit(abs, -i) for i in range(1000)]
+    assert sum(f.result(timeout=30) for f in futures) == sum(range(1000))
+
+
+def test_executor_invalid_stacksize_raises():
+    with pytest.raises(ValueError, match="stacksize"):
+        HPXExecutor(os_threads=4, stacksize="huge")
+
+
+def _square(x):
+    return x * x
+
+
+def _fail(x):
+    raise ValueError(x)
+
+
+def test_executor_profile_stats():
+    executor = HPXExecutor(os_threads=4, profile=True)
+    assert [f.result(timeout=30) for f in [executor.submit(_square, i) for i in range(50)]] == [
+        i * i for i in range(50)
+    ]
+    for future in [executor.submit(_fail, i) for i in range(5)]:
+        with pytest.raises(ValueError):
+            future.result(timeout=30)
+
+    stats = executor.stats()
+    assert stats["_square"]["count"] == 50
+    assert stats["_square"]["errors"] == 0
+    assert stats["_fail"]["count"] == 5
+    assert stats["_fail"]["errors"] == 5
+    for phase in ("queue_wait", "gil_wait", "run"):
+        summary = stats["_square"][phase]
+        assert summary["count"] == 50
+        assert sum(count for _, count in summary["buckets"]) == 50
+        assert summary["p50_ns"] <= summary["p90_ns"] <= summary["p99_ns"]
+        assert summary["total_ns"] >= 0
+
+
+def test_executor_profile_stats_reset():
+    executor = HPXExecutor(os_threads=4, profile=True)
+    executor.submit(_square, 3).result(timeout=30)
+    assert executor.stats(reset=True)["_square"]["count"] == 1
+    after = executor.stats()["_square"]
+    assert after["count"] == 0
+    assert after["run"]["buckets"] == []
+
+
+def test_executor_stats_requires_profile():
+    executor = HPXExecutor(os_threads=4)
+    with pytest.raises(RuntimeError, match="profile=True"):
+        executor.stats()
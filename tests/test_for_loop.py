@@ -15,28 +15,28 @@ def test_for_loop_basic():
 def test_for_loop_list_modification():
     """Test for_loop with in-place list modification"""
     data = [1, 2, 3, 4, 5]
-    
+
     def square(x):
         return x * x
-    
+
     with HPXRuntime():
         hpyx.multiprocessing.for_loop(square, data, "seq")
-    
+
     assert data == [1, 4, 9, 16, 25]
 
 
-@pytest.mark.parametrize("policy", ["seq"])  # Remove "par" temporarily due to potential issues
+@pytest.mark.parametrize("policy", ["seq", "par"])
 def test_for_loop_execution_policies(policy):
     """Test different execution policies"""
     data = list(range(100))
     original_data = data.copy()
-    
+
     def increment(x):
         return x + 1
-    
+
     with HPXRuntime():
         hpyx.multiprocessing.for_loop(increment, data, policy)
-    
+
     expected = [x + 1 for x in original_data]
     assert data == expected
 
@@ -44,26 +44,26 @@ def test_for_loop_execution_policies(policy):
 def test_for_loop_string_transformation():
     """Test for_loop with string operations"""
     data = ["hello", "world", "test"]
-    
+
     def uppercase(s):
         return s.upper()
-    
+
     with HPXRuntime():
         hpyx.multiprocessing.for_loop(uppercase, data, "seq")
-    
+
     assert data == ["HELLO", "WORLD", "TEST"]
 
 
 def test_for_loop_complex_objects():
     """Test for_loop with more complex objects"""
     data = [{"value": i} for i in range(5)]
-    
+
     def increment_value(obj):
         return {"value": obj["value"] + 10}
-    
+
     with HPXRuntime():
         hpyx.multiprocessing.for_loop(increment_value, data, "seq")  # Use sequential for stability
-    
+
     expected = [{"value": i + 10} for i in range(5)]
     assert data == expected
 
@@ -88,13 +88,13 @@ def test_for_loop_large_dataset():
     """Test for_loop with large dataset for performance verification"""
     size = 1000  # Reduce size for stability
     data = list(range(size))
-    
+
     def multiply_by_three(x):
         return x * 3
-    
+
     with HPXRuntime():
         hpyx.multiprocessing.for_loop(multiply_by_three, data, "seq")  # Use sequential for stability
-    
+
     expected = [i * 3 for i in range(size)]
     assert data == expected
 
@@ -102,14 +102,14 @@ def test_for_loop_large_dataset():
 def test_for_loop_mathematical_operations():
     """Test for_loop with more complex mathematical operations"""
     data = [float(i) for i in range(100)]
-    
+
     def complex_transform(x):
         # (x+1)^2 transformation
         return (x + 1) ** 2
-    
+
     with HPXRuntime():
         hpyx.multiprocessing.for_loop(complex_transform, data, "seq")  # Use sequential for stability
-    
+
     expected = [(float(i) + 1) ** 2 for i in range(100)]
     assert data == expected
 
@@ -117,56 +117,78 @@ def test_for_loop_mathematical_operations():
 def test_for_loop_mixed_types():
     """Test for_loop with mixed numeric types"""
     data = [1, 2.5, 3, 4.7, 5]
-    
+
     def add_ten(x):
         return x + 10
-    
+
     with HPXRuntime():
         hpyx.multiprocessing.for_loop(add_ten, data, "seq")
-    
+
     assert data == [11, 12.5, 13, 14.7, 15]
 
 
 def test_for_loop_boolean_operations():
     """Test for_loop with boolean transformations"""
     data = [True, False, True, False]
-    
+
     def negate(x):
         return not x
-    
+
     with HPXRuntime():
         hpyx.multiprocessing.for_loop(negate, data, "seq")
-    
+
     assert data == [False, True, False, True]
 
 
-# NOTE: Parallel execution tests are commented out due to stability issues
-# When parallel execution is stable, these tests can be uncommented:
-#
-# def test_for_loop_parallel_execution():
-#     """Test parallel execution policy"""
-#     data = list(range(10))
-#     
-#     def square(x):
-#         return x * x
-#     
-#     with HPXRuntime():
-#         hpyx.multiprocessing.for_loop(square, data, "par")
-#     
-#     expected = [i * i for i in range(10)]
-#     assert data == expected
+def test_for_loop_parallel_execution():
+    """Test parallel execution policy"""
+    data = list(range(10))
+
+    def square(x):
+        return x * x
+
+    with HPXRuntime():
+        hpyx.multiprocessing.for_loop(square, data, "par")
+
+    expected = [i * i for i in range(10)]
+    assert data == expected
+
+
+def test_for_loop_parallel_more_elements_than_chunks():
+    """Test parallel execution covers every element when chunked"""
+    data = list(range(1001))
+    with HPXRuntime():
+        hpyx.multiprocessing.for_loop(lambda x: -x, data, "par")
+    assert data == [-i for i in range(1001)]
+
+
+def test_for_loop_parallel_propagates_python_exception():
+    """Test a Python exception raised on an HPX worker keeps its type"""
+    def fail_on_five(x):
+        if x == 5:
+            raise KeyError("five")
+        return x
+
+    with HPXRuntime(), pytest.raises(KeyError, match="five"):
+        hpyx.multiprocessing.for_loop(fail_on_five, list(range(10)), "par")
+
+
+def test_for_loop_invalid_policy():
+    """Test an unknown policy is rejected"""
+    with HPXRuntime(), pytest.raises(ValueError, match="Invalid execution policy"):
+        hpyx.multiprocessing.for_loop(lambda x: x, [1], "bogus")
 
 
 def test_for_loop_numpy_array_basic():
     """Test for_loop with basic numpy array operations"""
     arr = np.array([1, 2, 3, 4, 5])
-    
+
     def double(x):
         return x * 2
-    
+
     with HPXRuntime():
         hpyx.multiprocessing.for_loop(double, arr, "seq")
-    
+
     expected = np.array([2, 4, 6, 8, 10])
     np.testing.assert_array_equal(arr, expected)
 
@@ -174,13 +196,13 @@ def test_for_loop_numpy_array_basic():
 def test_for_loop_numpy_float_array():
     """Test for_loop with numpy float arrays"""
     arr = np.array([1.5, 2.7, 3.1, 4.9], dtype=np.float64)
-    
+
     def add_half(x):
         return x + 0.5
-    
+
     with HPXRuntime():
         hpyx.multiprocessing.for_loop(add_half, arr, "seq")
-    
+
     expected = np.array([2.0, 3.2, 3.6, 5.4], dtype=np.float64)
     np.testing.assert_array_almost_equal(arr, expected)
 
@@ -189,13 +211,13 @@ def test_for_loop_numpy_2d_array():
     """Test for_loop with 2D numpy arrays (flattened iteration)"""
     arr = np.array([[1, 2], [3, 4], [5, 6]])
     original_shape = arr.shape
-    
+
     def increment(x):
         return x + 10
-    
+
     with HPXRuntime():
         hpyx.multiprocessing.for_loop(increment, arr, "seq")
-    
+
     expected = np.array([[11, 12], [13, 14], [15, 16]])
     np.testing.assert_array_equal(arr, expected)
     assert arr.shape == original_shape  # Shape should be preserved
@@ -204,13 +226,13 @@ def test_for_loop_numpy_2d_array():
 def test_for_loop_numpy_mathematical_operations():
     """Test for_loop with complex mathematical operations on numpy arrays"""
     arr = np.linspace(0, 10, 11)  # [0, 1, 2, ..., 10]
-    
+
     def polynomial_transform(x):
         return x**2 + 2*x + 1  # (x+1)^2
-    
+
     with HPXRuntime():
         hpyx.multiprocessing.for_loop(polynomial_transform, arr, "seq")
-    
+
     # Expected: (x+1)^2 for x in [0, 1, 2, ..., 10]
     expected = np.array([(x+1)**2 for x in range(11)], dtype=float)
     np.testing.assert_array_almost_equal(arr, expected)
@@ -219,13 +241,13 @@ def test_for_loop_numpy_mathematical_operations():
 def test_for_loop_numpy_trigonometric():
     """Test for_loop with trigonometric functions on numpy arrays"""
     arr = np.array([0, np.pi/4, np.pi/2, np.pi, 3*np.pi/2, 2*np.pi])
-    
+
     def sin_transform(x):
         return np.sin(x)
-    
+
     with HPXRuntime():
         hpyx.multiprocessing.for_loop(sin_transform, arr, "seq")
-    
+
     # Expected sin values
     expected = np.array([0, np.sqrt(2)/2, 1, 0, -1, 0])
     np.testing.assert_array_almost_equal(arr, expected, decimal=10)
@@ -234,13 +256,13 @@ def test_for_loop_numpy_trigonometric():
 def test_for_loop_numpy_boolean_array():
     """Test for_loop with numpy boolean arrays"""
     arr = np.array([True, False, True, False, True])
-    
+
     def logical_not(x):
         return not x
-    
+
     with HPXRuntime():
         hpyx.multiprocessing.for_loop(logical_not, arr, "seq")
-    
+
     expected = np.array([False, True, False, True, False])
     np.testing.assert_array_equal(arr, expected)
 
@@ -249,13 +271,13 @@ def test_for_loop_numpy_large_array():
     """Test for_loop with large numpy arrays for performance"""
     size = 10000
     arr = np.arange(size, dtype=np.float32)
-    
+
     def sqrt_plus_one(x):
         return np.sqrt(x) + 1
-    
+
     with HPXRuntime():
         hpyx.multiprocessing.for_loop(sqrt_plus_one, arr, "seq")
-    
+
     # Verify a few elements
     np.testing.assert_almost_equal(arr[0], 1.0, decimal=6)  # sqrt(0) + 1 = 1
     np.testing.assert_almost_equal(arr[4], 3.0, decimal=6)  # sqrt(4) + 1 = 3
@@ -265,13 +287,13 @@ def test_for_loop_numpy_large_array():
 def test_for_loop_numpy_empty_array():
     """Test for_loop with empty numpy arrays"""
     arr = np.array([])
-    
+
     def double(x):
         return x * 2
-    
+
     with HPXRuntime():
         hpyx.multiprocessing.for_loop(double, arr, "seq")
-    
+
     assert arr.size == 0
     np.testing.assert_array_equal(arr, np.array([]))
 
@@ -283,13 +305,13 @@ def test_for_loop_numpy_different_dtypes():
     with HPXRuntime():
         hpyx.multiprocessing.for_loop(lambda x: x * 2, arr_int32, "seq")
     np.testing.assert_array_equal(arr_int32, np.array([2, 4, 6], dtype=np.int32))
-    
+
     # Test int64
     arr_int64 = np.array([10, 20, 30], dtype=np.int64)
     with HPXRuntime():
         hpyx.multiprocessing.for_loop(lambda x: x + 5, arr_int64, "seq")
     np.testing.assert_array_equal(arr_int64, np.array([15, 25, 35], dtype=np.int64))
-    
+
     # Test float32
     arr_float32 = np.array([1.1, 2.2, 3.3], dtype=np.float32)
     with HPXRuntime():
@@ -13,3 +13,45 @@ def test_hpx_dot1d(v_len):
         result = hpyx._core.dot1d(a, b)
     assert isinstance(result, float), "Result should be a float"
     assert np.allclose(result, np.dot(a, b)), "HPX dot1d result does not match numpy dot product"
+
+
+class _DLPackOnly:
+    """Exposes an array through DLPack alone, like a foreign tensor."""
+
+    def __init__(self, array):
+        self._array = array
+
+    def __dlpack__(self, **kwargs):
+        return self._array.__dlpack__(**kwargs)
+
+    def __dlpack_device__(self):
+        return self._array.__dlpack_device__()
+
+
+def _inputs(a):
+    yield "memoryview", memoryview(a)
+    yield "bytes", a.tobytes()
+    yield "bytearray", bytearray(a.tobytes())
+    yield "byte memoryview", memoryview(a).cast("B")
+    yield "dlpack", _DLPackOnly(a)
+    yield "capsule", a.__dlpack__()
+
+
+def test_hpx_dot1d_accepts_buffers_and_dlpack():
+    a = np.random.default_rng(0).random(1000)
+    expected = np.dot(a, a)
+    with HPXRuntime():
+        for name, buffer in _inputs(a):
+            assert np.isclose(hpyx._core.dot1d(buffer, a), expected), name
+
+
+def test_hpx_dot1d_rejects_other_buffers():
+    with HPXRuntime():
+        with pytest.raises(TypeError, match="float64"):
+            hpyx._core.dot1d(np.ones(4, dtype=np.float32), np.ones(4))
+        with pytest.raises(TypeError, match="float64"):
+            hpyx._core.dot1d([1.0, 2.0], [1.0, 2.0])
+        with pytest.raises(ValueError, match="multiple of 8"):
+            hpyx._core.dot1d(b"\0" * 12, b"\0" * 12)
+        with pytest.raises(ValueError, match="aligned"):
+            hpyx._core.dot1d(memoryview(bytes(24))[1:17], np.ones(2))
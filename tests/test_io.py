@@ -0,0 +1,108 @@
+"""Tests for hpyx.io parallel file loading."""
+
+import numpy as np
+import pytest
+
+import hpyx
+from hpyx import io
+
+
+@pytest.fixture
+def values(tmp_path):
+    data = np.random.default_rng(0).random(100_003)
+    path = tmp_path / "values.bin"
+    data.tofile(path)
+    return path, data
+
+
+@pytest.mark.parametrize("pool", ["default", "io"])
+def test_fromfile_matches_numpy(values, pool):
+    path, data = values
+    result = io.fromfile(path, np.float64, block_size=4096 + 8, pool=pool).get()
+    np.testing.assert_array_equal(result, data)
+    assert result.flags.writeable and result.flags.c_contiguous
+
+
+def test_fromfile_count_offset_and_dtype(values):
+    path, data = values
+    result = io.fromfile(path, np.float64, 1000, offset=80, block_size=4096).get()
+    np.testing.assert_array_equal(result, data[10:1010])
+    raw = io.fromfile(str(path), np.uint8).get()
+    np.testing.assert_array_equal(raw, np.fromfile(path, np.uint8))
+    assert io.fromfile(path, np.float64, 0).get().shape == (0,)
+
+
+def test_fromfile_overlaps_with_work(values):
+    path, data = values
+    pending = io.fromfile(path, np.float64, block_size=1 << 16)
+    other = hpyx.futures.submit(np.sum, data)
+    assert pending.get().sum() == other.get()
+
+
+def test_fromfile_errors(values, tmp_path):
+    path, data = values
+    with pytest.raises(ValueError, match="fewer than count"):
+        io.fromfile(path, np.float64, data.size + 1)
+    with pytest.raises(FileNotFoundError):
+        io.fromfile(tmp_path / "missing.bin")
+    with pytest.raises(ValueError, match="pool"):
+        io.fromfile(path, pool="gpu")
+    with pytest.raises(ValueError, match="block_size"):
+        io.fromfile(path, block_size=0)
+    with pytest.raises(ValueError, match="dtype"):
+        io.fromfile(path, object)
+
+
+@pytest.mark.parametrize(
+    "array",
+    [
+        np.arange(60.0).reshape(3, 4, 5),
+        np.asfortranarray(np.arange(60, dtype=np.int32).reshape(6, 10)),
+        np.array(3.5),
+        np.zeros((0, 4)),
+        np.array([(1, 2.0), (3, 4.0)], dtype=[("a", "<i2"), ("b", ">f8")]),
+    ],
+    ids=["c-order", "fortran-order", "0-d", "empty", "structured"],
+)
+def test_load_npy_matches_numpy(tmp_path, array):
+    path = tmp_path / "array.npy"
+    np.save(path, array)
+    result = io.load_npy(path, block_size=64).get()
+    expected = np.load(path)
+    np.testing.assert_array_equal(result, expected)
+    assert result.dtype == expected.dtype
+    assert result.flags.f_contiguous == expected.flags.f_contiguous
+
+
+def test_load_npy_errors(tmp_path):
+    objects = tmp_path / "objects.npy"
+    np.save(objects, np.array([{}, []], dtype=object))
+    with pytest.raises(ValueError, match="dtype"):
+        io.load_npy(objects)
+
+    truncated = tmp_path / "truncated.npy"
+    np.save(truncated, np.arange(1000.0))
+    with open(truncated, "r+b") as f:
+        f.truncate(1000)
+    with pytest.raises(EOFError):
+        io.load_npy(truncated).get()
+
+
+def test_read_blocks(values):
+    path, data = values
+    blocks = io.read_blocks(path, 8 * 4096, dtype=np.float64)
+    assert len(blocks) == -(-data.size // 4096)
+    arrays = [block.get() for block in blocks]
+    assert all(a.size == 4096 for a in arrays[:-1])
+    np.testing.assert_array_equal(np.concatenate(arrays), data)
+
+    part = io.read_blocks(path, 100, offset=8, length=250, pool="io")
+    assert [b.get().size for b in part] == [100, 100, 50]
+
+
+def test_read_blocks_errors(values):
+    path, _data = values
+    with pytest.raises(ValueError, match="block_size"):
+        io.read_blocks(path, 12, dtype=np.float64)
+    with pytest.raises(ValueError, match="length"):
+        io.read_blocks(path, 16, dtype=np.float64, length=20)
@@ -0,0 +1,197 @@
+"""Tests for the native kernels in hpyx.kernels."""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+import hpyx
+from hpyx.kernels import memmap_dot, memmap_max, memmap_min, memmap_sum, stencil
+from hpyx.kernels._memmap import _source
+
+# A small block forces many blocks (and readahead) on small test files.
+_BLOCK = 4096
+
+
+@pytest.fixture
+def values():
+    return np.random.default_rng(0).random(100_003)
+
+
+@pytest.fixture
+def mapped(tmp_path, values):
+    path = tmp_path / "values.f64"
+    values.tofile(path)
+    return np.memmap(path, dtype=np.float64, mode="r")
+
+
+def test_exported():
+    assert hpyx.kernels.memmap_dot is memmap_dot
+
+
+@pytest.mark.parametrize("prefetch", [0, 1, 4])
+def test_memmap_dot(mapped, values, prefetch):
+    result = memmap_dot(mapped, mapped, block_size=_BLOCK, prefetch=prefetch)
+    assert result == pytest.approx(np.dot(values, values))
+
+
+def test_memmap_dot_large_block(mapped, values):
+    assert memmap_dot(mapped, values) == pytest.approx(np.dot(values, values))
+
+
+def test_memmap_dot_of_views_at_unaligned_offsets(mapped, values):
+    result = memmap_dot(mapped[3:50_003], mapped[50_003:], block_size=_BLOCK)
+    assert result == pytest.approx(np.dot(values[3:50_003], values[50_003:]))
+
+
+def test_memmap_dot_reads_the_data_after_release(mapped, values):
+    # Released blocks are read back from the file on the next pass.
+    first = memmap_dot(mapped, mapped, block_size=_BLOCK)
+    assert memmap_dot(mapped, mapped, block_size=_BLOCK) == first
+
+
+def test_memmap_reductions(mapped, values):
+    assert memmap_sum(mapped, block_size=_BLOCK) == pytest.approx(values.sum())
+    assert memmap_min(mapped, block_size=_BLOCK) == values.min()
+    assert memmap_max(mapped, block_size=_BLOCK) == values.max()
+
+
+def test_memmap_reductions_of_ndarrays():
+    a = np.arange(12.0).reshape(3, 4)
+    assert memmap_sum(a) == 66.0
+    assert memmap_min(a) == 0.0
+    assert memmap_max(a) == 11.0
+    assert memmap_sum(np.empty(0)) == 0.0
+    with pytest.raises(ValueError, match="no identity"):
+        memmap_min(np.empty(0))
+
+
+def test_memmap_min_max_propagate_nan():
+    a = np.ones(10_000)
+    a[5_000] = np.nan
+    assert np.isnan(memmap_min(a, block_size=_BLOCK))
+    assert np.isnan(memmap_max(a, block_size=_BLOCK))
+
+
+def test_copy_on_write_changes_survive(tmp_path, values):
+    path = tmp_path / "values.f64"
+    values.tofile(path)
+    private = np.memmap(path, dtype=np.float64, mode="c")
+    private[:] = 1.0
+    assert memmap_sum(private, block_size=_BLOCK) == private.size
+    assert memmap_sum(private, block_size=_BLOCK) == private.size
+
+
+def test_source(tmp_path, mapped):
+    assert _source(np.ones(3)) is None
+    path, offset, release = _source(mapped[10:])
+    assert path == str(tmp_path / "values.f64")
+    assert offset == 80
+    assert release
+    header = np.memmap(tmp_path / "values.f64", dtype=np.float64, mode="c", offset=16)
+    assert _source(header[1:])[1:] == (24, False)
+
+
+def test_memmap_kernels_read_buffers_in_place(values):
+    data = values.tobytes()
+    assert memmap_dot(data, memoryview(values), block_size=_BLOCK) == pytest.approx(
+        np.dot(values, values)
+    )
+    assert memmap_sum(bytearray(data), block_size=_BLOCK) == pytest.approx(values.sum())
+    assert memmap_max(values.__dlpack__()) == values.max()
+
+
+def test_invalid_inputs(mapped):
+    with pytest.raises(TypeError, match="float64"):
+        memmap_dot(np.ones(3, dtype=np.float32), np.ones(3))
+    with pytest.raises(ValueError, match="C-contiguous"):
+        memmap_sum(mapped[::2])
+    with pytest.raises(ValueError, match="1-D"):
+        memmap_dot(np.ones((2, 2)), np.ones((2, 2)))
+    with pytest.raises(ValueError, match="same size"):
+        memmap_dot(np.ones(3), np.ones(4))
+    with pytest.raises(ValueError, match="block_size"):
+        memmap_sum(mapped, block_size=0)
+    with pytest.raises(ValueError, match="prefetch"):
+        memmap_sum(mapped, prefetch=-1)
+
+
+_PAD_MODES = {"nearest": "edge", "periodic": "wrap", "reflect": "symmetric"}
+
+
+def _reference_stencil(a, weights, steps, boundary, cval=0.0):
+    weights = np.asarray(weights, dtype=np.float64)
+    radius = [(n // 2, n // 2) for n in weights.shape]
+    for _ in range(steps):
+        if boundary == "constant":
+            padded = np.pad(a, radius, mode="constant", constant_values=cval)
+        else:
+            padded = np.pad(a, radius, mode=_PAD_MODES[boundary])
+        windows = np.lib.stride_tricks.sliding_window_view(padded, weights.shape)
+        a = np.einsum(windows, list(range(2 * a.ndim)), weights, list(range(a.ndim, 2 * a.ndim)))
+    return a
+
+
+@pytest.mark.parametrize("boundary", ["constant", "nearest", "periodic", "reflect"])
+def test_stencil_1d(boundary):
+    a = np.random.default_rng(1).random(100_000)
+    weights = [0.1, 0.2, 0.4, 0.2, 0.1]
+    result = stencil(a, weights, steps=7, boundary=boundary, cval=0.5)
+    np.testing.assert_allclose(result, _reference_stencil(a, weights, 7, boundary, 0.5))
+
+
+@pytest.mark.parametrize("boundary", ["constant", "nearest", "periodic", "reflect"])
+@pytest.mark.parametrize("shape", [(300, 400), (3, 50_000), (50_000, 3)])
+def test_stencil_2d(boundary, shape):
+    a = np.random.default_rng(2).random(shape)
+    weights = np.array([[0.0, 0.1, 0.0], [0.1, 0.5, 0.15], [0.05, 0.1, 0.0]])
+    result = stencil(a, weights, steps=4, boundary=boundary)
+    np.testing.assert_allclose(result, _reference_stencil(a, weights, 4, boundary))
+
+
+def test_stencil_radius_larger_than_array():
+    a = np.arange(4.0)
+    weights = np.full(11, 1 / 11)
+    for boundary in ("constant", "nearest", "periodic", "reflect"):
+        np.testing.assert_allclose(
+            stencil(a, weights, steps=2, boundary=boundary),
+            _reference_stencil(a, weights, 2, boundary),
+        )
+
+
+@pytest.mark.parametrize("steps", [0, 1, 2, 3])
+def test_stencil_in_place_and_out(steps):
+    a = np.random.default_rng(3).random((64, 64))
+    weights = np.full((3, 3), 1 / 9)
+    expected = _reference_stencil(a, weights, steps, "periodic")
+    original = a.copy()
+
+    out = np.empty_like(a)
+    assert stencil(a, weights, steps=steps, boundary="periodic", out=out) is out
+    np.testing.assert_allclose(out, expected)
+    np.testing.assert_array_equal(a, original)
+
+    assert stencil(a, weights, steps=steps, boundary="periodic", out=a) is a
+    np.testing.assert_allclose(a, expected)
+
+
+def test_stencil_converts_inputs():
+    a = np.arange(10, dtype=np.int32)
+    result = stencil(a[::-1], [1, 0, 1])
+    np.testing.assert_array_equal(result, _reference_stencil(a[::-1].astype(float), [1, 0, 1], 1, "constant"))
+    assert stencil(np.empty((0, 5)), np.ones((1, 1)), steps=3).shape == (0, 5)
+
+
+def test_stencil_invalid_inputs():
+    with pytest.raises(ValueError, match="1-D or 2-D"):
+        stencil(np.zeros((2, 2, 2)), np.ones((1, 1, 1)))
+    with pytest.raises(ValueError, match="2-D like the input"):
+        stencil(np.zeros((4, 4)), np.ones(3))
+    with pytest.raises(ValueError, match="odd"):
+        stencil(np.zeros(4), np.ones(2))
+    with pytest.raises(ValueError, match="boundary"):
+        stencil(np.zeros(4), np.ones(3), boundary="mirror")
+    with pytest.raises(ValueError, match="steps"):
+        stencil(np.zeros(4), np.ones(3), steps=-1)
+    with pytest.raises(ValueError, match="out"):
+        stencil(np.zeros(4), np.ones(3), out=np.zeros(4, dtype=np.float32))
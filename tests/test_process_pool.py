@@ -0,0 +1,119 @@
+"""Tests for hpyx.multiprocessing.ProcessPool and shared-memory hand-off."""
+
+import time
+from concurrent.futures import wait
+
+import numpy as np
+import pytest
+
+import hpyx
+from hpyx.multiprocessing import ProcessPool, shared_empty
+
+
+def _scale(a, k=2.0):
+    return a * k
+
+
+def _increment_inplace(a):
+    a += 1
+    return a
+
+
+def _worker_runtime_state():
+    return hpyx.is_running(), hpyx.debug.get_num_worker_threads()
+
+
+def _boom():
+    raise ValueError("boom")
+
+
+@pytest.fixture(scope="module")
+def pool():
+    with ProcessPool(max_workers=2) as p:
+        yield p
+
+
+def test_submit_plain_python(pool):
+    assert pool.submit(pow, 2, 10).result() == 1024
+
+
+def test_submit_kwargs_and_numpy_result(pool):
+    result = pool.submit(_scale, np.arange(5.0), k=3.0).result()
+    np.testing.assert_array_equal(result, np.arange(5.0) * 3.0)
+
+
+def test_shared_array_is_not_copied(pool):
+    arr = shared_empty((2, 3), dtype=np.int64)
+    arr[:] = 0
+    pool.submit(_increment_inplace, arr).result()
+    np.testing.assert_array_equal(arr, np.ones((2, 3), dtype=np.int64))
+
+
+def test_shared_array_view_is_not_copied(pool):
+    arr = shared_empty(6)
+    arr[:] = 0.0
+    pool.submit(_increment_inplace, arr[2:4]).result()
+    np.testing.assert_array_equal(arr, [0.0, 0.0, 1.0, 1.0, 0.0, 0.0])
+
+
+def test_worker_has_own_runtime(pool):
+    running, threads = pool.submit(_worker_runtime_state).result()
+    assert running is True
+    assert threads == 1
+
+
+def test_exception_propagates(pool):
+    with pytest.raises(ValueError, match="boom"):
+        pool.submit(_boom).result()
+
+
+@pytest.mark.parametrize("chunksize", [1, 3])
+def test_map_preserves_order(pool, chunksize):
+    assert list(pool.map(abs, range(-5, 5), chunksize=chunksize)) == [
+        abs(i) for i in range(-5, 5)
+    ]
+
+
+def test_map_rejects_bad_chunksize(pool):
+    with pytest.raises(ValueError, match="chunksize"):
+        pool.map(abs, [1], chunksize=0)
+
+
+def test_module_level_map():
+    assert hpyx.multiprocessing.map(pow, [2, 3], [5, 2], max_workers=2) == [32, 9]
+
+
+def test_fork_rejected_while_runtime_running():
+    with pytest.raises(RuntimeError, match="fork"):
+        ProcessPool(max_workers=1, start_method="fork")
+
+
+def test_cancel_queued_task():
+    with ProcessPool(max_workers=1) as p:
+        running = p.submit(time.sleep, 1.0)
+        queued = [p.submit(pow, 2, i) for i in range(8)]
+        assert queued[-1].cancel()
+        assert queued[-1].cancelled()
+        assert not running.cancel()
+        assert running.result() is None
+        assert queued[0].result() == 1
+
+
+def test_shutdown_cancels_queued_futures():
+    p = ProcessPool(max_workers=1)
+    running = p.submit(time.sleep, 1.0)
+    queued = [p.submit(pow, 2, i) for i in range(8)]
+    p.shutdown(cancel_futures=True)
+    assert running.result() is None
+    assert queued[-1].cancelled()
+    assert all(f.cancelled() or f.result() == 2**i for i, f in enumerate(queued))
+
+
+def test_wait_reports_cancelled_futures():
+    with ProcessPool(max_workers=1) as p:
+        running = p.submit(time.sleep, 1.0)
+        queued = [p.submit(pow, 2, i) for i in range(4)]
+        assert queued[-1].cancel()
+        done, not_done = wait([running, *queued], timeout=30)
+        assert not not_done
+        assert queued[-1] in done
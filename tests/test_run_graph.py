@@ -0,0 +1,91 @@
+"""Tests for hpyx.run_graph on {key: (fn, *args)} task graphs."""
+
+from __future__ import annotations
+
+import operator
+import threading
+
+import numpy as np
+import pytest
+
+import hpyx
+
+
+def _inc(x):
+    return x + 1
+
+
+def test_run_graph_single_and_list_outputs():
+    graph = {
+        "x": 1,
+        "y": (_inc, "x"),
+        "z": (operator.add, "y", "y"),
+        "w": (operator.mul, "z", 10),
+    }
+    assert hpyx.run_graph(graph, "w") == 40
+    assert hpyx.run_graph(graph, ["z", "x", "w"]) == [4, 1, 40]
+    assert hpyx.run_graph(graph, "x") == 1
+
+
+def test_run_graph_keys_and_literal_arguments():
+    graph = {
+        ("a", 0): (np.arange, 4.0),
+        ("a", 1): (np.ones, 4),
+        "total": (np.add, ("a", 0), ("a", 1)),
+        "lists": (sum, [1, 2, 3]),  # containers are not searched for keys
+        "text": (str, "lists"),  # a string that is a key is a dependency
+    }
+    np.testing.assert_array_equal(hpyx.run_graph(graph, "total"), np.arange(1.0, 5.0))
+    assert hpyx.run_graph(graph, "lists") == 6
+    assert hpyx.run_graph(graph, "text") == "6"
+
+
+def test_run_graph_only_runs_needed_tasks():
+    calls = []
+
+    def record(name, *deps):
+        calls.append(name)
+        return name
+
+    graph = {
+        "a": (record, 1),
+        "b": (record, 2, "a"),
+        "unused": (record, 3, "a"),
+    }
+    assert hpyx.run_graph(graph, "b") == 2
+    assert sorted(calls) == [1, 2]
+
+
+def test_run_graph_runs_independent_tasks_concurrently():
+    barrier = threading.Barrier(2, timeout=30)
+
+    def meet(x):
+        barrier.wait()
+        return x
+
+    graph = {"a": (meet, 1), "b": (meet, 2), "c": (operator.add, "a", "b")}
+    assert hpyx.run_graph(graph, "c") == 3
+
+
+def test_run_graph_wide_and_deep():
+    n = 2000
+    graph = {("leaf", i): (_inc, i) for i in range(n)}
+    graph["sum"] = (lambda *xs: sum(xs), *[("leaf", i) for i in range(n)])
+    graph[("chain", 0)] = (_inc, "sum")
+    for i in range(1, n):
+        graph[("chain", i)] = (_inc, ("chain", i - 1))
+    assert hpyx.run_graph(graph, ("chain", n - 1)) == n * (n + 1) // 2 + n
+
+
+def test_run_graph_errors():
+    def fail(x):
+        raise ZeroDivisionError(x)
+
+    with pytest.raises(ZeroDivisionError):
+        hpyx.run_graph({"a": (fail, 1), "b": (_inc, "a")}, "b")
+    with pytest.raises(KeyError, match="missing"):
+        hpyx.run_graph({"a": 1}, "missing")
+    with pytest.raises(ValueError, match="cycle"):
+        hpyx.run_graph({"a": (_inc, "b"), "b": (_inc, "a")}, "a")
+    with pytest.raises(ValueError, match="stacksize"):
+        hpyx.run_graph({"a": 1}, "a", stacksize="huge")
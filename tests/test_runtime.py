@@ -29,6 +29,16 @@ def test_init_raises_on_conflicting_cfg():
         hpyx.init(cfg=["hpx.stacks.small_size=0x40000"])
 
 
+def test_init_raises_on_conflicting_small_stack_size():
+    with pytest.raises(RuntimeError, match="different config"):
+        hpyx.init(small_stack_size=0x8000)
+
+
+def test_cfg_strings_small_stack_size():
+    cfg = _runtime._build_cfg_strings(os_threads=None, cfg=[], small_stack_size=32768)
+    assert "hpx.stacks.small_size!=0x8000" in cfg
+
+
 def test_is_running_true_during_session():
     assert is_running()
 
@@ -0,0 +1,91 @@
+"""Tests for the efficiency and regression logic of benchmarks/scaling.py."""
+
+from __future__ import annotations
+
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+_spec = importlib.util.spec_from_file_location(
+    "scaling", Path(__file__).resolve().parents[1] / "benchmarks" / "scaling.py"
+)
+scaling = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(scaling)
+
+
+def _entry(os_threads, size, seconds):
+    return {"os_threads": os_threads, "size": size, "seconds": seconds}
+
+
+def _report(results, mode="strong", workload="dot1d"):
+    return {"workload": workload, "mode": mode, "results": results}
+
+
+def test_add_efficiency_strong_normalizes_each_size_to_fewest_threads():
+    results = [
+        _entry(4, 100, 4.0),
+        _entry(1, 100, 8.0),
+        _entry(2, 100, 4.0),
+        _entry(2, 500, 10.0),
+        _entry(8, 500, 5.0),
+    ]
+    scaling.add_efficiency(results, weak=False)
+    assert [(e["speedup"], e["efficiency"]) for e in results] == [
+        (2.0, 0.5),
+        (1.0, 1.0),
+        (2.0, 1.0),
+        (1.0, 1.0),
+        (2.0, 0.5),
+    ]
+
+
+def test_add_efficiency_weak_treats_flat_time_as_ideal():
+    results = [_entry(1, 100, 2.0), _entry(2, 100, 2.0), _entry(4, 100, 4.0)]
+    scaling.add_efficiency(results, weak=True)
+    assert [e["efficiency"] for e in results] == [1.0, 1.0, 0.5]
+    assert [e["speedup"] for e in results] == [1.0, 2.0, 2.0]
+
+
+def test_compare_flags_only_slowdowns_beyond_threshold():
+    baseline = _report([_entry(1, 100, 1.0), _entry(2, 100, 1.0), _entry(4, 100, 1.0)])
+    current = _report([
+        _entry(1, 100, 1.25),  # 25% slower: flagged
+        _entry(2, 100, 1.1),  # within the threshold
+        _entry(4, 100, 0.5),  # faster
+        _entry(8, 100, 9.0),  # not in the baseline
+    ])
+    regressions = scaling.compare(current, baseline, 0.2)
+    assert len(regressions) == 1
+    regression = regressions[0]
+    assert (regression["os_threads"], regression["size"]) == (1, 100)
+    assert regression["baseline_seconds"] == 1.0
+    assert regression["seconds"] == 1.25
+    assert regression["change"] == pytest.approx(0.25)
+
+
+def test_compare_without_regressions_is_empty():
+    baseline = _report([_entry(1, 100, 1.0)])
+    assert scaling.compare(_report([_entry(1, 100, 1.0)]), baseline, 0.0) == []
+    assert scaling.compare(_report([]), baseline, 0.1) == []
+
+
+@pytest.mark.parametrize(
+    ("mode", "workload"), [("weak", "dot1d"), ("strong", "submit")]
+)
+def test_compare_rejects_mismatched_runs(mode, workload):
+    baseline = _report([_entry(1, 100, 1.0)])
+    with pytest.raises(ValueError, match="cannot compare"):
+        scaling.compare(_report([_entry(1, 100, 1.0)], mode, workload), baseline, 0.1)
+
+
+def test_format_table_lists_every_configuration():
+    report = _report([_entry(1, 100, 2.0), _entry(2, 100, 1.0)])
+    for entry in report["results"]:
+        entry["total_size"] = entry["size"]
+        entry["throughput"] = entry["size"] / entry["seconds"]
+    scaling.add_efficiency(report["results"], weak=False)
+    lines = scaling.format_table(report).splitlines()
+    assert lines[0] == "dot1d (strong scaling)"
+    assert lines[1].split() == ["threads", "size", "seconds", "throughput", "speedup", "eff."]
+    assert lines[3].split() == ["2", "100", "1.0000", "100", "2.00", "1.00"]
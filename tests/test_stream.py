@@ -0,0 +1,137 @@
+"""Tests for hpyx.stream pipelines."""
+
+from __future__ import annotations
+
+import itertools
+import time
+
+import pytest
+
+import hpyx
+from hpyx.stream import Pipeline
+
+
+def _square(x):
+    return x * x
+
+
+def _odd(x):
+    return x % 2
+
+
+def _slow_square(x):
+    # Early records finish last, so a parallel stage completes out of order.
+    time.sleep(0.0001 * (20 - x % 20))
+    return x * x
+
+
+class _Counting:
+    """An unbounded source that records how far it has been read."""
+
+    def __init__(self):
+        self.pulled = 0
+
+    def __iter__(self):
+        for i in itertools.count():
+            self.pulled = i + 1
+            yield i
+
+
+def test_exported():
+    assert hpyx.stream.Pipeline is Pipeline
+
+
+def test_map_filter_batch():
+    pipeline = Pipeline(range(20)).map(_square, parallelism=3).filter(_odd).batch(4)
+    assert list(pipeline) == [[1, 9, 25, 49], [81, 121, 169, 225], [289, 361]]
+
+
+def test_stages_return_new_pipelines():
+    base = Pipeline(range(3))
+    mapped = base.map(_square)
+    assert list(base) == [0, 1, 2]
+    assert list(Pipeline(range(3)).map(_square)) == [0, 1, 4]
+    assert mapped is not base
+
+
+@pytest.mark.parametrize("parallelism", [1, 4, 16])
+def test_ordered_keeps_source_order(parallelism):
+    pipeline = Pipeline(range(200), capacity=8).map(_slow_square, parallelism=parallelism)
+    assert list(pipeline) == [x * x for x in range(200)]
+
+
+def test_ordered_filter_keeps_order():
+    pipeline = Pipeline(range(200), capacity=4).map(_slow_square, parallelism=8)
+    assert list(pipeline.filter(_odd, parallelism=4)) == [
+        x * x for x in range(200) if x % 2
+    ]
+
+
+def test_unordered_yields_every_record():
+    pipeline = Pipeline(range(200), ordered=False).map(_slow_square, parallelism=8)
+    assert sorted(pipeline.filter(_odd, parallelism=2)) == [
+        x * x for x in range(200) if x % 2
+    ]
+    batches = list(Pipeline(range(10), ordered=False).batch(4))
+    assert sorted(len(b) for b in batches) == [2, 4, 4]
+
+
+def test_reduce():
+    assert Pipeline(range(10)).map(_square, parallelism=2).reduce(lambda a, b: a + b) == 285
+    assert Pipeline([]).reduce(lambda a, b: a + b, 7) == 7
+    with pytest.raises(TypeError):
+        Pipeline([]).reduce(lambda a, b: a + b)
+
+
+def test_source_is_read_lazily_with_backpressure():
+    source = _Counting()
+    pipeline = Pipeline(source, capacity=4).map(_square, parallelism=2).batch(2)
+    assert source.pulled == 0
+    records = iter(pipeline)
+    assert next(records) == [0, 1]
+    time.sleep(0.05)
+    # Read so far: the first batch, two channels of 4 records, a channel of
+    # 4 batches, two records in the map stage, one held by the batch stage
+    # and one by the source task.
+    assert source.pulled <= 2 + 4 + 4 + 4 * 2 + 2 + 1 + 1
+    records.close()
+
+
+def test_break_cancels_an_unbounded_pipeline():
+    source = _Counting()
+    for value in Pipeline(source, capacity=2).map(_square, parallelism=4):
+        if value > 100:
+            break
+    pulled = source.pulled
+    time.sleep(0.05)
+    assert source.pulled == pulled
+
+
+def test_stage_error_is_raised():
+    def check(x):
+        if x == 13:
+            msg = "bad record 13"
+            raise ValueError(msg)
+        return x
+
+    with pytest.raises(ValueError, match="bad record 13"):
+        list(Pipeline(itertools.count()).map(check, parallelism=4))
+
+
+def test_source_error_is_raised():
+    def source():
+        yield 1
+        msg = "source failed"
+        raise RuntimeError(msg)
+
+    with pytest.raises(RuntimeError, match="source failed"):
+        list(Pipeline(source()).map(_square))
+
+
+def test_invalid_arguments():
+    with pytest.raises(ValueError, match="capacity"):
+        Pipeline([], capacity=0)
+    with pytest.raises(ValueError, match="parallelism"):
+        Pipeline([]).map(_square, parallelism=0)
+    with pytest.raises(ValueError, match="n must be"):
+        Pipeline([]).batch(0)
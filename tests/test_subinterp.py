@@ -0,0 +1,122 @@
+"""Tests for the per-worker subinterpreter execution mode."""
+
+import math
+import operator
+import subprocess
+import sys
+import textwrap
+
+import numpy as np
+import pytest
+
+from hpyx import _runtime, _subinterp, _subinterp_bootstrap
+
+
+def _run_inline(task):
+    """Run a task through the wire format without leaving this interpreter."""
+    payload, arrays = _subinterp._encode(task)
+    views = [memoryview(a).cast("B") for a in arrays]
+    return _subinterp._decode(_subinterp_bootstrap._hpyx_run(payload, views), arrays)
+
+
+def test_wire_format_call():
+    assert _run_inline(("call", pow, (2, 10), {})) == 1024
+
+
+def test_wire_format_map():
+    assert _run_inline(("map", math.sqrt, [1, 4, 9])) == [1.0, 2.0, 3.0]
+
+
+def test_wire_format_array_is_shared_not_copied():
+    arr = np.zeros(4)
+    _run_inline(("call", operator.setitem, (arr, 2, 7.0), {}))
+    assert arr.tolist() == [0.0, 0.0, 7.0, 0.0]
+
+
+def test_wire_format_returned_input_is_original_array():
+    arr = np.arange(3, dtype=np.int64)
+    assert _run_inline(("call", max, (arr, arr), {"key": len})) is arr
+
+
+def test_wire_format_new_memoryview_becomes_ndarray():
+    arr = np.arange(6.0)
+    result = _run_inline(("call", operator.getitem, (arr, slice(1, 3)), {}))
+    assert isinstance(result, np.ndarray)
+    np.testing.assert_array_equal(result, [1.0, 2.0])
+
+
+def test_wire_format_exception_keeps_type_and_traceback():
+    with pytest.raises(ValueError, match="math domain error") as excinfo:
+        _run_inline(("call", math.sqrt, (-1,), {}))
+    assert "subinterpreter" in excinfo.value.__notes__[0]
+
+
+def test_session_runtime_has_subinterpreters_disabled():
+    assert not _runtime.subinterpreters_enabled()
+
+
+def test_subinterpreter_mode_end_to_end():
+    # The session runtime cannot be reconfigured, so run in a fresh process.
+    script = textwrap.dedent("""
+        import math, operator
+        import numpy as np
+        import hpyx
+        from hpyx.futures import submit
+
+        hpyx.init(os_threads=2, subinterpreters=True)
+        assert submit(math.factorial, 20).get() == math.factorial(20)
+
+        arr = np.zeros(3)
+        submit(operator.setitem, arr, 1, 5.0).get()
+        assert arr.tolist() == [0.0, 5.0, 0.0]
+
+        data = [float(i * i) for i in range(100)]
+        hpyx.multiprocessing.for_loop(math.sqrt, data, "par")
+        assert data == [float(i) for i in range(100)]
+
+        try:
+            submit(math.sqrt, -1).get()
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("expected ValueError")
+        hpyx.shutdown()
+        print("ok")
+    """)
+    result = subprocess.run(
+        [sys.executable, "-c", script],
+        capture_output=True, text=True, timeout=120,
+    )
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == "ok"
+
+
+def test_subinterpreter_buffers_released_when_future_is_dropped():
+    # get() releases a task's buffer views on the calling thread. Futures
+    # dropped without get() release them from a worker, which must take the
+    # main interpreter's GIL rather than the worker subinterpreter's.
+    script = textwrap.dedent("""
+        import gc, operator
+        import numpy as np
+        import hpyx
+        from hpyx.futures import submit
+
+        hpyx.init(os_threads=2, subinterpreters=True)
+        arrays = [np.zeros(8) for _ in range(64)]
+        for arr in arrays:
+            submit(operator.setitem, arr, 0, 1.0)
+        gc.collect()
+        assert submit(sum, [1, 2, 3]).get() == 6
+        kept = np.zeros(8)
+        submit(operator.setitem, kept, 1, 2.0).get()
+        kept.resize(16, refcheck=False)  # get() released the buffer export
+        assert kept[1] == 2.0
+        hpyx.shutdown()
+        print("ok")
+    """)
+    result = subprocess.run(
+        [sys.executable, "-c", script],
+        capture_output=True, text=True, timeout=120,
+    )
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == "ok"
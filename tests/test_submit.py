@@ -6,6 +6,7 @@ import time
 from typing import Callable, Any
 import pytest
 import numpy as np
+import hpyx
 from hpyx.futures import submit
 from hpyx.runtime import HPXRuntime
 
@@ -523,3 +524,60 @@ class TestSubmitReturnValues:
         future = submit(typed_function, 42, "Answer")
         result = future.get()
         assert result == "Answer: 42"
+
+
+class TestSubmitStacksize:
+    """Tests for eager submission with an explicit HPX stack size."""
+
+    @pytest.mark.parametrize("stacksize", ["nostack", "small", "medium", "large"])
+    def test_submit_with_stacksize(self, stacksize, hpx_runtime):
+        future = submit(pow, 3, 4, stacksize=stacksize)
+        assert future.get() == 81
+
+    def test_submit_many_nostack_tasks(self, hpx_runtime):
+        futures = [submit(abs, -i, stacksize="nostack") for i in range(10_000)]
+        assert sum(f.get() for f in futures) == sum(range(10_000))
+
+    def test_nostack_task_cannot_wait_for_hpx_work(self, hpx_runtime):
+        def waits():
+            return submit(abs, -1, stacksize="small").get()
+
+        def runs_graph():
+            return hpyx.run_graph({"x": (abs, -1)}, "x")
+
+        with pytest.raises(RuntimeError, match="nostack"):
+            submit(waits, stacksize="nostack").get()
+        with pytest.raises(RuntimeError, match="nostack"):
+            submit(runs_graph, stacksize="nostack").get()
+        assert submit(waits, stacksize="small").get() == 1
+        assert submit(runs_graph, stacksize="small").get() == 1
+
+    @pytest.mark.parametrize(
+        "kernel",
+        [
+            lambda a: hpyx._core.dot1d(a, a),
+            lambda a: hpyx.multiprocessing.for_loop(abs, list(a), "par"),
+            lambda a: hpyx.array.from_array(a).sum().compute(),
+            lambda a: hpyx.kernels.memmap_dot(a, a),
+            lambda a: hpyx.kernels.memmap_sum(a),
+            lambda a: hpyx.kernels.stencil(a, np.ones(3)),
+            lambda a: list(hpyx.stream.Pipeline(a.tolist()).map(abs)),
+        ],
+        ids=["dot1d", "for_loop", "array", "memmap_dot", "memmap_sum", "stencil", "stream"],
+    )
+    def test_nostack_task_cannot_run_parallel_kernels(self, kernel, hpx_runtime):
+        a = np.ones(1000)
+        with pytest.raises(RuntimeError, match="nostack"):
+            submit(kernel, a, stacksize="nostack").get()
+        submit(kernel, a, stacksize="small").get()
+
+    def test_submit_stacksize_propagates_exception(self, hpx_runtime):
+        def fail():
+            raise KeyError("boom")
+
+        with pytest.raises(KeyError, match="boom"):
+            submit(fail, stacksize="small").get()
+
+    def test_submit_invalid_stacksize_raises(self, hpx_runtime):
+        with pytest.raises(ValueError, match="stacksize"):
+            submit(abs, -1, stacksize="tiny")